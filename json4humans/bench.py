@@ -0,0 +1,410 @@
+"""
+This module benchmarks the supported dialects on synthetic shapes or on arbitrary corpora.
+
+It is runnable as `python -m json4humans.bench`:
+
+```console
+$ python -m json4humans.bench                       # All the synthetic shapes
+$ python -m json4humans.bench --shape deep --size 500
+$ python -m json4humans.bench path/to/corpus --memory --startup
+```
+
+For each document, it reports:
+
+- the best `loads` and `dumps` timings (best of `--repeat` runs of an auto-calibrated loop)
+- the same timings for the standard library [json][] module when the document is valid JSON,
+  and the resulting slowdown ratio
+- the `loads` peak memory measured with [tracemalloc][] (with `--memory`)
+
+With `--startup`, the cold-start time of every dialect module (import and first parse)
+is measured in fresh interpreters.
+
+Synthetic documents are deterministic (see [SHAPES][json4humans.bench.SHAPES]) so runs are comparable.
+"""
+from __future__ import annotations
+
+import argparse
+import json as stdjson
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from .cli import DIALECTS, get_module, iter_files
+
+WORDS = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor".split()
+
+
+def sentence(rand: random.Random, words: int) -> str:
+    return " ".join(rand.choice(WORDS) for _ in range(words))
+
+
+def comments(size: int) -> str:
+    """An object of `size` members, each preceded by line and block comments (JSONC)"""
+    rand = random.Random(size)
+    lines = ["// Generated configuration", "{"]
+    for i in range(size):
+        lines.append(f"  // {sentence(rand, 6)}")
+        lines.append(f"  /* {sentence(rand, 4)} */")
+        value = rand.choice([str(rand.randint(0, 1000)), "true", "null", f'"{sentence(rand, 2)}"'])
+        lines.append(f'  "key{i}": {value}, // {sentence(rand, 3)}')
+    lines.append('  "last": [] /* end */')
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def json5_syntax(size: int) -> str:
+    """
+    An array of `size` objects using JSON5 specific syntax:
+    identifiers keys, single quotes, hexadecimal and signed numbers and trailing comas.
+    """
+    rand = random.Random(size)
+    items = [
+        f"  {{id: 0x{i:X}, name: '{sentence(rand, 2)}', ratio: .{rand.randint(1, 99)}, "
+        f"delta: {rand.choice('+-')}{rand.randint(0, 99)}, inf: -Infinity, "
+        f"tags: ['{rand.choice(WORDS)}', \"{rand.choice(WORDS)}\",],}},"
+        for i in range(size)
+    ]
+    return "// Generated\n[\n" + "\n".join(items) + "\n]\n"
+
+
+def deep(size: int) -> str:
+    """Alternating objects and arrays nested `size` levels deep"""
+    opening = "".join('{"a": [' if i % 2 == 0 else "" for i in range(size))
+    closing = "".join("]}" if i % 2 == 0 else "" for i in range(size))
+    return f"{opening}1{closing}"
+
+
+def wide(size: int) -> str:
+    """A flat array of `size` numbers"""
+    rand = random.Random(size)
+    return stdjson.dumps(
+        [rand.choice([rand.randint(-1000, 1000), rand.random()]) for _ in range(size)]
+    )
+
+
+def strings(size: int) -> str:
+    """An object of `size` long strings with escape sequences"""
+    rand = random.Random(size)
+    return stdjson.dumps(
+        {f"text{i}": f'{sentence(rand, 30)}\n\t"{sentence(rand, 5)}"\\' for i in range(size)},
+        indent=2,
+    )
+
+
+class Shape(NamedTuple):
+    """A synthetic document generator"""
+
+    dialect: str
+    """The dialect of the generated documents"""
+    generate: Callable[[int], str]
+    """Generate a document given its size"""
+    size: int
+    """The default size"""
+
+
+SHAPES: dict[str, Shape] = {
+    "comments": Shape("jsonc", comments, 500),
+    "json5": Shape("json5", json5_syntax, 300),
+    "deep": Shape("json", deep, 500),
+    "wide": Shape("json", wide, 5000),
+    "strings": Shape("json", strings, 500),
+}
+"""The synthetic document shapes by name"""
+
+
+def timing(func: Callable[[], Any], repeat: int = 5, min_time: float = 0.2) -> float:
+    """
+    Measure the best time of a function call in seconds.
+
+    The function is called in a loop long enough to last at least `min_time` seconds.
+
+    :param func: The function to measure
+    :param repeat: The number of measured loops
+    :param min_time: The minimum duration of a loop
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def peak_memory(func: Callable[[], Any]) -> int:
+    """
+    Measure the peak memory allocated during a function call in bytes.
+
+    :param func: The function to measure
+    """
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        tracemalloc.clear_traces()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        func()
+        return tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+
+STARTUP = """\
+import time
+start = time.perf_counter()
+import json4humans.{dialect} as module
+module.loads("{{}}")
+print(time.perf_counter() - start)
+"""
+
+
+def startup(dialect: str, repeat: int = 5) -> float:
+    """
+    Measure the best cold-start time of a dialect (import and first parse) in seconds.
+
+    Each measure runs in a fresh interpreter.
+
+    :param dialect: The dialect name (ie. `jsonc`)
+    :param repeat: The number of interpreters to run
+    """
+    return min(
+        float(
+            subprocess.run(
+                [sys.executable, "-c", STARTUP.format(dialect=dialect)],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+        )
+        for _ in range(repeat)
+    )
+
+
+@dataclass
+class Result:
+    """The measures of a document"""
+
+    name: str
+    dialect: str
+    size: int
+    """The document size in bytes"""
+    loads: float
+    dumps: float
+    stdlib_loads: float | None = None
+    """The standard library `json.loads()` timing if the document is valid JSON"""
+    stdlib_dumps: float | None = None
+    peak: int | None = None
+    """The `loads()` peak memory in bytes"""
+
+    @property
+    def ratio(self) -> float | None:
+        """How many times slower than the standard library"""
+        return self.loads / self.stdlib_loads if self.stdlib_loads else None
+
+
+def measure(
+    name: str,
+    src: str,
+    dialect: str,
+    repeat: int = 5,
+    min_time: float = 0.2,
+    memory: bool = False,
+) -> Result:
+    """
+    Measure a document `loads` and `dumps` in a dialect and with the standard library.
+
+    :param name: The document name
+    :param src: The source document
+    :param dialect: The document dialect
+    :param repeat: The number of measured loops
+    :param min_time: The minimum duration of a loop
+    :param memory: Measure the `loads` peak memory
+    :raises JSONDecodeError: if the document is invalid in its dialect
+    """
+    module = get_module(dialect)
+    doc = module.loads(src)
+    result = Result(
+        name,
+        dialect,
+        len(src.encode()),
+        timing(lambda: module.loads(src), repeat, min_time),
+        timing(lambda: module.dumps(doc), repeat, min_time),
+    )
+    try:
+        data = stdjson.loads(src)
+    except ValueError:
+        pass
+    else:
+        result.stdlib_loads = timing(lambda: stdjson.loads(src), repeat, min_time)
+        result.stdlib_dumps = timing(lambda: stdjson.dumps(data), repeat, min_time)
+    if memory:
+        result.peak = peak_memory(lambda: module.loads(src))
+    return result
+
+
+def documents(
+    paths: Sequence[Path], dialect: str | None, shapes: Sequence[str], size: int | None
+) -> Iterator[tuple[str, str, str]]:
+    """
+    Yield the name, source and dialect of the corpus files or of the synthetic shapes.
+
+    Files which are not valid UTF-8 are reported as skipped.
+    """
+    if paths:
+        for path, found in iter_files(paths, dialect):
+            try:
+                src = path.read_text(encoding="utf-8")
+            except UnicodeDecodeError as e:
+                skip(str(path), e)
+                continue
+            yield str(path), src, found
+        return
+    for name in shapes:
+        shape = SHAPES[name]
+        yield f"{name}({size or shape.size})", shape.generate(size or shape.size), shape.dialect
+
+
+def skip(name: str, error: ValueError):
+    """Report a document which can't be measured"""
+    print(f"{name}: skipped ({error})", file=sys.stderr)
+
+
+def duration(seconds: float | None) -> str:
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+def filesize(size: int | None) -> str:
+    if size is None:
+        return "-"
+    for unit, scale in (("MiB", 1 << 20), ("KiB", 1 << 10)):
+        if size >= scale:
+            return f"{size / scale:.1f}{unit}"
+    return f"{size}B"
+
+
+def table(rows: Sequence[Sequence[str]]) -> str:
+    """Render rows as a text table, the first one being the header"""
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = ["  ".join(cell.ljust(width) for cell, width in zip(row, widths)) for row in rows]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(line.rstrip() for line in lines)
+
+
+def report(results: Sequence[Result]) -> str:
+    """Render the results as a text table"""
+    rows = [
+        [
+            "document",
+            "dialect",
+            "size",
+            "loads",
+            "dumps",
+            "json.loads",
+            "json.dumps",
+            "ratio",
+            "peak",
+        ]
+    ]
+    for result in results:
+        rows.append(
+            [
+                result.name,
+                result.dialect,
+                filesize(result.size),
+                duration(result.loads),
+                duration(result.dumps),
+                duration(result.stdlib_loads),
+                duration(result.stdlib_dumps),
+                f"x{result.ratio:.1f}" if result.ratio else "-",
+                filesize(result.peak),
+            ]
+        )
+    return table(rows)
+
+
+def parser() -> argparse.ArgumentParser:
+    """Build the command line arguments parser"""
+    parser = argparse.ArgumentParser(
+        prog="python -m json4humans.bench", description=__doc__.splitlines()[1]
+    )
+    parser.add_argument(
+        "paths", nargs="*", type=Path, help="Files and directories to measure (default: shapes)"
+    )
+    parser.add_argument(
+        "-d", "--dialect", choices=DIALECTS, help="Force the dialect instead of using extensions"
+    )
+    parser.add_argument(
+        "-s",
+        "--shape",
+        dest="shapes",
+        action="append",
+        choices=SHAPES,
+        help="Synthetic shapes to measure without paths (default: all)",
+    )
+    parser.add_argument("--size", type=int, help="Synthetic documents size (default: per shape)")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="Measured loops")
+    parser.add_argument(
+        "--min-time", type=float, default=0.2, help="Minimum duration of a loop in seconds"
+    )
+    parser.add_argument("-m", "--memory", action="store_true", help="Measure peak memory")
+    parser.add_argument(
+        "--startup", action="store_true", help="Measure the dialects cold-start time"
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """
+    The benchmark entrypoint.
+
+    :param argv: The command line arguments (default to `sys.argv`)
+    :returns: The exit code
+    """
+    args = parser().parse_args(argv)
+    results = []
+    for name, src, dialect in documents(
+        args.paths, args.dialect, args.shapes or list(SHAPES), args.size
+    ):
+        try:
+            results.append(measure(name, src, dialect, args.repeat, args.min_time, args.memory))
+        except ValueError as e:
+            skip(name, e)
+    if not results:
+        print("No document to measure", file=sys.stderr)
+        return 1
+    print(report(results))
+    if args.startup:
+        print()
+        print(
+            table(
+                [["dialect", "startup"]]
+                + [[dialect, duration(startup(dialect, args.repeat))] for dialect in DIALECTS]
+            )
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
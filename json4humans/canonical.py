@@ -0,0 +1,233 @@
+"""
+This module serializes documents into canonical JSON,
+as defined by the [JSON Canonicalization Scheme](https://www.rfc-editor.org/rfc/rfc8785) (JCS).
+
+The canonical form only depends on the data, not on the source dialect nor on its style:
+whitespaces and comments are dropped, object members are sorted by their keys UTF-16 code units,
+strings use the minimal escaping and numbers are formatted like ECMAScript does.
+It is suitable for hashing and signing:
+
+```python
+import hashlib
+
+from json4humans import canonical, json5
+
+doc = json5.loads("{b: 0x10, a: 'é', /* comment */ c: [1.50, true]}")
+assert canonical.dumps(doc) == '{"a":"é","b":16,"c":[1.5,true]}'
+digest = canonical.update(hashlib.sha256(), doc).hexdigest()
+```
+
+The output is produced in a single streaming pass over the document (style preserving or plain builtins)
+without building any intermediate copy, nor recursing.
+"""
+from __future__ import annotations
+
+import math
+import re
+from collections.abc import Iterator
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Protocol, TextIO, TypeVar
+
+from .types import Literal
+
+CHUNK_PARTS = 4096
+"""The number of encoded parts buffered before a chunk is yielded"""
+
+ESCAPED = re.compile(r'[\x00-\x1f"\\]')
+"""Match the characters which must be escaped in strings"""
+
+ESCAPES = {
+    '"': '\\"',
+    "\\": "\\\\",
+    "\b": "\\b",
+    "\f": "\\f",
+    "\n": "\\n",
+    "\r": "\\r",
+    "\t": "\\t",
+}
+"""The characters having a short escape sequence"""
+
+
+class Hash(Protocol):
+    """An incremental hash (ie. from [hashlib][])"""
+
+    def update(self, data: bytes, /) -> None:
+        ...
+
+
+H = TypeVar("H", bound=Hash)
+
+
+def escape(match: re.Match) -> str:
+    char = match.group()
+    return ESCAPES.get(char) or f"\\u{ord(char):04x}"
+
+
+def encode_string(value: str) -> str:
+    """Serialize a string with the minimal escaping"""
+    if ESCAPED.search(value) is None:
+        return f'"{value}"'
+    return f'"{ESCAPED.sub(escape, value)}"'
+
+
+def encode_number(value: int | float) -> str:
+    """
+    Serialize a number like ECMAScript `Number.prototype.toString()`.
+
+    Numbers are IEEE 754 doubles: integers are exact up to 2**53 only.
+
+    :raises ValueError: for `NaN`, `Infinity` and integers out of the doubles range
+    """
+    if isinstance(value, int) and -(2**53) <= value <= 2**53:
+        return int.__repr__(value)
+    try:
+        number = float(value)
+    except OverflowError:
+        raise ValueError(f"{value} is out of range of canonical JSON numbers") from None
+    if not math.isfinite(number):
+        raise ValueError(f"{number} is not allowed in canonical JSON")
+    if number == 0:
+        return "0"
+    if number < 0:
+        return f"-{encode_number(-number)}"
+    # Python shortest round-tripping digits are the ECMAScript ones, only the notation differs
+    mantissa, _, exponent = float.__repr__(number).partition("e")
+    whole, _, fraction = mantissa.partition(".")
+    digits = (whole + fraction).lstrip("0")
+    # The value is 0.<digits> * 10**point
+    point = len(whole) + int(exponent or 0) - (len(whole) + len(fraction) - len(digits))
+    digits = digits.rstrip("0")
+    if len(digits) <= point <= 21:
+        return digits + "0" * (point - len(digits))
+    if 0 < point <= 21:
+        return f"{digits[:point]}.{digits[point:]}"
+    if -6 < point <= 0:
+        return f"0.{'0' * -point}{digits}"
+    power = point - 1
+    sign = "+" if power >= 0 else "-"
+    significand = digits if len(digits) == 1 else f"{digits[0]}.{digits[1:]}"
+    return f"{significand}e{sign}{abs(power)}"
+
+
+def encode_scalar(obj: Any) -> str:
+    match obj:
+        case bool():
+            return "true" if obj else "false"
+        case None:
+            return "null"
+        case str():
+            return encode_string(obj)
+        case int() | float():
+            return encode_number(obj)
+        case Literal():
+            return encode_scalar(obj.value)
+        case Decimal():
+            return encode_number(float(obj))
+    raise NotImplementedError(f"Unknown type: {type(obj)}")
+
+
+def utf16(key: str) -> bytes:
+    return key.encode("utf-16-be", "surrogatepass")
+
+
+def sorted_members(obj: dict) -> list[tuple[Any, Any]]:
+    """The members of an object sorted by their keys UTF-16 code units"""
+    ascii = True
+    for key in obj:
+        if not isinstance(key, str):
+            raise NotImplementedError(f"Unknown key type: {type(key)}")
+        ascii = ascii and key.isascii()
+    if ascii:
+        # Code points order is the same
+        return sorted(obj.items())
+    return sorted(obj.items(), key=lambda member: utf16(member[0]))
+
+
+def encode_container(obj: dict | list | tuple, out: list[str]) -> Iterator[Any]:
+    """
+    Write an object or an array punctuation and keys into `out`,
+    yielding its values to be encoded in between.
+    """
+    if isinstance(obj, dict):
+        out.append("{")
+        for index, (key, value) in enumerate(sorted_members(obj)):
+            out.append(f",{encode_string(key)}:" if index else f"{encode_string(key)}:")
+            yield value
+        out.append("}")
+    else:
+        out.append("[")
+        for index, item in enumerate(obj):
+            if index:
+                out.append(",")
+            yield item
+        out.append("]")
+
+
+def iterencode(obj: Any) -> Iterator[str]:
+    """
+    Serialize an object into canonical JSON chunks.
+
+    :param obj: The document or value to serialize
+    :raises ValueError: if a number can't be represented in canonical JSON
+    """
+    if not isinstance(obj, (dict, list, tuple)):
+        yield encode_scalar(obj)
+        return
+    out: list[str] = []
+    stack = [encode_container(obj, out)]
+    while stack:
+        # Resume the innermost container until it yields a nested container
+        for item in stack[-1]:
+            if isinstance(item, (dict, list, tuple)):
+                stack.append(encode_container(item, out))
+                break
+            out.append(encode_scalar(item))
+            if len(out) >= CHUNK_PARTS:
+                yield "".join(out)
+                out.clear()
+        else:
+            stack.pop()
+    yield "".join(out)
+
+
+def dumps(obj: Any) -> str:
+    """
+    Serialize an object into a canonical JSON string.
+
+    :param obj: The document or value to serialize
+    :raises ValueError: if a number can't be represented in canonical JSON
+    """
+    return "".join(iterencode(obj))
+
+
+def dump(obj: Any, out: TextIO | Path):
+    """
+    Serialize an object into canonical JSON to a file-like object or a path (UTF-8 encoded).
+
+    No line return is added.
+
+    :param obj: The document or value to serialize
+    :param out: The output file
+    :raises ValueError: if a number can't be represented in canonical JSON
+    """
+    if isinstance(out, Path):
+        with out.open("w", encoding="utf-8", newline="") as file:
+            dump(obj, file)
+        return
+    for chunk in iterencode(obj):
+        out.write(chunk)
+
+
+def update(hash: H, obj: Any) -> H:
+    """
+    Feed the UTF-8 encoded canonical JSON of an object to an incremental hash.
+
+    :param hash: The hash to update (ie. `hashlib.sha256()`)
+    :param obj: The document or value to hash
+    :returns: The updated hash
+    :raises ValueError: if a number can't be represented in canonical JSON
+    """
+    for chunk in iterencode(obj):
+        hash.update(chunk.encode("utf-8"))
+    return hash
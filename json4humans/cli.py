@@ -0,0 +1,320 @@
+"""
+The `json4humans` command line interface.
+
+It provides the following subcommands:
+
+- `check`: report syntax errors in files
+- `format`: normalize files through a style-preserving round-trip
+- `convert`: stream a file from a dialect to another
+
+Files are dispatched to a process pool and the already clean files
+are remembered in an on-disk cache so subsequent runs only process changed files.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json as stdjson
+import os
+import sys
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from importlib import import_module
+from pathlib import Path
+
+from ._version import __version__
+from .convert import convert
+from .env import CACHE_DIR
+from .errors import JSONDecodeError
+from .protocol import JSONModule
+
+EXTENSIONS: dict[str, str] = {
+    ".json": "json",
+    ".jsonc": "jsonc",
+    ".json5": "json5",
+}
+"""Known file extensions and their dialect"""
+
+DIALECTS = tuple(sorted(set(EXTENSIONS.values())))
+"""Supported dialects"""
+
+
+def get_module(dialect: str) -> JSONModule:
+    """
+    Get the [JSON module][json4humans.protocol.JSONModule] implementing a dialect.
+
+    :param dialect: The dialect name (ie. `jsonc`)
+    """
+    return import_module(f"{__package__}.{dialect}")  # type: ignore[return-value]
+
+
+def detect_dialect(path: Path, default: str | None = None) -> str | None:
+    """
+    Detect the dialect of a file from its extension.
+
+    :param path: The file path
+    :param default: The dialect to use if it can't be detected
+    """
+    return EXTENSIONS.get(path.suffix.lower(), default)
+
+
+def iter_files(paths: Iterable[Path], dialect: str | None = None) -> Iterator[tuple[Path, str]]:
+    """
+    Expand paths into files with a known (or forced) dialect.
+
+    Directories are walked recursively, skipping hidden ones.
+
+    :param paths: Files and directories to process
+    :param dialect: Force the dialect instead of detecting it
+    """
+    for path in paths:
+        if path.is_dir():
+            for root, dirs, files in os.walk(path):
+                dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+                for name in sorted(files):
+                    file = Path(root) / name
+                    if file.suffix.lower() in EXTENSIONS:
+                        yield file, dialect or EXTENSIONS[file.suffix.lower()]
+        elif found := dialect or detect_dialect(path):
+            yield path, found
+
+
+def digest(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+class Cache:
+    """
+    An on-disk cache of already clean files.
+
+    Entries are stored by resolved path with their modification time, size and content hash.
+    A file whose modification time or size changed is still considered clean if its content hash
+    didn't change.
+    Each command and options set has its own cache file, invalidated on version change.
+    """
+
+    def __init__(self, directory: Path, key: str):
+        self.path = directory / f"cache.{key}.{__version__}.json"
+        self.entries: dict[str, tuple[int, int, str]] = {}
+        try:
+            self.entries = {k: tuple(v) for k, v in stdjson.loads(self.path.read_text()).items()}
+        except (OSError, ValueError):
+            pass
+
+    def is_clean(self, path: Path) -> bool:
+        """Wether a file is known to be clean"""
+        key = str(path.resolve())
+        if not (entry := self.entries.get(key)):
+            return False
+        stat = path.stat()
+        if (stat.st_mtime_ns, stat.st_size) == entry[:2]:
+            return True
+        clean = digest(path.read_bytes()) == entry[2]
+        if clean:
+            self.entries[key] = (stat.st_mtime_ns, stat.st_size, entry[2])
+        return clean
+
+    def mark_clean(self, path: Path, hash: str):
+        """Store a file as clean given its content hash"""
+        stat = path.stat()
+        self.entries[str(path.resolve())] = (stat.st_mtime_ns, stat.st_size, hash)
+
+    def save(self):
+        """Atomically write the cache on disk"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(stdjson.dumps(self.entries))
+        tmp.replace(self.path)
+
+
+@dataclass
+class Report:
+    """The result of a command on a single file"""
+
+    path: Path
+    hash: str
+    errors: list[str] = field(default_factory=list)
+    """Errors formatted as `path:line:column: message`"""
+    changed: bool = False
+    """Wether the file has been (or would be) reformatted"""
+
+
+def check_file(path: Path, dialect: str) -> Report:
+    """
+    Check a file syntax, collecting all errors.
+
+    :param path: The file to check
+    :param dialect: The file dialect
+    """
+    content = path.read_bytes()
+    try:
+        src = content.decode()
+    except UnicodeDecodeError as e:
+        return Report(path, digest(content), [f"{path}: {e}"])
+    errors = get_module(dialect).check(src)
+    return Report(path, digest(content), [f"{path}:{e.lineno}:{e.colno}: {e.msg}" for e in errors])
+
+
+def format_file(path: Path, dialect: str, write: bool = True) -> Report:
+    """
+    Format a file through a style-preserving round-trip, ensuring a trailing line return.
+
+    :param path: The file to format
+    :param dialect: The file dialect
+    :param write: Write the formatted content back or only report it would change
+    """
+    content = path.read_bytes()
+    module = get_module(dialect)
+    try:
+        src = content.decode()
+        data = module.loads(src)
+    except UnicodeDecodeError as e:
+        return Report(path, digest(content), [f"{path}: {e}"])
+    except ValueError as e:
+        error = getattr(e, "lineno", None) and f"{e.lineno}:{e.colno}: {e.msg}"  # type: ignore
+        return Report(path, digest(content), [f"{path}:{error or e}"])
+    formatted = module.dumps(data).rstrip("\n") + "\n"
+    if formatted == src:
+        return Report(path, digest(content))
+    try:
+        same = module.loads(formatted) == data
+    except ValueError:
+        same = False
+    if not same:
+        return Report(
+            path, digest(content), [f"{path}: formatting would change the content, left untouched"]
+        )
+    if write:
+        path.write_text(formatted, encoding="utf-8")
+    return Report(path, digest(formatted.encode()) if write else "", changed=True)
+
+
+def run(files: Sequence[tuple[Path, str]], worker, jobs: int | None, *args) -> Iterator[Report]:
+    """
+    Run a worker on every file, in a process pool if there is more than one file and job.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(files) <= 1:
+        for path, dialect in files:
+            yield worker(path, dialect, *args)
+        return
+    paths = [path for path, _ in files]
+    dialects = [dialect for _, dialect in files]
+    extra = [[arg] * len(files) for arg in args]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(files))) as executor:
+        chunksize = max(1, len(files) // (jobs * 4))
+        yield from executor.map(worker, paths, dialects, *extra, chunksize=chunksize)
+
+
+def process(args: argparse.Namespace, key: str, worker, *worker_args) -> int:
+    files = list(iter_files(args.paths, args.dialect))
+    cache = None if args.no_cache else Cache(args.cache_dir, key)
+    if cache:
+        files = [(path, dialect) for path, dialect in files if not cache.is_clean(path)]
+    failed = changed = 0
+    for report in run(files, worker, args.jobs, *worker_args):
+        for error in report.errors:
+            print(error)
+        failed += bool(report.errors)
+        changed += report.changed
+        if report.changed and not args.quiet:
+            verb = "would reformat" if getattr(args, "check", False) else "reformatted"
+            print(f"{verb} {report.path}", file=sys.stderr)
+        if cache and report.hash and not report.errors and not (report.changed and args.check):
+            cache.mark_clean(report.path, report.hash)
+    if cache:
+        cache.save()
+    if not args.quiet:
+        print(
+            f"{len(files)} file(s) processed, {failed} with errors, {changed} reformatted",
+            file=sys.stderr,
+        )
+    return 1 if failed or (changed and getattr(args, "check", False)) else 0
+
+
+def cmd_check(args: argparse.Namespace) -> int:
+    return process(args, f"check-{args.dialect or 'auto'}", check_file)
+
+
+def cmd_format(args: argparse.Namespace) -> int:
+    return process(args, f"format-{args.dialect or 'auto'}", format_file, not args.check)
+
+
+def cmd_convert(args: argparse.Namespace) -> int:
+    source = args.source or detect_dialect(Path(args.input.name))
+    if source is None:
+        print(f"Unable to detect {args.input.name} dialect, use --from", file=sys.stderr)
+        return 2
+    try:
+        convert(args.input, args.output, source, args.target, comments=args.comments)
+    except JSONDecodeError as e:
+        print(f"{args.input.name}:{e.lineno}:{e.colno}: {e.msg}", file=sys.stderr)
+        return 1
+    finally:
+        for file in (args.input, args.output):
+            if file not in (sys.stdin, sys.stdout):
+                file.close()
+    return 0
+
+
+def parser() -> argparse.ArgumentParser:
+    """Build the command line arguments parser"""
+    parser = argparse.ArgumentParser(prog="json4humans", description=__doc__.splitlines()[1])
+    parser.add_argument("--version", action="version", version=__version__)
+    subparsers = parser.add_subparsers(required=True, metavar="command")
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("paths", nargs="+", type=Path, help="Files and directories to process")
+    common.add_argument(
+        "-d", "--dialect", choices=DIALECTS, help="Force the dialect instead of using extensions"
+    )
+    common.add_argument(
+        "-j", "--jobs", type=int, default=None, help="Number of parallel jobs (default: CPU count)"
+    )
+    common.add_argument("-q", "--quiet", action="store_true", help="Only output errors")
+    common.add_argument(
+        "--no-cache", action="store_true", help="Process all files, ignoring the cache"
+    )
+    common.add_argument("--cache-dir", type=Path, default=CACHE_DIR, help="Cache directory")
+
+    check = subparsers.add_parser("check", parents=[common], help="Report syntax errors")
+    check.set_defaults(func=cmd_check)
+
+    fmt = subparsers.add_parser("format", parents=[common], help="Format files")
+    fmt.add_argument(
+        "--check", action="store_true", help="Don't write files, fail if some would be reformatted"
+    )
+    fmt.set_defaults(func=cmd_format)
+
+    conv = subparsers.add_parser("convert", help="Convert a file from a dialect to another")
+    conv.add_argument("input", type=argparse.FileType(), help="The file to convert (`-` for stdin)")
+    conv.add_argument(
+        "-o",
+        "--output",
+        type=argparse.FileType("w"),
+        default="-",
+        help="The converted file (default: stdout)",
+    )
+    conv.add_argument(
+        "-f", "--from", dest="source", choices=DIALECTS, help="Source dialect (default: detected)"
+    )
+    conv.add_argument("-t", "--to", dest="target", choices=DIALECTS, required=True)
+    conv.add_argument(
+        "--comments",
+        action=argparse.BooleanOptionalAction,
+        help="Keep or drop comments (default: keep if supported)",
+    )
+    conv.set_defaults(func=cmd_convert)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """
+    The command line entrypoint.
+
+    :param argv: The command line arguments (default to `sys.argv`)
+    :returns: The exit code
+    """
+    args = parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,116 @@
+"""
+This module reads and writes compressed documents transparently.
+
+The [load()][json4humans.protocol.JSONModule.load] and [dump()][json4humans.protocol.JSONModule.dump]
+functions of every [JSON module][json4humans.protocol.JSONModule] open paths with
+[open()][json4humans.compression.open]: [gzip][], [bz2][] and [lzma][] (`xz`) compressed files
+are detected by their magic bytes when reading (or their extension when written),
+and are decompressed incrementally by the standard library codecs.
+Binary file-like objects are supported by `load()` too.
+
+```python
+from pathlib import Path
+
+from json4humans import json5
+
+data = json5.load(Path("export.json5.xz"))
+json5.dump(data, Path("export.json5.gz"))
+```
+
+The streams returned by [open()][json4humans.compression.open] can be given to the chunked APIs
+(ie. [validate_stream()][json4humans.schema.validate_stream] or [convert()][json4humans.convert.convert])
+so compressed documents are processed without ever being fully decompressed in memory:
+
+```python
+from json4humans import compression, schema
+
+with compression.open(Path("export.json5.xz")) as stream:
+    schema.validate_stream(stream, SCHEMA, "json5")
+```
+"""
+from __future__ import annotations
+
+import bz2
+import gzip
+import io
+import lzma
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, BinaryIO, Literal, NamedTuple
+
+
+class Codec(NamedTuple):
+    """A compression format"""
+
+    name: str
+    magic: bytes
+    """The bytes compressed files start with"""
+    extensions: tuple[str, ...]
+    """The file extensions, lower-cased"""
+    open: Callable[..., Any]
+    """The standard library `open()` function of this format"""
+
+
+CODECS = (
+    Codec("gzip", b"\x1f\x8b", (".gz", ".gzip"), gzip.open),
+    Codec("bz2", b"BZh", (".bz2",), bz2.open),
+    Codec("lzma", b"\xfd7zXZ\x00", (".xz", ".lzma"), lzma.open),
+)
+"""The supported compression formats"""
+
+MAGIC_SIZE = max(len(codec.magic) for codec in CODECS)
+"""The number of bytes required to detect a compression format"""
+
+ENCODING = "utf-8"
+"""The documents encoding"""
+
+
+def by_magic(header: bytes) -> Codec | None:
+    """Detect the compression format of some data from its first bytes"""
+    return next((codec for codec in CODECS if header.startswith(codec.magic)), None)
+
+
+def by_extension(path: Path) -> Codec | None:
+    """Detect the compression format of a file from its extension"""
+    suffix = path.suffix.lower()
+    return next((codec for codec in CODECS if suffix in codec.extensions), None)
+
+
+def peek(file: BinaryIO) -> bytes:
+    """Read the first bytes of a binary stream without consuming them"""
+    if hasattr(file, "peek"):
+        return file.peek(MAGIC_SIZE)[:MAGIC_SIZE]
+    position = file.tell()
+    header = file.read(MAGIC_SIZE)
+    file.seek(position)
+    return header
+
+
+def open(file: Path | BinaryIO, mode: Literal["r", "w"] = "r") -> io.TextIOWrapper:
+    """
+    Open a possibly compressed document as a text stream.
+
+    When reading, the compression is detected from the first bytes, falling back on the extension
+    (ie. for the `.lzma` legacy format). When writing, it is selected by the extension.
+    Data is (de)compressed incrementally as the stream is read or written.
+
+    :param file: A path or, when reading, a binary file-like object
+                 ([detach()][io.TextIOBase.detach] the returned stream to leave it open)
+    :param mode: `r` to read, `w` to write
+    :raises TypeError: when opening a file-like object for writing
+    """
+    if mode == "w":
+        if not isinstance(file, Path):
+            raise TypeError("Only paths can be opened for writing")
+        if codec := by_extension(file):
+            return codec.open(file, "wt", encoding=ENCODING)
+        return file.open("w", encoding=ENCODING)
+    if isinstance(file, Path):
+        with file.open("rb") as binary:
+            header = binary.read(MAGIC_SIZE)
+        if codec := by_magic(header) or by_extension(file):
+            return codec.open(file, "rt", encoding=ENCODING)
+        return file.open(encoding=ENCODING)
+    if codec := by_magic(peek(file)):
+        return io.TextIOWrapper(codec.open(file, "rb"), encoding=ENCODING)
+    return io.TextIOWrapper(file, encoding=ENCODING)
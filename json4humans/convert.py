@@ -0,0 +1,450 @@
+"""
+This module provides streaming conversion between the supported dialects.
+
+Conversion is purely lexical: the source is tokenized chunk by chunk and each token
+is translated to the target dialect on the fly (quotes, identifiers, numbers, trailing comas and comments)
+without ever building the [JSONType][json4humans.types.JSONType] tree,
+so memory usage is bounded by the chunk size and the nesting depth.
+
+Dialects are either names or custom [Features][json4humans.features.Features]:
+the tokens using a feature disabled in the source are rejected
+and the ones using a feature disabled in the target are translated.
+
+As a consequence, only lexical errors and values not representable in the target dialect are detected.
+Use `check()` on the source to fully validate it.
+"""
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Iterator
+from typing import TextIO
+
+from .errors import JSONDecodeError
+from .features import DESCRIPTIONS, Features, number_features, resolve, string_features
+
+CHUNK_SIZE = 64 * 1024
+"""The default number of characters read at once"""
+
+LOOKAHEAD = 8
+"""The number of characters required after a token to ensure it is complete"""
+
+
+TOKENS = re.compile(
+    r"""
+    (?P<whitespace>[ \t\n\r\f]+)
+    | (?P<comment>//[^\n]*|/\*[\s\S]*?\*/|\#[^\n]*)
+    | (?P<string>"(?:[^"\\\n\r]|\\(?:\r\n|[\s\S]))*"|'(?:[^'\\\n\r]|\\(?:\r\n|[\s\S]))*')
+    | (?P<number>[+-]?(?:0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?|(?:Infinity|NaN)(?![\w$])))
+    | (?P<identifier>[A-Za-z_][A-Za-z0-9_]*)
+    | (?P<punctuation>[{}\[\]:,])
+    """,
+    re.VERBOSE,
+)
+
+PARTIAL = re.compile(
+    r"""
+    "(?:[^"\\\n\r]|\\[\s\S])*\\?
+    | '(?:[^'\\\n\r]|\\[\s\S])*\\?
+    | /\*[\s\S]*
+    | [\w$.+-]+
+    """,
+    re.VERBOSE,
+)
+"""Match the start of a token which may continue in the next chunk (ie. an unterminated string)"""
+
+LITERALS = frozenset(("true", "false", "null"))
+
+STRING_ESCAPES = re.compile(
+    r"""\\(?:x([0-9a-fA-F]{2})|(u[0-9a-fA-F]{4}|["\\/bfnrt])|(\r\n|[\n\r\u2028\u2029])|([\s\S]))|(")"""
+    r"|([\x00-\x1f])"
+)
+
+CHAR_ESCAPES = {"v": "\\u000b", "0": "\\u0000"}
+
+DECIMAL = re.compile(r"(\d*)(?:\.(\d*))?(.*)")
+
+ESCAPE = re.compile(
+    r"\\(?:u(d[89ab][0-9a-f]{2})\\u(d[c-f][0-9a-f]{2})|u([0-9a-f]{4})|x([0-9a-f]{2})"
+    r"|(\r\n|[\n\r\u2028\u2029])|(.))",
+    re.IGNORECASE | re.DOTALL,
+)
+"""Match an escape sequence in a string"""
+
+UNESCAPES = {"b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v", "0": "\0"}
+"""Single character escapes, any other escaped character stands for itself"""
+
+
+def escape(match: re.Match) -> str:
+    hex, valid, continuation, char, quote, control = match.groups()
+    if hex:
+        return f"\\u00{hex}"
+    elif valid:
+        return match.group()
+    elif continuation:
+        return ""
+    elif quote:
+        return '\\"'
+    char = char or control
+    return CHAR_ESCAPES.get(char) or (char if char >= " " else f"\\u{ord(char):04x}")
+
+
+def to_json_string(token: str) -> str:
+    """
+    Translate a JSON5 string token into a JSON string token.
+
+    :param token: A single or double quoted JSON5 string, quotes included
+    """
+    return f'"{STRING_ESCAPES.sub(escape, token[1:-1])}"'
+
+
+def unescape(content: str) -> tuple[str, list[int]]:
+    """
+    Decode the escape sequences of a string, the same way for every dialect and path.
+
+    :param content: The string content, quotes excluded
+    :returns: The decoded string and the offsets of its line continuations in it
+    """
+    if "\\" not in content:
+        return content, []
+    parts: list[str] = []
+    linebreaks: list[int] = []
+    size = position = 0
+    for match in ESCAPE.finditer(content):
+        parts.append(content[position : match.start()])
+        size += match.start() - position
+        position = match.end()
+        high, low, code, byte, linebreak, char = match.groups()
+        if linebreak:
+            linebreaks.append(size)
+            continue
+        if high:
+            parts.append(chr(0x10000 + ((int(high, 16) - 0xD800) << 10) + int(low, 16) - 0xDC00))
+        else:
+            parts.append(chr(int(code or byte, 16)) if code or byte else UNESCAPES.get(char, char))
+        size += 1
+    parts.append(content[position:])
+    return "".join(parts), linebreaks
+
+
+def to_json_number(token: str) -> str:
+    """
+    Translate a finite JSON5 number token into a JSON number token.
+
+    :param token: A JSON5 number (ie. `+0xFF`, `.5` or `5.`)
+    """
+    sign, body = token[0] if token[0] in "+-" else "", token.lstrip("+-")
+    sign = sign.replace("+", "")
+    if body[:2] in ("0x", "0X"):
+        return f"{sign}{int(body, 16)}"
+    integer, fraction, exponent = DECIMAL.fullmatch(body).groups()  # type: ignore[union-attr]
+    number = sign + (integer or "0")
+    if fraction is not None:
+        number += "." + (fraction or "0")
+    return number + exponent
+
+
+class Lexer:
+    """
+    A chunked tokenizer, tracking the position of the current token in the whole stream.
+
+    :param features: The features the tokens may use (see [check()][json4humans.convert.Lexer.check])
+    """
+
+    def __init__(self, features: Features):
+        self.features = features
+        self.buffer = ""
+        self.pos = 0
+        self.offset = 0
+        self.lines = 0
+        self.column = 0
+        # The last computed location: offset, line number and line start offset in the buffer
+        self.mark = (0, 1, 0)
+
+    def tokenize(self, chunks: Iterable[str]) -> Iterator[re.Match]:
+        """
+        Tokenize a stream of chunks.
+
+        The position of a token is the current one until the next token is requested.
+
+        :param chunks: The source document chunks
+        :raises JSONDecodeError: on unknown tokens
+        """
+        chunks = iter(chunks)
+        eof = False
+        while True:
+            match = TOKENS.match(self.buffer, self.pos)
+            # A token close to the end of the buffer may continue in the next chunk (ie. `1.e3`)
+            end = self.pos if match is None else match.end()
+            if not eof and (
+                len(self.buffer) - end < LOOKAHEAD
+                or (match is None and PARTIAL.fullmatch(self.buffer, self.pos))
+            ):
+                chunk = next(chunks, None)
+                if chunk is None:
+                    eof = True
+                else:
+                    self.refill(chunk)
+                continue
+            if match is None:
+                if self.pos < len(self.buffer):
+                    raise self.error(f"Unexpected {self.buffer[self.pos]!r}")
+                break
+            yield match
+            self.pos = match.end()
+
+    def refill(self, chunk: str):
+        consumed = self.buffer[: self.pos]
+        if (lines := consumed.count("\n")) > 0:
+            self.lines += lines
+            self.column = len(consumed) - consumed.rfind("\n") - 1
+        else:
+            self.column += len(consumed)
+        self.offset += self.pos
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        self.mark = (0, self.lines + 1, -self.column)
+
+    @property
+    def position(self) -> int:
+        """The offset of the current token in the whole stream"""
+        return self.offset + self.pos
+
+    def location(self) -> tuple[int, int]:
+        """The line and column numbers (starting at 1) of the current token"""
+        # Lines are counted from the last computed location so successive calls are cheap
+        start, lineno, line_start = self.mark
+        if start > self.pos:
+            start, lineno, line_start = 0, self.lines + 1, -self.column
+        if newlines := self.buffer.count("\n", start, self.pos):
+            lineno += newlines
+            line_start = self.buffer.rfind("\n", start, self.pos) + 1
+        self.mark = (self.pos, lineno, line_start)
+        return lineno, self.pos - line_start + 1
+
+    def error(self, msg: str, at: int | None = None) -> JSONDecodeError:
+        """
+        Build an error at the current token.
+
+        `doc` is only the buffered part of the stream (and `excerpt` is computed from it)
+        while `pos`, `lineno` and `colno` are relative to the whole stream.
+
+        :param msg: The error message
+        :param at: The offset of the error in the whole stream if not at the current token,
+                   only honored while it is still buffered
+        """
+        current = self.pos
+        if at is not None and at >= self.offset:
+            self.pos = at - self.offset
+        try:
+            error = JSONDecodeError(msg, self.buffer, self.pos)
+            error.pos = self.position
+            error.lineno, error.colno = self.location()
+        finally:
+            self.pos = current
+        error.args = (f"{msg}: line {error.lineno} column {error.colno}",)
+        return error
+
+    def unsupported(self, feature: str, at: int | None = None) -> JSONDecodeError:
+        """Build the error reporting the usage of a disabled feature, like on parsing"""
+        return self.error(f"Unexpected {DESCRIPTIONS[feature]}", at)
+
+    def check(self, kind: str, token: str):
+        """
+        Reject a comment, string or number token using a disabled feature.
+
+        :raises JSONDecodeError: at the offending token
+        """
+        if kind == "number":
+            for name in number_features(token):
+                if not getattr(self.features, name):
+                    raise self.unsupported(name)
+        elif kind == "string":
+            for name, offset in string_features(token):
+                if not getattr(self.features, name):
+                    raise self.unsupported(name, self.position + offset)
+        elif kind == "comment":
+            name = "hash_comments" if token[0] == "#" else "comments"
+            if not getattr(self.features, name):
+                raise self.unsupported(name)
+
+
+class Converter(Lexer):
+    """
+    A streaming translator from a dialect into another.
+
+    :param source: The source dialect name or features
+    :param target: The target dialect name or features
+    :param comments: Keep the comments (default to keeping them if the target supports them)
+    """
+
+    def __init__(
+        self, source: str | Features, target: str | Features, comments: bool | None = None
+    ):
+        super().__init__(resolve(source))
+        self.target = resolve(target)
+        self.target_name = target if isinstance(target, str) else "the target"
+        if comments and not self.target.comments:
+            raise ValueError(f"{self.target_name} does not support comments")
+        self.comments = self.target.comments if comments is None else comments
+        # Only strings using a feature missing from the target need to be translated
+        self.translate_strings = any(
+            getattr(self.features, name) and not getattr(self.target, name)
+            for name in ("single_quotes", "line_continuations")
+        )
+        self.containers: list[str] = []
+        self.last = ""
+        self.pending: list[str] | None = None
+        self.coma = 0
+
+    def convert(self, chunks: Iterable[str]) -> Iterator[str]:
+        """
+        Convert a stream of source chunks, yielding translated tokens.
+
+        :param chunks: The source document chunks
+        """
+        for match in self.tokenize(chunks):
+            if output := getattr(self, f"on_{match.lastgroup}")(match.group()):
+                yield output
+        if self.pending:
+            yield "".join(self.pending)
+
+    def emit(self, token: str) -> str:
+        """Emit a significant token, resolving a pending coma"""
+        if self.pending is None:
+            return token
+        coma, *trivia = self.pending
+        self.pending = None
+        if token in ("]", "}"):
+            if not self.features.trailing_comas:
+                raise self.unsupported("trailing_comas", self.coma)
+            if not self.target.trailing_comas:
+                coma = ""
+        return "".join((coma, *trivia, token))
+
+    def trivia(self, token: str) -> str:
+        if self.pending is not None:
+            self.pending.append(token)
+            return ""
+        return token
+
+    def on_whitespace(self, token: str) -> str:
+        return self.trivia(token)
+
+    def on_comment(self, token: str) -> str:
+        self.check("comment", token)
+        if not self.comments:
+            return ""
+        if token[0] == "#" and not self.target.hash_comments:
+            token = f"//{token[1:]}"
+        return self.trivia(token)
+
+    def on_punctuation(self, token: str) -> str:
+        if token in ("{", "["):
+            self.containers.append(token)
+        elif token in ("}", "]") and self.containers:
+            self.containers.pop()
+        if token == ",":
+            output = self.emit("")
+            self.pending = [token]
+            self.coma = self.position
+        else:
+            output = self.emit(token)
+        self.last = token
+        return output
+
+    @property
+    def is_key(self) -> bool:
+        return bool(self.containers) and self.containers[-1] == "{" and self.last in ("{", ",")
+
+    def on_string(self, token: str) -> str:
+        self.check("string", token)
+        self.last = token[0]
+        return self.emit(to_json_string(token) if self.translate_strings else token)
+
+    def on_number(self, token: str) -> str:
+        if self.is_key:
+            # `Infinity` and `NaN` are valid identifiers
+            return self.on_identifier(token)
+        self.check("number", token)
+        if missing := [name for name in number_features(token) if not getattr(self.target, name)]:
+            if "constants" in missing:
+                raise self.error(f"{token} is not supported by {self.target_name}")
+            token = to_json_number(token)
+        self.last = "0"
+        return self.emit(token)
+
+    def on_identifier(self, token: str) -> str:
+        if self.is_key:
+            if not self.features.identifiers:
+                raise self.unsupported("identifiers")
+            if not self.target.identifiers:
+                token = f'"{token}"'
+        elif token not in LITERALS:
+            # Constants are lexed as numbers in value position
+            raise self.error(f"Unexpected {token!r}")
+        self.last = "i"
+        return self.emit(token)
+
+
+def iterconvert(
+    chunks: Iterable[str],
+    source: str | Features,
+    target: str | Features,
+    *,
+    comments: bool | None = None,
+) -> Iterator[str]:
+    """
+    Lazily convert a stream of chunks from a dialect to another.
+
+    :param chunks: The source document chunks
+    :param source: The source dialect name or features
+    :param target: The target dialect name or features
+    :param comments: Keep the comments (default to keeping them if the target supports them)
+    :raises JSONDecodeError: on lexical errors and values not supported by the target
+    """
+    return Converter(source, target, comments).convert(chunks)
+
+
+def convert(
+    input: TextIO,
+    output: TextIO,
+    source: str | Features,
+    target: str | Features,
+    *,
+    comments: bool | None = None,
+    chunk_size: int = CHUNK_SIZE,
+):
+    """
+    Convert a file-like object from a dialect to another into another file-like object.
+
+    :param input: The source file-like object
+    :param output: The target file-like object
+    :param source: The source dialect name or features
+    :param target: The target dialect name or features
+    :param comments: Keep the comments (default to keeping them if the target supports them)
+    :param chunk_size: The number of characters read at once
+    """
+    chunks = iter(lambda: input.read(chunk_size), "")
+    for token in iterconvert(chunks, source, target, comments=comments):
+        output.write(token)
+
+
+def converts(
+    src: str,
+    source: str | Features,
+    target: str | Features,
+    *,
+    comments: bool | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> str:
+    """
+    Convert a string from a dialect to another.
+
+    :param src: The source document
+    :param source: The source dialect name or features
+    :param target: The target dialect name or features
+    :param comments: Keep the comments (default to keeping them if the target supports them)
+    :param chunk_size: The number of characters processed at once
+    """
+    chunks = (src[i : i + chunk_size] for i in range(0, len(src), chunk_size))
+    return "".join(iterconvert(chunks, source, target, comments=comments))
@@ -0,0 +1,140 @@
+"""
+This module provides the single parsing engine shared by all the dialects.
+
+Its grammar accepts the union of the [JSON](https://www.json.org/), JSONC and [JSON5](https://json5.org/)
+syntaxes so only one LALR parser is compiled, and its transformer rejects the syntax
+not enabled by the [Features][json4humans.features.Features] of the current call
+while building the [style preserving types][json4humans.types].
+
+Checks only happen on the tokens which may use an optional feature
+(ie. comments are only looked for in trivia containing a `/` or a `#`),
+so strict parsing costs nothing on plain JSON.
+"""
+from __future__ import annotations
+
+from dataclasses import fields
+
+from lark import Token
+from lark.visitors import merge_transformers, v_args
+
+from . import wsc
+from .convert import unescape
+from .features import Features, number_features, string_features, unsupported
+from .protocol import load_options
+from .style import StylePreservingTransformer, TrailingComa
+from .types import WSC, Float, HexInteger, Identifier, Literal, Quote, String
+
+ALL = Features(**{field.name: True for field in fields(Features)})
+"""Every feature, used when parsing outside of a `loads()` call"""
+
+
+def features() -> Features:
+    """The features of the current call"""
+    return load_options.get().features or ALL
+
+
+def decode(lexeme: str, quote: Quote) -> String:
+    """Decode a quoted string lexeme"""
+    content, linebreaks = unescape(lexeme[1:-1])
+    return String(content, quote=quote, linebreaks=linebreaks)
+
+
+class DialectTransformer(StylePreservingTransformer):
+    """
+    A [Transformer][lark.visitors.Transformer] for the union of the dialects,
+    enforcing the [Features][json4humans.features.Features] of the current call.
+    """
+
+    @v_args(inline=True)
+    def literal(self, token: Token) -> Literal:
+        match token.value:
+            case "true":
+                return Literal[bool](True)
+            case "false":
+                return Literal[bool](False)
+            case "null":
+                return Literal[None](None)
+        raise ValueError(f"Unknown literal: {token.value}")
+
+    def DOUBLE_QUOTE_STRING(self, token: Token) -> String:
+        if "\\" in token.value:
+            self._check_string(token)
+        return decode(token.value, Quote.DOUBLE)
+
+    def SINGLE_QUOTE_STRING(self, token: Token) -> String:
+        self._check_string(token)
+        return decode(token.value, Quote.SINGLE)
+
+    @v_args(inline=True)
+    def identifier(self, token: Token) -> Identifier:
+        if not features().identifiers:
+            unsupported("identifiers", token.start_pos or 0)
+        return Identifier(token)
+
+    def SIGNED_HEXNUMBER(self, token: Token) -> HexInteger:
+        self._check_number(token)
+        return HexInteger(
+            int(token.value, base=16),
+            prefixed=token.value.startswith(("+", "-")),
+            raw=token.value,
+        )
+
+    def SIGNED_NUMBER(self, token: Token):
+        value = token.value
+        if value[0] == "+" or "." in value:
+            self._check_number(token)
+        return self._number(value, prefixed=value[0] in "+-")
+
+    @v_args(inline=True)
+    def constant(self, token: Token):
+        self._check_number(token)
+        options = load_options.get()
+        if options.parse_constant is not None:
+            return options.parse_constant(token.value)
+        return Float(token.value, raw=token.value, prefixed=token.value.startswith(("+", "-")))
+
+    @v_args(inline=True)
+    def trailing_coma(self, coma: Token, tail: list[WSC]) -> TrailingComa:
+        if not features().trailing_comas:
+            unsupported("trailing_comas", coma.start_pos or 0)
+        return TrailingComa(tail)
+
+    def _check_number(self, token: Token):
+        enabled = features()
+        for name in number_features(token.value):
+            if not getattr(enabled, name):
+                unsupported(name, token.start_pos or 0)
+
+    def _check_string(self, token: Token):
+        enabled = features()
+        for name, offset in string_features(token.value):
+            if not getattr(enabled, name):
+                unsupported(name, (token.start_pos or 0) + offset)
+
+
+class TriviaTransformer(wsc.WSCTransformer):
+    """
+    A [WSCTransformer][json4humans.wsc.WSCTransformer]
+    enforcing the comments [Features][json4humans.features.Features] of the current call.
+    """
+
+    def WSCHS(self, token: Token) -> list[WSC]:
+        trivia = token.value
+        if "/" in trivia or "#" in trivia:
+            enabled = features()
+            if ("/" in trivia and not enabled.comments) or (
+                "#" in trivia and not enabled.hash_comments
+            ):
+                self._check_comments(token, enabled)
+        return wsc.lex(trivia)
+
+    def _check_comments(self, token: Token, enabled: Features):
+        # Either marker may also appear in the other kind of comments
+        for match in wsc.TRIVIA.finditer(token.value):
+            if match.lastgroup in ("line", "block") and not enabled.comments:
+                unsupported("comments", (token.start_pos or 0) + match.start())
+            elif match.lastgroup == "hash" and not enabled.hash_comments:
+                unsupported("hash_comments", (token.start_pos or 0) + match.start())
+
+
+transformer = merge_transformers(DialectTransformer(), wsc=TriviaTransformer())
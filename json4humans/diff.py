@@ -0,0 +1,238 @@
+"""
+This module compares parsed documents using [Merkle](https://en.wikipedia.org/wiki/Merkle_tree) digests.
+
+Each node gets a content digest computed from the digests of its children,
+either on values only or including the style (whitespaces, comments, quotes, numbers representation...).
+Digests are memoized by node identity for the duration of a call,
+so [diff()][json4humans.diff.diff] hashes each node once and only walks the changed subtrees.
+Nothing is cached on the nodes, so documents can be freely modified between calls.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from hashlib import blake2b
+from itertools import chain
+from typing import Any, NamedTuple
+
+from .numeric import NumericArray
+from .query import Tokens, format_pointer
+from .types import Container, JSONType, Literal, Number, String
+
+DIGEST_SIZE = 16
+"""The size of digests in bytes"""
+
+
+def style_of(node: Any) -> bytes:
+    """The representation-specific parts of a node (excluding its children)"""
+    style = repr(node.json_before) + repr(node.json_after) if isinstance(node, JSONType) else ""
+    if isinstance(node, Container):
+        style += f"{node.json_container_tail!r}{node.json_container_trailing_coma}"
+    if isinstance(node, NumericArray):
+        # Numeric arrays hold their items layout
+        style += f"{node.json_container_head!r}{node.json_item_before!r}{node.json_item_after!r}"
+    if isinstance(node, String):
+        style += f"{node.quote.value}{node.linebreaks}"
+    elif isinstance(node, Number):
+        style += str(node)
+    return f"{type(node).__name__}{style}".encode()
+
+
+def scalar(node: Any) -> bytes:
+    """The value representation of a scalar"""
+    match node:
+        case str():
+            return b"s" + node.encode("utf-8", "surrogatepass")
+        case bool() | None:
+            return f"l{node}".encode()
+        case int():
+            return f"n{int(node)}".encode()
+        case float() if node.is_integer():
+            # Like in Python, 1.0 == 1
+            return f"n{int(node)}".encode()
+        case float():
+            return f"n{float(node)!r}".encode()
+    raise TypeError(f"Unsupported type: {type(node).__name__}")
+
+
+def compute(node: Any, style: bool, digests: dict[int, bytes]) -> bytes:
+    """Compute the digest of a node given the digests of its children by identity"""
+    if isinstance(node, Literal):
+        # A literal has the same value digest than the value it wraps
+        value = compute(node.value, False, digests)
+        return blake2b(style_of(node) + value, digest_size=DIGEST_SIZE).digest() if style else value
+    hash = blake2b(style_of(node) if style else b"", digest_size=DIGEST_SIZE)
+    if isinstance(node, dict) and style:
+        for key, value in node.items():
+            hash.update(digests[id(key)])
+            hash.update(digests[id(value)])
+    elif isinstance(node, dict):
+        # Members order is not significant
+        hash.update(b"{")
+        for member in sorted(digests[id(key)] + digests[id(value)] for key, value in node.items()):
+            hash.update(member)
+    elif isinstance(node, NumericArray):
+        # Items are created on access, they can't be identified
+        hash.update(b"[")
+        for item in node:
+            hash.update(compute(item, style, digests))
+    elif isinstance(node, list):
+        hash.update(b"[")
+        for item in node:
+            hash.update(digests[id(item)])
+    else:
+        hash.update(scalar(node))
+    return hash.digest()
+
+
+def digest(node: Any, style: bool = False, digests: dict[int, bytes] | None = None) -> bytes:
+    """
+    Compute the content digest of a node.
+
+    The tree is walked with an explicit stack, so the nesting depth is not bounded by the recursion limit.
+
+    :param node: The node to hash
+    :param style: Include the style in the digest
+    :param digests: Digests already computed with the same `style` by node identity,
+                    completed with the new ones.
+                    It must not outlive the hashed nodes nor be reused once they are modified.
+    """
+    if not isinstance(node, (dict, list)):
+        # Scalars may be transient (ie. numeric arrays items), they are not memoized
+        return compute(node, style, {})
+    digests = {} if digests is None else digests
+    if (found := digests.get(id(node))) is not None:
+        return found
+    # Children are hashed before their parent, which is pushed back once they are
+    stack: list[tuple[Any, bool]] = [(node, False)]
+    while stack:
+        current, ready = stack.pop()
+        if ready or not isinstance(current, (dict, list)) or isinstance(current, NumericArray):
+            digests[id(current)] = compute(current, style, digests)
+            continue
+        stack.append((current, True))
+        for child in chain.from_iterable(current.items()) if isinstance(current, dict) else current:
+            if id(child) not in digests:
+                stack.append((child, False))
+    return digests[id(node)]
+
+
+def equal(a: Any, b: Any, style: bool = False, digests: dict[int, bytes] | None = None) -> bool:
+    """
+    Compare two nodes using their digests.
+
+    Unlike `==`, objects members order is only significant when comparing style.
+
+    :param style: Compare the style too
+    :param digests: The digests memo, see [digest()][json4humans.diff.digest]
+    """
+    digests = {} if digests is None else digests
+    return a is b or digest(a, style, digests) == digest(b, style, digests)
+
+
+class Change(NamedTuple):
+    """
+    A change between two documents.
+
+    Changes are ordered so that they can be applied sequentially as JSON Patch operations:
+    array items pointers are valid once the previous changes are applied.
+    """
+
+    op: str
+    """The change kind: `add`, `remove`, `replace` or `style` (same value, different style)"""
+    path: str
+    """The JSON Pointer to the changed value"""
+    old: Any = None
+    """The original value (if any)"""
+    new: Any = None
+    """The new value (if any)"""
+
+
+def diff(a: Any, b: Any, style: bool = False) -> list[Change]:
+    """
+    Compute the changes between two documents.
+
+    Identical subtrees are pruned using their digests,
+    so only the changed nodes (and their ancestors) are walked.
+
+    :param a: The original document
+    :param b: The new document
+    :param style: Report style-only changes too (as `style` changes)
+    :returns: The changes, in document order
+    """
+    changes: list[Change] = []
+    digests: dict[int, bytes] = {}
+    # Nested containers comparisons are stacked instead of recursing
+    stack: list[Iterator[tuple[Any, Any, Tokens]]] = [iter(((a, b, ()),))]
+    while stack:
+        for old, new, tokens in stack[-1]:
+            if (children := compare(old, new, tokens, style, changes, digests)) is not None:
+                stack.append(children)
+                break
+        else:
+            stack.pop()
+    return changes
+
+
+def compare(
+    a: Any, b: Any, tokens: Tokens, style: bool, changes: list[Change], digests: dict[int, bytes]
+) -> Iterator[tuple[Any, Any, Tokens]] | None:
+    """
+    Compare two nodes, reporting their changes.
+
+    :returns: The children pairs to compare next, if both nodes are containers of the same kind
+    """
+    if equal(a, b, style, digests):
+        return None
+    if isinstance(a, dict) and isinstance(b, dict):
+        compare_style(a, b, tokens, style, changes)
+        return compare_objects(a, b, tokens, changes)
+    elif isinstance(a, list) and isinstance(b, list):
+        compare_style(a, b, tokens, style, changes)
+        return compare_arrays(a, b, tokens, style, changes, digests)
+    op = "style" if style and digest(a) == digest(b) else "replace"
+    changes.append(Change(op, format_pointer(tokens), a, b))
+    return None
+
+
+def compare_style(a: Any, b: Any, tokens: Tokens, style: bool, changes: list[Change]):
+    # Containers style changes are reported before their children ones
+    if style and (style_of(a) != style_of(b) or keys_style(a, b) != keys_style(b, a)):
+        changes.append(Change("style", format_pointer(tokens), a, b))
+
+
+def keys_style(node: Any, other: Any) -> list[bytes] | None:
+    """The order and style of the keys an object shares with another one"""
+    if not isinstance(node, dict):
+        return None
+    return [digest(key, True) for key in node if key in other]
+
+
+def compare_objects(
+    a: dict, b: dict, tokens: Tokens, changes: list[Change]
+) -> Iterator[tuple[Any, Any, Tokens]]:
+    for key, value in a.items():
+        if key not in b:
+            changes.append(Change("remove", format_pointer((*tokens, str(key))), value))
+        else:
+            yield value, b[key], (*tokens, str(key))
+    for key, value in b.items():
+        if key not in a:
+            changes.append(Change("add", format_pointer((*tokens, str(key))), new=value))
+
+
+def compare_arrays(
+    a: list, b: list, tokens: Tokens, style: bool, changes: list[Change], digests: dict[int, bytes]
+) -> Iterator[tuple[Any, Any, Tokens]]:
+    # Skip the common head and tail, compare the remaining items pairwise
+    start, end_a, end_b = 0, len(a), len(b)
+    while start < min(end_a, end_b) and equal(a[start], b[start], style, digests):
+        start += 1
+    while end_a > start and end_b > start and equal(a[end_a - 1], b[end_b - 1], style, digests):
+        end_a, end_b = end_a - 1, end_b - 1
+    common = min(end_a, end_b)
+    for index in range(start, common):
+        yield a[index], b[index], (*tokens, str(index))
+    for index in range(end_a - 1, common - 1, -1):
+        changes.append(Change("remove", format_pointer((*tokens, str(index))), a[index]))
+    for index in range(common, end_b):
+        changes.append(Change("add", format_pointer((*tokens, str(index))), new=b[index]))
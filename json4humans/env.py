@@ -1,10 +1,24 @@
 import os
+from pathlib import Path
 
 DEBUG: bool = bool(os.environ.get("DEBUG", 0))
 """
 If this environment is set to a truthy value,
 the parsing and transform will be done in 2 steps
-allowing detailled parsing errors.
+which eases transformers debugging.
+
+Parsing errors are detailed in both modes.
 
 See [Tree-less LALR](https://lark-parser.readthedocs.io/en/latest/json_tutorial.html#step-3-tree-less-lalr-1)
 """
+
+CACHE_DIR: Path = Path(
+    os.environ.get("JSON4HUMANS_CACHE_DIR")
+    or Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "json4humans"
+)
+"""
+The directory where the command line interface stores its cache.
+
+Defaults to `$XDG_CACHE_HOME/json4humans` (`~/.cache/json4humans`)
+and can be overridden by the `JSON4HUMANS_CACHE_DIR` environment variable.
+"""
@@ -0,0 +1,154 @@
+"""
+This module provides the errors raised on invalid documents.
+"""
+from __future__ import annotations
+
+import json
+from collections.abc import Container, Iterable
+
+from lark import Lark
+from lark.exceptions import UnexpectedCharacters, UnexpectedEOF, UnexpectedInput, UnexpectedToken
+
+
+class JSONDecodeError(json.JSONDecodeError):
+    """
+    Raised when a document can't be parsed.
+
+    Being a subclass of the builtin [json.JSONDecodeError][json.JSONDecodeError],
+    it exposes the same `msg`, `doc`, `pos`, `lineno` and `colno` attributes
+    as well as some extra diagnostic details.
+    """
+
+    expected: frozenset[str]
+    """The tokens which would have been accepted at this position."""
+
+    excerpt: str
+    """The source line of the error with a marker under the faulty position."""
+
+    def __init__(self, msg: str, doc: str, pos: int, expected: Iterable[str] = ()):
+        super().__init__(msg, doc, pos)
+        self.expected = frozenset(expected)
+        self.excerpt = excerpt(doc, pos)
+
+    def __reduce__(self):
+        return self.__class__, (self.msg, self.doc, self.pos, self.expected)
+
+    def relocate(self, doc: str, offset: int) -> JSONDecodeError:
+        """
+        Get the same error in a document containing the parsed one.
+
+        :param doc: The containing document
+        :param offset: The offset of the parsed document in the containing one
+        """
+        cls, (msg, _, pos, *extra) = self.__reduce__()
+        return cls(msg, doc, pos + offset, *extra)
+
+    @classmethod
+    def from_lark(
+        cls, error: UnexpectedInput, doc: str, parser: Lark, hidden: Container[str] = ()
+    ) -> JSONDecodeError:
+        """
+        Build a [JSONDecodeError][json4humans.errors.JSONDecodeError] from a Lark parsing error.
+
+        :param error: The Lark error to convert.
+        :param doc: The parsed document.
+        :param parser: The Lark parser which raised the error, used to describe the expected tokens.
+        :param hidden: The terminals not to list as expected (ie. the ones of disabled features).
+        """
+        expected: Iterable[str] = ()
+        match error:
+            case UnexpectedToken(token=token) if token.type == "$END":
+                msg, pos, expected = "Unexpected end of document", len(doc), error.expected
+            case UnexpectedToken(token=token):
+                msg, pos, expected = f"Unexpected {token.value!r}", token.start_pos, error.expected
+            case UnexpectedCharacters():
+                msg, pos, expected = (
+                    f"Unexpected {error.char!r}",
+                    error.pos_in_stream or 0,
+                    error.allowed or (),
+                )
+            case UnexpectedEOF():
+                msg, pos, expected = "Unexpected end of document", len(doc), error.expected
+            case _:
+                msg, pos = str(error), error.pos_in_stream or 0
+        return cls(
+            msg, doc, pos, (describe(parser, name) for name in expected if name not in hidden)
+        )
+
+
+def describe(parser: Lark, terminal: str) -> str:
+    """
+    Get a human readable representation of a terminal.
+
+    Anonymous terminals are represented by their quoted value, named ones by their name.
+
+    :param parser: The parser defining the terminal.
+    :param terminal: The terminal name.
+    """
+    if terminal == "$END":
+        return "end of document"
+    try:
+        pattern = parser.get_terminal(terminal).pattern
+    except KeyError:
+        return terminal
+    if pattern.type == "str":
+        return repr(pattern.value)
+    return terminal.rsplit("__", 1)[-1]
+
+
+def excerpt(doc: str, pos: int) -> str:
+    """
+    Extract the source line containing `pos` with a marker under this position.
+
+    :param doc: The source document.
+    :param pos: The offset in the document.
+    """
+    start = doc.rfind("\n", 0, pos) + 1
+    end = doc.find("\n", pos)
+    line = doc[start:] if end < 0 else doc[start:end]
+    return f"{line}\n{' ' * (pos - start)}^"
+
+
+class LimitError(JSONDecodeError):
+    """
+    Raised when a document exceeds one of the [Limits][json4humans.limits.Limits] of a `loads()` call.
+    """
+
+    limit: str
+    """The name of the exceeded limit (ie. `max_depth`)."""
+
+    def __init__(self, msg: str, doc: str, pos: int, expected: Iterable[str] = (), limit: str = ""):
+        super().__init__(msg, doc, pos, expected)
+        self.limit = limit
+
+    def __reduce__(self):
+        return self.__class__, (self.msg, self.doc, self.pos, self.expected, self.limit)
+
+
+class ValidationError(ValueError):
+    """
+    Raised when a document does not match a [schema][json4humans.schema].
+    """
+
+    msg: str
+    """The unformatted error message."""
+
+    pointer: str
+    """The JSON Pointer to the invalid value."""
+
+    lineno: int | None
+    """The line of the invalid value (starting at 1), if the source is known."""
+
+    colno: int | None
+    """The column of the invalid value (starting at 1), if the source is known."""
+
+    def __init__(self, msg: str, pointer: str, lineno: int | None = None, colno: int | None = None):
+        location = f": line {lineno} column {colno}" if lineno is not None else ""
+        super().__init__(f"{msg} at {pointer!r}{location}")
+        self.msg = msg
+        self.pointer = pointer
+        self.lineno = lineno
+        self.colno = colno
+
+    def __reduce__(self):
+        return self.__class__, (self.msg, self.pointer, self.lineno, self.colno)
@@ -0,0 +1,221 @@
+"""
+This module provides a streaming pull parser yielding parsing events.
+
+Unlike `loads()`, no tree is built: the source is tokenized chunk by chunk
+(see [Lexer][json4humans.convert.Lexer]) and each value is reported as an [Event][json4humans.events.Event]
+with its decoded Python value, so memory usage is bounded by the chunk size and the nesting depth.
+The syntax of the dialect is fully checked, but whitespaces and comments are discarded.
+Numbers, identifiers and string escapes follow the same lexical rules as `loads()`,
+so both accept the same documents and decode them to the same values.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from typing import Any, NamedTuple
+
+from .convert import CHUNK_SIZE, LITERALS, Lexer, unescape
+from .features import Features, resolve
+
+START_OBJECT = "start_object"
+END_OBJECT = "end_object"
+START_ARRAY = "start_array"
+END_ARRAY = "end_array"
+KEY = "key"
+SCALAR = "scalar"
+
+CONSTANTS = {"true": True, "false": False, "null": None}
+
+
+class Event(NamedTuple):
+    """A parsing event"""
+
+    kind: str
+    """One of `start_object`, `end_object`, `start_array`, `end_array`, `key` or `scalar`"""
+    value: Any
+    """The decoded key or scalar value, `None` for containers"""
+    pos: int
+    """The offset of the token in the document"""
+
+
+def decode_number(token: str) -> int | float:
+    """
+    Decode a JSON or JSON5 number token.
+
+    :param token: A number token (ie. `-1.5e3`, `+0xFF`, `.5` or `-Infinity`)
+    """
+    body = token.lstrip("+-")
+    if body[:2] in ("0x", "0X"):
+        number = int(body, 16)
+        return -number if token[0] == "-" else number
+    if body in ("Infinity", "NaN") or any(c in body for c in ".eE"):
+        return float(token)
+    return int(token)
+
+
+class Reader(Lexer):
+    """
+    A streaming pull parser.
+
+    :param dialect: The dialect name or features of the document
+    """
+
+    def __init__(self, dialect: str | Features = "json"):
+        super().__init__(resolve(dialect))
+        self.containers: list[str] = []
+        # The expected token: a value, a key, a colon or the next entry
+        self.expect = "value"
+        # The offset of the coma preceding the expected entry, if any
+        self.coma: int | None = None
+        self.done = False
+
+    def events(self, chunks: Iterable[str]) -> Iterator[Event]:
+        """
+        Parse a stream of chunks, yielding the parsing events in document order.
+
+        :param chunks: The source document chunks
+        :raises JSONDecodeError: on invalid documents
+        """
+        for match in self.tokenize(chunks):
+            kind, token = match.lastgroup, match.group()
+            if kind in ("whitespace", "comment"):
+                self.trivia(kind, token)
+            elif self.done:
+                raise self.error(f"Unexpected {token!r}")
+            elif kind == "punctuation":
+                if event := self.on_punctuation(token):
+                    yield event
+            elif self.expect == "key":
+                yield Event(KEY, self.key(kind or "", token), self.position)
+                self.expect = ":"
+                self.coma = None
+            elif self.expect == "value":
+                yield Event(SCALAR, self.scalar(kind or "", token), self.position)
+                self.close_value()
+            else:
+                raise self.error(f"Unexpected {token!r}")
+        if not self.done:
+            self.pos = len(self.buffer)
+            raise self.error("Unexpected end of document")
+
+    def trivia(self, kind: str, token: str):
+        if kind == "comment":
+            self.check(kind, token)
+
+    def close_value(self):
+        self.expect = "next"
+        self.coma = None
+        self.done = not self.containers
+
+    def on_punctuation(self, token: str) -> Event | None:
+        if token in "{[" and self.expect == "value":
+            self.containers.append(token)
+            self.expect = "key" if token == "{" else "value"
+            self.coma = None
+            return Event(START_OBJECT if token == "{" else START_ARRAY, None, self.position)
+        if token in "}]" and self.can_close(token):
+            self.containers.pop()
+            self.close_value()
+            return Event(END_OBJECT if token == "}" else END_ARRAY, None, self.position)
+        if token == ":" and self.expect == ":":
+            self.expect = "value"
+            return None
+        if token == "," and self.expect == "next":
+            self.expect = "key" if self.containers[-1] == "{" else "value"
+            self.coma = self.position
+            return None
+        raise self.error(f"Unexpected {token!r}")
+
+    def can_close(self, token: str) -> bool:
+        if not self.containers or self.containers[-1] != ("{" if token == "}" else "["):
+            return False
+        if self.expect == "next":
+            return True
+        if self.expect != ("key" if token == "}" else "value"):
+            return False
+        if self.coma is not None and not self.features.trailing_comas:
+            raise self.unsupported("trailing_comas", self.coma)
+        return True
+
+    def key(self, kind: str, token: str) -> str:
+        if kind == "string":
+            return self.string(token)
+        if kind == "identifier" or (kind == "number" and token in ("Infinity", "NaN")):
+            if not self.features.identifiers:
+                raise self.unsupported("identifiers")
+            return token
+        raise self.error(f"Unexpected {token!r}")
+
+    def string(self, token: str) -> str:
+        self.check("string", token)
+        return unescape(token[1:-1])[0]
+
+    def scalar(self, kind: str, token: str) -> Any:
+        if kind == "string":
+            return self.string(token)
+        if kind == "identifier" and token in LITERALS:
+            return CONSTANTS[token]
+        if kind == "number":
+            self.check(kind, token)
+            return decode_number(token)
+        raise self.error(f"Unexpected {token!r}")
+
+
+def iterevents(chunks: Iterable[str], dialect: str | Features = "json") -> Iterator[Event]:
+    """
+    Lazily parse a stream of chunks into parsing events.
+
+    :param chunks: The source document chunks
+    :param dialect: The dialect name or features of the document
+    :raises JSONDecodeError: on invalid documents
+    """
+    return Reader(dialect).events(chunks)
+
+
+def events(
+    src: str, dialect: str | Features = "json", chunk_size: int = CHUNK_SIZE
+) -> Iterator[Event]:
+    """
+    Lazily parse a string into parsing events.
+
+    :param src: The source document
+    :param dialect: The dialect name or features of the document
+    :param chunk_size: The number of characters processed at once
+    """
+    return iterevents((src[i : i + chunk_size] for i in range(0, len(src), chunk_size)), dialect)
+
+
+def build(event: Event, events: Iterator[Event]) -> Any:
+    """
+    Build the value starting with an event from the following events.
+
+    :param event: The first event of the value
+    :param events: The following events, consumed up to the end of the value
+    :returns: The value as plain `dict`, `list` and scalars
+    """
+    if event.kind == SCALAR:
+        return event.value
+    root: Any = {} if event.kind == START_OBJECT else []
+    stack: list[Any] = [root]
+    key = None
+    for event in events:
+        container = stack[-1]
+        if event.kind == KEY:
+            key = event.value
+            continue
+        if event.kind in (END_OBJECT, END_ARRAY):
+            stack.pop()
+            if not stack:
+                break
+            continue
+        value = event.value
+        if event.kind == START_OBJECT:
+            value = {}
+        elif event.kind == START_ARRAY:
+            value = []
+        if isinstance(container, dict):
+            container[key] = value
+        else:
+            container.append(value)
+        if isinstance(value, (dict, list)):
+            stack.append(value)
+    return root
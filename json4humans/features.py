@@ -0,0 +1,205 @@
+"""
+This module defines the syntax features selectable on every `loads()` call.
+
+All the dialects are parsed by a single engine accepting the union of their syntaxes
+(see [dialect][json4humans.dialect]): each [JSON module][json4humans.protocol.JSONModule]
+is a preset of [Features][json4humans.features.Features] (see [PRESETS][json4humans.features.PRESETS])
+and any other combination can be selected per call without building another parser:
+
+```python
+from dataclasses import replace
+
+from json4humans import jsonc
+
+# JSON with comments but without trailing comas
+data = jsonc.loads(src, features=replace(jsonc.features, trailing_comas=False))
+```
+
+Disabled features are reported as a [JSONDecodeError][json4humans.errors.JSONDecodeError]
+at the position of the offending token.
+
+The streaming paths ([events][json4humans.events], [typed][json4humans.typed],
+[validate_stream()][json4humans.schema.Validator.validate_stream] and [convert][json4humans.convert])
+accept the same features in place of a dialect name and check the tokens with the same rules
+(see [number_features()][json4humans.features.number_features]
+and [string_features()][json4humans.features.string_features]).
+"""
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, fields
+
+from .errors import JSONDecodeError
+
+
+@dataclass(frozen=True)
+class Features:
+    """The syntax features accepted on top of standard JSON, all disabled by default"""
+
+    comments: bool = False
+    """Support line (`//`) and block (`/* */`) comments"""
+    hash_comments: bool = False
+    """Support hash (`#`) line comments"""
+    trailing_comas: bool = False
+    """Support a trailing coma in arrays and objects"""
+    single_quotes: bool = False
+    """Support single quoted strings"""
+    identifiers: bool = False
+    """Support unquoted identifiers as keys"""
+    hex_numbers: bool = False
+    """Support hexadecimal integers (ie. `0xFF`)"""
+    decimal_points: bool = False
+    """Support leading and trailing decimal points (ie. `.5` and `5.`)"""
+    line_continuations: bool = False
+    """Support escaped line breaks in strings"""
+    constants: bool = False
+    """Support `Infinity` and `NaN`"""
+    plus_signs: bool = False
+    """Support an explicit plus sign on numbers"""
+
+
+JSON = Features()
+"""Standard [JSON](https://www.json.org/)"""
+
+JSONC = Features(comments=True, trailing_comas=True)
+"""[JSON with Comments](https://code.visualstudio.com/docs/languages/json#_json-with-comments)"""
+
+JSON5 = Features(
+    **{field.name: True for field in fields(Features) if field.name != "hash_comments"}
+)
+"""[JSON5](https://spec.json5.org)"""
+
+PRESETS: dict[str, Features] = {"json": JSON, "jsonc": JSONC, "json5": JSON5}
+"""The features of the supported dialects"""
+
+LINE_CONTINUATION = re.compile(r"\\(?:\r\n|[\n\r\u2028\u2029])")
+"""Match an escaped line break in a string"""
+
+DANGLING_POINT = re.compile(r"\.(?!\d)")
+"""Match a decimal point not followed by a digit"""
+
+DESCRIPTIONS = {
+    "comments": "comment",
+    "hash_comments": "hash comment",
+    "trailing_comas": "trailing coma",
+    "single_quotes": "single quoted string",
+    "identifiers": "identifier",
+    "hex_numbers": "hexadecimal number",
+    "decimal_points": "decimal point",
+    "line_continuations": "line continuation",
+    "constants": "constant",
+    "plus_signs": "plus sign",
+}
+"""How the usage of each feature is described in errors"""
+
+TERMINALS = {
+    "CNAME": ("identifiers",),
+    "CONSTANT": ("constants",),
+    "SIGNED_CONSTANT": ("constants",),
+    "SIGNED_HEXNUMBER": ("hex_numbers",),
+    "SINGLE_QUOTE_STRING": ("single_quotes",),
+    "wsc__WSCHS": ("comments", "hash_comments"),
+}
+"""The grammar terminals only meaningful when one of the given features is enabled"""
+
+
+def resolve(dialect: str | Features) -> Features:
+    """
+    Get the features of a dialect.
+
+    :param dialect: A dialect name (see [PRESETS][json4humans.features.PRESETS]) or custom features
+    :raises KeyError: if the dialect is unknown
+    """
+    return PRESETS[dialect] if isinstance(dialect, str) else dialect
+
+
+def number_features(lexeme: str) -> tuple[str, ...]:
+    """
+    The optional features used by a number lexeme, all of them located at its start.
+
+    :param lexeme: A number as written in the document (ie. `+0xFF`, `.5` or `-Infinity`)
+    """
+    body = lexeme.lstrip("+-")
+    used: tuple[str, ...] = ("plus_signs",) if lexeme[0] == "+" else ()
+    if body[:2] in ("0x", "0X"):
+        return (*used, "hex_numbers")
+    if body in ("Infinity", "NaN"):
+        return (*used, "constants")
+    if "." in body and (body[0] == "." or DANGLING_POINT.search(body)):
+        return (*used, "decimal_points")
+    return used
+
+
+def string_features(lexeme: str) -> tuple[tuple[str, int], ...]:
+    """
+    The optional features used by a string lexeme and their offset in it.
+
+    :param lexeme: A quoted string as written in the document
+    """
+    used: tuple[tuple[str, int], ...] = (("single_quotes", 0),) if lexeme[0] == "'" else ()
+    if "\\" in lexeme and (match := LINE_CONTINUATION.search(lexeme)):
+        return (*used, ("line_continuations", match.start()))
+    return used
+
+
+def disabled_terminals(features: Features | None) -> frozenset[str]:
+    """
+    The grammar terminals which can't be expected with some features.
+
+    :param features: The enabled features, all of them if `None`
+    """
+    if features is None:
+        return frozenset()
+    return frozenset(
+        terminal
+        for terminal, names in TERMINALS.items()
+        if not any(getattr(features, name) for name in names)
+    )
+
+
+class Unsupported(Exception):
+    """A disabled feature usage, raised as a [JSONDecodeError][json4humans.errors.JSONDecodeError]"""
+
+    def __init__(self, feature: str, pos: int):
+        self.msg = f"Unexpected {DESCRIPTIONS[feature]}"
+        super().__init__(self.msg)
+        self.feature = feature
+        self.pos = pos
+
+
+collected: ContextVar[list[Unsupported]] = ContextVar("collected")
+"""The disabled features found by the [collecting()][json4humans.features.collecting] context in progress"""
+
+
+def unsupported(feature: str, pos: int):
+    """
+    Report the usage of a disabled feature.
+
+    :param feature: The feature name
+    :param pos: The offset of the offending token
+    :raises Unsupported: unless collecting
+    """
+    error = Unsupported(feature, pos)
+    if (errors := collected.get(None)) is None:
+        raise error
+    errors.append(error)
+
+
+@contextmanager
+def collecting(src: str) -> Iterator[list[JSONDecodeError]]:
+    """
+    Collect the usages of disabled features instead of stopping on the first one.
+
+    :param src: The parsed document
+    """
+    errors: list[Unsupported] = []
+    token = collected.set(errors)
+    found: list[JSONDecodeError] = []
+    try:
+        yield found
+    finally:
+        collected.reset(token)
+        found.extend(JSONDecodeError(error.msg, src, error.pos) for error in errors)
@@ -0,0 +1,283 @@
+"""
+This module provides opt-in profiling of the `loads` and `dumps` calls.
+
+Once enabled (see [enable()][json4humans.instrument.enable] and [profile()][json4humans.instrument.profile]),
+every call of the [JSON modules][json4humans.protocol.JSONModule] records a
+[Stats][json4humans.instrument.Stats] with its per-phase wall time and counts:
+
+```python
+from json4humans import instrument, jsonc
+
+with instrument.profile() as recorder:
+    jsonc.loads(src)
+print(recorder.stats[-1].phases)
+# {'lex': 0.0011, 'parse': 0.0017, 'transform': 0.0031, 'wsc': 0.0004, 'encode': 0.0}
+```
+
+Instrumented calls use a dedicated parser wrapping the lexer and the parser callbacks,
+so disabled instrumentation only costs a context variable lookup per call.
+This parser is built by the first instrumented call of each dialect, which accounts it to its `parse` phase.
+Timing every token and reduction slows the instrumented calls down,
+so the phases are meant to be compared with each other rather than with uninstrumented timings.
+"""
+from __future__ import annotations
+
+import sys
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import wraps
+from time import perf_counter
+from typing import Any
+
+from lark import Lark
+
+from .types import JSONType
+
+PHASES = ("lex", "parse", "transform", "wsc", "encode")
+"""The measured phases"""
+
+
+@dataclass
+class Stats:
+    """The measures of a single `loads` or `dumps` call"""
+
+    operation: str
+    """Either `loads` or `dumps`"""
+    dialect: str
+    """The dialect name (ie. `jsonc`)"""
+    size: int = 0
+    """The length of the parsed or serialized document"""
+    lex: float = 0.0
+    """Time spent tokenizing the source, in seconds"""
+    parse: float = 0.0
+    """Time spent in the LALR parser itself (and in typed decoding), in seconds"""
+    transform: float = 0.0
+    """Time spent building the values in the transformer callbacks, in seconds"""
+    wsc: float = 0.0
+    """Time spent building the whitespaces and comments, in seconds"""
+    encode: float = 0.0
+    """Time spent serializing, in seconds"""
+    tokens: int = 0
+    """The number of tokens produced by the lexer"""
+    nodes: int = 0
+    """The number of [JSONType][json4humans.types.JSONType] nodes built"""
+    blocks: int = 0
+    """The net number of memory blocks allocated by the call (see [sys.getallocatedblocks][])"""
+    error: str | None = None
+    """The exception type name if the call failed"""
+
+    @property
+    def phases(self) -> dict[str, float]:
+        """The time spent in each phase, in seconds"""
+        return {phase: getattr(self, phase) for phase in PHASES}
+
+    @property
+    def total(self) -> float:
+        """The whole call time, in seconds"""
+        return sum(self.phases.values())
+
+
+class Recorder:
+    """
+    Collect the stats of the instrumented calls.
+
+    :param callback: Called with every [Stats][json4humans.instrument.Stats] (ie. to forward them to metrics)
+    :param maxlen: The number of most recent stats to keep
+    """
+
+    def __init__(self, callback: Callable[[Stats], Any] | None = None, maxlen: int = 1000):
+        self.callback = callback
+        self.stats: deque[Stats] = deque(maxlen=maxlen)
+
+    def record(self, stats: Stats):
+        self.stats.append(stats)
+        if self.callback is not None:
+            self.callback(stats)
+
+    def totals(self) -> dict[str, float]:
+        """The time spent in each phase by all the kept stats, in seconds"""
+        return {phase: sum(getattr(stats, phase) for stats in self.stats) for phase in PHASES}
+
+    def clear(self):
+        self.stats.clear()
+
+
+recorder: Recorder | None = None
+"""The process-wide [Recorder][json4humans.instrument.Recorder], `None` when disabled"""
+
+profiling: ContextVar[Recorder | None] = ContextVar("profiling", default=None)
+"""The [Recorder][json4humans.instrument.Recorder] of the innermost `profile()` context, if any"""
+
+current: ContextVar[Stats] = ContextVar("current")
+"""The [Stats][json4humans.instrument.Stats] of the instrumented call in progress"""
+
+
+def enable(callback: Callable[[Stats], Any] | None = None, maxlen: int = 1000) -> Recorder:
+    """
+    Instrument all the following calls, process-wide.
+
+    :param callback: Called with the stats of every call
+    :param maxlen: The number of most recent stats to keep
+    :returns: The new active recorder
+    """
+    global recorder
+    recorder = Recorder(callback, maxlen)
+    return recorder
+
+
+def disable() -> Recorder | None:
+    """
+    Stop instrumenting calls.
+
+    :returns: The recorder which was active, if any
+    """
+    global recorder
+    previous, recorder = recorder, None
+    return previous
+
+
+def active() -> Recorder | None:
+    """The recorder of the calls in the current context, `None` when disabled"""
+    profiled = profiling.get()
+    return recorder if profiled is None else profiled
+
+
+@contextmanager
+def profile(callback: Callable[[Stats], Any] | None = None) -> Iterator[Recorder]:
+    """
+    Instrument the calls within this context, restoring the previous recorder on exit.
+
+    The recorder is bound to the current context (thread or task) and takes precedence
+    over the process-wide one, so concurrent profiles don't record each other's calls.
+
+    :param callback: Called with the stats of every call
+    """
+    profiled = Recorder(callback)
+    token = profiling.set(profiled)
+    try:
+        yield profiled
+    finally:
+        profiling.reset(token)
+
+
+@contextmanager
+def measure(operation: str, dialect: str, size: int = 0) -> Iterator[Stats]:
+    """
+    Measure a call, recording its stats in the active recorder on exit.
+
+    The time not spent in another phase is accounted to `parse` for `loads` and to `encode` for `dumps`.
+
+    :param operation: Either `loads` or `dumps`
+    :param dialect: The dialect name
+    :param size: The document length, if already known
+    """
+    stats = Stats(operation, dialect, size)
+    token = current.set(stats)
+    blocks = sys.getallocatedblocks()
+    start = perf_counter()
+    try:
+        yield stats
+    except Exception as e:
+        stats.error = type(e).__name__
+        raise
+    finally:
+        elapsed = perf_counter() - start
+        stats.blocks = sys.getallocatedblocks() - blocks
+        current.reset(token)
+        remainder = max(0.0, elapsed - stats.total)
+        if operation == "dumps":
+            stats.encode += remainder
+        else:
+            stats.parse += remainder
+        if (target := active()) is not None:
+            target.record(stats)
+
+
+def instrumented(dialect: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Decorate a `loads` or `dumps` function to measure its calls while instrumentation is enabled.
+
+    :param dialect: The dialect name
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        operation = func.__name__
+
+        @wraps(func)
+        def call(arg: Any, *args: Any, **kwargs: Any) -> Any:
+            if active() is None:
+                return func(arg, *args, **kwargs)
+            with measure(operation, dialect, len(arg) if operation == "loads" else 0) as stats:
+                result = func(arg, *args, **kwargs)
+                if operation == "dumps":
+                    stats.size = len(result)
+                return result
+
+        return call
+
+    return decorator
+
+
+class TimedLexer:
+    """Wrap a Lark lexer to measure the time spent producing tokens"""
+
+    def __init__(self, lexer: Any):
+        self.lexer = lexer
+
+    def lex(self, *args: Any) -> Iterator[Any]:
+        stats = current.get()
+        tokens = self.lexer.lex(*args)
+        while True:
+            start = perf_counter()
+            try:
+                token = next(tokens)
+            except StopIteration:
+                stats.lex += perf_counter() - start
+                return
+            stats.lex += perf_counter() - start
+            stats.tokens += 1
+            yield token
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.lexer, name)
+
+
+def timed(callback: Callable[[Any], Any], wsc: bool) -> Callable[[Any], Any]:
+    """Wrap a parser callback to measure its time and count the nodes it builds"""
+
+    def call(arg: Any) -> Any:
+        start = perf_counter()
+        result = callback(arg)
+        elapsed = perf_counter() - start
+        stats = current.get()
+        if wsc:
+            stats.wsc += elapsed
+            return result
+        stats.transform += elapsed
+        # Rules returning one of their children only add trivia around it (ie. `value` and `key`)
+        if isinstance(result, JSONType) and not (
+            isinstance(arg, list) and any(child is result for child in arg)
+        ):
+            stats.nodes += 1
+        return result
+
+    return call
+
+
+def instrumented_parser(parser: Lark) -> Lark:
+    """
+    Make a tree-less LALR parser measure its phases in the current call [Stats][json4humans.instrument.Stats].
+
+    :param parser: A LALR parser with a transformer, modified in place
+    """
+    frontend = parser.parser
+    frontend.lexer = TimedLexer(frontend.lexer)
+    # Lark has no public API to hook the reductions
+    callbacks = frontend.parser.parser.callbacks
+    for key, callback in callbacks.items():
+        name = key if isinstance(key, str) else str(key.origin.name)
+        callbacks[key] = timed(callback, name.startswith("wsc__"))
+    return parser
@@ -9,14 +9,15 @@ This one do by returning [style preserving types][json4humans.types] storing whi
 """
 from __future__ import annotations
 
+import re
+from collections.abc import Iterator
 from dataclasses import dataclass
+from decimal import Decimal
 from typing import Any
 
-from lark import Token
-from lark.visitors import merge_transformers, v_args
-
-from . import protocol, wsc
-from .style import StylePreservingTransformer, with_style
+from . import dialect, protocol, wsc
+from .numeric import FORMATS, NumericArray
+from .style import with_style
 from .types import (  # noqa: F401
     WSC,
     Array,
@@ -31,35 +32,23 @@ from .types import (  # noqa: F401
     String,
 )
 
+transformer = dialect.transformer
 
-class JSONTransformer(StylePreservingTransformer):
-    """
-    A [Transformer][lark.visitors.Transformer] for JSON
-    """
-
-    @v_args(inline=True)
-    def string(self, s):
-        return String(
-            s[1:-1].replace("\\/", "/").encode().decode("unicode_escape", "surrogatepass")
-        )
-
-    @v_args(inline=True)
-    def number(self, num: str):
-        return Float(num) if "." in num or "e" in num else Integer(num)
-
-    @v_args(inline=True)
-    def literal(self, token: Token) -> Literal:
-        match token.value:
-            case "true":
-                return Literal[bool](True)
-            case "false":
-                return Literal[bool](False)
-            case "null":
-                return Literal[None](None)
-        raise ValueError(f"Unknown literal: {token.value}")
+ESCAPES = {chr(code): f"\\u{code:04x}" for code in range(0x20)} | {
+    '"': '\\"',
+    "\\": "\\\\",
+    "\n": "\\n",
+    "\r": "\\r",
+    "\b": "\\b",
+    "\f": "\\f",
+    "\t": "\\t",
+}
+"""Characters which must be escaped in a JSON string"""
 
+TRANSLATION = str.maketrans(ESCAPES)
 
-transformer = merge_transformers(JSONTransformer(), wsc=wsc.transformer)
+NUMBER = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?")
+"""Match a number lexeme valid in JSON (ie. not a JSON5 one like `+1`, `.5` or `0xFF`)"""
 
 
 class JSONEncoder(protocol.JSONEncoder):
@@ -72,6 +61,26 @@ class JSONEncoder(protocol.JSONEncoder):
         self.indent = indent
 
     def encode(self, obj: Any) -> str:
+        """
+        Serialize an object using an explicit stack,
+        so the nesting depth is not bounded by the recursion limit.
+        """
+        if not isinstance(obj, (dict, list, tuple)):
+            return self.encode_scalar(obj)
+        out: list[str] = []
+        stack = [self.encode_container(obj, out)]
+        while stack:
+            # Resume the innermost container until it yields a nested container
+            for item in stack[-1]:
+                if isinstance(item, (dict, list, tuple)):
+                    stack.append(self.encode_container(item, out))
+                    break
+                out.append(self.encode_scalar(item))
+            else:
+                stack.pop()
+        return "".join(out)
+
+    def encode_scalar(self, obj: Any) -> str:
         match obj:
             case bool():
                 return self.encode_bool(obj)
@@ -81,24 +90,30 @@ class JSONEncoder(protocol.JSONEncoder):
                 return self.encode_int(obj)
             case float():
                 return self.encode_float(obj)
-            case dict():
-                return self.encode_dict(obj)
-            case list() | tuple():
-                return self.encode_iterable(obj)
+            case Decimal():
+                return self.encode_decimal(obj)
             case Literal():
                 return self.encode_literal(obj)
+            case None:
+                return "null"
         raise NotImplementedError(f"Unknown type: {type(obj)}")
 
     @with_style
     def encode_string(self, obj: str) -> str:
-        return f'"{obj}"'
+        return f'"{obj.translate(TRANSLATION)}"'
 
     @with_style
     def encode_int(self, obj: int) -> str:
-        return str(obj)
+        raw = getattr(obj, "raw", None)
+        return raw if raw is not None and NUMBER.fullmatch(raw) else int.__repr__(obj)
 
     @with_style
     def encode_float(self, obj: float) -> str:
+        raw = getattr(obj, "raw", None)
+        return raw if raw is not None and NUMBER.fullmatch(raw) else float.__repr__(obj)
+
+    @with_style
+    def encode_decimal(self, obj: Decimal) -> str:
         return str(obj)
 
     @with_style
@@ -116,34 +131,41 @@ class JSONEncoder(protocol.JSONEncoder):
                 return "null"
         raise NotImplementedError(f"Unknown literal: {obj.value}")
 
-    @with_style
-    def encode_dict(self, obj: dict) -> str:
-        return "".join(
-            (
-                "{",
-                "".join(wsc.encode_wsc(w) for w in getattr(obj, "json_container_head", [])),
-                ",".join(self.encode_pair(k, v) for k, v in obj.items()),
-                "," if getattr(obj, "json_container_trailing_coma", False) else "",
-                "".join(wsc.encode_wsc(w) for w in getattr(obj, "json_container_tail", [])),
-                "}",
-            )
-        )
-
-    @with_style
-    def encode_iterable(self, obj: list | tuple) -> str:
-        return "".join(
-            (
-                "[",
-                "".join(wsc.encode_wsc(w) for w in getattr(obj, "json_container_head", [])),
-                ",".join(self.encode(item) for item in obj),
-                "," if getattr(obj, "json_container_trailing_coma", False) else "",
-                "".join(wsc.encode_wsc(w) for w in getattr(obj, "json_container_tail", [])),
-                "]",
-            )
-        )
-
-    def encode_pair(self, key: str, value: Any) -> str:
-        return f"{self.encode(key)}:{self.encode(value)}"
+    def encode_numbers(self, obj: NumericArray) -> str:
+        """Serialize the items of a numeric array, which all share the same layout"""
+        after = "".join(map(wsc.encode_wsc, obj.json_item_after))
+        separator = f"{after},{''.join(map(wsc.encode_wsc, obj.json_item_before))}"
+        items = separator.join(map(FORMATS[obj.data.typecode], obj.data))
+        return f"{items}{after}" if obj.json_container_trailing_coma and obj.data else items
+
+    def encode_container(self, obj: dict | list | tuple, out: list[str]) -> Iterator[Any]:
+        """
+        Write an object or an array punctuation and style into `out`,
+        yielding its keys and values to be encoded in between.
+        """
+        out.extend(wsc.encode_wsc(w) for w in getattr(obj, "json_before", []))
+        opening, closing = "{}" if isinstance(obj, dict) else "[]"
+        out.append(opening)
+        out.extend(wsc.encode_wsc(w) for w in getattr(obj, "json_container_head", []))
+        if isinstance(obj, dict):
+            for index, (key, value) in enumerate(obj.items()):
+                if index:
+                    out.append(",")
+                yield key
+                out.append(":")
+                yield value
+        elif isinstance(obj, NumericArray):
+            out.append(self.encode_numbers(obj))
+        else:
+            for index, item in enumerate(obj):
+                if index:
+                    out.append(",")
+                yield item
+        if getattr(obj, "json_container_trailing_coma", False):
+            out.append(",")
+        out.extend(wsc.encode_wsc(w) for w in getattr(obj, "json_container_tail", []))
+        out.append(closing)
+        out.extend(wsc.encode_wsc(w) for w in getattr(obj, "json_after", []))
 
 
 @dataclass
@@ -153,7 +175,4 @@ class FormatOptions:
     add_end_line_return: bool = True
 
 
-# parser, loads, load, dumps, dump = protocol.factory("json", transformer, JSONEncoder, lexer="basic")
-
-
-protocol.implement("json", transformer, JSONEncoder, lexer="basic")
+protocol.implement("json", transformer, JSONEncoder)
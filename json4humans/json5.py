@@ -11,15 +11,11 @@ See: [specifications](https://spec.json5.org)
 """
 from __future__ import annotations
 
-import re
-from typing import Any, cast
+from typing import Any
 
-from lark import Token
-from lark.visitors import merge_transformers, v_args
-
-from . import json, protocol, wsc
+from . import dialect, protocol
 from .jsonc import JSONCEncoder
-from .style import StylePreservingTransformer, with_style
+from .style import with_style
 from .types import (  # noqa: F401
     WSC,
     AnyNumber,
@@ -40,69 +36,7 @@ from .types import (  # noqa: F401
     Value,
 )
 
-
-class JSON5Transformer(StylePreservingTransformer):
-    """
-    A [Transformer][lark.visitors.Transformer] for JSON5
-    """
-
-    @v_args(inline=True)
-    def string(self, string: String):
-        return string
-
-    @v_args(inline=True)
-    def SINGLE_QUOTE_CHARS(self, token: Token) -> str:
-        return token.value.replace("\\/", "/").encode().decode("unicode_escape", "surrogatepass")
-
-    @v_args(inline=True)
-    def DOUBLE_QUOTE_CHARS(self, token: Token) -> tuple[str, list[int]]:
-        return token.value.replace("\\/", "/").encode().decode("unicode_escape", "surrogatepass"), [
-            m.start() for m in re.finditer("\\\n", token.value)
-        ]
-
-    @v_args(inline=True)
-    def double_quote_string(self, string: tuple[str, list[int]] | None = None) -> String:
-        value, linebreaks = string or ("", [])
-        return String(value, quote=Quote.DOUBLE, linebreaks=linebreaks)
-
-    @v_args(inline=True)
-    def single_quote_string(self, string: str | None = None) -> String:
-        return String(string or "", quote=Quote.SINGLE)
-
-    @v_args(inline=True)
-    def identifier(self, string) -> Identifier:
-        return Identifier(string)
-
-    @v_args(inline=True)
-    def number(self, number: Number):
-        return number
-
-    def SIGNED_HEXNUMBER(self, token: Token):
-        return HexInteger(int(token.value, base=16), prefixed=token.value.startswith(("+", "-")))
-
-    def SIGNED_NUMBER(self, token: Token):
-        prefixed = token.value.startswith(("+", "-"))
-        if "." in token.value or "e" in token.value:
-            significand = len(token.value.split(".")[1]) if "." in token.value else None
-            return Float(
-                token.value,
-                prefixed=prefixed,
-                leading_point=token.value.startswith("."),
-                significand=significand,
-            )
-        else:
-            return Integer(token.value, prefixed=prefixed)
-
-    def object_with_trailing(self, children: list) -> Any:
-        o = Object(cast(Member, c) for c in children if isinstance(c, tuple))
-        o.json_container_tail = children[-2]
-        o.json_container_trailing_coma = isinstance(children[-3], Token)
-        return o
-
-    pair = tuple
-
-
-transformer = merge_transformers(JSON5Transformer(), wsc=wsc.transformer, json=json.transformer)
+transformer = dialect.transformer
 
 
 ESCAPES = {
@@ -113,36 +47,46 @@ ESCAPES = {
     "\f": r"\f",
     "\t": r"\t",
     "\v": r"\v",
-    "\0": r"\0",
-    "\u2028": r"\\u2028",
-    "\u2029": r"\\u2029",
+    "\0": r"\x00",
+    "\u2028": r"\u2028",
+    "\u2029": r"\u2029",
+}
+
+TRANSLATIONS = {
+    quote.value: str.maketrans({quote.value: f"\\{quote.value}", **ESCAPES}) for quote in Quote
 }
 
 
-def escape_string(string: str, **escapes: str | int | None) -> str:
-    out = string.translate(str.maketrans({**escapes, **ESCAPES}))
-    if isinstance(string, String):
-        for linebreak in string.linebreaks:
-            out = out[: linebreak - 1] + "\\\n" + out[linebreak - 1 :]
-    return out
+def escape_string(string: str, quote: str = '"', **escapes: str | int | None) -> str:
+    table = (
+        str.maketrans({**escapes, quote: f"\\{quote}", **ESCAPES})
+        if escapes
+        else TRANSLATIONS[quote]
+    )
+    if isinstance(string, String) and string.linebreaks:
+        bounds = zip([0, *string.linebreaks], [*string.linebreaks, None])
+        return "\\\n".join(string[start:end].translate(table) for start, end in bounds)
+    return string.translate(table)
 
 
 class JSON5Encoder(JSONCEncoder):
-    def encode(self, obj: Any) -> str:
+    def encode_scalar(self, obj: Any) -> str:
         match obj:
             case Number():
                 return self.encode_number(obj)
-        return super().encode(obj)
+        return super().encode_scalar(obj)
 
     @with_style
     def encode_number(self, obj: AnyNumber) -> str:
+        if obj.raw is not None:
+            return obj.raw
         return f"+{obj}" if obj > 0 and obj.prefixed else str(obj)
 
     @with_style
     def encode_string(self, obj: str) -> str:
         match obj:
             case String():
-                return f"{obj.quote.value}{escape_string(obj)}{obj.quote.value}"
+                return f"{obj.quote.value}{escape_string(obj, obj.quote.value)}{obj.quote.value}"
             case Identifier():
                 return str(obj)
         return f'"{escape_string(obj)}"'
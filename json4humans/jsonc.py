@@ -10,24 +10,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from lark.visitors import merge_transformers
-
-from . import json, protocol, wsc
-from .style import StylePreservingTransformer
+from . import dialect, json, protocol
 from .types import WSC, Array, Float, Integer, JSONType, Object, String  # noqa: F401
 
 Member = tuple[String, JSONType]
 
 
-class JSONCTransformer(StylePreservingTransformer):
-    """
-    A [Transformer][lark.visitors.Transformer] for JSONC aka. JSON with Comments
-    """
-
-    pass
-
-
-transformer = merge_transformers(JSONCTransformer(), json=json.transformer, wsc=wsc.transformer)
+transformer = dialect.transformer
 
 
 class JSONCEncoder(json.JSONEncoder):
@@ -42,4 +31,4 @@ class FormatOptions:
     add_end_line_return: bool = True
 
 
-protocol.implement("jsonc", transformer, JSONCEncoder, lexer="basic")
+protocol.implement("jsonc", transformer, JSONCEncoder)
@@ -0,0 +1,226 @@
+"""
+This module enforces resource limits on untrusted documents.
+
+When loading with `limits=Limits(...)`, the limits are checked on every token as soon as it is lexed,
+before the parser and the transformer do any work on it, so pathological inputs
+(giant numbers, huge nesting or millions of tiny nodes) are rejected early and cheaply
+with a [LimitError][json4humans.errors.LimitError]:
+
+```python
+from json4humans import json5
+from json4humans.limits import Limits
+
+LIMITS = Limits(max_bytes=1 << 20, max_depth=64, max_nodes=100_000)
+
+data = json5.loads(untrusted, limits=LIMITS)
+```
+
+The document size is checked before parsing
+(and [load()][json4humans.protocol.JSONModule.load] doesn't read past the limit).
+"""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from lark import Lark, Token
+
+from .errors import LimitError
+
+
+@dataclass(frozen=True)
+class Limits:
+    """The maximum resources a document may use, `None` meaning unlimited"""
+
+    max_depth: int | None = None
+    """The maximum nesting depth of objects and arrays (the root container being at depth 1)"""
+    max_bytes: int | None = None
+    """The maximum size of the document, in UTF-8 bytes"""
+    max_nodes: int | None = None
+    """The maximum number of values and keys"""
+    max_string_length: int | None = None
+    """The maximum length of a string or a key, in source characters (escape sequences included)"""
+    max_number_digits: int | None = None
+    """The maximum number of digits of a number (exponent included)"""
+
+
+class Exceeded(Exception):
+    """A limit exceeded while lexing, raised as a [LimitError][json4humans.errors.LimitError]"""
+
+    def __init__(self, msg: str, pos: int, limit: str):
+        super().__init__(msg)
+        self.msg = msg
+        self.pos = pos
+        self.limit = limit
+
+
+enforced: ContextVar[Limits] = ContextVar("enforced")
+"""The [Limits][json4humans.limits.Limits] of the parsing in progress"""
+
+
+@contextmanager
+def enforcing(limits: Limits, src: str) -> Iterator[Limits]:
+    """
+    Enforce some limits on a document parsed by a limited parser within this context.
+
+    :param limits: The limits to enforce
+    :param src: The parsed document
+    :raises LimitError: if the document exceeds a limit
+    """
+    check_size(src, limits)
+    token = enforced.set(limits)
+    try:
+        yield limits
+    except Exceeded as e:
+        raise LimitError(e.msg, src, e.pos, limit=e.limit) from None
+    finally:
+        enforced.reset(token)
+
+
+def check_size(src: str, limits: Limits):
+    """
+    Ensure a document doesn't exceed the maximum size, without encoding it if not needed.
+
+    :raises LimitError: if the document is too large
+    """
+    if (max_bytes := limits.max_bytes) is None or len(src) * 4 <= max_bytes:
+        return
+    # An UTF-8 encoded character takes 1 to 4 bytes
+    if len(src) > max_bytes or len(src.encode("utf-8", "surrogatepass")) > max_bytes:
+        raise LimitError(
+            f"Document exceeds the maximum size of {max_bytes} bytes", src, 0, limit="max_bytes"
+        )
+
+
+OTHER, OPENING, CLOSING, STRING, QUOTED, NUMBER, SCALAR = range(7)
+
+TERMINALS = {
+    "LBRACE": OPENING,
+    "LSQB": OPENING,
+    "RBRACE": CLOSING,
+    "RSQB": CLOSING,
+    "DOUBLE_QUOTE_STRING": QUOTED,
+    "SINGLE_QUOTE_STRING": QUOTED,
+    "CNAME": STRING,
+    "SIGNED_NUMBER": NUMBER,
+    "SIGNED_HEXNUMBER": NUMBER,
+    "TRUE": SCALAR,
+    "FALSE": SCALAR,
+    "NULL": SCALAR,
+    "CONSTANT": SCALAR,
+    "SIGNED_CONSTANT": SCALAR,
+}
+"""The limited terminals of the dialects grammar, by name without namespace"""
+
+KINDS: dict[str, int] = {}
+"""The kind of every terminal by full name, filled on first use"""
+
+
+def kind_of(terminal: str) -> int:
+    if (kind := KINDS.get(terminal)) is None:
+        kind = KINDS[terminal] = TERMINALS.get(terminal.rsplit("__", 1)[-1], OTHER)
+    return kind
+
+
+def digits(lexeme: str) -> int:
+    """The number of digits of a number lexeme"""
+    body = lexeme.lstrip("+-")
+    if body[:2] in ("0x", "0X"):
+        return len(body) - 2
+    return sum(char.isdigit() for char in body)
+
+
+class Budget:
+    """The resources used so far by a document"""
+
+    def __init__(self, limits: Limits):
+        self.limits = limits
+        self.depth = 0
+        self.nodes = 0
+
+    def consume(self, token: Token, kind: int):
+        """
+        Account for a token.
+
+        :raises Exceeded: if a limit is exceeded
+        """
+        if kind == CLOSING:
+            self.depth -= 1
+            return
+        self.count(token)
+        if kind == OPENING:
+            self.depth += 1
+            if (max_depth := self.limits.max_depth) is not None and self.depth > max_depth:
+                raise Exceeded(
+                    f"Maximum depth of {max_depth} exceeded", token.start_pos or 0, "max_depth"
+                )
+        elif kind == STRING or kind == QUOTED:
+            self.check_string(token, len(token) - 2 if kind == QUOTED else len(token))
+        elif kind == NUMBER:
+            self.check_number(token)
+
+    def count(self, token: Token):
+        self.nodes += 1
+        if (max_nodes := self.limits.max_nodes) is not None and self.nodes > max_nodes:
+            raise Exceeded(
+                f"Document exceeds the maximum of {max_nodes} nodes",
+                token.start_pos or 0,
+                "max_nodes",
+            )
+
+    def check_string(self, token: Token, length: int):
+        if (max_length := self.limits.max_string_length) is not None and length > max_length:
+            raise Exceeded(
+                f"String of {length} characters exceeds the maximum length of {max_length}",
+                token.start_pos or 0,
+                "max_string_length",
+            )
+
+    def check_number(self, token: Token):
+        max_digits = self.limits.max_number_digits
+        # The lexeme length is an upper bound of the digits count
+        if (
+            max_digits is not None
+            and len(token) > max_digits
+            and (count := digits(token)) > max_digits
+        ):
+            raise Exceeded(
+                f"Number of {count} digits exceeds the maximum of {max_digits}",
+                token.start_pos or 0,
+                "max_number_digits",
+            )
+
+
+class LimitedLexer:
+    """Wrap a Lark lexer to enforce the current limits on every token"""
+
+    def __init__(self, lexer: Any):
+        self.lexer = lexer
+
+    def lex(self, *args: Any) -> Iterator[Token]:
+        budget = Budget(enforced.get())
+        for token in self.lexer.lex(*args):
+            kind = KINDS.get(token.type)
+            if kind is None:
+                kind = kind_of(token.type)
+            if kind:
+                budget.consume(token, kind)
+            yield token
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.lexer, name)
+
+
+def limited_parser(parser: Lark) -> Lark:
+    """
+    Make a LALR parser enforce the [limits][json4humans.limits.Limits]
+    of the current [enforcing()][json4humans.limits.enforcing] context.
+
+    :param parser: A LALR parser, modified in place
+    """
+    frontend = parser.parser
+    frontend.lexer = LimitedLexer(frontend.lexer)
+    return parser
@@ -0,0 +1,394 @@
+"""
+This module provides a compact storage for arrays of numbers.
+
+Loading with `numeric_arrays=True` stores the arrays of numbers
+in a [NumericArray][json4humans.numeric.NumericArray] backed by an [array][array.array]
+of 64 bits integers or floats instead of an [Array][json4humans.types.Array]
+of [Integer][json4humans.types.Integer] or [Float][json4humans.types.Float] nodes
+(each with its own trivia lists), which takes an order of magnitude less memory:
+
+```python
+from json4humans import json5
+
+doc = json5.loads("{samples: [0.5, 1.25, 3.0], ids: [1, 2, 3]}", numeric_arrays=True)
+assert doc["samples"].data.typecode == "d"
+assert json5.dumps(doc) == "{samples: [0.5, 1.25, 3.0], ids: [1, 2, 3]}"
+```
+
+An array is only packed if all its items are numbers of the same kind, serialized exactly like Python does
+(ie. arrays containing `1.50`, `1e3` or `0x10` are not packed) and separated by the same whitespaces.
+Items are plain `int` or `float`: assigning, appending or inserting anything which can't be stored as-is
+(ie. a string or a number with comments) turns the array into a regular [Array][json4humans.types.Array]
+in place.
+
+Numeric arrays are views for [NumPy](https://numpy.org/) (which is not required otherwise):
+
+```python
+import numpy
+from json4humans.numeric import NumericArray
+
+values = numpy.asarray(doc["samples"])  # No copy: modifying `values` modifies the document
+doc["ids"] = NumericArray(numpy.arange(10))
+```
+"""
+from __future__ import annotations
+
+import math
+import sys
+from array import array
+from collections.abc import Iterable, Sequence
+from typing import Any, SupportsIndex
+
+from . import wsc
+from .types import WSC, Array, Container, Float, Integer, JSONType, WhiteSpace
+
+TYPECODES: dict[type, str] = {Integer: "q", Float: "d"}
+"""The [array][array.array] typecodes of the parsed numbers packed in numeric arrays"""
+
+NODES: dict[str, Any] = {"q": Integer, "d": Float}
+"""The nodes created for the items of numeric arrays turned into regular arrays"""
+
+ACCEPTED: dict[str, tuple[type, ...]] = {"q": (int, Integer), "d": (float, Float)}
+"""The types of the values numeric arrays can store, by typecode"""
+
+FORMATS = {"q": int.__repr__, "d": float.__repr__}
+"""The serialization of the items, by typecode"""
+
+NATIVE_FORMATS = {"q": ("q", "l", "n", "@q", "@l", "@n"), "d": ("d", "@d")}
+"""The buffers formats copied as-is into numeric arrays, by typecode"""
+
+INTEGER_FORMATS = "bBhHiIlLqQnN"
+"""The buffers formats of integers"""
+
+INT64_MIN, INT64_MAX = -(2**63), 2**63 - 1
+"""The bounds of the integers numeric arrays can store"""
+
+
+def whitespaces(trivia: list[WSC]) -> bool:
+    return all(isinstance(w, WhiteSpace) for w in trivia)
+
+
+def plain(value: Any) -> Any:
+    """The items of a numeric array as a list, any other value as-is"""
+    return value.data.tolist() if isinstance(value, NumericArray) else value
+
+
+def packed(items: Iterable, typecode: str | None = None) -> array:
+    """
+    Copy some numbers into an [array][array.array].
+
+    Buffers in the native format (ie. NumPy arrays) are copied at once.
+
+    :param items: The numbers, an iterable or a buffer
+    :param typecode: `q` for 64 bits integers, `d` for floats.
+                     Guessed from the buffer format or the numbers if `None`.
+    """
+    if isinstance(items, NumericArray):
+        items = items.data
+    try:
+        view = memoryview(items)  # type: ignore[arg-type]
+    except TypeError:
+        items = list(items)
+        integers = all(isinstance(item, int) and not isinstance(item, bool) for item in items)
+        return array(typecode or ("q" if integers else "d"), items)
+    typecode = typecode or ("q" if view.format[-1] in INTEGER_FORMATS else "d")
+    data = array(typecode)
+    if (
+        view.format in NATIVE_FORMATS[typecode]
+        and view.itemsize == data.itemsize
+        and view.c_contiguous
+    ):
+        data.frombytes(view.cast("B"))
+        return data
+    return array(typecode, items)
+
+
+def fitting(value: Any, typecode: str) -> Any:
+    """
+    Get the number stored in a numeric array for a value.
+
+    :returns: The value, or `None` if it can't be stored without changing its serialization
+    """
+    if type(value) not in ACCEPTED[typecode]:
+        return None
+    text = FORMATS[typecode](value)
+    if (
+        getattr(value, "raw", None) not in (None, text)
+        or str(value) != text
+        or getattr(value, "json_before", None)
+        or getattr(value, "json_after", None)
+    ):
+        return None
+    if typecode == "q":
+        return value if INT64_MIN <= value <= INT64_MAX else None
+    return value if math.isfinite(value) else None
+
+
+class NumericArray(Array):
+    """
+    An [Array][json4humans.types.Array] of integers or floats stored in a compact [array][array.array].
+
+    Items have no trivia of their own: they share the same layout, the whitespaces before the first one
+    being in the container head and the ones after the last one in the container tail
+    (unless there is a trailing coma).
+    Any modification which can't be stored as-is turns it into a regular [Array][json4humans.types.Array].
+
+    It exposes its items buffer to [NumPy][numpy.asarray] without copying them:
+    the array can't be resized while a view exists.
+    """
+
+    data: array
+    """The items, as 64 bits integers (`q` typecode) or floats (`d` typecode)"""
+    json_item_before: list[WSC]
+    """Whitespaces before each item, except the first one."""
+    json_item_after: list[WSC]
+    """Whitespaces after each item, except the last one when there is no trailing coma."""
+
+    def __init__(
+        self,
+        items: Iterable = (),
+        typecode: str | None = None,
+        *,
+        before: list[WSC | str] | None = None,
+        after: list[WSC | str] | None = None,
+        head: list[WSC | str] | None = None,
+        tail: list[WSC | str] | None = None,
+        trailing_coma: bool = False,
+        item_before: list[WSC | str] | None = None,
+        item_after: list[WSC | str] | None = None,
+    ):
+        Container.__init__(
+            self, before=before, after=after, head=head, tail=tail, trailing_coma=trailing_coma
+        )
+        self.data = packed(items, typecode)
+        self.json_item_before = wsc.parse_list(item_before)
+        self.json_item_after = wsc.parse_list(item_after)
+
+    @classmethod
+    def pack(
+        cls, items: Sequence[Any], tail: list[WSC], trailing_coma: bool
+    ) -> NumericArray | None:
+        """
+        Pack the parsed items of an array, if they are numbers of the same kind, uniformly laid out,
+        and serialized like Python does.
+
+        :param items: The parsed items
+        :param tail: The array tail
+        :param trailing_coma: Wether the array has a trailing coma
+        :returns: The numeric array, or `None` if the items can't be packed
+        """
+        if not items or (typecode := TYPECODES.get(type(items[0]))) is None:
+            return None
+        node, format = NODES[typecode], FORMATS[typecode]
+        last = len(items) - 1
+        before = items[1].json_before if last else []
+        after = items[0].json_after if last or trailing_coma else []
+        if not whitespaces(before) or not whitespaces(after):
+            return None
+        for index, item in enumerate(items):
+            if (
+                type(item) is not node
+                or item.raw != format(item)
+                or (index and item.json_before != before)
+                or ((index < last or trailing_coma) and item.json_after != after)
+            ):
+                return None
+        try:
+            data = array(typecode, items)
+        except OverflowError:
+            return None
+        numeric = cls.__new__(cls)
+        numeric.data = data
+        numeric.json_before = []
+        numeric.json_after = []
+        numeric.json_container_head = items[0].json_before
+        numeric.json_container_tail = list(tail) if trailing_coma else items[-1].json_after + tail
+        numeric.json_container_trailing_coma = trailing_coma
+        numeric.json_item_before = before
+        numeric.json_item_after = after
+        return numeric
+
+    def inflate(self):
+        """Turn into a regular [Array][json4humans.types.Array], giving each item its own node and layout"""
+        node = NODES[self.data.typecode]
+        last = len(self.data) - 1
+        items = []
+        for index, value in enumerate(self.data):
+            item = node(value)
+            item.json_before = list(self.json_item_before) if index else self.json_container_head
+            if index < last or self.json_container_trailing_coma:
+                item.json_after = list(self.json_item_after)
+            items.append(item)
+        if items:
+            self.json_container_head = []
+        del self.data, self.json_item_before, self.json_item_after
+        self.__class__ = Array  # type: ignore[assignment]
+        list.extend(self, items)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __iter__(self) -> Any:
+        return iter(self.data)
+
+    def __reversed__(self) -> Any:
+        return reversed(self.data)
+
+    def __contains__(self, value: object) -> bool:
+        return value in self.data
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return self.data[index].tolist()
+        return self.data[index]
+
+    def __setitem__(self, index: Any, value: Any):
+        typecode = self.data.typecode
+        if isinstance(index, slice):
+            numbers = [fitting(item, typecode) for item in value]
+            if None not in numbers:
+                self.data[index] = array(typecode, numbers)
+                return
+        elif (number := fitting(value, typecode)) is not None:
+            self.data[index] = number
+            return
+        else:
+            self.join(value, index, replace=True)
+        self.inflate()
+        self[index] = value
+
+    def __delitem__(self, index: Any):
+        del self.data[index]
+
+    def __eq__(self, other: object) -> bool:
+        return self.data.tolist().__eq__(plain(other))
+
+    def __ne__(self, other: object) -> bool:
+        return self.data.tolist().__ne__(plain(other))
+
+    def __lt__(self, other: Any) -> bool:
+        return self.data.tolist().__lt__(plain(other))
+
+    def __le__(self, other: Any) -> bool:
+        return self.data.tolist().__le__(plain(other))
+
+    def __gt__(self, other: Any) -> bool:
+        return self.data.tolist().__gt__(plain(other))
+
+    def __ge__(self, other: Any) -> bool:
+        return self.data.tolist().__ge__(plain(other))
+
+    def __add__(self, other: Any) -> Any:
+        return self.data.tolist() + plain(other)
+
+    def __radd__(self, other: Any) -> Any:
+        return plain(other) + self.data.tolist()
+
+    def __iadd__(self, other: Any) -> Any:
+        self.extend(other)
+        return self
+
+    def __mul__(self, count: SupportsIndex) -> Any:
+        return self.data.tolist() * count
+
+    __rmul__ = __mul__
+
+    def __imul__(self, count: SupportsIndex) -> Any:
+        self.data *= int(count)
+        return self
+
+    def __repr__(self) -> str:
+        return repr(self.data.tolist())
+
+    def __sizeof__(self) -> int:
+        return list.__sizeof__(self) + self.data.__sizeof__()
+
+    def __reduce__(self) -> Any:
+        state = {name: value for name, value in self.__dict__.items() if name != "data"}
+        return self.__class__, (self.data,), state
+
+    def __buffer__(self, flags: int) -> memoryview:
+        return memoryview(self.data)
+
+    def __array__(self, dtype: Any = None, copy: bool | None = None) -> Any:
+        import numpy
+
+        view = numpy.frombuffer(self.data, dtype=self.data.typecode)
+        if dtype is not None and numpy.dtype(dtype) != view.dtype:
+            if copy is False:
+                raise ValueError(f"Can't view {self.data.typecode} items as {dtype} without a copy")
+            return view.astype(dtype)
+        return view.copy() if copy else view
+
+    def join(self, value: Any, index: SupportsIndex, replace: bool = False):
+        """
+        Lay a value inserted (or set) at an index out like the items, unless it has its own layout.
+
+        Must be called before turning into a regular array, which drops the items layout.
+        """
+        count = len(self.data)
+        if not count or not isinstance(value, JSONType) or value.json_before or value.json_after:
+            return
+        position = min(max(int(index) + count if int(index) < 0 else int(index), 0), count)
+        last = count - 1 if replace else count
+        if position:
+            value.json_before = list(self.json_item_before)
+        elif replace:
+            value.json_before = list(self.json_container_head)
+        else:
+            # The current first item is then laid out like the following ones
+            value.json_before = self.json_container_head
+            self.json_container_head = list(self.json_item_before)
+        if position < last or self.json_container_trailing_coma:
+            value.json_after = list(self.json_item_after)
+
+    def append(self, value: Any):
+        if (number := fitting(value, self.data.typecode)) is None:
+            self.join(value, len(self.data))
+            self.inflate()
+            return self.append(value)
+        self.data.append(number)
+
+    def extend(self, values: Iterable):
+        if isinstance(values, NumericArray) and values.data.typecode == self.data.typecode:
+            self.data.extend(values.data)
+            return
+        values = list(values)
+        numbers = [fitting(value, self.data.typecode) for value in values]
+        if None in numbers:
+            for offset, value in enumerate(values):
+                self.join(value, len(self.data) + offset)
+            self.inflate()
+            return self.extend(values)
+        self.data.extend(numbers)
+
+    def insert(self, index: SupportsIndex, value: Any):
+        if (number := fitting(value, self.data.typecode)) is None:
+            self.join(value, index)
+            self.inflate()
+            return self.insert(index, value)
+        self.data.insert(int(index), number)
+
+    def pop(self, index: SupportsIndex = -1) -> Any:
+        return self.data.pop(int(index))
+
+    def remove(self, value: Any):
+        self.data.remove(value)
+
+    def clear(self):
+        del self.data[:]
+
+    def index(self, value: Any, start: SupportsIndex = 0, stop: SupportsIndex = sys.maxsize) -> int:
+        return self.data.index(value, int(start), int(stop))
+
+    def count(self, value: Any) -> int:
+        return self.data.count(value)
+
+    def sort(self, *, key: Any = None, reverse: bool = False):
+        self.data[:] = array(self.data.typecode, sorted(self.data, key=key, reverse=reverse))
+
+    def reverse(self):
+        self.data.reverse()
+
+    def copy(self) -> list:
+        return self.data.tolist()
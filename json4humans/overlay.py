@@ -0,0 +1,185 @@
+"""
+This module stacks parsed documents into a single copy-on-write view.
+
+An [Overlay][json4humans.overlay.Overlay] resolves every lookup through its layers,
+from the top one down, without merging nor copying anything:
+objects defined by several layers are returned as nested views on these objects
+while any other value is returned from the highest layer defining it.
+
+```python
+from pathlib import Path
+
+from json4humans import jsonc
+from json4humans.overlay import Overlay
+
+settings = Overlay(
+    jsonc.load(Path("base.jsonc")),
+    jsonc.load(Path("production.jsonc")),
+    jsonc.load(Path("host.jsonc")),
+)
+settings["database"]["port"]  # From the highest layer defining it
+settings["database"]["pool"] = 16  # Only written in `host.jsonc` tree
+```
+
+Writes and deletions only touch the top layer, using [query][json4humans.query] so its style is preserved:
+the objects missing on the path of a write are created in the top layer only,
+holding nothing but the written value (the lower layers are shared, never copied).
+Like with [ChainMap][collections.ChainMap], only the members of the top layer can be deleted.
+
+Arrays and scalars are returned as-is and are not merged: modifying them in place modifies their layer.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterator, MutableMapping
+from typing import Any
+
+from . import query
+from .protocol import JSONModule
+from .query import Tokens
+from .tree import clone
+from .types import JSONType, Object
+
+
+class Overlay(MutableMapping[str, Any]):
+    """
+    A read-through, copy-on-write view of stacked objects.
+
+    :param documents: The stacked documents, from the lowest to the highest priority.
+                      Writes land in the last one.
+    :param path: The path of this view in the documents (used by nested views)
+    """
+
+    def __init__(self, *documents: dict, path: Tokens = ()):
+        if not documents:
+            raise ValueError("An overlay requires at least one document")
+        if not all(isinstance(document, dict) for document in documents):
+            raise TypeError("Only objects can be stacked")
+        self.documents = documents
+        self.path = path
+
+    @property
+    def top(self) -> dict:
+        """The document receiving the writes"""
+        return self.documents[-1]
+
+    @property
+    def layers(self) -> tuple[dict, ...]:
+        """
+        The objects found at the path of this view, from the lowest to the highest priority.
+
+        They are resolved on each access, so the view follows the writes made to the documents.
+        """
+        layers = self.documents
+        for key in self.path:
+            found = lookup(layers, key)
+            layers = found if isinstance(found, tuple) else ()
+        return layers
+
+    def __getitem__(self, key: str) -> Any:
+        found = lookup(self.layers, key)
+        if not isinstance(found, tuple):
+            return found
+        if not found:
+            raise KeyError(key)
+        return Overlay(*self.documents, path=(*self.path, key))
+
+    def __contains__(self, key: object) -> bool:
+        return any(key in layer for layer in self.layers)
+
+    def __iter__(self) -> Iterator[str]:
+        seen: set[str] = set()
+        for layer in self.layers:
+            for key in layer:
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+
+    def __len__(self) -> int:
+        return len(set().union(*self.layers))
+
+    def __setitem__(self, key: str, value: Any):
+        if isinstance(value, Overlay):
+            value = value.materialize()
+        self.ensure()
+        query.assign(self.top, (*self.path, key), value)
+
+    def __delitem__(self, key: str):
+        parent = query.get(self.top, self.path, None)
+        if not isinstance(parent, dict) or key not in parent:
+            raise KeyError(f"{key!r} is not defined by the top layer")
+        query.delete(self.top, (*self.path, key))
+
+    def __repr__(self) -> str:
+        return f"Overlay({dict(self.items())!r})"
+
+    def ensure(self):
+        """Create the objects missing on the path of this view in the top layer"""
+        node = self.top
+        for depth, token in enumerate(self.path):
+            if token not in node:
+                query.assign(self.top, self.path[: depth + 1], Object())
+            node = node[token]
+            if not isinstance(node, dict):
+                raise TypeError(f"{query.format_pointer(self.path[: depth + 1])} is not an object")
+
+    def materialize(self) -> Any:
+        """
+        Build the merged document, sharing no node with the layers.
+
+        The result has the layout of the lowest layer:
+        the values of the upper layers replace its values or are added to its objects
+        like with [query.assign()][json4humans.query.assign],
+        without their own surrounding whitespaces and comments.
+        """
+        root = clone(self.layers[0])
+        for layer in self.layers[1:]:
+            stack = [(root, layer)]
+            while stack:
+                out, src = stack.pop()
+                for key, value in src.items():
+                    current = out.get(key)
+                    if isinstance(value, dict) and isinstance(current, dict):
+                        stack.append((current, value))
+                    else:
+                        query.assign(out, (key,), relocated(value))
+        return root
+
+    def dumps(self, module: JSONModule, **kwargs: Any) -> str:
+        """
+        Serialize the merged document.
+
+        :param module: The [JSON module][json4humans.protocol.JSONModule] to serialize with
+        :param kwargs: The [dumps()][json4humans.protocol.JSONModule.dumps] keyword arguments
+        """
+        return module.dumps(self.materialize(), **kwargs)
+
+
+def lookup(layers: tuple[dict, ...], key: str) -> Any:
+    """
+    Find a key in stacked objects.
+
+    :returns: The value from the highest layer defining it if it is not an object,
+              the objects defined by the layers for this key otherwise,
+              from the lowest to the highest priority (empty if none defines it)
+    """
+    found: list[dict] = []
+    for layer in reversed(layers):
+        if key not in layer:
+            continue
+        value = layer[key]
+        if not isinstance(value, dict):
+            # A value masks the objects below it
+            if not found:
+                return value
+            break
+        found.append(value)
+    return tuple(reversed(found))
+
+
+def relocated(value: Any) -> Any:
+    """A copy of a value without its surrounding whitespaces and comments"""
+    node = clone(value)
+    if isinstance(node, JSONType):
+        node.json_before = []
+        node.json_after = []
+    return node
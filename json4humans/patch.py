@@ -0,0 +1,390 @@
+"""
+This module implements [JSON Patch](https://www.rfc-editor.org/rfc/rfc6902)
+either directly on the source text or on parsed documents.
+
+[apply_patch()][json4humans.patch.apply_patch] rewrites only the spans targeted by the operations,
+located using the [skip scanner][json4humans.scan],
+so every whitespace and comment elsewhere is left untouched.
+Each operation scans the text up to its target and splices it: this is linear in the document size
+but much cheaper than parsing and serializing it.
+Consecutive `replace` and `test` operations on unrelated paths share a single scan and a single rewrite,
+while the other operations still scan and rewrite the text once each.
+Moved and copied values keep their source text, comments included.
+
+[apply()][json4humans.patch.apply] gives the same layout on parsed documents.
+"""
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from typing import Any
+
+from . import query, scan
+from .query import Tokens, to_tokens
+from .scan import Entry, Span
+from .tree import clone
+from .types import JSONType
+
+Operation = Mapping[str, Any]
+"""A JSON Patch operation (ie. `{"op": "add", "path": "/a", "value": 1}`)"""
+
+
+class PatchError(ValueError):
+    """Raised on invalid operations or failed `test` operations"""
+
+
+def encode(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, allow_nan=False)
+
+
+def splice(src: str, start: int, end: int, text: str = "") -> str:
+    return f"{src[:start]}{text}{src[end:]}"
+
+
+def indentation(src: str, start: int, pos: int) -> str:
+    """The layout preceding `pos`: its line return and indentation if alone on its line, a space otherwise"""
+    nl = src.rfind("\n", start, pos)
+    if nl >= 0 and not src[nl + 1 : pos].strip():
+        return src[nl:pos]
+    return " "
+
+
+def container(src: str, tokens: Tokens) -> tuple[int, list[Entry], int]:
+    start, _ = scan.locate(src, tokens)
+    found, closing = scan.entries(src, start)
+    return start, found, closing
+
+
+def find(entries: list[Entry], token: str, is_object: bool) -> int:
+    """Find the position of an existing entry"""
+    if is_object:
+        for position in range(len(entries) - 1, -1, -1):
+            if entries[position].key == token:
+                return position
+        raise KeyError(token)
+    return query.array_index(entries, token)
+
+
+def append(src: str, start: int, entries: list[Entry], closing: int, text: str) -> str:
+    """Append an entry to a container, mimicking the layout of the last entry"""
+    if not entries:
+        return splice(src, start + 1, start + 1, text)
+    last = entries[-1]
+    layout = indentation(src, entries[-2].coma + 1 if len(entries) > 1 else start + 1, last.start)
+    if last.coma >= 0:
+        nl = scan.line_end(src, last.coma + 1, closing)
+        pos = nl if nl >= 0 else last.coma + 1
+        return splice(src, pos, pos, f"{layout}{text},")
+    # Comments on the same line as the last entry stay on its line
+    nl = scan.line_end(src, last.end, closing)
+    if nl < 0:
+        return splice(src, last.end, last.end, f",{layout}{text}")
+    src = splice(src, nl, nl, f"{layout}{text}")
+    return splice(src, last.end, last.end, ",")
+
+
+def insert(src: str, start: int, entries: list[Entry], position: int, text: str) -> str:
+    """Insert an item before an existing one, mimicking its layout"""
+    target = entries[position]
+    after = entries[position - 1].coma + 1 if position else start + 1
+    return splice(
+        src, target.start, target.start, f"{text},{indentation(src, after, target.start)}"
+    )
+
+
+def add(src: str, tokens: Tokens, text: str) -> str:
+    """Add or replace a value given as source text"""
+    if not tokens:
+        return splice(src, *scan.locate(src, tokens), text)
+    start, entries, closing = container(src, tokens[:-1])
+    token = tokens[-1]
+    if src.startswith("{", start):
+        for entry in reversed(entries):
+            if entry.key == token:
+                return splice(src, entry.value, entry.end, text)
+        return append(src, start, entries, closing, f"{encode(token)}: {text}")
+    position = query.array_index(entries, token, append=True)
+    if position == len(entries):
+        return append(src, start, entries, closing, text)
+    return insert(src, start, entries, position, text)
+
+
+def own_lines(src: str, start: int, end: int, limit: int) -> Span | None:
+    """The full lines span of an entry if it starts its line and ends it, including same-line comments"""
+    nl = src.rfind("\n", 0, start)
+    if nl < 0 or src[nl + 1 : start].strip() or (last := scan.line_end(src, end, limit)) < 0:
+        return None
+    return nl, last
+
+
+def remove(src: str, tokens: Tokens) -> str:
+    """Remove a value and its entry, handing over its layout to its siblings"""
+    if not tokens:
+        raise PatchError("Can't remove the root document")
+    start, entries, closing = container(src, tokens[:-1])
+    position = find(entries, tokens[-1], src.startswith("{", start))
+    entry = entries[position]
+    end = entry.coma + 1 if entry.coma >= 0 else entry.end
+    following = entries[position + 1].start if position + 1 < len(entries) else closing
+    if lines := own_lines(src, entry.start, end, following):
+        if position and entry.coma < 0 and following == closing:
+            previous = entries[position - 1].coma
+            return splice(splice(src, *lines), previous, previous + 1)
+        return splice(src, *lines)
+    if following != closing:
+        return splice(src, entry.start, following)
+    if not position:
+        return splice(src, entry.start, end)
+    previous = entries[position - 1].coma
+    if entry.coma >= 0:
+        return splice(src, previous + 1, end)
+    return splice(src, previous, end)
+
+
+def source(src: str, pointer: str) -> str:
+    start, end = scan.locate(src, pointer)
+    return src[start:end]
+
+
+def check_move(operation: Operation):
+    if operation["path"].startswith(f"{operation['from']}/"):
+        raise PatchError(f"Can't move {operation['from']} into itself")
+
+
+def text_add(src: str, operation: Operation) -> str:
+    return add(src, to_tokens(operation["path"]), encode(operation["value"]))
+
+
+def text_remove(src: str, operation: Operation) -> str:
+    return remove(src, to_tokens(operation["path"]))
+
+
+def text_replace(src: str, operation: Operation) -> str:
+    return splice(src, *scan.locate(src, operation["path"]), encode(operation["value"]))
+
+
+def text_move(src: str, operation: Operation) -> str:
+    if operation["from"] == operation["path"]:
+        return src
+    check_move(operation)
+    text = source(src, operation["from"])
+    return add(remove(src, to_tokens(operation["from"])), to_tokens(operation["path"]), text)
+
+
+def text_copy(src: str, operation: Operation) -> str:
+    return add(src, to_tokens(operation["path"]), source(src, operation["from"]))
+
+
+def check_value(text: str, operation: Operation):
+    from . import json5  # JSON5 syntax is a superset of the other dialects
+
+    if json5.loads(text) != operation["value"]:  # type: ignore[attr-defined]
+        raise PatchError(f"Test failed: {operation['path']} != {operation['value']!r}")
+
+
+def text_test(src: str, operation: Operation) -> str:
+    check_value(source(src, operation["path"]), operation)
+    return src
+
+
+TEXT_OPERATIONS: dict[str, Callable[[str, Operation], str]] = {
+    "add": text_add,
+    "remove": text_remove,
+    "replace": text_replace,
+    "move": text_move,
+    "copy": text_copy,
+    "test": text_test,
+}
+
+
+def operation_for(operations: Mapping[str, Callable], operation: Operation) -> Callable:
+    try:
+        return operations[operation["op"]]
+    except (KeyError, TypeError):
+        raise PatchError(f"Invalid operation: {operation!r}") from None
+
+
+BATCHED = frozenset(("replace", "test"))
+"""The operations which can be applied at once when their paths are unrelated"""
+
+
+def batchable(operation: Operation) -> Tokens | None:
+    """The reference tokens of a `replace` or `test` operation, `None` for any other operation"""
+    try:
+        if operation["op"] in BATCHED:
+            return to_tokens(operation["path"])
+    except (KeyError, TypeError, ValueError):
+        pass
+    return None
+
+
+def runs(patch: Iterable[Operation]) -> Iterator[list[Operation]]:
+    """
+    Group consecutive `replace` and `test` operations on unrelated paths (none being a prefix of another):
+    they don't depend on each other so they are applied at once. Any other operation is alone in its run.
+    """
+    run: list[Operation] = []
+    paths: list[Tokens] = []
+    for operation in patch:
+        tokens = batchable(operation)
+        if tokens is None or any(
+            path[: len(tokens)] == tokens or tokens[: len(path)] == path for path in paths
+        ):
+            if run:
+                yield run
+            run, paths = [], []
+        if tokens is None:
+            yield [operation]
+        else:
+            run.append(operation)
+            paths.append(tokens)
+    if run:
+        yield run
+
+
+def apply_operation(src: str, operation: Operation) -> str:
+    try:
+        return operation_for(TEXT_OPERATIONS, operation)(src, operation)
+    except KeyError as e:
+        raise KeyError(f"{operation['op']} {operation.get('path')}: {e.args[0]}") from e
+
+
+def apply_run(src: str, run: list[Operation]) -> str:
+    """Apply unrelated `replace` and `test` operations with a single scan and a single rewrite"""
+    spans = scan.locate_all(src, (operation["path"] for operation in run))
+    edits: list[tuple[int, int, str]] = []
+    for operation in run:
+        if (span := spans.get(to_tokens(operation["path"]))) is None:
+            # Raise the same error as when applied alone
+            apply_operation(src, operation)
+        elif operation["op"] == "test":
+            check_value(src[slice(*span)], operation)
+        else:
+            edits.append((*span, encode(operation["value"])))
+    parts: list[str] = []
+    pos = 0
+    for start, end, text in sorted(edits):
+        parts += (src[pos:start], text)
+        pos = end
+    parts.append(src[pos:])
+    return "".join(parts)
+
+
+def apply_patch(src: str, patch: Iterable[Operation]) -> str:
+    """
+    Apply a JSON Patch to a source document text.
+
+    Operations are applied in order, each one on the result of the previous one.
+    Consecutive `replace` and `test` operations on unrelated paths are applied at once,
+    locating all their targets in a single scan.
+
+    :param src: The source document, in any of the supported dialects
+    :param patch: The JSON Patch operations
+    :returns: The patched source document
+    :raises KeyError: if a pointer does not resolve
+    :raises PatchError: if an operation is invalid or a `test` operation fails
+    """
+    for run in runs(patch):
+        src = apply_run(src, run) if len(run) > 1 else apply_operation(src, run[0])
+    return src
+
+
+def parsed(value: Any) -> Any:
+    """Parse a builtin value as encoded by the text operations, so it gets the same layout"""
+    from . import json
+
+    return value if isinstance(value, JSONType) else json.loads(encode(value))  # type: ignore[attr-defined]
+
+
+def relocated(value: Any) -> Any:
+    """Strip the whitespaces and comments surrounding a moved or copied value, like its source text"""
+    if isinstance(value, JSONType):
+        value.json_before = []
+        value.json_after = []
+    return value
+
+
+def insert_item(array: list, position: int, value: Any) -> Any:
+    """Insert an item before an existing one which keeps its leading trivia, mimicking its layout"""
+    node = query.wrap(value)
+    target = array[position]
+    if isinstance(node, JSONType) and isinstance(target, JSONType):
+        node.json_before, node.json_after = target.json_before, []
+        target.json_before = query.indentation(target.json_before)
+    array.insert(position, node)
+    return node
+
+
+def tree_add(doc: Any, operation: Operation) -> Any:
+    tokens = to_tokens(operation["path"])
+    value = parsed(operation["value"])
+    if not tokens:
+        return query.wrap(value, doc)
+    parent = query.resolve(doc, tokens[:-1])
+    if isinstance(parent, list) and (
+        position := query.array_index(parent, tokens[-1], append=True)
+    ) < len(parent):
+        insert_item(parent, position, value)
+    else:
+        query.assign(parent, tokens[-1:], value)
+    return doc
+
+
+def tree_remove(doc: Any, operation: Operation) -> Any:
+    if not to_tokens(operation["path"]):
+        raise PatchError("Can't remove the root document")
+    query.delete(doc, operation["path"])
+    return doc
+
+
+def tree_replace(doc: Any, operation: Operation) -> Any:
+    tokens = to_tokens(operation["path"])
+    if not tokens:
+        return query.wrap(parsed(operation["value"]), doc)
+    query.get(doc, tokens)
+    query.assign(doc, tokens, parsed(operation["value"]))
+    return doc
+
+
+def tree_move(doc: Any, operation: Operation) -> Any:
+    if operation["from"] == operation["path"]:
+        return doc
+    check_move(operation)
+    value = relocated(query.delete(doc, operation["from"]))
+    return tree_add(doc, {"path": operation["path"], "value": value})
+
+
+def tree_copy(doc: Any, operation: Operation) -> Any:
+    value = relocated(clone(query.get(doc, operation["from"])))
+    return tree_add(doc, {"path": operation["path"], "value": value})
+
+
+def tree_test(doc: Any, operation: Operation) -> Any:
+    if query.get(doc, operation["path"]) != operation["value"]:
+        raise PatchError(f"Test failed: {operation['path']} != {operation['value']!r}")
+    return doc
+
+
+TREE_OPERATIONS: dict[str, Callable[[Any, Operation], Any]] = {
+    "add": tree_add,
+    "remove": tree_remove,
+    "replace": tree_replace,
+    "move": tree_move,
+    "copy": tree_copy,
+    "test": tree_test,
+}
+
+
+def apply(doc: Any, patch: Iterable[Operation]) -> Any:
+    """
+    Apply a JSON Patch to a parsed document, in place.
+
+    :param doc: The parsed document
+    :param patch: The JSON Patch operations
+    :returns: The patched document (a new value only if the root has been replaced)
+    :raises KeyError: if a pointer does not resolve
+    :raises PatchError: if an operation is invalid or a `test` operation fails
+    """
+    for operation in patch:
+        doc = operation_for(TREE_OPERATIONS, operation)(doc, operation)
+    return doc
@@ -0,0 +1,231 @@
+"""
+This module records the source positions of parsed nodes.
+
+When loading with `positions=True`, the start and end offsets of every value and key
+are recorded while parsing into a single [Positions][json4humans.positions.Positions] table
+attached to the document root (see [of()][json4humans.positions.of]).
+Spans exclude the surrounding whitespaces and comments.
+
+Nodes don't carry any extra attribute: they are mapped to their slot in the table by identity,
+so only the parsed nodes have a span, not the ones added or copied afterward
+(except by [copy.deepcopy()][copy.deepcopy] on the whole document).
+"""
+from __future__ import annotations
+
+import re
+from array import array
+from bisect import bisect_right
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from copy import deepcopy
+from typing import Any, NamedTuple
+
+from lark import Lark, Token
+
+from .types import POSITIONS, JSONType
+
+
+class Span(NamedTuple):
+    """The offsets of a node in its source"""
+
+    start: int
+    """The offset of the first character"""
+    end: int
+    """The offset following the last character"""
+
+
+class Location(NamedTuple):
+    """A location in a source document"""
+
+    lineno: int
+    """The line number, starting at 1"""
+    colno: int
+    """The column number, starting at 1"""
+
+
+class Positions:
+    """
+    The spans of a document nodes.
+
+    :param src: The source document
+    """
+
+    def __init__(self, src: str):
+        self.src = src
+        self.nodes: list[Any] = []
+        self.spans = array("q")
+        self.slots: dict[int, int] = {}
+        # Spans of the reduced values not yet consumed by the parser, by identity
+        self.pending: dict[int, tuple[int, int]] = {}
+        self._lines: array | None = None
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, node: Any) -> bool:
+        slot = self.slots.get(id(node))
+        return slot is not None and self.nodes[slot] is node
+
+    def __deepcopy__(self, memo: dict) -> Positions:
+        copy = Positions(self.src)
+        copy.nodes = deepcopy(self.nodes, memo)
+        copy.spans = array("q", self.spans)
+        copy.slots = {id(node): slot for slot, node in enumerate(copy.nodes)}
+        return copy
+
+    def add(self, node: Any, start: int, end: int):
+        """Record the span of a node"""
+        self.slots[id(node)] = len(self.nodes)
+        self.nodes.append(node)
+        self.spans.append(start)
+        self.spans.append(end)
+
+    def span(self, node: Any) -> Span:
+        """
+        Get the span of a node in O(1).
+
+        :param node: A parsed value or key
+        :raises KeyError: if the node has not been parsed from this document
+        """
+        slot = self.slots.get(id(node))
+        if slot is None or self.nodes[slot] is not node:
+            raise KeyError(f"Unknown node: {node!r}")
+        return Span(self.spans[2 * slot], self.spans[2 * slot + 1])
+
+    @property
+    def lines(self) -> array:
+        """The offsets of the lines starts, computed once"""
+        if self._lines is None:
+            self._lines = array("q", [0])
+            self._lines.extend(match.end() for match in re.finditer("\n", self.src))
+        return self._lines
+
+    def location(self, offset: int) -> Location:
+        """
+        Convert an offset into a line and column in O(log(lines)).
+
+        :param offset: An offset in the source
+        """
+        line = bisect_right(self.lines, offset)
+        return Location(line, offset - self.lines[line - 1] + 1)
+
+    def start(self, node: Any) -> Location:
+        """The location of the first character of a node"""
+        return self.location(self.span(node).start)
+
+    def end(self, node: Any) -> Location:
+        """The location following the last character of a node"""
+        return self.location(self.span(node).end)
+
+    def items(self) -> Iterator[tuple[Any, Span]]:
+        """Iterate over all the nodes and their spans in parsing order (children first)"""
+        for slot, node in enumerate(self.nodes):
+            yield node, Span(self.spans[2 * slot], self.spans[2 * slot + 1])
+
+    def rebase(self, src: str, offset: int):
+        """
+        Shift the spans of a document parsed from a slice of another one.
+
+        :param src: The whole source document
+        :param offset: The offset of the parsed slice in the whole document
+        """
+        self.src = src
+        self.spans = array("q", (span + offset for span in self.spans))
+        self._lines = None
+
+    @contextmanager
+    def recording(self) -> Iterator[Positions]:
+        """Record the spans of the nodes built by the spanning parsers within this context"""
+        token = recording.set(self)
+        try:
+            yield self
+        finally:
+            recording.reset(token)
+            self.pending.clear()
+
+    def attach(self, doc: Any) -> Any:
+        """Attach this table to the document root"""
+        attrs = getattr(doc, "__dict__", None)
+        if attrs is None:
+            raise TypeError(f"Can't attach positions to {type(doc).__name__}")
+        attrs[POSITIONS] = self
+        return doc
+
+
+recording: ContextVar[Positions] = ContextVar("recording")
+"""The [Positions][json4humans.positions.Positions] table of the parsing in progress"""
+
+
+def of(doc: Any) -> Positions:
+    """
+    Get the positions of a document loaded with `positions=True`.
+
+    :param doc: The document root
+    :raises ValueError: if the document has been loaded without positions
+    """
+    try:
+        return doc.__dict__[POSITIONS]
+    except (AttributeError, KeyError):
+        raise ValueError("The document has been loaded without positions") from None
+
+
+def spanning(callback: Callable[[list], Any]) -> Callable[[list], Any]:
+    """Wrap a parser callback to record the span of its result"""
+
+    def reduce(children: list) -> Any:
+        result = callback(children)
+        table = recording.get()
+        pending = table.pending
+        start = end = -1
+        span: tuple[int, int]
+        for child in children:
+            if isinstance(child, Token):
+                span = (child.start_pos or 0, child.end_pos or 0)
+            elif (found := pending.pop(id(child), None)) is not None:
+                span = found
+            else:
+                continue
+            if start < 0:
+                start = span[0]
+            end = span[1]
+        if start >= 0:
+            pending[id(result)] = (start, end)
+            # Rules returning one of their children only add trivia around it (ie. `value` and `key`)
+            if isinstance(result, JSONType) and not any(child is result for child in children):
+                table.add(result, start, end)
+        return result
+
+    return reduce
+
+
+def spanning_terminal(callback: Callable[[Token], Any]) -> Callable[[Token], Any]:
+    """Wrap a terminal callback to record the span of its result"""
+
+    def shift(token: Token) -> Any:
+        result = callback(token)
+        start, end = token.start_pos or 0, token.end_pos or 0
+        table = recording.get()
+        table.pending[id(result)] = (start, end)
+        if isinstance(result, JSONType):
+            table.add(result, start, end)
+        return result
+
+    return shift
+
+
+def spanning_parser(parser: Lark) -> Lark:
+    """
+    Make a tree-less LALR parser record the span of every node it builds.
+
+    Spans are recorded in the [Positions][json4humans.positions.Positions] table
+    of the current [recording()][json4humans.positions.Positions.recording] context.
+
+    :param parser: A LALR parser with a transformer, modified in place
+    """
+    # Lark has no public API to hook the reductions
+    callbacks = parser.parser.parser.parser.callbacks
+    for key, callback in callbacks.items():
+        # Terminals callbacks are registered by name
+        callbacks[key] = spanning_terminal(callback) if isinstance(key, str) else spanning(callback)
+    return parser
@@ -4,13 +4,86 @@ This modules provides the JSONModule protocol as well as some related helpers.
 from __future__ import annotations
 
 import inspect
+import io
+import re
+from collections.abc import Callable, Sequence
+from contextlib import ExitStack
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import cache, partial
 from pathlib import Path
-from typing import Any, Literal, Protocol, TextIO, runtime_checkable
+from typing import Any, BinaryIO, Literal, Protocol, TextIO, runtime_checkable
 
-from lark import Lark
+from lark import Lark, Token
+from lark.exceptions import UnexpectedCharacters, UnexpectedInput, UnexpectedToken
 from lark.visitors import Transformer
 
+from . import compression, instrument, positions, scan, typed
 from .env import DEBUG
+from .errors import JSONDecodeError
+from .features import PRESETS, Features, Unsupported, collecting, disabled_terminals
+from .limits import Limits, enforcing, limited_parser
+from .positions import Positions
+
+
+@dataclass(frozen=True)
+class LoadOptions:
+    """
+    Per-call parsing options.
+
+    Transformers read the options of the current [loads()][json4humans.protocol.JSONModule.loads] call
+    from [load_options][json4humans.protocol.load_options] so they can be applied during the single
+    parse and transform pass.
+    """
+
+    parse_float: Callable[[str], Any] | None = None
+    """Called with the lexeme of every JSON float. Defaults to [Float][json4humans.types.Float]."""
+    parse_int: Callable[[str], Any] | None = None
+    """
+    Called with the lexeme of every decimal JSON integer.
+    Defaults to [Integer][json4humans.types.Integer].
+    """
+    parse_constant: Callable[[str], Any] | None = None
+    """Called with `Infinity`, `-Infinity` or `NaN` (and their signed variants) when supported."""
+    object_hook: Callable[[dict], Any] | None = None
+    """Called with a `dict` of every decoded object instead of an [Object][json4humans.types.Object]."""
+    object_pairs_hook: Callable[[list[tuple[Any, Any]]], Any] | None = None
+    """Called with the ordered pairs list of every decoded object. Takes precedence over `object_hook`."""
+    array_hook: Callable[[list], Any] | None = None
+    """Called with a `list` of every decoded array instead of building an [Array][json4humans.types.Array]."""
+    positions: bool = False
+    """Record the source span of every node (see [positions][json4humans.positions])."""
+    limits: Limits | None = None
+    """The resources limits enforced while parsing (see [limits][json4humans.limits])."""
+    features: Features | None = None
+    """The syntax features accepted, all of them if `None` (see [features][json4humans.features])"""
+    numeric_arrays: bool = False
+    """Store the arrays of numbers compactly (see [numeric][json4humans.numeric])."""
+
+    def __post_init__(self):
+        if self.positions and self.numeric_arrays:
+            raise ValueError("numeric_arrays can't be combined with positions")
+        if self.positions and self.hooked:
+            raise ValueError("positions can't be combined with hooks")
+
+    @property
+    def hooked(self) -> bool:
+        """Is any hook replacing the default nodes"""
+        return any(
+            hook is not None
+            for hook in (
+                self.parse_float,
+                self.parse_int,
+                self.parse_constant,
+                self.object_hook,
+                self.object_pairs_hook,
+                self.array_hook,
+            )
+        )
+
+
+load_options: ContextVar[LoadOptions] = ContextVar("load_options", default=LoadOptions())
+"""The [LoadOptions][json4humans.protocol.LoadOptions] of the parsing in progress"""
 
 
 class JSONEncoder(Protocol):
@@ -47,24 +120,105 @@ class JSONModule(Protocol):
     The default tranformer instance
     """
 
+    features: Features
+    """
+    The syntax features accepted by default (see [features][json4humans.features])
+    """
+
     __name__: str
     """The module fully qualified name"""
 
     def __str__(self) -> str:
         return self.__name__
 
-    def loads(self, src: str) -> Any:
+    def loads(
+        self,
+        src: str,
+        *,
+        parse_float: Callable[[str], Any] | None = None,
+        parse_int: Callable[[str], Any] | None = None,
+        parse_constant: Callable[[str], Any] | None = None,
+        object_hook: Callable[[dict], Any] | None = None,
+        object_pairs_hook: Callable[[list[tuple[Any, Any]]], Any] | None = None,
+        array_hook: Callable[[list], Any] | None = None,
+        type: Any = None,
+        positions: bool = False,
+        limits: Limits | None = None,
+        features: Features | None = None,
+        numeric_arrays: bool = False,
+    ) -> Any:
         """
         Loads data from a string.
 
+        Numbers keep their source lexeme and are serialized back as-is.
+        The hooks behave like their [json.loads()][json.loads] counterparts
+        and are applied while parsing, without building the replaced containers.
+        Values returned by a hook which are not [JSONType][json4humans.types.JSONType]
+        don't carry the surrounding whitespaces and comments.
+
+        :param src: Some JSON data as string.
+        :param parse_float: Called with the string of every JSON float to decode (ie. `decimal.Decimal`).
+        :param parse_int: Called with the string of every decimal JSON integer to decode.
+        :param parse_constant: Called with `Infinity`, `-Infinity` or `NaN` if the format supports them.
+        :param object_hook: Called with a `dict` of every decoded object, its result is used instead.
+        :param object_pairs_hook: Called with the ordered list of pairs of every decoded object,
+                                  its result is used instead. Takes precedence over `object_hook`.
+        :param array_hook: Called with a `list` of every decoded array, its result is used instead.
+        :param type: Decode straight into this type (ie. a dataclass) without building the document tree
+                     (see [typed][json4humans.typed]). Can't be combined with the hooks.
+        :param positions: Record the source span of every value and key
+                          (see [positions][json4humans.positions]). Can't be combined with the hooks.
+        :param limits: Reject the documents exceeding these resources limits as early as possible
+                       (see [limits][json4humans.limits]). Can't be combined with `type`.
+        :param features: The syntax features accepted instead of the module ones
+                         (see [features][json4humans.features]).
+        :param numeric_arrays: Store the arrays of numbers in compact
+                               [NumericArray][json4humans.numeric.NumericArray]
+                               (see [numeric][json4humans.numeric]).
+                               Can't be combined with `type` nor `positions`.
+        :raises JSONDecodeError: if the document is invalid or doesn't match the given type.
+        :raises LimitError: if the document exceeds the limits.
+        """
+        ...
+
+    def loads_at(self, src: str, pointer: str | Sequence[str | int], **kwargs: Any) -> Any:
+        """
+        Loads only the value referenced by a JSON Pointer from a string.
+
+        The path to the value is located by a fast skip scanner (see [scan][json4humans.scan])
+        so the rest of the document is neither parsed nor validated.
+
+        Accepts the same keyword arguments as [loads()][json4humans.protocol.JSONModule.loads].
+
+        :param src: Some JSON data as string.
+        :param pointer: The JSON Pointer to the value to load (ie. `/compilerOptions`).
+        :raises KeyError: if the pointer does not resolve.
+        :raises JSONDecodeError: if the value is invalid.
+        """
+        ...
+
+    def check(self, src: str, *, features: Features | None = None) -> list[JSONDecodeError]:
+        """
+        Parse a string in error-recovery mode and collect all the errors found.
+
+        Unlike [loads()][json4humans.protocol.JSONModule.loads] which stops on the first error,
+        parsing resumes after each error so a single pass reports as much errors as possible.
+
         :param src: Some JSON data as string.
+        :param features: The syntax features accepted instead of the module ones.
+        :returns: The list of errors in document order, empty if the document is valid.
         """
         ...
 
-    def load(self, file: TextIO | Path) -> Any:
+    def load(self, file: TextIO | BinaryIO | Path, **kwargs: Any) -> Any:
         """
         Loads data from a file-like object or a Path.
 
+        Accepts the same keyword arguments as [loads()][json4humans.protocol.JSONModule.loads].
+        With a `max_bytes` limit, the file is not read past the limit.
+        Compressed paths and binary file-like objects are decompressed on the fly
+        (see [compression][json4humans.compression]).
+
         :param file: A file-like object or path to a file containing JSON to parse.
         """
         ...
@@ -101,65 +255,321 @@ class JSONModule(Protocol):
         :param indent: Indentation to use, either an integer defining the number of spaces
                        or a string representing the indentation characters to be used as indentation.
         :param out: A file-like object or path to a file to serialize to JSON into.
+                    Paths with a compression extension (ie. `.gz`) are compressed
+                    (see [compression][json4humans.compression]).
         """
         ...
 
 
+SYNC = re.compile(
+    r"""("(?:[^"\\\n\r]|\\.)*"|'(?:[^'\\\n\r]|\\.)*'|//[^\n]*|/\*.*?(?:\*/|\Z)|#[^\n]*)|[,\]}]""",
+    re.DOTALL,
+)
+"""Match the next `,`, `]` or `}` (strings and comments are matched as a whole to be skipped)"""
+
+SYNC_TERMINALS = {",": "COMMA", "]": "RSQB", "}": "RBRACE"}
+"""The terminals the parser resynchronizes on after an error"""
+
+FILLERS = {"COLON": ":", "SIGNED_NUMBER": "0"}
+"""Tokens fed to complete a member or a value interrupted by an error"""
+
+
+def resync(error: UnexpectedCharacters | UnexpectedToken, src: str):
+    """
+    Recover from a syntax error by skipping the input up to the next `,`, `]` or `}`,
+    completing the member or value in progress if it is required to accept it.
+    """
+    parser = error.interactive_parser
+    line_ctr = parser.lexer_thread.state.line_ctr  # type: ignore[union-attr]
+    if isinstance(error, UnexpectedToken) and error.token.type in SYNC_TERMINALS.values():
+        pending: Token | None = error.token
+    else:
+        start = line_ctr.char_pos
+        end = next((m.start() for m in SYNC.finditer(src, start) if m.group(1) is None), len(src))
+        line_ctr.feed(src[start : end + 1])
+        pending = (
+            Token(SYNC_TERMINALS[src[end]], src[end], start_pos=end) if end < len(src) else None
+        )
+    terminal = pending.type if pending is not None else "$END"
+    while terminal not in (accepted := parser.accepts()):
+        if (filler := next((name for name in FILLERS if name in accepted), None)) is None:
+            return
+        parser.feed_token(Token(filler, FILLERS[filler], start_pos=line_ctr.char_pos))
+    if pending is not None:
+        parser.feed_token(pending)
+
+
+def collect_errors(
+    parser: Lark, src: str, features: Features | None = None
+) -> list[JSONDecodeError]:
+    """
+    Parse `src` using Lark error recovery and collect all the errors.
+
+    After an error, the parser resynchronizes on the next `,`, `]` or `}`
+    so each error is reported once.
+
+    :param parser: A LALR parser
+    :param src: The document to parse
+    :param features: The syntax features accepted, all of them if `None`
+    :returns: The errors in document order
+    """
+    errors: list[JSONDecodeError] = []
+    hidden = disabled_terminals(features)
+
+    def report(e: UnexpectedInput):
+        error = JSONDecodeError.from_lark(e, src, parser, hidden)
+        if not errors or errors[-1].pos != error.pos:
+            errors.append(error)
+
+    def on_error(e: UnexpectedInput) -> bool:
+        report(e)
+        if isinstance(e, UnexpectedCharacters) or (
+            isinstance(e, UnexpectedToken) and e.token.type != "$END"
+        ):
+            resync(e, src)
+        return True
+
+    token = load_options.set(LoadOptions(features=features))
+    try:
+        with collecting(src) as unsupported:
+            parser.parse(src, on_error=on_error)
+    except UnexpectedInput as e:
+        # Unrecoverable error (ie. unexpected end of document), may already be reported
+        report(e)
+    finally:
+        load_options.reset(token)
+    return sorted(errors + unsupported, key=lambda error: error.pos)
+
+
+def load_at(
+    loads: Callable[..., Any], src: str, pointer: str | Sequence[str | int], **kwargs: Any
+) -> Any:
+    """
+    Locate a value with the [skip scanner][json4humans.scan.locate] and load only this value.
+
+    :param loads: The `loads()` function used to parse the value.
+    :param src: The source document.
+    :param pointer: The JSON Pointer to the value to load.
+    """
+    start, end = scan.locate(src, pointer)
+    try:
+        value = loads(src[start:end], **kwargs)
+    except JSONDecodeError as e:
+        raise e.relocate(src, start) from e
+    if kwargs.get("positions"):
+        positions.of(value).rebase(src, start)
+    return value
+
+
+def parse(
+    parser: Lark,
+    transformer: Transformer | None,
+    src: str,
+    options: LoadOptions,
+    variant: Callable[[bool, bool, bool], Lark] | None = None,
+) -> Any:
+    """
+    Parse a document with the given per-call options.
+
+    :param parser: The Lark parser of the format
+    :param transformer: The transformer to apply on the parsed tree, if not applied by the parser
+    :param src: The source document
+    :param options: The options of this call
+    :param variant: Get the parser recording the positions, measuring its phases and/or enforcing limits
+                    when requested by the options or by an [instrumented][json4humans.instrument] call
+    :raises JSONDecodeError: if the document is invalid or uses a disabled feature.
+    :raises LimitError: if the document exceeds the limits of the options.
+    """
+    token = load_options.set(options)
+    instrumented = instrument.current.get(None) is not None
+    limited = options.limits is not None
+    try:
+        with ExitStack() as stack:
+            if (options.positions or instrumented or limited) and variant is not None:
+                parser = variant(options.positions, instrumented, limited)
+                transformer = None
+            if options.limits is not None and variant is not None:
+                stack.enter_context(enforcing(options.limits, src))
+            if options.positions and variant is not None:
+                table = stack.enter_context(Positions(src).recording())
+                return table.attach(parser.parse(src))
+            if transformer is not None:
+                return transformer.transform(parser.parse(src))
+            return parser.parse(src)
+    except UnexpectedInput as e:
+        raise JSONDecodeError.from_lark(e, src, parser, disabled_terminals(options.features)) from e
+    except Unsupported as e:
+        raise JSONDecodeError(e.msg, src, e.pos) from None
+    finally:
+        load_options.reset(token)
+
+
+def read(file: TextIO | BinaryIO | Path, limits: Limits | None = None) -> str:
+    """
+    Read a document from a file-like object or a Path, decompressing it if needed
+    (see [compression][json4humans.compression]).
+
+    :param limits: Don't read (nor decompress) more characters than the maximum size (in bytes)
+                   of these limits
+    """
+    size = -1 if limits is None or limits.max_bytes is None else limits.max_bytes + 1
+    if isinstance(file, Path):
+        with compression.open(file) as f:
+            return f.read(size)
+    if not isinstance(file, (io.RawIOBase, io.BufferedIOBase)):
+        return file.read(size)  # type: ignore[return-value]
+    stream = compression.open(file)
+    try:
+        return stream.read(size)
+    finally:
+        # The caller owns the file
+        stream.detach()
+
+
+def load_typed(src: str, type: Any, dialect: str, options: LoadOptions) -> Any:
+    """
+    Decode a document straight into a type (see [typed][json4humans.typed]).
+
+    :raises ValueError: if some hooks, positions, limits or numeric arrays are requested too.
+    """
+    features = options.features or PRESETS[dialect]
+    if options != LoadOptions(features=features):
+        raise ValueError("type can't be combined with hooks, positions, limits or numeric_arrays")
+    return typed.loads(src, type, features)
+
+
 LexerType = Literal["auto", "basic", "contextual", "dynamic", "complete_dynamic"]
 """Lark supported lexer types"""
 
 
+@cache
+def compile_parser(
+    grammar: str,
+    transformer: Transformer | None,
+    lexer: LexerType = "auto",
+    spanning: bool = False,
+    instrumented: bool = False,
+    limited: bool = False,
+) -> Lark:
+    """
+    Build a LALR parser, once per distinct set of arguments.
+
+    Dialects sharing a grammar and a transformer share the same parsers.
+    Variants recording the positions, measuring the phases and/or enforcing the limits
+    are only built on first use, so these options don't cost anything when not requested.
+
+    :param grammar: the base name of the grammar
+    :param transformer: the transformer applied while parsing, if any
+    :param lexer: the lexer implementation for Lark
+    :param spanning: record the positions (see [positions][json4humans.positions])
+    :param instrumented: measure the phases (see [instrument][json4humans.instrument])
+    :param limited: enforce the limits (see [limits][json4humans.limits])
+    """
+    parser = Lark.open(
+        f"grammar/{grammar}.lark",
+        rel_to=__file__,
+        lexer=lexer,
+        parser="lalr",
+        start="value",
+        maybe_placeholders=False,
+        regex=True,
+        transformer=transformer,
+    )
+    if limited:
+        parser = limited_parser(parser)
+    if spanning:
+        parser = positions.spanning_parser(parser)
+    if instrumented:
+        parser = instrument.instrumented_parser(parser)
+    return parser
+
+
 def implement(
-    grammar: str, transformer: Transformer, encoder: type[JSONEncoder], lexer: LexerType = "auto"
+    dialect: str,
+    transformer: Transformer,
+    encoder: type[JSONEncoder],
+    lexer: LexerType = "auto",
+    grammar: str = "dialect",
 ):
     """
     A [JSON module][json4humans.protocol.JSONModule] attributes factory.
 
-    Only provide the grammar, the transformer, the encoder class (and a few optional parameters)
+    Only provide the dialect name, the transformer, the encoder class (and a few optional parameters)
     and this factory will create all the missing helpers and boiler plate to implement
     [JSONModule][json4humans.protocol.JSONModule] in the caller module.
 
-    :param grammar: the base name of the grammar (will use the Lark grammar of the same name)
+    :param dialect: the dialect name, accepting its [preset features][json4humans.features.PRESETS] by default
     :param transformer: the instanciated tranformer for this grammar
     :param encoder: the default encoder class used on serialization
     :param lexer: optionaly specify a lexer implementation for Lark
+    :param grammar: the base name of the grammar (will use the Lark grammar of the same name)
     """
-    _params = {
-        "lexer": lexer,
-        "parser": "lalr",
-        "start": "value",
-        "maybe_placeholders": False,
-        "regex": True,
-    }
+    preset = PRESETS[dialect]
 
-    if not DEBUG:
-        _params["transformer"] = transformer
+    # In debug mode, the transformer is applied on the parsed tree
+    tree_transformer: Transformer | None = transformer if DEBUG else None
+    parser = compile_parser(grammar, None if DEBUG else transformer, lexer)
 
-    parser = Lark.open(f"grammar/{grammar}.lark", rel_to=__file__, **_params)
+    variant = partial(compile_parser, grammar, transformer, lexer)
 
     def dump(obj: Any, out: TextIO | Path, *, indent: str | int | None = None):
-        out = out.open("w") if isinstance(out, Path) else out
+        if isinstance(out, Path):
+            with compression.open(out, "w") as f:
+                dump(obj, f, indent=indent)
+            return
         out.write(dumps(obj))
         out.write("\n")
 
+    @instrument.instrumented(dialect)
     def dumps(obj: Any, *, indent: str | int | None = None) -> str:
         return encoder(indent=indent).encode(obj)
 
-    def load(file: TextIO | Path) -> str:
-        data = file.read_text() if isinstance(file, Path) else file.read()
-        return loads(data)
+    def load(file: TextIO | BinaryIO | Path, **kwargs: Any) -> Any:
+        return loads(read(file, kwargs.get("limits")), **kwargs)
 
-    def loads(src: str) -> Any:
-        if DEBUG:
-            tree = parser.parse(src)
-            return transformer.transform(tree)
-        else:
-            return parser.parse(src)
+    @instrument.instrumented(dialect)
+    def loads(
+        src: str,
+        *,
+        parse_float: Callable[[str], Any] | None = None,
+        parse_int: Callable[[str], Any] | None = None,
+        parse_constant: Callable[[str], Any] | None = None,
+        object_hook: Callable[[dict], Any] | None = None,
+        object_pairs_hook: Callable[[list[tuple[Any, Any]]], Any] | None = None,
+        array_hook: Callable[[list], Any] | None = None,
+        type: Any = None,
+        positions: bool = False,
+        limits: Limits | None = None,
+        features: Features | None = None,
+        numeric_arrays: bool = False,
+    ) -> Any:
+        options = LoadOptions(
+            parse_float=parse_float,
+            parse_int=parse_int,
+            parse_constant=parse_constant,
+            object_hook=object_hook,
+            object_pairs_hook=object_pairs_hook,
+            array_hook=array_hook,
+            positions=positions,
+            limits=limits,
+            features=features or preset,
+            numeric_arrays=numeric_arrays,
+        )
+        if type is not None:
+            return load_typed(src, type, dialect, options)
+        return parse(parser, tree_transformer, src, options, variant)
+
+    def check(src: str, *, features: Features | None = None) -> list[JSONDecodeError]:
+        return collect_errors(parser, src, features or preset)
+
+    loads_at = partial(load_at, loads)
 
     dump.__doc__ = JSONModule.dump.__doc__
     dumps.__doc__ = JSONModule.dumps.__doc__
     load.__doc__ = JSONModule.load.__doc__
     loads.__doc__ = JSONModule.loads.__doc__
+    loads_at.__doc__ = JSONModule.loads_at.__doc__
+    check.__doc__ = JSONModule.check.__doc__
 
     info = inspect.stack()[1]
     module = inspect.getmodule(info[0])
@@ -168,7 +578,10 @@ def implement(
         raise RuntimeError(f"Unable to process module from FrameInfo: {info}")
 
     setattr(module, "parser", parser)
+    setattr(module, "features", preset)
     setattr(module, "loads", loads)
+    setattr(module, "loads_at", loads_at)
+    setattr(module, "check", check)
     setattr(module, "load", load)
     setattr(module, "dump", dump)
     setattr(module, "dumps", dumps)
@@ -0,0 +1,654 @@
+"""
+This module provides [JSON Pointer](https://www.rfc-editor.org/rfc/rfc6901) access
+and [JSONPath](https://www.rfc-editor.org/rfc/rfc9535) queries over parsed documents.
+
+Mutations preserve the style of the document:
+replaced values inherit the whitespaces and comments of the value they replace,
+added members and items mimic the layout of their siblings
+and removed ones hand over their layout to their siblings.
+
+Supported JSONPath syntax is the following subset:
+
+- `$`: the root
+- `.name`, `['name']` or `["name"]`: an object member
+- `[0]` or `[-1]`: an array item
+- `[start:end:step]`: an array slice
+- `.*` or `[*]`: all members or items
+- `..`: recursive descent (ie. `$..name`)
+- `[a,b]`: union of selectors
+"""
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator, Sequence
+from functools import lru_cache
+from typing import Any, NamedTuple
+
+from .types import (
+    Array,
+    Container,
+    Float,
+    Integer,
+    JSONType,
+    LineStyleComment,
+    Literal,
+    Object,
+    Quote,
+    String,
+    WhiteSpace,
+)
+
+Tokens = tuple[str, ...]
+"""A parsed JSON Pointer"""
+
+Pointer = str | Sequence[str | int]
+"""A JSON Pointer either as a string (ie. `/a/0`) or as a sequence of tokens (ie. `("a", 0)`)"""
+
+MISSING: Any = object()
+
+
+@lru_cache(maxsize=1024)
+def parse_pointer(pointer: str) -> Tokens:
+    """
+    Parse a JSON Pointer string into its unescaped reference tokens.
+
+    :param pointer: A JSON Pointer (ie. `/a/b~1c/0`)
+    :raises ValueError: if the pointer is not empty and does not start with `/`
+    """
+    if not pointer:
+        return ()
+    if not pointer.startswith("/"):
+        raise ValueError(f"Invalid JSON Pointer: {pointer!r}")
+    return tuple(t.replace("~1", "/").replace("~0", "~") for t in pointer[1:].split("/"))
+
+
+def format_pointer(tokens: Sequence[str | int]) -> str:
+    """
+    Format reference tokens as a JSON Pointer string.
+
+    :param tokens: The reference tokens
+    """
+    return "".join(f"/{str(t).replace('~', '~0').replace('/', '~1')}" for t in tokens)
+
+
+def to_tokens(pointer: Pointer) -> Tokens:
+    if isinstance(pointer, str):
+        return parse_pointer(pointer)
+    return tuple(str(t) for t in pointer)
+
+
+def array_index(array: list, token: str, append: bool = False) -> int:
+    """
+    Resolve an array reference token into an index.
+
+    :param array: The array being indexed
+    :param token: The reference token
+    :param append: Accept `-` and the array length as a reference to the end of the array
+    :raises KeyError: if the token is not a valid index
+    """
+    if append and token == "-":
+        return len(array)
+    if not token.isdigit() or (token.startswith("0") and token != "0"):
+        raise KeyError(token)
+    index = int(token)
+    if index > len(array) or (index == len(array) and not append):
+        raise KeyError(token)
+    return index
+
+
+def child(node: Any, token: str) -> Any:
+    """
+    Get the child of a container given a reference token.
+
+    :raises KeyError: if there is no such child
+    """
+    if isinstance(node, dict):
+        return node[token]
+    if isinstance(node, list):
+        return node[array_index(node, token)]
+    raise KeyError(token)
+
+
+def resolve(doc: Any, tokens: Tokens) -> Any:
+    node = doc
+    for token in tokens:
+        node = child(node, token)
+    return node
+
+
+def get(doc: Any, pointer: Pointer, default: Any = MISSING) -> Any:
+    """
+    Get the value referenced by a JSON Pointer.
+
+    :param doc: The document to look into
+    :param pointer: The JSON Pointer to the value
+    :param default: The value to return if the pointer does not resolve
+    :raises KeyError: if the pointer does not resolve and no default is provided
+    """
+    try:
+        return resolve(doc, to_tokens(pointer))
+    except KeyError:
+        if default is MISSING:
+            raise KeyError(pointer) from None
+        return default
+
+
+def assign(doc: Any, pointer: Pointer, value: Any) -> Any:
+    """
+    Set the value referenced by a JSON Pointer.
+
+    Existing values are replaced, missing object members are added
+    and array items are appended using either `-` or the array length as index.
+    Builtin values are wrapped into their style-preserving type to hold the style of the replaced value.
+
+    :param doc: The document to modify
+    :param pointer: The JSON Pointer to the value (can't be the root)
+    :param value: The new value
+    :returns: The value as stored in the document
+    :raises KeyError: if the parent of the pointed value does not exist
+    """
+    tokens = to_tokens(pointer)
+    if not tokens:
+        raise KeyError("Can't set the root document")
+    parent, token = resolve(doc, tokens[:-1]), tokens[-1]
+    if isinstance(parent, dict):
+        if token in parent:
+            parent[token] = node = wrap(value, parent[token])
+        else:
+            node = add_member(parent, token, value)
+    elif isinstance(parent, list):
+        index = array_index(parent, token, append=True)
+        if index < len(parent):
+            parent[index] = node = wrap(value, parent[index])
+        else:
+            node = add_item(parent, value)
+    else:
+        raise KeyError(pointer)
+    return node
+
+
+def delete(doc: Any, pointer: Pointer) -> Any:
+    """
+    Delete the value referenced by a JSON Pointer.
+
+    :param doc: The document to modify
+    :param pointer: The JSON Pointer to the value (can't be the root)
+    :returns: The deleted value
+    :raises KeyError: if the pointer does not resolve
+    """
+    tokens = to_tokens(pointer)
+    if not tokens:
+        raise KeyError("Can't delete the root document")
+    parent, token = resolve(doc, tokens[:-1]), tokens[-1]
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise KeyError(pointer)
+        keys = list(parent)
+        position = keys.index(token)
+        next_key = keys[position + 1] if position + 1 < len(keys) else None
+        previous = parent[keys[position - 1]] if position else None
+        key = keys[position]
+        value = parent.pop(token)
+        handover(parent, key, value, next_key, previous)
+    elif isinstance(parent, list):
+        position = array_index(parent, token)
+        value = parent.pop(position)
+        following = parent[position] if position < len(parent) else None
+        previous = parent[position - 1] if position else None
+        handover(parent, value, value, following, previous)
+    else:
+        raise KeyError(pointer)
+    return value
+
+
+def wrap(value: Any, like: Any = None) -> Any:
+    """
+    Wrap a builtin value into its style-preserving type.
+
+    :param value: The value to wrap (returned as-is if already wrapped or not wrappable)
+    :param like: A node to borrow whitespaces, comments and quotes from
+    """
+    match value:
+        case JSONType():
+            node = value
+        case bool() | None:
+            node = Literal(value)
+        case str():
+            node = String(value, quote=getattr(like, "quote", Quote.DOUBLE))
+        case int():
+            node = Integer(value)
+        case float():
+            node = Float(value)
+        case dict():
+            node = Object(value.items())
+        case list() | tuple():
+            node = Array(value)
+        case _:
+            return value
+    if isinstance(like, JSONType):
+        node.json_before = node.json_before or list(like.json_before)
+        node.json_after = node.json_after or list(like.json_after)
+    return node
+
+
+def layout(trivia: list) -> list:
+    """Extract the whitespaces following the last comment of a trivia sequence"""
+    start = len(trivia)
+    while start and isinstance(trivia[start - 1], WhiteSpace):
+        start -= 1
+    return trivia[start:]
+
+
+def indentation(trivia: list) -> list:
+    """The layout of an entry: its line return and indentation if alone on its line, a space otherwise"""
+    _, line = split_line(trivia, last=True)
+    if line and all(isinstance(wsc, WhiteSpace) for wsc in line):
+        return line
+    return [WhiteSpace(" ")]
+
+
+def add_member(obj: dict, key: str, value: Any) -> Any:
+    """Add a member to an object, mimicking the layout of the last member"""
+    if not obj:
+        node = obj[wrap(key)] = wrap(value)
+        if isinstance(node, JSONType):
+            node.json_before = node.json_before or [WhiteSpace(" ")]
+        return node
+    last_key, last_value = next(reversed(obj.items()))
+    if isinstance(last_key, JSONType):
+        quote = getattr(last_key, "quote", Quote.DOUBLE)
+        key = String(key, quote=quote, after=list(last_key.json_after))
+    node = obj[key] = wrap(value)
+    if isinstance(node, JSONType) and isinstance(last_value, JSONType):
+        node.json_before = node.json_before or list(last_value.json_before)
+    follow(obj, last_key, last_value, key, node)
+    return node
+
+
+def add_item(array: list, value: Any) -> Any:
+    """Append an item to an array, mimicking the layout of the last item"""
+    node = wrap(value)
+    if array:
+        follow(array, array[-1], array[-1], node, node)
+    array.append(node)
+    return node
+
+
+def follow(container: Any, last_leading: Any, last: Any, leading: Any, node: Any):
+    """
+    Style a new last entry after the current last one,
+    like [apply_patch()][json4humans.patch.apply_patch] does on the source text.
+
+    :param container: The container the entry is added to
+    :param last_leading: The node holding the current last entry leading trivia (the key for members)
+    :param last: The current last value
+    :param leading: The node holding the new entry leading trivia (the key for members)
+    :param node: The new value
+    """
+    if not isinstance(last, JSONType) or not isinstance(node, JSONType):
+        return
+    if isinstance(last_leading, JSONType) and isinstance(leading, JSONType):
+        layout = indentation(last_leading.json_before)
+        if getattr(container, "json_container_trailing_coma", False):
+            # The new entry is inserted on the line following the trailing coma, and gets its own
+            same_line, rest = split_line(container.json_container_tail)
+            leading.json_before = same_line + layout if rest else layout
+            container.json_container_tail = rest or container.json_container_tail
+            return
+        # Comments on the same line as the current last entry stay on its line, after the coma
+        same_line, rest = split_line(last.json_after)
+        leading.json_before = same_line + layout if rest else layout
+        node.json_after, last.json_after = rest or last.json_after, []
+    elif not any(isinstance(wsc, LineStyleComment) for wsc in last.json_after):
+        # Trivia closing the container moves to the new last entry
+        # unless a line comment would swallow the separating coma
+        node.json_after, last.json_after = last.json_after, []
+
+
+def split_line(trivia: list, last: bool = False) -> tuple[list, list]:
+    """Split a trivia sequence at its first (or last) line return, which starts the second part"""
+    for i in range(len(trivia) - 1, -1, -1) if last else range(len(trivia)):
+        wsc = trivia[i]
+        if isinstance(wsc, WhiteSpace) and "\n" in wsc:
+            nl = wsc.rfind("\n") if last else wsc.find("\n")
+            head = [*trivia[:i], WhiteSpace(wsc[:nl])] if nl else trivia[:i]
+            return head, [WhiteSpace(wsc[nl:]), *trivia[i + 1 :]]
+    return trivia, []
+
+
+def handover(container: Any, leading: Any, value: Any, following: Any, previous: Any):
+    """
+    Hand over the layout of a removed entry to its siblings,
+    like [apply_patch()][json4humans.patch.apply_patch] does on the source text.
+
+    An entry filling its own lines is removed with them (including the comments following it on its line)
+    so the comment lines preceding it now precede the following entry.
+    Otherwise the following entry takes over its leading trivia.
+
+    :param container: The container the entry has been removed from
+    :param leading: The node holding the removed entry leading trivia (the key for members)
+    :param value: The removed value
+    :param following: The node holding the following entry leading trivia, if any
+    :param previous: The previous value, if any
+    """
+    if not isinstance(leading, JSONType) or not isinstance(value, JSONType):
+        return
+    trailing_coma = following is None and getattr(container, "json_container_trailing_coma", False)
+    if following is not None:
+        after = following.json_before if isinstance(following, JSONType) else []
+    else:
+        after = container.json_container_tail if trailing_coma else value.json_after
+    head, line = split_line(leading.json_before, last=True)
+    _, rest = split_line(after)
+    own_lines = line and rest and all(isinstance(wsc, WhiteSpace) for wsc in line)
+    if isinstance(following, JSONType):
+        following.json_before = head + rest if own_lines else leading.json_before
+    elif following is not None:
+        return
+    elif previous is None:
+        # The container is now empty, its trivia are kept as its tail
+        if isinstance(container, Container):
+            container.json_container_tail = (
+                head + rest if own_lines else leading.json_before + after
+            )
+            container.json_container_trailing_coma = False
+    elif trailing_coma:
+        # The previous entry coma becomes the trailing one
+        container.json_container_tail = head + rest if own_lines else after
+    elif isinstance(previous, JSONType):
+        previous.json_after = previous.json_after + (head + rest if own_lines else after)
+
+
+class Index:
+    """
+    A precomputed index of all the values of a document by their JSON Pointer tokens,
+    making repeated lookups O(1).
+
+    Mutations done through the index update it incrementally:
+    only the modified subtree (and shifted array items) are reindexed.
+
+    Mutations done directly on the document are not tracked:
+    call [reindex()][json4humans.query.Index.reindex] on the modified subtree.
+
+    :param doc: The document to index
+    """
+
+    def __init__(self, doc: Any):
+        self.doc = doc
+        self.nodes: dict[Tokens, Any] = {}
+        self.add((), doc)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, pointer: Pointer) -> bool:
+        return to_tokens(pointer) in self.nodes
+
+    def add(self, tokens: Tokens, node: Any):
+        """Index a subtree"""
+        nodes = self.nodes
+        stack = [(tokens, node)]
+        while stack:
+            path, node = stack.pop()
+            nodes[path] = node
+            if isinstance(node, dict):
+                stack.extend(((*path, str(k)), v) for k, v in node.items())
+            elif isinstance(node, list):
+                stack.extend(((*path, str(i)), v) for i, v in enumerate(node))
+
+    def remove(self, tokens: Tokens):
+        """Remove a subtree from the index"""
+        stack = [tokens]
+        while stack:
+            path = stack.pop()
+            node = self.nodes.pop(path, MISSING)
+            if isinstance(node, dict):
+                stack.extend((*path, str(k)) for k in node)
+            elif isinstance(node, list):
+                stack.extend((*path, str(i)) for i in range(len(node)))
+
+    def reindex(self, pointer: Pointer = ""):
+        """
+        Reindex a subtree after it has been modified outside of the index.
+
+        :param pointer: The JSON Pointer to the modified subtree
+        """
+        tokens = to_tokens(pointer)
+        # The indexed subtree is gone, so stale entries can only be found by prefix
+        depth = len(tokens)
+        for path in [path for path in self.nodes if path[:depth] == tokens]:
+            del self.nodes[path]
+        self.add(tokens, resolve(self.doc, tokens))
+
+    def get(self, pointer: Pointer, default: Any = MISSING) -> Any:
+        """
+        Get the value referenced by a JSON Pointer.
+
+        See [get()][json4humans.query.get].
+        """
+        try:
+            return self.nodes[to_tokens(pointer)]
+        except KeyError:
+            if default is MISSING:
+                raise KeyError(pointer) from None
+            return default
+
+    def parent(self, tokens: Tokens) -> Any:
+        if not tokens:
+            raise KeyError("The root document has no parent")
+        try:
+            return self.nodes[tokens[:-1]]
+        except KeyError:
+            raise KeyError(format_pointer(tokens)) from None
+
+    def assign(self, pointer: Pointer, value: Any) -> Any:
+        """
+        Set the value referenced by a JSON Pointer and update the index.
+
+        See [assign()][json4humans.query.assign].
+        """
+        tokens = to_tokens(pointer)
+        parent = self.parent(tokens)
+        if isinstance(parent, list):
+            tokens = (*tokens[:-1], str(array_index(parent, tokens[-1], append=True)))
+        self.remove(tokens)
+        node = assign(parent, tokens[-1:], value)
+        self.add(tokens, node)
+        return node
+
+    def delete(self, pointer: Pointer) -> Any:
+        """
+        Delete the value referenced by a JSON Pointer and update the index.
+
+        See [delete()][json4humans.query.delete].
+        """
+        tokens = to_tokens(pointer)
+        parent = self.parent(tokens)
+        if isinstance(parent, list):
+            # Following items are shifted
+            start = array_index(parent, tokens[-1])
+            for index in range(start, len(parent)):
+                self.remove((*tokens[:-1], str(index)))
+            value = delete(parent, tokens[-1:])
+            for index in range(start, len(parent)):
+                self.add((*tokens[:-1], str(index)), parent[index])
+        else:
+            self.remove(tokens)
+            value = delete(parent, tokens[-1:])
+        return value
+
+    def query(self, path: str) -> list[Any]:
+        """
+        Query the indexed document using JSONPath.
+
+        See [query()][json4humans.query.query].
+        """
+        return query(self.doc, path)
+
+
+class Name(NamedTuple):
+    name: str
+
+
+class Slice(NamedTuple):
+    start: int | None
+    stop: int | None
+    step: int | None
+
+
+class Wildcard(NamedTuple):
+    pass
+
+
+Selector = Name | int | Slice | Wildcard
+
+
+class Segment(NamedTuple):
+    selectors: tuple[Selector, ...]
+    descendant: bool = False
+
+
+SEGMENT = re.compile(
+    r"""
+    (?P<descendant>\.\.)?
+    (?:
+        (?:(?<=\.)|\.)(?P<name>\*|[^\W\d][\w$-]*)
+        | \[(?P<selectors>(?:'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|[^\]'"])*)\]
+    )
+    """,
+    re.VERBOSE,
+)
+
+SELECTOR = re.compile(
+    r"""
+    \s*(?:
+        (?P<quoted>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+        | (?P<wildcard>\*)
+        | (?P<slice>(?P<start>-?\d+)?\s*:\s*(?P<stop>-?\d+)?\s*(?::\s*(?P<step>-?\d+)?)?)
+        | (?P<index>-?\d+)
+    )\s*(?:,|$)
+    """,
+    re.VERBOSE,
+)
+
+
+def unquote(quoted: str) -> str:
+    return re.sub(r"\\(.)", r"\1", quoted[1:-1])
+
+
+def parse_selectors(selectors: str, path: str) -> tuple[Selector, ...]:
+    parsed: list[Selector] = []
+    pos = 0
+    while pos < len(selectors):
+        if not (match := SELECTOR.match(selectors, pos)):
+            raise ValueError(f"Invalid JSONPath selector in {path!r}: [{selectors}]")
+        if match["quoted"]:
+            parsed.append(Name(unquote(match["quoted"])))
+        elif match["wildcard"]:
+            parsed.append(Wildcard())
+        elif match["slice"]:
+            start, stop, step = (
+                int(n) if n else None for n in match.group("start", "stop", "step")
+            )
+            parsed.append(Slice(start, stop, step))
+        else:
+            parsed.append(int(match["index"]))
+        pos = match.end()
+    return tuple(parsed)
+
+
+@lru_cache(maxsize=256)
+def parse_path(path: str) -> tuple[Segment, ...]:
+    """
+    Parse a JSONPath expression into its segments.
+
+    :param path: The JSONPath expression (ie. `$.services[*].name`)
+    :raises ValueError: on invalid or unsupported expressions
+    """
+    if not path.startswith("$"):
+        raise ValueError(f"JSONPath must start with '$': {path!r}")
+    segments = []
+    pos = 1
+    while pos < len(path):
+        if not (match := SEGMENT.match(path, pos)):
+            raise ValueError(f"Invalid JSONPath at position {pos}: {path!r}")
+        if name := match["name"]:
+            selectors: tuple[Selector, ...] = (Wildcard() if name == "*" else Name(name),)
+        else:
+            selectors = parse_selectors(match["selectors"], path)
+        segments.append(Segment(selectors, bool(match["descendant"])))
+        pos = match.end()
+    return tuple(segments)
+
+
+def children(node: Any, selector: Selector) -> Iterator[tuple[str, Any]]:
+    """Iterate over the children of a node matching a selector"""
+    match selector, node:
+        case Wildcard(), dict():
+            yield from ((str(k), v) for k, v in node.items())
+        case Wildcard(), list():
+            yield from ((str(i), v) for i, v in enumerate(node))
+        case Name(name), dict() if name in node:
+            yield name, node[name]
+        case int(), list() if -len(node) <= selector < len(node):
+            index = selector % len(node)
+            yield str(index), node[index]
+        case Slice(), list():
+            for index in range(*slice(*selector).indices(len(node))):
+                yield str(index), node[index]
+
+
+def descendants(tokens: Tokens, node: Any) -> Iterator[tuple[Tokens, Any]]:
+    """Iterate over a node and all its descendants in document order"""
+    stack = [(tokens, node)]
+    while stack:
+        path, node = stack.pop()
+        yield path, node
+        if isinstance(node, dict):
+            stack.extend(reversed([((*path, str(k)), v) for k, v in node.items()]))
+        elif isinstance(node, list):
+            stack.extend(reversed([((*path, str(i)), v) for i, v in enumerate(node)]))
+
+
+def iterquery(doc: Any, path: str) -> Iterator[tuple[Tokens, Any]]:
+    """
+    Lazily query a document using JSONPath.
+
+    :param doc: The document to query
+    :param path: The JSONPath expression
+    :returns: An iterator over the matching values and their JSON Pointer tokens
+    """
+    matches: Iterator[tuple[Tokens, Any]] = iter((((), doc),))
+    for segment in parse_path(path):
+        matches = select(matches, segment)
+    return matches
+
+
+def select(matches: Iterator[tuple[Tokens, Any]], segment: Segment) -> Iterator[tuple[Tokens, Any]]:
+    for tokens, node in matches:
+        nodes = descendants(tokens, node) if segment.descendant else ((tokens, node),)
+        for path, candidate in nodes:
+            for selector in segment.selectors:
+                for token, value in children(candidate, selector):
+                    yield (*path, token), value
+
+
+def query(doc: Any, path: str) -> list[Any]:
+    """
+    Query a document using JSONPath.
+
+    :param doc: The document to query
+    :param path: The JSONPath expression (ie. `$.services[*].name`)
+    :returns: The matching values in document order
+    """
+    return [value for _, value in iterquery(doc, path)]
+
+
+def pointers(doc: Any, path: str) -> list[str]:
+    """
+    Get the JSON Pointers of the values matching a JSONPath expression.
+
+    :param doc: The document to query
+    :param path: The JSONPath expression
+    """
+    return [format_pointer(tokens) for tokens, _ in iterquery(doc, path)]
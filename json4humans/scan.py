@@ -0,0 +1,262 @@
+"""
+This module provides a fast skip scanner locating values in a source document without parsing it.
+
+The scanner only understands the document structure (containers, strings and comments)
+and jumps over irrelevant values using regular expressions,
+so it accepts all the supported dialects but does not validate skipped values.
+"""
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from .convert import unescape
+from .errors import JSONDecodeError
+from .query import Pointer, Tokens, to_tokens
+
+TRIVIA = re.compile(r"(?:\s+|//[^\n]*|/\*[\s\S]*?\*/)*")
+TRIVIA_ITEM = re.compile(r"(?P<ws>\s+)|//[^\n]*|/\*[\s\S]*?\*/")
+STRING = re.compile(r"\"(?:[^\"\\\n]|\\[\s\S])*\"|'(?:[^'\\\n]|\\[\s\S])*'")
+SCALAR = re.compile(r"[^\s,:\[\]{}/\"']+")
+STRUCTURE = re.compile(
+    r"\"(?:[^\"\\\n]|\\[\s\S])*\"|'(?:[^'\\\n]|\\[\s\S])*'|//[^\n]*|/\*[\s\S]*?\*/|[\[\]{}]"
+)
+OPENING = frozenset("[{")
+
+Span = tuple[int, int]
+"""A `(start, end)` offsets pair"""
+
+
+def unexpected(src: str, pos: int) -> JSONDecodeError:
+    if pos >= len(src):
+        return JSONDecodeError("Unexpected end of document", src, len(src))
+    return JSONDecodeError(f"Unexpected {src[pos]!r}", src, pos)
+
+
+def skip_trivia(src: str, pos: int) -> int:
+    """
+    Skip the whitespaces and comments starting at `pos`.
+
+    :returns: The offset of the next significant character
+    """
+    return TRIVIA.match(src, pos).end()  # type: ignore[union-attr]
+
+
+def skip_container(src: str, pos: int) -> int:
+    depth = 0
+    for match in STRUCTURE.finditer(src, pos):
+        char = match.group()[0]
+        if char in OPENING:
+            depth += 1
+        elif char == "]" or char == "}":
+            depth -= 1
+            if not depth:
+                return match.end()
+    raise unexpected(src, len(src))
+
+
+def skip_value(src: str, pos: int) -> int:
+    """
+    Skip the value starting at `pos`.
+
+    :returns: The offset following the value
+    :raises JSONDecodeError: if there is no value at `pos`
+    """
+    if pos < len(src) and src[pos] in OPENING:
+        return skip_container(src, pos)
+    if match := (STRING if src.startswith(("'", '"'), pos) else SCALAR).match(src, pos):
+        return match.end()
+    raise unexpected(src, pos)
+
+
+def expect(src: str, pos: int, char: str) -> int:
+    if not src.startswith(char, pos):
+        raise unexpected(src, pos)
+    return skip_trivia(src, pos + 1)
+
+
+def read_key(src: str, pos: int) -> tuple[str, int]:
+    """
+    Read an object key starting at `pos`.
+
+    :returns: The decoded key and the offset following it
+    """
+    end = skip_value(src, pos)
+    key = src[pos:end]
+    if key[0] in "'\"":
+        key = unescape(key[1:-1])[0]
+    return key, end
+
+
+def find_member(src: str, pos: int, name: str) -> int:
+    """
+    Find the value of an object member.
+
+    Like on parsing, the last occurence of a duplicated key wins.
+
+    :param pos: The offset of the object opening brace
+    :returns: The offset of the member value
+    :raises KeyError: if the object has no such member
+    """
+    found = -1
+    pos = skip_trivia(src, pos + 1)
+    while not src.startswith("}", pos):
+        key, pos = read_key(src, pos)
+        pos = expect(src, skip_trivia(src, pos), ":")
+        if key == name:
+            found = pos
+        pos = skip_trivia(src, skip_value(src, pos))
+        if not src.startswith(",", pos):
+            expect(src, pos, "}")
+            break
+        pos = skip_trivia(src, pos + 1)
+    if found < 0:
+        raise KeyError(name)
+    return found
+
+
+def find_item(src: str, pos: int, token: str) -> int:
+    """
+    Find an array item.
+
+    :param pos: The offset of the array opening bracket
+    :param token: The item index reference token
+    :returns: The offset of the item
+    :raises KeyError: if the token is not an index or the array is too short
+    """
+    if not token.isdigit() or (token.startswith("0") and token != "0"):
+        raise KeyError(token)
+    pos = skip_trivia(src, pos + 1)
+    for _ in range(int(token)):
+        if src.startswith("]", pos):
+            raise KeyError(token)
+        pos = skip_trivia(src, skip_value(src, pos))
+        if not src.startswith(",", pos):
+            expect(src, pos, "]")
+            raise KeyError(token)
+        pos = skip_trivia(src, pos + 1)
+    if src.startswith("]", pos):
+        raise KeyError(token)
+    return pos
+
+
+def locate(src: str, pointer: Pointer) -> Span:
+    """
+    Locate the value referenced by a JSON Pointer in a source document.
+
+    Only the values along the path are scanned, all the other ones are skipped.
+
+    :param src: The source document
+    :param pointer: The JSON Pointer to the value
+    :returns: The value span, excluding its surrounding whitespaces and comments
+    :raises KeyError: if the pointer does not resolve
+    :raises JSONDecodeError: on structural errors met while scanning
+    """
+    pos = skip_trivia(src, 0)
+    for token in to_tokens(pointer):
+        if src.startswith("{", pos):
+            pos = find_member(src, pos, token)
+        elif src.startswith("[", pos):
+            pos = find_item(src, pos, token)
+        else:
+            raise KeyError(token)
+    return pos, skip_value(src, pos)
+
+
+class Entry(NamedTuple):
+    """The offsets of an object member or an array item"""
+
+    key: str | None
+    """The decoded key of a member, `None` for items"""
+    start: int
+    """The offset of the entry (ie. of the key for members)"""
+    value: int
+    """The offset of the value"""
+    end: int
+    """The offset following the value"""
+    coma: int
+    """The offset of the coma following the entry, `-1` if there is none"""
+
+
+def entries(src: str, pos: int) -> tuple[list[Entry], int]:
+    """
+    Scan the entries of a container.
+
+    :param pos: The offset of the container opening brace or bracket
+    :returns: The entries and the offset of the container closing brace or bracket
+    :raises KeyError: if there is no container at `pos`
+    """
+    if src.startswith("{", pos):
+        closing = "}"
+    elif src.startswith("[", pos):
+        closing = "]"
+    else:
+        raise KeyError(pos)
+    found: list[Entry] = []
+    pos = skip_trivia(src, pos + 1)
+    while not src.startswith(closing, pos):
+        start, key = pos, None
+        if closing == "}":
+            key, pos = read_key(src, pos)
+            pos = expect(src, skip_trivia(src, pos), ":")
+        value, end = pos, skip_value(src, pos)
+        pos = skip_trivia(src, end)
+        if src.startswith(",", pos):
+            found.append(Entry(key, start, value, end, pos))
+            pos = skip_trivia(src, pos + 1)
+        else:
+            found.append(Entry(key, start, value, end, -1))
+            if not src.startswith(closing, pos):
+                raise unexpected(src, pos)
+    return found, pos
+
+
+def locate_all(src: str, pointers: Iterable[Pointer]) -> dict[Tokens, Span]:
+    """
+    Locate the values referenced by several JSON Pointers in a single scan.
+
+    Each container along the paths is scanned once, whatever the number of pointers going through it,
+    so locating many values costs about as much as locating the farthest one.
+
+    :param src: The source document
+    :param pointers: The JSON Pointers to the values
+    :returns: The spans of the values by reference tokens, the unresolved pointers being missing
+    :raises JSONDecodeError: on structural errors met while scanning
+    """
+    found: dict[Tokens, Span] = {}
+    root = skip_trivia(src, 0)
+    # The values to visit: their span, depth and the paths going through them
+    stack = [(root, skip_value(src, root), 0, {to_tokens(pointer) for pointer in pointers})]
+    while stack:
+        start, end, depth, paths = stack.pop()
+        children: dict[str, list[Tokens]] = {}
+        for path in paths:
+            if len(path) == depth:
+                found[path] = (start, end)
+            else:
+                children.setdefault(path[depth], []).append(path)
+        if not children or not src.startswith(("{", "["), start):
+            continue
+        items, _ = entries(src, start)
+        # Like on parsing, the last occurence of a duplicated key wins
+        spans = {
+            entry.key if entry.key is not None else str(index): (entry.value, entry.end)
+            for index, entry in enumerate(items)
+        }
+        for token, group in children.items():
+            if token in spans:
+                stack.append((*spans[token], depth + 1, set(group)))
+    return found
+
+
+def line_end(src: str, start: int, end: int) -> int:
+    """
+    Find the first line return in the trivia between `start` and `end`, ignoring comments content.
+
+    :returns: The line return offset or `-1` if there is none
+    """
+    for match in TRIVIA_ITEM.finditer(src, start, end):
+        if match.lastgroup == "ws" and (nl := src.find("\n", match.start(), match.end())) >= 0:
+            return nl
+    return -1
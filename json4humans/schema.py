@@ -0,0 +1,721 @@
+"""
+This module validates documents against [JSON Schemas](https://json-schema.org/).
+
+Schemas are compiled once into closures (see [compile()][json4humans.schema.compile]),
+cached by content, and validate parsed documents in a single pass.
+Errors are reported with the JSON Pointer of the invalid value
+and, given the source document, its line and column.
+
+Documents can also be validated in streaming mode while being parsed
+by the [events][json4humans.events] reader, failing on the first error without building the document tree.
+
+The following keywords are supported (others are ignored):
+
+- `type`, `enum`, `const`
+- `minimum`, `maximum`, `exclusiveMinimum`, `exclusiveMaximum`, `multipleOf`
+- `minLength`, `maxLength`, `pattern`
+- `properties`, `patternProperties`, `additionalProperties`, `required`,
+  `minProperties`, `maxProperties`, `propertyNames`, `dependentRequired`
+- `prefixItems`, `items` (and the legacy `items` array form with `additionalItems`),
+  `minItems`, `maxItems`, `uniqueItems`, `contains`
+- `allOf`, `anyOf`, `oneOf`, `not`, `if`/`then`/`else`
+- `$ref` to the local `$defs` and `definitions` (ie. `#/$defs/name`)
+"""
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from decimal import Decimal
+from functools import lru_cache
+from numbers import Number
+from typing import Any, TextIO
+from urllib.parse import unquote
+
+from . import events as ev
+from .diff import digest
+from .errors import ValidationError
+from .features import Features
+from .query import Tokens, format_pointer, parse_pointer
+from .types import Literal
+
+Schema = Mapping[str, Any] | bool
+"""A JSON Schema"""
+
+Check = Callable[[Any], "str | None"]
+"""A compiled keyword, returning an error message for invalid values"""
+
+Errors = list[tuple[Tokens, str]]
+
+ARRAYS = (list, range)
+"""Arrays types (arrays are represented by their indexes range once streamed)"""
+
+TYPES: dict[str, Callable[[Any], bool]] = {
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, ARRAYS),
+    "string": lambda value: isinstance(value, str),
+    "integer": lambda value: is_integer(value),
+    "number": lambda value: is_number(value),
+    "boolean": lambda value: isinstance(value, bool),
+    "null": lambda value: value is None,
+}
+
+DEEP_KEYWORDS = frozenset(
+    ("enum", "const", "anyOf", "oneOf", "not", "if", "uniqueItems", "contains")
+)
+"""Keywords requiring the whole value to validate a container"""
+
+
+def is_number(value: Any) -> bool:
+    return isinstance(value, Number) and not isinstance(value, bool)
+
+
+def is_integer(value: Any) -> bool:
+    if isinstance(value, (int, float)):
+        return not isinstance(value, bool) and (isinstance(value, int) or value.is_integer())
+    if not is_number(value):
+        return False
+    try:
+        return value == int(value)
+    except (ArithmeticError, TypeError, ValueError):
+        # Infinities, NaNs and complex numbers
+        return False
+
+
+def show(value: Any) -> str:
+    if is_number(value) and not isinstance(value, (int, float)):
+        # ie. Decimal, not serializable by the builtin json module
+        return str(value)
+    return json.dumps(value, ensure_ascii=False)
+
+
+def type_of(value: Any) -> str:
+    for name in ("null", "boolean", "integer", "number", "string", "array", "object"):
+        if TYPES[name](value):
+            return name
+    return type(value).__name__
+
+
+class Compiled:
+    """A compiled schema"""
+
+    def __init__(self):
+        self.allowed = True
+        self.types: list[str] = []
+        self.checks: list[Check] = []
+        self.deep = False
+        self.also: list[Compiled] = []
+        self.properties: dict[str, Compiled] = {}
+        self.patterns: list[tuple[re.Pattern, Compiled]] = []
+        self.additional: Compiled | None = None
+        self.prefix: list[Compiled] = []
+        self.items: Compiled | None = None
+        self._expanded: list[Compiled] | None = None
+
+    @property
+    def expanded(self) -> list[Compiled]:
+        """This schema and all the ones applying to the same values (`$ref` and `allOf`)"""
+        if self._expanded is None:
+            expanded: list[Compiled] = []
+            stack = [self]
+            while stack:
+                compiled = stack.pop()
+                if compiled not in expanded:
+                    expanded.append(compiled)
+                    stack.extend(reversed(compiled.also))
+            self._expanded = expanded
+        return self._expanded
+
+    def reject(self, value: Any) -> str | None:
+        """Check the value is allowed and of the expected type"""
+        if not self.allowed:
+            return "Not allowed by the schema"
+        if self.types and not any(TYPES[name](value) for name in self.types):
+            return f"Expected {' or '.join(self.types)}, got {type_of(value)}"
+        return None
+
+    def members(self, key: str) -> Iterator[Compiled]:
+        """The schemas applying to an object member"""
+        found = False
+        if (compiled := self.properties.get(key)) is not None:
+            found = True
+            yield compiled
+        for pattern, compiled in self.patterns:
+            if pattern.search(key):
+                found = True
+                yield compiled
+        if not found and self.additional is not None:
+            yield self.additional
+
+    def item(self, index: int) -> Compiled | None:
+        """The schema applying to an array item"""
+        return self.prefix[index] if index < len(self.prefix) else self.items
+
+    def check(self, value: Any, tokens: Tokens, errors: Errors):
+        """Validate a value, collecting the errors"""
+        if isinstance(value, Literal):
+            value = value.value
+        for compiled in self.expanded:
+            compiled.check_node(value, tokens, errors)
+
+    def check_node(self, value: Any, tokens: Tokens, errors: Errors):
+        if message := self.reject(value):
+            errors.append((tokens, message))
+            return
+        for check in self.checks:
+            if message := check(value):
+                errors.append((tokens, message))
+        if isinstance(value, dict):
+            for key, member in value.items():
+                for compiled in self.members(key):
+                    compiled.check(member, (*tokens, str(key)), errors)
+        elif isinstance(value, list) and (self.prefix or self.items):
+            for index, item in enumerate(value):
+                if (schema := self.item(index)) is not None:
+                    schema.check(item, (*tokens, str(index)), errors)
+
+    def valid(self, value: Any) -> bool:
+        errors: Errors = []
+        self.check(value, (), errors)
+        return not errors
+
+
+def minimum(limit: Any, exclusive: bool = False) -> Check:
+    def check(value: Any) -> str | None:
+        if is_number(value) and (value <= limit if exclusive else value < limit):
+            return f"{show(value)} is less than {'or equal to ' if exclusive else ''}{show(limit)}"
+        return None
+
+    return check
+
+
+def maximum(limit: Any, exclusive: bool = False) -> Check:
+    def check(value: Any) -> str | None:
+        if is_number(value) and (value >= limit if exclusive else value > limit):
+            return (
+                f"{show(value)} is greater than {'or equal to ' if exclusive else ''}{show(limit)}"
+            )
+        return None
+
+    return check
+
+
+def multiple_of(divisor: Any) -> Check:
+    exact = Decimal(str(divisor))
+
+    def check(value: Any) -> str | None:
+        if is_number(value) and Decimal(str(value)) % exact:
+            return f"{show(value)} is not a multiple of {show(divisor)}"
+        return None
+
+    return check
+
+
+def length(limit: int, minimum: bool) -> Check:
+    def check(value: Any) -> str | None:
+        if isinstance(value, str) and (len(value) < limit if minimum else len(value) > limit):
+            return f"{show(value)} is too {'short' if minimum else 'long'}"
+        return None
+
+    return check
+
+
+def pattern(regex: str) -> Check:
+    compiled = re.compile(regex)
+
+    def check(value: Any) -> str | None:
+        if isinstance(value, str) and not compiled.search(value):
+            return f"{show(value)} does not match {regex!r}"
+        return None
+
+    return check
+
+
+def size(limit: int, minimum: bool, types: Any, unit: str) -> Check:
+    def check(value: Any) -> str | None:
+        if isinstance(value, types) and (len(value) < limit if minimum else len(value) > limit):
+            return (
+                f"Expected {'at least' if minimum else 'at most'} {limit} {unit}, got {len(value)}"
+            )
+        return None
+
+    return check
+
+
+def required(names: list[str]) -> Check:
+    def check(value: Any) -> str | None:
+        if isinstance(value, dict) and (missing := [name for name in names if name not in value]):
+            return f"Missing required properties: {', '.join(map(repr, missing))}"
+        return None
+
+    return check
+
+
+def dependent_required(dependencies: Mapping[str, list[str]]) -> Check:
+    checks = {name: required(names) for name, names in dependencies.items()}
+
+    def check(value: Any) -> str | None:
+        if isinstance(value, dict):
+            for name, dependency in checks.items():
+                if name in value and (message := dependency(value)):
+                    return f"{message} (required by {name!r})"
+        return None
+
+    return check
+
+
+def property_names(compiled: Compiled) -> Check:
+    def check(value: Any) -> str | None:
+        if isinstance(value, dict):
+            for key in value:
+                if not compiled.valid(str(key)):
+                    return f"Invalid property name {show(key)}"
+        return None
+
+    return check
+
+
+def enum(values: list[Any]) -> Check:
+    digests = {digest(value) for value in values}
+
+    def check(value: Any) -> str | None:
+        if digest(value) not in digests:
+            return f"Expected one of {', '.join(show(v) for v in values)}"
+        return None
+
+    return check
+
+
+def unique_items(enabled: bool) -> Check:
+    def check(value: Any) -> str | None:
+        if (
+            enabled
+            and isinstance(value, list)
+            and len({digest(item) for item in value}) < len(value)
+        ):
+            return "Items are not unique"
+        return None
+
+    return check
+
+
+def contains(compiled: Compiled) -> Check:
+    def check(value: Any) -> str | None:
+        if isinstance(value, list) and not any(compiled.valid(item) for item in value):
+            return "No item matches the `contains` schema"
+        return None
+
+    return check
+
+
+def any_of(schemas: list[Compiled]) -> Check:
+    def check(value: Any) -> str | None:
+        if not any(compiled.valid(value) for compiled in schemas):
+            return "Does not match any of the `anyOf` schemas"
+        return None
+
+    return check
+
+
+def one_of(schemas: list[Compiled]) -> Check:
+    def check(value: Any) -> str | None:
+        if (matches := sum(compiled.valid(value) for compiled in schemas)) != 1:
+            return f"Expected exactly one `oneOf` schema to match, {matches} did"
+        return None
+
+    return check
+
+
+def not_(compiled: Compiled) -> Check:
+    def check(value: Any) -> str | None:
+        return "Matches the `not` schema" if compiled.valid(value) else None
+
+    return check
+
+
+def if_then_else(condition: Compiled, then: Compiled | None, otherwise: Compiled | None) -> Check:
+    def check(value: Any) -> str | None:
+        branch, name = (then, "then") if condition.valid(value) else (otherwise, "else")
+        if branch is not None and not branch.valid(value):
+            return f"Does not match the `{name}` schema"
+        return None
+
+    return check
+
+
+class Compiler:
+    """
+    Compile a schema and the local schemas it references.
+
+    :param root: The root schema, used to resolve references
+    """
+
+    def __init__(self, root: Schema):
+        self.root = root
+        self.refs: dict[str, Compiled] = {}
+
+    def compile(self, schema: Schema) -> Compiled:
+        compiled = Compiled()
+        if schema is self.root:
+            self.refs["#"] = compiled
+        self.fill(compiled, schema)
+        return compiled
+
+    def ref(self, ref: str) -> Compiled:
+        """Compile a referenced schema, only once to support recursive schemas"""
+        if (compiled := self.refs.get(ref)) is None:
+            if not ref.startswith("#"):
+                raise ValueError(f"Unsupported reference: {ref}")
+            target: Any = self.root
+            try:
+                for token in parse_pointer(unquote(ref[1:])):
+                    target = target[int(token) if isinstance(target, list) else token]
+            except (KeyError, IndexError, ValueError, TypeError):
+                raise ValueError(f"Unresolvable reference: {ref}") from None
+            compiled = self.refs[ref] = Compiled()
+            self.fill(compiled, target)
+        return compiled
+
+    def fill(self, compiled: Compiled, schema: Schema):
+        if isinstance(schema, bool):
+            compiled.allowed = schema
+            return
+        types = schema.get("type", [])
+        compiled.types = [types] if isinstance(types, str) else list(types)
+        compiled.deep = not DEEP_KEYWORDS.isdisjoint(schema)
+        compiled.checks = [
+            check
+            for keyword, value in schema.items()
+            if (check := self.keyword(keyword, value, schema))
+        ]
+        if "$ref" in schema:
+            compiled.also.append(self.ref(schema["$ref"]))
+        compiled.also.extend(self.compile(subschema) for subschema in schema.get("allOf", ()))
+        self.children(compiled, schema)
+
+    def children(self, compiled: Compiled, schema: Mapping[str, Any]):
+        compiled.properties = {
+            name: self.compile(subschema)
+            for name, subschema in schema.get("properties", {}).items()
+        }
+        compiled.patterns = [
+            (re.compile(regex), self.compile(subschema))
+            for regex, subschema in schema.get("patternProperties", {}).items()
+        ]
+        if "additionalProperties" in schema:
+            compiled.additional = self.compile(schema["additionalProperties"])
+        items = schema.get("items")
+        if isinstance(items, list):
+            # Legacy tuple validation
+            compiled.prefix = [self.compile(subschema) for subschema in items]
+            items = schema.get("additionalItems")
+        else:
+            compiled.prefix = [
+                self.compile(subschema) for subschema in schema.get("prefixItems", ())
+            ]
+        if items is not None:
+            compiled.items = self.compile(items)
+
+    def keyword(self, keyword: str, value: Any, schema: Mapping[str, Any]) -> Check | None:
+        if builder := KEYWORDS.get(keyword):
+            return builder(self, value, schema)
+        return None
+
+
+def if_keyword(compiler: Compiler, value: Any, schema: Mapping[str, Any]) -> Check:
+    then, otherwise = schema.get("then"), schema.get("else")
+    return if_then_else(
+        compiler.compile(value),
+        compiler.compile(then) if then is not None else None,
+        compiler.compile(otherwise) if otherwise is not None else None,
+    )
+
+
+def numeric(builder: Callable[..., Check], exclusive: bool = False):
+    # Draft 4 boolean `exclusiveMinimum` and `exclusiveMaximum` modifiers
+    legacy = "exclusiveMinimum" if builder is minimum else "exclusiveMaximum"
+
+    def build(compiler: Compiler, value: Any, schema: Mapping[str, Any]) -> Check | None:
+        if isinstance(value, bool):
+            return None
+        return builder(value, exclusive or schema.get(legacy) is True)
+
+    return build
+
+
+KEYWORDS: dict[str, Callable[[Compiler, Any, Mapping[str, Any]], Check | None]] = {
+    "minimum": numeric(minimum),
+    "maximum": numeric(maximum),
+    "exclusiveMinimum": numeric(minimum, exclusive=True),
+    "exclusiveMaximum": numeric(maximum, exclusive=True),
+    "multipleOf": lambda compiler, value, schema: multiple_of(value),
+    "minLength": lambda compiler, value, schema: length(value, minimum=True),
+    "maxLength": lambda compiler, value, schema: length(value, minimum=False),
+    "pattern": lambda compiler, value, schema: pattern(value),
+    "minProperties": lambda compiler, value, schema: size(value, True, dict, "properties"),
+    "maxProperties": lambda compiler, value, schema: size(value, False, dict, "properties"),
+    "minItems": lambda compiler, value, schema: size(value, True, ARRAYS, "items"),
+    "maxItems": lambda compiler, value, schema: size(value, False, ARRAYS, "items"),
+    "required": lambda compiler, value, schema: required(value),
+    "dependentRequired": lambda compiler, value, schema: dependent_required(value),
+    "propertyNames": lambda compiler, value, schema: property_names(compiler.compile(value)),
+    "enum": lambda compiler, value, schema: enum(value),
+    "const": lambda compiler, value, schema: enum([value]),
+    "uniqueItems": lambda compiler, value, schema: unique_items(value),
+    "contains": lambda compiler, value, schema: contains(compiler.compile(value)),
+    "anyOf": lambda compiler, value, schema: any_of([compiler.compile(s) for s in value]),
+    "oneOf": lambda compiler, value, schema: one_of([compiler.compile(s) for s in value]),
+    "not": lambda compiler, value, schema: not_(compiler.compile(value)),
+    "if": if_keyword,
+}
+"""The supported keywords compilers (structural keywords excepted)"""
+
+
+class Locator:
+    """
+    The locations of values in their source, scanning each container at most once.
+
+    :param src: The document source
+    """
+
+    def __init__(self, src: str):
+        from . import scan
+        from .positions import Positions
+
+        self.src = src
+        self.lines = Positions(src)
+        # The offset of each value reached so far and the containers already scanned
+        self.offsets: dict[Tokens, int] = {(): scan.skip_trivia(src, 0)}
+        self.scanned: set[Tokens] = set()
+
+    def offset(self, tokens: Tokens) -> int:
+        """
+        The offset of a value.
+
+        :raises KeyError: if the path does not resolve
+        :raises JSONDecodeError: on structural errors met while scanning
+        """
+        from . import scan
+
+        for depth in range(len(tokens)):
+            container = tokens[:depth]
+            if container not in self.scanned:
+                entries, _ = scan.entries(self.src, self.offsets[container])
+                for index, entry in enumerate(entries):
+                    token = str(index) if entry.key is None else entry.key
+                    self.offsets[(*container, token)] = entry.value
+                self.scanned.add(container)
+        return self.offsets[tokens]
+
+    def __call__(self, tokens: Tokens) -> tuple[int | None, int | None]:
+        """The line and column of a value, `None` if it can't be located"""
+        try:
+            offset = self.offset(tokens)
+        except (KeyError, ValueError):
+            return None, None
+        return self.lines.location(offset)
+
+
+class Frame:
+    """An opened container while streaming"""
+
+    def __init__(
+        self, schemas: list[Compiled], tokens: Tokens, is_object: bool, location: tuple[int, int]
+    ):
+        self.schemas = schemas
+        self.tokens = tokens
+        self.is_object = is_object
+        self.lineno, self.colno = location
+        self.keys: dict[str, None] = {}
+        self.count = 0
+        self.key = ""
+
+    @property
+    def value(self) -> dict | range:
+        """The container as seen by the shallow keywords"""
+        return self.keys if self.is_object else range(self.count)
+
+    def child(self) -> tuple[list[Compiled], Tokens]:
+        """The schemas and path of the next child"""
+        if self.is_object:
+            token = self.key
+            self.keys[token] = None
+            found = [
+                c
+                for schema in self.schemas
+                for member in schema.members(token)
+                for c in member.expanded
+            ]
+        else:
+            token = str(self.count)
+            found = [
+                c
+                for schema in self.schemas
+                if (item := schema.item(self.count))
+                for c in item.expanded
+            ]
+            self.count += 1
+        return found, (*self.tokens, token)
+
+
+class Validator:
+    """
+    A compiled schema.
+
+    :param schema: The JSON Schema
+    :raises ValueError: if the schema references can't be resolved
+    """
+
+    def __init__(self, schema: Schema):
+        self.schema = schema
+        self.root = Compiler(schema).compile(schema)
+
+    def errors(self, doc: Any, src: str | None = None) -> list[ValidationError]:
+        """
+        Validate a parsed document, collecting all the errors.
+
+        :param doc: The parsed document
+        :param src: The document source, used to locate the errors
+        :returns: The errors in document order, empty if the document is valid
+        """
+        found: Errors = []
+        self.root.check(doc, (), found)
+        locate = Locator(src) if src and found else None
+        return [
+            ValidationError(message, format_pointer(tokens), *(locate(tokens) if locate else ()))
+            for tokens, message in found
+        ]
+
+    def validate(self, doc: Any, src: str | None = None):
+        """
+        Validate a parsed document.
+
+        :param doc: The parsed document
+        :param src: The document source, used to locate the error
+        :raises ValidationError: on the first error
+        """
+        if errors := self.errors(doc, src):
+            raise errors[0]
+
+    def validate_stream(
+        self, input: str | TextIO | Iterable[str], dialect: str | Features = "json"
+    ):
+        """
+        Validate a document while parsing it, without building its tree.
+
+        Containers are only built when a keyword needs their whole value (ie. `enum` or `anyOf`),
+        in which case the errors they contain are located at the container start.
+
+        :param input: The document as a string, a file-like object or an iterable of chunks
+        :param dialect: The dialect name or features of the document
+        :raises ValidationError: on the first error
+        :raises JSONDecodeError: on the first syntax error
+        """
+        if isinstance(input, str):
+            chunks: Iterable[str] = (
+                input[i : i + ev.CHUNK_SIZE] for i in range(0, len(input), ev.CHUNK_SIZE)
+            )
+        elif hasattr(input, "read"):
+            chunks = iter(lambda: input.read(ev.CHUNK_SIZE), "")  # type: ignore[union-attr]
+        else:
+            chunks = input
+        reader = ev.Reader(dialect)
+        events = reader.events(chunks)
+        stack: list[Frame] = []
+        for event in events:
+            if event.kind == ev.KEY:
+                stack[-1].key = event.value
+            elif event.kind in (ev.END_OBJECT, ev.END_ARRAY):
+                self.close(stack.pop())
+            else:
+                self.open(event, events, stack, reader)
+
+    def open(
+        self, event: ev.Event, events: Iterator[ev.Event], stack: list[Frame], reader: ev.Reader
+    ):
+        """Validate a value as soon as it starts"""
+        schemas, tokens = stack[-1].child() if stack else (self.root.expanded, ())
+        location = reader.location()
+        errors: Errors = []
+        if event.kind == ev.SCALAR or any(schema.deep for schema in schemas):
+            # Scalars and containers requiring their whole value are fully checked
+            value = ev.build(event, events)
+            for schema in schemas:
+                schema.check_node(value, tokens, errors)
+        else:
+            frame = Frame(schemas, tokens, event.kind == ev.START_OBJECT, location)
+            errors = [
+                (tokens, message) for schema in schemas if (message := schema.reject(frame.value))
+            ]
+            stack.append(frame)
+        if errors:
+            tokens, message = errors[0]
+            raise ValidationError(message, format_pointer(tokens), *location)
+
+    def close(self, frame: Frame):
+        """Validate the container-level keywords of a closed container"""
+        value = frame.value
+        for schema in frame.schemas:
+            for check in schema.checks:
+                if message := check(value):
+                    raise ValidationError(
+                        message, format_pointer(frame.tokens), frame.lineno, frame.colno
+                    )
+
+
+@lru_cache(maxsize=256)
+def compile_cached(schema: str) -> Validator:
+    return Validator(json.loads(schema))
+
+
+def compile(schema: Schema) -> Validator:
+    """
+    Compile a JSON Schema into a [Validator][json4humans.schema.Validator].
+
+    Compiled schemas are cached by content, so compiling the same schema again is cheap.
+
+    :param schema: The JSON Schema
+    :raises ValueError: if the schema references can't be resolved
+    """
+    return compile_cached(json.dumps(schema, sort_keys=True))
+
+
+def validate(doc: Any, schema: Schema, src: str | None = None):
+    """
+    Validate a parsed document against a JSON Schema.
+
+    :param doc: The parsed document
+    :param schema: The JSON Schema
+    :param src: The document source, used to locate the error
+    :raises ValidationError: on the first error
+    """
+    compile(schema).validate(doc, src)
+
+
+def errors(doc: Any, schema: Schema, src: str | None = None) -> list[ValidationError]:
+    """
+    Validate a parsed document against a JSON Schema, collecting all the errors.
+
+    :param doc: The parsed document
+    :param schema: The JSON Schema
+    :param src: The document source, used to locate the errors
+    :returns: The errors in document order, empty if the document is valid
+    """
+    return compile(schema).errors(doc, src)
+
+
+def validate_stream(
+    input: str | TextIO | Iterable[str], schema: Schema, dialect: str | Features = "json"
+):
+    """
+    Validate a document against a JSON Schema while parsing it.
+
+    See [Validator.validate_stream()][json4humans.schema.Validator.validate_stream].
+
+    :param input: The document as a string, a file-like object or an iterable of chunks
+    :param schema: The JSON Schema
+    :param dialect: The dialect name or features of the document
+    :raises ValidationError: on the first error
+    :raises JSONDecodeError: on the first syntax error
+    """
+    compile(schema).validate_stream(input, dialect)
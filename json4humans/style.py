@@ -4,15 +4,30 @@ This modules provides some helpers to handle style preservation.
 
 from __future__ import annotations
 
-from collections.abc import Callable
-from typing import Generic, TypeAlias, TypeVar, cast
+from collections.abc import Callable, Iterable
+from typing import Any, Generic, TypeAlias, TypeVar, cast
 
-from lark import Token
 from lark.visitors import Transformer, v_args
 
 from . import wsc
-from .protocol import JSONEncoder
-from .types import WSC, Array, JSONType, Key, Member, Object, TupleWithTrailingComa, Value
+from .numeric import NumericArray
+from .protocol import JSONEncoder, load_options
+from .types import (
+    WSC,
+    Array,
+    Float,
+    Integer,
+    JSONType,
+    Key,
+    Member,
+    Object,
+    TupleWithTrailingComa,
+    Value,
+)
+
+
+class TrailingComa(list[WSC]):
+    """The whitespaces and comments following a trailing coma"""
 
 
 class StylePreservingTransformer(Transformer):
@@ -21,32 +36,32 @@ class StylePreservingTransformer(Transformer):
     """
 
     @v_args(inline=True)
-    def array(
-        self, elements: TupleWithTrailingComa[JSONType], tail: list[WSC | str] | None = None
-    ) -> Array:
-        return Array(elements, tail=tail, trailing_coma=getattr(elements, "trailing_coma", False))
+    def array(self, content: TupleWithTrailingComa[Value] | list[WSC]) -> Any:
+        if isinstance(content, TupleWithTrailingComa):
+            return self._array(content, content.tail, content.trailing_coma)
+        # An empty array only has its tail
+        return self._array((), content, False)
 
-    @v_args(inline=True)
-    def value_list(self, *values) -> TupleWithTrailingComa[JSONType]:
-        return TupleWithTrailingComa[JSONType](
-            (value for value in values if isinstance(value, JSONType)),
-            trailing_coma=isinstance(values[-1], Token),
-        )
+    def value_list(self, values: list) -> TupleWithTrailingComa[Value]:
+        if isinstance(values[-1], TrailingComa):
+            return TupleWithTrailingComa[Value](values[:-1], trailing_coma=True, tail=values[-1])
+        return TupleWithTrailingComa[Value](values)
 
     @v_args(inline=True)
-    def object(
-        self, members: TupleWithTrailingComa[Member], tail: list[WSC | str] | None = None, last=None
-    ) -> Object:
-        o = Object(members)
-        o.json_container_tail = wsc.parse_list(tail)
-        return o
+    def object(self, content: TupleWithTrailingComa[Member] | list[WSC]) -> Any:
+        if isinstance(content, TupleWithTrailingComa):
+            return self._object(content, content.tail, content.trailing_coma)
+        # An empty object only has its tail
+        return self._object((), content, False)
+
+    def member_list(self, members: list) -> TupleWithTrailingComa[Member]:
+        if isinstance(members[-1], TrailingComa):
+            return TupleWithTrailingComa[Member](members[:-1], trailing_coma=True, tail=members[-1])
+        return TupleWithTrailingComa[Member](members)
 
     @v_args(inline=True)
-    def member_list(self, *members) -> TupleWithTrailingComa[Member]:
-        return TupleWithTrailingComa[Member](
-            (cast(Member, member) for member in members if isinstance(member, tuple)),
-            trailing_coma=isinstance(members[-1], Token),
-        )
+    def trailing_coma(self, tail: list[WSC]) -> TrailingComa:
+        return TrailingComa(tail)
 
     def member(self, kv: list[Key | Value]) -> Member:
         assert len(kv) == 2
@@ -54,10 +69,51 @@ class StylePreservingTransformer(Transformer):
 
     @v_args(inline=True)
     def pack_wsc(self, before: list[WSC], value: JSONType, after: list[WSC]) -> JSONType:
-        value.json_before = before
-        value.json_after = after
+        if isinstance(value, JSONType):
+            value.json_before = before
+            value.json_after = after
         return value
 
+    def _array(self, elements: Iterable[Value], tail: list[WSC], trailing_coma: bool) -> Any:
+        """
+        Build an array, honoring the `array_hook` and the `numeric_arrays` options.
+        """
+        options = load_options.get()
+        if options.array_hook is not None:
+            return options.array_hook(list(elements))
+        if options.numeric_arrays and (
+            numeric := NumericArray.pack(cast(tuple, elements), tail, trailing_coma)
+        ):
+            return numeric
+        return Array(elements, tail=cast(list[WSC | str], tail), trailing_coma=trailing_coma)
+
+    def _object(self, members: Iterable[Member], tail: list[WSC], trailing_coma: bool) -> Any:
+        """
+        Build an object, honoring the `object_pairs_hook` and `object_hook`.
+        """
+        options = load_options.get()
+        if options.object_pairs_hook is not None:
+            return options.object_pairs_hook(list(members))
+        if options.object_hook is not None:
+            return options.object_hook(dict(members))
+        o = Object(members)
+        o.json_container_tail = tail
+        o.json_container_trailing_coma = trailing_coma
+        return o
+
+    def _number(self, lexeme: str, **kwargs) -> Any:
+        """
+        Build a number from its source lexeme, honoring the `parse_float` and `parse_int` hooks.
+        """
+        options = load_options.get()
+        if "." in lexeme or "e" in lexeme or "E" in lexeme:
+            if options.parse_float is not None:
+                return options.parse_float(lexeme)
+            return Float(lexeme, raw=lexeme, **kwargs)
+        if options.parse_int is not None:
+            return options.parse_int(lexeme)
+        return Integer(lexeme, raw=lexeme, **kwargs)
+
     value = pack_wsc
     key = pack_wsc
 
@@ -80,13 +136,13 @@ class with_style(Generic[Encoder, T]):
         self.fn = fn
 
     def __call__(self, obj: T) -> str:
-        return "".join(
-            (
-                "".join(wsc.encode_wsc(w) for w in getattr(obj, "json_before", [])),
-                self.fn(self.encoder, obj),
-                "".join(wsc.encode_wsc(w) for w in getattr(obj, "json_after", [])),
-            )
-        )
+        encoded = self.fn(self.encoder, obj)
+        # Most values have no surrounding whitespaces nor comments
+        if before := getattr(obj, "json_before", None):
+            encoded = "".join(map(wsc.encode_wsc, before)) + encoded
+        if after := getattr(obj, "json_after", None):
+            encoded += "".join(map(wsc.encode_wsc, after))
+        return encoded
 
     def __get__(self, instance, owner) -> JSONEncoderBoundMethod:
         self.encoder = instance
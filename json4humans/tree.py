@@ -0,0 +1,459 @@
+"""
+This module provides helpers operating on whole style preserving trees.
+
+[clone()][json4humans.tree.clone] is a fast replacement of [copy.deepcopy()][copy.deepcopy]
+for parsed documents: containers are copied iteratively (so any depth is supported),
+plain immutable values are shared and style preserving scalars are copied without
+going through [pickle protocol][object.__reduce_ex__] and their constructors:
+
+```python
+from json4humans import jsonc
+from json4humans.tree import clone
+
+doc = jsonc.loads(src)
+copy = clone(doc)
+```
+
+[to_python()][json4humans.tree.to_python] unwraps a tree into plain builtins
+(ie. to hand it to other libraries) and [from_python()][json4humans.tree.from_python]
+wraps plain builtins into style preserving types, optionally borrowing the style of a template tree:
+
+```python
+from json4humans.tree import from_python, to_python
+
+data = to_python(doc)  # Only dict, list, str, int, float, bool and None
+data["version"] += 1
+doc = from_python(data, template=doc)  # Same whitespaces, comments and quotes
+```
+"""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Callable, Iterator
+from copy import deepcopy
+from functools import partial
+from operator import attrgetter
+from typing import Any, TypeVar
+
+from .numeric import NumericArray
+from .query import layout
+from .types import (
+    POSITIONS,
+    Array,
+    Container,
+    Float,
+    HexInteger,
+    Identifier,
+    Integer,
+    JSONType,
+    Literal,
+    Object,
+    Quote,
+    String,
+)
+
+T = TypeVar("T")
+
+IMMUTABLES = (str, int, float, bool, type(None))
+"""The plain values shared by clones"""
+
+
+ALLOCATORS: dict[type, Callable[[Any], Any]] = {}
+"""The uninitialized instances factories by class, filled on first use"""
+
+
+def allocator(cls: Any) -> Callable[[Any], Any]:
+    """
+    Get the function creating an uninitialized instance of a class from an existing one.
+
+    Scalars are created from the builtin value they subclass, containers are created empty.
+    """
+    if (factory := ALLOCATORS.get(cls)) is not None:
+        return factory
+    base: Any
+    for base in (str, int, float):
+        if issubclass(cls, base):
+            factory = partial(base.__new__, cls)
+            break
+    else:
+        if issubclass(cls, (dict, list)):
+            factory = lambda node: cls.__new__(cls)  # noqa: E731
+        else:
+            factory = lambda node: object.__new__(cls)  # noqa: E731
+    ALLOCATORS[cls] = factory
+    return factory
+
+
+def shallow(node: Any, share_trivia: bool) -> Any:
+    """Copy a node and its attributes, but neither its items nor its members"""
+    cls = type(node)
+    if cls in IMMUTABLES:
+        return node
+    if cls is dict or cls is list:
+        return cls()
+    if (attrs := getattr(node, "__dict__", None)) is None:
+        return deepcopy(node)
+    copy = allocator(cls)(node)
+    attributes = copy.__dict__
+    attributes.update(attrs)
+    if POSITIONS in attributes:
+        # Positions are bound to the parsed nodes
+        del attributes[POSITIONS]
+    if cls is NumericArray:
+        attributes["data"] = array(node.data.typecode, node.data)
+    if not share_trivia:
+        for name, value in attributes.items():
+            if type(value) is list:
+                attributes[name] = list(value)
+    return copy
+
+
+def clone(node: T, share_trivia: bool = True) -> T:
+    """
+    Copy a document or a node, much faster than [copy.deepcopy()][copy.deepcopy].
+
+    Every [Object][json4humans.types.Object], [Array][json4humans.types.Array],
+    key and style preserving scalar is copied
+    (so they can be modified or moved independently from the original ones)
+    while builtin immutable values are shared.
+    The [source positions][json4humans.positions] are not kept.
+
+    :param node: The document or node to copy
+    :param share_trivia: Share the whitespaces and comments lists
+                         (and other list attributes) with the original nodes.
+                         This is safe as long as these lists are replaced rather than modified in place,
+                         which is what json4humans does.
+    """
+    root = shallow(node, share_trivia)
+    stack: list[tuple[Any, Any]] = [(node, root)] if isinstance(node, (dict, list)) else []
+    while stack:
+        src, out = stack.pop()
+        if isinstance(src, dict):
+            for key, value in src.items():
+                copy = shallow(value, share_trivia)
+                out[shallow(key, share_trivia)] = copy
+                if isinstance(value, (dict, list)):
+                    stack.append((value, copy))
+        elif not isinstance(src, NumericArray):
+            # Numeric arrays have been copied with their items
+            items = [shallow(value, share_trivia) for value in src]
+            list.extend(out, items)
+            stack.extend(
+                (value, copy) for value, copy in zip(src, items) if isinstance(value, (dict, list))
+            )
+    return root
+
+
+def same(value: Any) -> Any:
+    return value
+
+
+def new_dict(node: Any) -> dict:
+    return {}
+
+
+def new_list(node: Any) -> list:
+    return []
+
+
+UNWRAPPERS: dict[type, Callable[[Any], Any]] = {
+    str: same,
+    int: same,
+    float: same,
+    bool: same,
+    type(None): same,
+    dict: new_dict,
+    list: new_list,
+    Object: new_dict,
+    Array: new_list,
+    String: str.__str__,
+    Identifier: str.__str__,
+    Integer: int.__int__,
+    HexInteger: int.__int__,
+    Float: float.__float__,
+    Literal: attrgetter("value"),
+}
+"""The builtin values factories by class, filled on first use for the other classes"""
+
+
+def unwrapper(cls: Any) -> Callable[[Any], Any]:
+    """Get the function converting an instance of a class into a builtin value (or an empty container)"""
+    factory: Callable[[Any], Any]
+    for base, factory in (
+        (Literal, attrgetter("value")),
+        (bool, same),
+        (str, str.__str__),
+        (int, int.__int__),
+        (float, float.__float__),
+        (dict, new_dict),
+        (list, new_list),
+        (tuple, new_list),
+    ):
+        if issubclass(cls, base):
+            break
+    else:
+        factory = same
+    UNWRAPPERS[cls] = factory
+    return factory
+
+
+def to_python(tree: Any) -> Any:
+    """
+    Convert a tree into plain builtins, dropping its style.
+
+    [Objects][json4humans.types.Object] become `dict`, [Arrays][json4humans.types.Array] become `list`,
+    keys and strings become `str`, numbers become `int` and `float`
+    and [Literals][json4humans.types.Literal] are replaced by their value.
+    The result shares nothing with the tree.
+
+    :param tree: The tree or node to convert
+    """
+    unwrappers = UNWRAPPERS
+    root = (unwrappers.get(type(tree)) or unwrapper(type(tree)))(tree)
+    stack: list[tuple[Any, Any]] = [(tree, root)] if type(root) in (dict, list) else []
+    while stack:
+        src, out = stack.pop()
+        if type(out) is dict:
+            for key, value in src.items():
+                cls = type(value)
+                item = out[str.__str__(key)] = (unwrappers.get(cls) or unwrapper(cls))(value)
+                if type(item) is dict or type(item) is list:
+                    stack.append((value, item))
+        else:
+            append = out.append
+            for value in src:
+                cls = type(value)
+                item = (unwrappers.get(cls) or unwrapper(cls))(value)
+                append(item)
+                if type(item) is dict or type(item) is list:
+                    stack.append((value, item))
+    return root
+
+
+def style(node: JSONType, like: Any):
+    """Borrow the whitespaces and comments surrounding a template node (if any)"""
+    if isinstance(like, JSONType):
+        node.json_before = list(like.json_before)
+        node.json_after = list(like.json_after)
+    else:
+        node.json_before = []
+        node.json_after = []
+
+
+def wrap_string(value: str, like: Any) -> Any:
+    if isinstance(like, str) and isinstance(like, JSONType) and like == value:
+        return shallow(like, share_trivia=False)
+    node = str.__new__(String, value)
+    style(node, like)
+    node.quote = getattr(like, "quote", Quote.DOUBLE)
+    node.linebreaks = []
+    return node
+
+
+def wrap_integer(value: int, like: Any) -> Any:
+    if isinstance(like, Integer) and like == value:
+        return shallow(like, share_trivia=False)
+    node = int.__new__(HexInteger if isinstance(like, HexInteger) else Integer, value)
+    style(node, like)
+    node.prefixed = False
+    node.raw = None
+    return node
+
+
+def wrap_float(value: float, like: Any) -> Any:
+    if isinstance(like, Float) and like == value:
+        return shallow(like, share_trivia=False)
+    node = float.__new__(Float, value)
+    style(node, like)
+    node.prefixed = False
+    node.raw = None
+    node.leading_point = False
+    node.significand = None
+    return node
+
+
+def wrap_literal(value: bool | None, like: Any) -> Any:
+    if isinstance(like, Literal) and like.value is value:
+        return shallow(like, share_trivia=False)
+    node: Literal = object.__new__(Literal)
+    style(node, like)
+    node.value = value
+    return node
+
+
+def wrap_container(node: Any, like: Any) -> Any:
+    style(node, like)
+    if isinstance(like, Container) and isinstance(like, dict) is isinstance(node, dict):
+        node.json_container_head = list(like.json_container_head)
+        node.json_container_tail = list(like.json_container_tail)
+        node.json_container_trailing_coma = like.json_container_trailing_coma
+    else:
+        node.json_container_head = []
+        node.json_container_tail = []
+        node.json_container_trailing_coma = False
+    return node
+
+
+def wrap_object(value: dict, like: Any) -> Any:
+    return wrap_container(Object.__new__(Object), like)
+
+
+def wrap_array(value: list | tuple, like: Any) -> Any:
+    return wrap_container(list.__new__(Array), like)
+
+
+def keep(value: Any, like: Any) -> Any:
+    return value
+
+
+WRAPPERS: dict[type, Callable[[Any, Any], Any]] = {
+    str: wrap_string,
+    int: wrap_integer,
+    float: wrap_float,
+    bool: wrap_literal,
+    type(None): wrap_literal,
+    dict: wrap_object,
+    list: wrap_array,
+    tuple: wrap_array,
+}
+"""The style preserving nodes factories by class, filled on first use for the other classes"""
+
+
+def wrapper(cls: Any) -> Callable[[Any, Any], Any]:
+    """Get the function wrapping an instance of a class into a style preserving node"""
+    factory: Callable[[Any, Any], Any]
+    for base, factory in (
+        (JSONType, keep),
+        (bool, wrap_literal),
+        (str, wrap_string),
+        (int, wrap_integer),
+        (float, wrap_float),
+        (dict, wrap_object),
+        (list, wrap_array),
+        (tuple, wrap_array),
+    ):
+        if issubclass(cls, base):
+            break
+    else:
+        factory = keep
+    WRAPPERS[cls] = factory
+    return factory
+
+
+def detach(*nodes: Any):
+    """Only keep the whitespaces borrowed from a sibling template node, not its comments"""
+    for node in nodes:
+        if isinstance(node, JSONType):
+            node.json_before = layout(node.json_before)
+            node.json_after = layout(node.json_after)
+            if isinstance(node, Container):
+                node.json_container_head = layout(node.json_container_head)
+                node.json_container_tail = layout(node.json_container_tail)
+
+
+def restyle(entries: list, i: int, count: int, match: int, leading: Any, node: Any):
+    """
+    Fix the layout of an entry borrowing the style of a template entry at another position.
+
+    The first entry leading whitespaces and the last entry trailing whitespaces
+    (closing the container) always follow the first and the last template entries,
+    and the trailing comments of an entry moving from or to the end of the container are dropped.
+
+    :param entries: The template entries as `(leading, value)` pairs
+                    (the leading trivia being held by the key for members)
+    :param i: The entry position
+    :param count: The number of entries
+    :param match: The position of the template entry the style is borrowed from
+    :param leading: The node holding the entry leading trivia (the key for members)
+    :param node: The entry value
+    """
+    last = len(entries) - 1
+    if (i == 0) != (match == 0) and isinstance(leading, JSONType):
+        like = entries[0 if i == 0 else min(1, last)][0]
+        if isinstance(like, JSONType):
+            trivia = leading.json_before
+            comments = trivia[: len(trivia) - len(layout(trivia))]
+            leading.json_before = comments + layout(like.json_before)
+    if (i == count - 1) != (match == last) and isinstance(node, JSONType):
+        source = last if i == count - 1 else last - 1
+        like = entries[source][1] if source >= 0 else None
+        node.json_after = layout(like.json_after) if isinstance(like, JSONType) else []
+
+
+def wrap_members(src: dict, out: dict, like: Any) -> Iterator[tuple[Any, Any, Any]]:
+    """
+    Wrap the members of an object, styled like a template object.
+
+    :returns: The containers to fill, with their source and template
+    """
+    wrappers = WRAPPERS
+    entries = list(like.items()) if isinstance(like, dict) else []
+    positions = {key: i for i, key in enumerate(like)} if entries else {}
+    for i, (key, value) in enumerate(src.items()):
+        own = key in positions
+        match = positions[key] if own else min(i, len(entries) - 1)
+        like_key, like_value = entries[match] if entries else (None, None)
+        node_key = (wrappers.get(type(key)) or wrapper(type(key)))(key, like_key)
+        node = out[node_key] = (wrappers.get(type(value)) or wrapper(type(value)))(
+            value, like_value
+        )
+        if entries:
+            leading = node_key if node_key is not key else None
+            trailing = node if node is not value else None
+            if not own:
+                detach(leading, trailing)
+            restyle(entries, i, len(src), match, leading, trailing)
+        if node is not value and isinstance(node, Container):
+            yield value, node, like_value if own else None
+
+
+def wrap_items(src: list | tuple, out: list, like: Any) -> Iterator[tuple[Any, Any, Any]]:
+    """
+    Wrap the items of an array, styled like a template array.
+
+    :returns: The containers to fill, with their source and template
+    """
+    wrappers = WRAPPERS
+    entries = [(item, item) for item in like] if isinstance(like, list) else []
+    items = []
+    for i, value in enumerate(src):
+        own = i < len(entries)
+        match = min(i, len(entries) - 1)
+        like_value = entries[match][1] if entries else None
+        node = (wrappers.get(type(value)) or wrapper(type(value)))(value, like_value)
+        if entries and node is not value:
+            if not own:
+                detach(node)
+            restyle(entries, i, len(src), match, node, node)
+        items.append(node)
+        if node is not value and isinstance(node, Container):
+            yield value, node, like_value if own else None
+    out.extend(items)
+
+
+def from_python(data: Any, template: Any = None) -> Any:
+    """
+    Wrap plain builtins into style preserving types.
+
+    Without template, the result has a compact layout.
+    With a template tree (ie. the document `data` has been extracted from),
+    every node borrows the whitespaces, comments, quotes, number representations
+    and containers layout of its template node:
+    the member with the same key for objects, the item at the same position for arrays.
+    New members and items only borrow the whitespaces of their siblings.
+
+    Style preserving nodes found in `data` are kept as-is.
+
+    :param data: The builtin values to wrap
+    :param template: A tree to borrow the style from
+    """
+    root = (WRAPPERS.get(type(data)) or wrapper(type(data)))(data, template)
+    stack: list[tuple[Any, Any, Any]] = []
+    if root is not data and isinstance(root, Container):
+        stack.append((data, root, template))
+    while stack:
+        src, out, like = stack.pop()
+        stack.extend(
+            wrap_members(src, out, like) if isinstance(out, dict) else wrap_items(src, out, like)
+        )
+    return root
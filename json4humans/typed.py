@@ -0,0 +1,358 @@
+"""
+This module decodes documents straight into typed Python objects.
+
+Decoders are compiled once per target type (see [decoder()][json4humans.typed.decoder])
+and consume the [events][json4humans.events] of the document top-down,
+so the [JSONType][json4humans.types.JSONType] tree is never built
+and only the target objects are allocated.
+
+Supported types are:
+
+- `str`, `int`, `float` (accepting integers), `bool` and `None`
+- `Any` and `object` (decoded as plain `dict`, `list` and scalars)
+- `list[T]`, `set[T]`, `frozenset[T]`, `tuple[T, ...]`, `tuple[T1, T2]` and `dict[str, T]`
+- `typing.Literal` and `enum.Enum` subclasses
+- dataclasses and `TypedDict` (unknown keys are rejected)
+- unions of the above (ie. `T | None`), decoded by the first member accepting the first token of the value
+"""
+from __future__ import annotations
+
+import dataclasses
+import enum
+import types
+import typing
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from .errors import JSONDecodeError
+from .events import END_ARRAY, END_OBJECT, SCALAR, START_ARRAY, START_OBJECT, Event, Reader, build
+from .features import Features
+from .query import format_pointer
+
+Events = Iterator[Event]
+
+
+class Invalid(Exception):
+    """A value not matching its type, raised while decoding"""
+
+    def __init__(self, msg: str, pos: int):
+        super().__init__(msg)
+        self.msg = msg
+        self.pos = pos
+        self.tokens: list[str] = []
+
+
+def kind_of(event: Event) -> str:
+    """The JSON type name of the value starting with an event"""
+    if event.kind == START_OBJECT:
+        return "object"
+    if event.kind == START_ARRAY:
+        return "array"
+    match event.value:
+        case None:
+            return "null"
+        case bool():
+            return "boolean"
+        case int():
+            return "integer"
+        case float():
+            return "number"
+    return "string"
+
+
+class Decoder:
+    """Decode a value of a given type from its events"""
+
+    expected: str = "any"
+    """The description of the expected values"""
+
+    def accepts(self, event: Event) -> bool:
+        """Wether a value starting with this event may be decoded"""
+        return True
+
+    def decode(self, event: Event, events: Events) -> Any:
+        return build(event, events)
+
+    def __call__(self, event: Event, events: Events) -> Any:
+        """
+        Decode the value starting with an event.
+
+        :param event: The first event of the value
+        :param events: The following events, consumed up to the end of the value
+        :raises Invalid: if the value does not match the type
+        """
+        if not self.accepts(event):
+            raise Invalid(f"Expected {self.expected}, got {kind_of(event)}", event.pos)
+        return self.decode(event, events)
+
+
+class ScalarDecoder(Decoder):
+    def __init__(
+        self, expected: str, accepts: Callable[[Any], bool], convert: Callable[[Any], Any]
+    ):
+        self.expected = expected
+        self.predicate = accepts
+        self.convert = convert
+
+    def accepts(self, event: Event) -> bool:
+        return event.kind == SCALAR and self.predicate(event.value)
+
+    def decode(self, event: Event, events: Events) -> Any:
+        return self.convert(event.value)
+
+
+def is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def identity(value: Any) -> Any:
+    return value
+
+
+SCALARS: dict[Any, Decoder] = {
+    str: ScalarDecoder("string", lambda value: isinstance(value, str), identity),
+    int: ScalarDecoder("integer", is_int, identity),
+    float: ScalarDecoder("number", is_number, float),
+    bool: ScalarDecoder("boolean", lambda value: isinstance(value, bool), identity),
+    None: ScalarDecoder("null", lambda value: value is None, identity),
+    types.NoneType: ScalarDecoder("null", lambda value: value is None, identity),
+}
+
+
+class ChoiceDecoder(Decoder):
+    """Decode `Literal` and `Enum` values"""
+
+    def __init__(self, choices: list[Any], convert: Callable[[Any], Any] = identity):
+        self.choices = choices
+        self.convert = convert
+        self.expected = " or ".join(repr(choice) for choice in choices)
+
+    def accepts(self, event: Event) -> bool:
+        # `True == 1` but they are distinct choices
+        value = event.value
+        return event.kind == SCALAR and any(
+            value == choice and type(value) is type(choice) for choice in self.choices
+        )
+
+    def decode(self, event: Event, events: Events) -> Any:
+        return self.convert(event.value)
+
+    def __call__(self, event: Event, events: Events) -> Any:
+        if not self.accepts(event):
+            got = repr(event.value) if event.kind == SCALAR else kind_of(event)
+            raise Invalid(f"Expected {self.expected}, got {got}", event.pos)
+        return self.decode(event, events)
+
+
+class ArrayDecoder(Decoder):
+    expected = "array"
+
+    def __init__(self, item: Decoder, factory: Callable[[list], Any] = identity):
+        self.item = item
+        self.factory = factory
+
+    def accepts(self, event: Event) -> bool:
+        return event.kind == START_ARRAY
+
+    def decode(self, event: Event, events: Events) -> Any:
+        items: list[Any] = []
+        item = self.item
+        for event in events:
+            if event.kind == END_ARRAY:
+                break
+            try:
+                items.append(item(event, events))
+            except Invalid as e:
+                e.tokens.insert(0, str(len(items)))
+                raise
+        return self.factory(items)
+
+
+class TupleDecoder(ArrayDecoder):
+    """Decode fixed size tuples"""
+
+    def __init__(self, items: list[Decoder]):
+        self.items = items
+        self.expected = f"array of {len(items)} items"
+
+    def decode(self, event: Event, events: Events) -> Any:
+        items: list[Any] = []
+        for item in events:
+            if item.kind == END_ARRAY:
+                break
+            if len(items) >= len(self.items):
+                raise Invalid(f"Expected {self.expected}", event.pos)
+            try:
+                items.append(self.items[len(items)](item, events))
+            except Invalid as e:
+                e.tokens.insert(0, str(len(items)))
+                raise
+        if len(items) < len(self.items):
+            raise Invalid(f"Expected {self.expected}, got {len(items)}", event.pos)
+        return tuple(items)
+
+
+class MappingDecoder(Decoder):
+    expected = "object"
+
+    def __init__(self, value: Decoder):
+        self.value = value
+
+    def accepts(self, event: Event) -> bool:
+        return event.kind == START_OBJECT
+
+    def decode(self, event: Event, events: Events) -> Any:
+        result: dict[str, Any] = {}
+        for key in events:
+            if key.kind == END_OBJECT:
+                break
+            try:
+                result[key.value] = self.value(next(events), events)
+            except Invalid as e:
+                e.tokens.insert(0, key.value)
+                raise
+        return result
+
+
+class RecordDecoder(MappingDecoder):
+    """Decode dataclasses and `TypedDict` from objects with known keys"""
+
+    def __init__(self, factory: Callable[..., Any]):
+        self.factory = factory
+        self.fields: dict[str, Decoder] = {}
+        self.required: frozenset[str] = frozenset()
+        self.expected = f"{getattr(factory, '__name__', 'record')} object"
+
+    def decode(self, event: Event, events: Events) -> Any:
+        values: dict[str, Any] = {}
+        fields = self.fields
+        for key in events:
+            if key.kind == END_OBJECT:
+                break
+            if (field := fields.get(key.value)) is None:
+                raise Invalid(f"Unknown field {key.value!r}", key.pos)
+            try:
+                values[key.value] = field(next(events), events)
+            except Invalid as e:
+                e.tokens.insert(0, key.value)
+                raise
+        if missing := self.required.difference(values):
+            names = ", ".join(repr(name) for name in sorted(missing))
+            raise Invalid(f"Missing required fields: {names}", event.pos)
+        return self.factory(**values)
+
+
+class UnionDecoder(Decoder):
+    """Decode using the first member accepting the value"""
+
+    def __init__(self, members: list[Decoder]):
+        self.members = members
+        self.expected = " or ".join(member.expected for member in members)
+
+    def accepts(self, event: Event) -> bool:
+        return any(member.accepts(event) for member in self.members)
+
+    def decode(self, event: Event, events: Events) -> Any:
+        for member in self.members:
+            if member.accepts(event):
+                return member.decode(event, events)
+
+
+ANY = Decoder()
+
+DECODERS: dict[Any, Decoder] = {**SCALARS, Any: ANY, object: ANY}
+"""The compiled decoders by type"""
+
+
+def decoder(target: Any) -> Decoder:
+    """
+    Get the decoder of a type, compiling it on first use.
+
+    :param target: The type to decode
+    :raises TypeError: if the type is not supported
+    """
+    try:
+        return DECODERS[target]
+    except KeyError:
+        pass
+    except TypeError:
+        # Unhashable type hints are compiled each time
+        return compile(target)
+    if dataclasses.is_dataclass(target) or typing.is_typeddict(target):
+        # Registered before compiling the fields to support recursive types
+        record = DECODERS[target] = RecordDecoder(target)
+        try:
+            fill(record, target)
+        except BaseException:
+            # Don't keep a half-built decoder (ie. with an unsupported field type)
+            DECODERS.pop(target, None)
+            raise
+        return record
+    found = DECODERS[target] = compile(target)
+    return found
+
+
+def fill(record: RecordDecoder, target: Any):
+    hints = typing.get_type_hints(target)
+    if typing.is_typeddict(target):
+        record.fields = {name: decoder(hint) for name, hint in hints.items()}
+        record.required = frozenset(target.__required_keys__)
+        return
+    fields = [field for field in dataclasses.fields(target) if field.init]
+    record.fields = {field.name: decoder(hints[field.name]) for field in fields}
+    record.required = frozenset(
+        field.name
+        for field in fields
+        if field.default is dataclasses.MISSING and field.default_factory is dataclasses.MISSING
+    )
+
+
+def compile(target: Any) -> Decoder:
+    origin, args = typing.get_origin(target), typing.get_args(target)
+    if origin is typing.Union or origin is types.UnionType:
+        return UnionDecoder([decoder(arg) for arg in args])
+    if origin is typing.Literal:
+        return ChoiceDecoder(list(args))
+    if isinstance(target, type) and issubclass(target, enum.Enum):
+        return ChoiceDecoder([member.value for member in target], target)
+    if origin is tuple and len(args) == 2 and args[1] is Ellipsis:
+        return ArrayDecoder(decoder(args[0]), tuple)
+    if origin is tuple:
+        return TupleDecoder([decoder(arg) for arg in args])
+    if target in (list, set, frozenset, tuple) or origin in (list, set, frozenset):
+        factory = origin or target
+        return ArrayDecoder(
+            decoder(args[0]) if args else ANY, identity if factory is list else factory
+        )
+    if target is dict or origin is dict:
+        if args and args[0] is not str:
+            raise TypeError(f"Unsupported type: {target!r} (only string keys are supported)")
+        return MappingDecoder(decoder(args[1]) if args else ANY)
+    raise TypeError(f"Unsupported type: {target!r}")
+
+
+def loads(src: str, target: Any, dialect: str | Features = "json") -> Any:
+    """
+    Decode a document into a typed value.
+
+    :param src: The source document
+    :param target: The type to decode (see [decoder()][json4humans.typed.decoder])
+    :param dialect: The dialect name or features of the document
+    :raises JSONDecodeError: if the document is invalid or doesn't match the type
+    :raises TypeError: if the type is not supported
+    """
+    decode = decoder(target)
+    events = Reader(dialect).events((src,))
+    try:
+        value = decode(next(events), events)
+    except Invalid as e:
+        msg = f"{e.msg} at {format_pointer(e.tokens)!r}" if e.tokens else e.msg
+        raise JSONDecodeError(msg, src, e.pos) from None
+    # Ensure there is nothing left
+    for _ in events:
+        pass
+    return value
@@ -11,6 +11,9 @@ from collections.abc import Iterable
 from enum import Enum
 from typing import Generic, TypeVar
 
+POSITIONS = "_json_positions"
+"""The attribute storing the [source positions][json4humans.positions.Positions] on a document root"""
+
 
 class JSONType:
     """
@@ -31,7 +34,7 @@ class JSONType:
         self.json_after = wsc.parse_list(after)
 
     def __repr__(self) -> str:
-        if attrs := getattr(self, "__dict__"):
+        if attrs := {k: v for k, v in getattr(self, "__dict__").items() if not k.startswith("_")}:
             kwargs = ", ".join(f"{k}={v}" for k, v in attrs.items())
             return f"{self.__class__.__name__}({super().__repr__()}, {kwargs})"
         return f"{self.__class__.__name__}({super().__repr__()})"
@@ -106,7 +109,21 @@ class HashStyleComment(Comment):
 class Object(OrderedDict, Container):
     """A JSON Object with order and style preservation"""
 
-    pass
+    def __init__(
+        self,
+        items: Iterable = (),
+        *,
+        before: list[WSC | str] | None = None,
+        after: list[WSC | str] | None = None,
+        head: list[WSC | str] | None = None,
+        tail: list[WSC | str] | None = None,
+        trailing_coma: bool = False,
+        **kwargs,
+    ):
+        OrderedDict.__init__(self, items, **kwargs)
+        Container.__init__(
+            self, before=before, after=after, head=head, tail=tail, trailing_coma=trailing_coma
+        )
 
 
 class Array(list["Value"], Container):
@@ -182,9 +199,16 @@ class Number(JSONType):
     Is the number prefixed by an explicit sign
     """
 
+    raw: str | None
+    """
+    The source lexeme this number has been parsed from (if any).
+    It is serialized as-is, preserving precision and representation.
+    """
+
     def __new__(cls, value, *args, **kwargs):
         number = super().__new__(cls, value)
         number.prefixed = kwargs.get("prefixed", False)
+        number.raw = kwargs.get("raw")
         return number
 
 
@@ -194,6 +218,8 @@ class Integer(Number, int):
     """
 
     def __str__(self) -> str:
+        if self.raw is not None:
+            return self.raw.lstrip("+")
         return int.__repr__(self)
 
 
@@ -203,6 +229,8 @@ class HexInteger(Integer):
     """
 
     def __str__(self) -> str:
+        if self.raw is not None:
+            return self.raw.lstrip("+")
         return hex(self)
 
 
@@ -212,19 +240,34 @@ class Float(Number, float):
     """
 
     leading_point: bool
+    """
+    Is the number written without its leading zero (ie. `.5`)
+    """
+
     significand: int | None
+    """
+    The number of digits written after the point (if any)
+    """
 
     def __new__(cls, value, *args, **kwargs):
-        number = super().__new__(cls, value, prefixed=kwargs.get("prefixed", False))
-        number.leading_point = kwargs.get("leading_point", False)
-        number.significand = kwargs.get("significand")
+        number = super().__new__(cls, value, **kwargs)
+        # Derived from the lexeme when parsed, they only matter once it has been dropped
+        digits = number.raw.lstrip("+-") if number.raw is not None else ""
+        point = digits.find(".")
+        number.leading_point = kwargs.get("leading_point", point == 0)
+        number.significand = kwargs.get(
+            "significand",
+            len(digits[point + 1 :].split("e")[0].split("E")[0]) if point >= 0 else None,
+        )
         return number
 
     def __str__(self) -> str:
+        if self.raw is not None:
+            return self.raw.lstrip("+")
         raw = float.__repr__(self)
         if self.leading_point and raw.startswith("0"):
             return raw[1:]
-        if self.significand is not None:
+        if self.significand is not None and "." in raw:
             pos = raw.index(".") + 1
             raw = raw[: pos + self.significand]
         return raw
@@ -250,7 +293,9 @@ class Literal(JSONType, Generic[T]):
         self.value = value
 
     def __eq__(self, obj: object) -> bool:
-        return self.value.__eq__(obj)
+        if isinstance(obj, Literal):
+            obj = obj.value
+        return self.value == obj
 
     def __hash__(self) -> int:
         return self.value.__hash__()
@@ -269,10 +314,15 @@ A Key-Value pair in an [Object][json4humans.types.Object]
 
 class TupleWithTrailingComa(tuple[T, ...]):
     trailing_coma: bool
+    tail: list[WSC]
+    """Whitespaces and comments following the trailing coma"""
 
     def __new__(cls, items, *args, **kwargs):
         # explicitly only pass value to the tuple constructor
         return super().__new__(cls, items)
 
-    def __init__(self, items: Iterable[T], trailing_coma: bool = False):
+    def __init__(
+        self, items: Iterable[T], trailing_coma: bool = False, tail: list[WSC] | None = None
+    ):
         self.trailing_coma = trailing_coma
+        self.tail = tail or []
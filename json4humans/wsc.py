@@ -4,13 +4,52 @@ This module handles whitespaces and comments
 
 from __future__ import annotations
 
+import re
+from functools import lru_cache
 from typing import cast
 
 from lark import Lark, Token
-from lark.visitors import Transformer, v_args
+from lark.visitors import Transformer
 
 from .env import DEBUG
-from .types import WSC, BlockStyleComment, HashStyleComment, LineStyleComment, WhiteSpace
+from .types import (
+    WSC,
+    BlockStyleComment,
+    Comment,
+    HashStyleComment,
+    LineStyleComment,
+    WhiteSpace,
+)
+
+TRIVIA = re.compile(
+    r"(?P<ws>[ \t\f\r\n]+)|//(?P<line>[^\n]*)|/\*(?P<block>[\s\S]*?)\*/|#(?P<hash>[^\n]*)"
+)
+"""Match a single whitespaces sequence or comment, the named group giving its kind"""
+
+WHITESPACES = re.compile(r"[ \t\f\r\n]*")
+"""Match a sequence of whitespaces only"""
+
+PARSE_CACHE_SIZE = 4096
+"""Maximum number of distinct strings memoized by [parse_cached()][json4humans.wsc.parse_cached]"""
+
+TRIVIA_TYPES: dict[str | None, type[WSC]] = {
+    "ws": WhiteSpace,
+    "line": LineStyleComment,
+    "block": BlockStyleComment,
+    "hash": HashStyleComment,
+}
+
+
+def lex(trivia: str) -> list[WSC]:
+    """
+    Split an already validated run of whitespaces and comments into a list of [WSC][json4humans.types.WSC].
+
+    :param trivia: A string made only of whitespaces and comments (ie. a `WSCHS` token).
+    :returns: A list of [WSC][json4humans.types.WSC] only.
+    """
+    return [
+        TRIVIA_TYPES[m.lastgroup](m.group(cast(str, m.lastgroup))) for m in TRIVIA.finditer(trivia)
+    ]
 
 
 def parse(wsc: str) -> list[WSC]:
@@ -20,11 +59,28 @@ def parse(wsc: str) -> list[WSC]:
     :param wsc: A string representing whitespaces and/or comments.
     :returns: A list of [WSC][json4humans.types.WSC] only.
     """
+    return list(parse_cached(wsc))
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_cached(wsc: str) -> tuple[WSC, ...]:
+    """
+    Memoized version of [parse()][json4humans.wsc.parse].
+
+    The returned tuple is shared between all calls with the same string
+    and so must be copied before being stored as a mutable attribute.
+
+    :param wsc: A string representing whitespaces and/or comments.
+    :returns: An immutable sequence of [WSC][json4humans.types.WSC] only.
+    """
+    if WHITESPACES.fullmatch(wsc):
+        # Pure whitespaces don't need a parser
+        return (WhiteSpace(wsc),) if wsc else ()
     if DEBUG:
         tree = parser.parse(wsc)
-        return cast(list[WSC], transformer.transform(tree))
+        return tuple(cast(list[WSC], transformer.transform(tree)))
     else:
-        return cast(list[WSC], parser.parse(wsc))
+        return tuple(cast(list[WSC], parser.parse(wsc)))
 
 
 def parse_list(items: list[WSC | str] | None = None) -> list[WSC]:
@@ -39,10 +95,10 @@ def parse_list(items: list[WSC | str] | None = None) -> list[WSC]:
         return []
     wscs: list[WSC] = []
     for item in items:
-        if isinstance(item, str):
-            wscs.extend(parse(item))
-        else:
+        if isinstance(item, WhiteSpace | Comment):
             wscs.append(item)
+        else:
+            wscs.extend(parse_cached(item))
     return wscs
 
 
@@ -51,27 +107,11 @@ class WSCTransformer(Transformer):
     A [Transformer][lark.visitors.Transformer] handling whitespaces and comments.
     """
 
-    @v_args(inline=True)
-    def WS(self, token: Token) -> WhiteSpace:
-        return WhiteSpace(token.value)
-
-    def CPP_COMMENT(self, token: Token) -> LineStyleComment:
-        return LineStyleComment(token.value[2:])
+    def WSCHS(self, token: Token) -> list[WSC]:
+        return lex(token.value)
 
-    def C_COMMENT(self, token: Token) -> BlockStyleComment:
-        return BlockStyleComment(token.value[2:-2])
-
-    def SH_COMMENT(self, token: Token) -> HashStyleComment:
-        return HashStyleComment(token.value[1:])
-
-    def wschs(self, wscs: list[WSC]) -> list[WSC]:
-        return wscs
-
-    def wscs(self, wscs: list[WSC]) -> list[WSC]:
-        return wscs
-
-    def ws(self, wscs: list[WSC]) -> list[WSC]:
-        return wscs
+    def wschs(self, children: list[list[WSC]]) -> list[WSC]:
+        return children[0] if children else []
 
 
 transformer = WSCTransformer()
@@ -89,7 +129,7 @@ def encode_wsc(wsc: WSC):
         case BlockStyleComment():
             return f"/*{wsc}*/"
         case HashStyleComment():
-            return f"/*{wsc}*/"
+            return f"#{wsc}"
         case WhiteSpace():
             return str(wsc)
     raise NotImplementedError(f"Unknown whitespace or comment type: {wsc!r}")
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import json as stdjson
+from contextlib import nullcontext
+from copy import deepcopy
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, TypedDict
 
 import pytest
 
+from json4humans import bench, canonical, diff, instrument, query, schema
+from json4humans.limits import Limits
+from json4humans.tree import clone, from_python, to_python
 from tests.conftest import JSONTester
 
 if TYPE_CHECKING:
@@ -34,3 +42,279 @@ def bench_json_loads(benchmark: BenchmarkFixture, jsont: JSONTester, fixture: Pa
     data = fixture.read_text()
 
     benchmark(jsont.loads, data)
+
+
+@pytest.mark.fixturize("json/benchs/*.json")
+@pytest.mark.benchmark(group="json-loads-positions")
+def bench_json_loads_positions(benchmark: BenchmarkFixture, jsont: JSONTester, fixture: Path):
+    benchmark.name = jsont.name
+    benchmark.fullname = f"loads({fixture.stem}.json, positions=True)"
+
+    data = fixture.read_text()
+    jsont.loads(data, positions=True)  # Build the spanning parser once
+
+    benchmark(jsont.loads, data, positions=True)
+
+
+@pytest.mark.benchmark(group="json-query")
+@pytest.mark.parametrize("indexed", [False, True], ids=["tree", "index"])
+def bench_json_pointer_get(
+    benchmark: BenchmarkFixture, jsont: JSONTester, fixtures: Path, indexed: bool
+):
+    benchmark.name = f"{jsont.name}-{'index' if indexed else 'tree'}"
+    benchmark.fullname = "get(large.json)"
+
+    data = jsont.loads((fixtures / "benchs/large.json").read_text())
+    pointers = [f"/{i}/profile/name" for i in range(0, len(data), 7)]
+    get = query.Index(data).get if indexed else partial(query.get, data)
+
+    benchmark(lambda: [get(pointer) for pointer in pointers])
+
+
+@pytest.mark.benchmark(group="json-diff")
+@pytest.mark.parametrize("hashed", [False, True], ids=["eq", "diff"])
+def bench_json_diff(benchmark: BenchmarkFixture, jsont: JSONTester, fixtures: Path, hashed: bool):
+    benchmark.name = f"{jsont.name}-{'diff' if hashed else 'eq'}"
+    benchmark.fullname = "diff(large.json)"
+
+    src = (fixtures / "benchs/large.json").read_text()
+    old, new = jsont.loads(src), jsont.loads(src)
+    # Comparing successive versions of a document
+    pointer = f"/{len(new) - 1}/profile/name"
+
+    def compare():
+        query.assign(new, pointer, "changed")
+        return diff.diff(old, new) if hashed else old == new
+
+    benchmark(compare)
+
+
+LARGE_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "required": ["id", "email", "profile", "roles"],
+        "properties": {
+            "email": {"type": "string", "pattern": "@"},
+            "profile": {
+                "type": "object",
+                "properties": {
+                    "location": {"properties": {"lat": {"minimum": -90, "maximum": 90}}}
+                },
+            },
+            "roles": {"type": "array", "items": {"type": "string"}},
+        },
+    },
+}
+
+
+@pytest.mark.benchmark(group="json-schema")
+@pytest.mark.parametrize("streamed", [False, True], ids=["tree", "stream"])
+def bench_json_schema(
+    benchmark: BenchmarkFixture, jsont: JSONTester, fixtures: Path, streamed: bool
+):
+    benchmark.name = f"{jsont.name}-{'stream' if streamed else 'tree'}"
+    benchmark.fullname = "validate(large.json)"
+
+    src = (fixtures / "benchs/large.json").read_text()
+    validator = schema.compile(LARGE_SCHEMA)
+
+    def validate():
+        if streamed:
+            validator.validate_stream(src, jsont.name)
+        else:
+            validator.validate(jsont.loads(src))
+
+    benchmark(validate)
+
+
+class Location(TypedDict):
+    lat: float
+    long: float
+
+
+@dataclass
+class Profile:
+    name: str
+    company: str
+    dob: str
+    address: str
+    location: Location
+    about: str
+
+
+@dataclass
+class User:
+    id: str
+    email: str
+    username: str
+    profile: Profile
+    apiKey: str
+    roles: list[str]
+    createdAt: str
+    updatedAt: str
+
+
+def to_user(data: dict) -> User:
+    profile = dict(data["profile"], location=dict(data["profile"]["location"]))
+    return User(**dict(data, profile=Profile(**profile), roles=list(data["roles"])))
+
+
+@pytest.mark.benchmark(group="json-typed")
+@pytest.mark.parametrize("typed", [False, True], ids=["tree", "typed"])
+def bench_json_typed(benchmark: BenchmarkFixture, jsont: JSONTester, fixtures: Path, typed: bool):
+    benchmark.name = f"{jsont.name}-{'typed' if typed else 'tree'}"
+    benchmark.fullname = "loads(large.json, type=list[User])"
+
+    src = (fixtures / "benchs/large.json").read_text()
+
+    def load():
+        if typed:
+            return jsont.loads(src, type=list[User])
+        return [to_user(data) for data in jsont.loads(src)]
+
+    assert load() == [to_user(data) for data in jsont.loads(src)]
+    benchmark(load)
+
+
+JSON_SHAPES = [name for name, shape in bench.SHAPES.items() if shape.dialect == "json"]
+
+
+@pytest.mark.benchmark(group="json-shapes")
+@pytest.mark.parametrize("shape", JSON_SHAPES)
+def bench_json_shapes(benchmark: BenchmarkFixture, jsont: JSONTester, shape: str):
+    benchmark.name = jsont.name
+    benchmark.fullname = f"loads({shape})"
+
+    data = bench.SHAPES[shape].generate(bench.SHAPES[shape].size)
+    benchmark.extra_info["peak"] = bench.peak_memory(lambda: jsont.loads(data))
+
+    benchmark(jsont.loads, data)
+
+
+@pytest.mark.benchmark(group="json-shapes")
+@pytest.mark.parametrize("shape", JSON_SHAPES)
+def bench_json_shapes_stdlib(benchmark: BenchmarkFixture, shape: str):
+    benchmark.name = "stdlib"
+    benchmark.fullname = f"loads({shape})"
+
+    data = bench.SHAPES[shape].generate(bench.SHAPES[shape].size)
+    benchmark.extra_info["peak"] = bench.peak_memory(lambda: stdjson.loads(data))
+
+    benchmark(stdjson.loads, data)
+
+
+@pytest.mark.benchmark(group="startup")
+def bench_startup(benchmark: BenchmarkFixture, jsont: JSONTester):
+    benchmark.name = jsont.name
+    benchmark.fullname = "startup"
+
+    # Each round spawns a fresh interpreter, measured as a whole (interpreter startup included)
+    benchmark.pedantic(bench.startup, args=(jsont.name, 1), rounds=5)
+
+
+@pytest.mark.fixturize("json/benchs/*.json")
+@pytest.mark.benchmark(group="json-instrument")
+@pytest.mark.parametrize("enabled", [False, True], ids=["disabled", "enabled"])
+def bench_json_instrument(
+    benchmark: BenchmarkFixture, jsont: JSONTester, fixture: Path, enabled: bool
+):
+    benchmark.name = f"{jsont.name}-{'enabled' if enabled else 'disabled'}"
+    benchmark.fullname = f"loads({fixture.stem}.json)"
+
+    data = fixture.read_text()
+
+    with instrument.profile() if enabled else nullcontext():
+        jsont.loads(data)  # Build the instrumented parser once
+        benchmark(jsont.loads, data)
+
+
+@pytest.mark.benchmark(group="json-depth")
+@pytest.mark.parametrize("depth", [16, 256, 4096])
+def bench_json_dumps_depth(benchmark: BenchmarkFixture, jsont: JSONTester, depth: int):
+    benchmark.name = jsont.name
+    benchmark.fullname = f"dumps(deep({depth}))"
+
+    data = jsont.loads(bench.deep(depth))
+
+    benchmark(jsont.dumps, data)
+
+
+@pytest.mark.benchmark(group="json-depth")
+@pytest.mark.parametrize("depth", [16, 256, 4096])
+def bench_json_digest_depth(benchmark: BenchmarkFixture, jsont: JSONTester, depth: int):
+    benchmark.name = jsont.name
+    benchmark.fullname = f"digest(deep({depth}))"
+
+    doc = jsont.loads(bench.deep(depth))
+
+    benchmark(diff.digest, doc)
+
+
+@pytest.mark.fixturize("json/benchs/*.json")
+@pytest.mark.benchmark(group="json-limits")
+@pytest.mark.parametrize("limited", [False, True], ids=["unlimited", "limited"])
+def bench_json_limits(benchmark: BenchmarkFixture, jsont: JSONTester, fixture: Path, limited: bool):
+    benchmark.name = f"{jsont.name}-{'limited' if limited else 'unlimited'}"
+    benchmark.fullname = f"loads({fixture.stem}.json)"
+
+    data = fixture.read_text()
+    options = {"limits": Limits(max_bytes=len(data) * 4, max_depth=64)} if limited else {}
+
+    benchmark(partial(jsont.loads, data, **options))
+
+
+@pytest.mark.fixturize("json/benchs/*.json")
+@pytest.mark.benchmark(group="json-clone")
+@pytest.mark.parametrize("copier", [deepcopy, clone], ids=["deepcopy", "clone"])
+def bench_json_clone(benchmark: BenchmarkFixture, jsont: JSONTester, fixture: Path, copier):
+    benchmark.name = f"{jsont.name}-{copier.__name__}"
+    benchmark.fullname = f"{copier.__name__}({fixture.stem}.json)"
+
+    data = jsont.loads(fixture.read_text())
+
+    benchmark(copier, data)
+
+
+@pytest.mark.benchmark(group="json-python")
+@pytest.mark.parametrize("direction", ["to", "from", "from-template"])
+def bench_json_python(
+    benchmark: BenchmarkFixture, jsont: JSONTester, fixtures: Path, direction: str
+):
+    benchmark.name = f"{jsont.name}-{direction}"
+    benchmark.fullname = f"{direction}_python(large.json)"
+
+    doc = jsont.loads((fixtures / "benchs/large.json").read_text())
+    data = to_python(doc)
+
+    if direction == "to":
+        benchmark(to_python, doc)
+    else:
+        benchmark(from_python, data, doc if direction == "from-template" else None)
+
+
+@pytest.mark.fixturize("json/benchs/*.json")
+@pytest.mark.benchmark(group="json-canonical")
+@pytest.mark.parametrize("canonicalized", [False, True], ids=["dumps", "canonical"])
+def bench_json_canonical(
+    benchmark: BenchmarkFixture, jsont: JSONTester, fixture: Path, canonicalized: bool
+):
+    benchmark.name = f"{jsont.name}-{'canonical' if canonicalized else 'dumps'}"
+    benchmark.fullname = f"dumps({fixture.stem}.json)"
+
+    data = jsont.loads(fixture.read_text())
+
+    benchmark(canonical.dumps if canonicalized else jsont.dumps, data)
+
+
+@pytest.mark.benchmark(group="json-numeric-arrays")
+@pytest.mark.parametrize("packed", [False, True], ids=["arrays", "numeric-arrays"])
+def bench_json_numeric_arrays(benchmark: BenchmarkFixture, jsont: JSONTester, packed: bool):
+    benchmark.name = f"{jsont.name}-{'numeric-arrays' if packed else 'arrays'}"
+    benchmark.fullname = "dumps(loads(telemetry))"
+
+    src = stdjson.dumps(
+        {"timestamps": list(range(10_000)), "samples": [i * 0.25 for i in range(10_000)]}
+    )
+
+    benchmark(lambda: jsont.dumps(jsont.loads(src, numeric_arrays=packed)))
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+import pickle
+from typing import TYPE_CHECKING
+
+import pytest
+
+from json4humans import features
+from json4humans.errors import JSONDecodeError
+
+if TYPE_CHECKING:
+    from tests.conftest import JSONTester
+
+
+pytestmark = pytest.mark.jsons("json", "jsonc", "json5")
+
+
+def test_error_diagnostics(jsont: JSONTester):
+    with pytest.raises(JSONDecodeError) as excinfo:
+        jsont.loads('{"a": 1,\n "b" 2}')
+    error = excinfo.value
+    assert error.lineno == 2
+    assert error.colno == 6
+    assert error.pos == 14
+    assert error.expected == {"':'"}
+    assert error.excerpt == ' "b" 2}\n     ^'
+
+
+def test_error_is_a_builtin_json_error(jsont: JSONTester):
+    with pytest.raises(json.JSONDecodeError):
+        jsont.loads("[1 2]")
+
+
+def test_unexpected_end_of_document(jsont: JSONTester):
+    with pytest.raises(JSONDecodeError) as excinfo:
+        jsont.loads("[1, 2")
+    assert excinfo.value.msg == "Unexpected end of document"
+    assert excinfo.value.pos == 5
+    assert excinfo.value.expected == {"','", "']'"}
+
+
+def test_error_can_be_pickled(jsont: JSONTester):
+    with pytest.raises(JSONDecodeError) as excinfo:
+        jsont.loads("[1 2]")
+    error = pickle.loads(pickle.dumps(excinfo.value))
+    assert (error.pos, error.expected, error.excerpt) == (
+        excinfo.value.pos,
+        excinfo.value.expected,
+        excinfo.value.excerpt,
+    )
+
+
+def test_check_valid_document(jsont: JSONTester):
+    assert jsont.check('{"a": [1, 2]}') == []
+
+
+def test_check_collects_multiple_errors(jsont: JSONTester):
+    errors = jsont.check('{"a": [1 2], "b": [3 4]}')
+    assert [(e.lineno, e.colno) for e in errors] == [(1, 10), (1, 22)]
+
+
+@pytest.mark.parametrize(
+    "src,positions",
+    [
+        ('{"a": 1 "b": 2, "c": @, "d": [1 2]}', [8, 21, 32]),
+        ('{"a" 1, "b": [1,,2], "c": "x,]" 3}', [5, 16, 32]),
+        ('{"a": [1, 2 "]" 3], "b": tru}', [12, 25]),
+        ('{"a": 1', [7]),
+    ],
+)
+def test_check_resynchronize_after_errors(jsont: JSONTester, src: str, positions: list[int]):
+    errors = jsont.check(src, features=features.JSON)
+    assert [e.pos for e in errors] == positions
+
+
+def test_expected_tokens_depend_on_features(jsont: JSONTester):
+    with pytest.raises(JSONDecodeError) as excinfo:
+        jsont.loads("[1, }", features=features.JSON)
+    assert excinfo.value.expected == {
+        "'['",
+        "']'",
+        "'{'",
+        "'true'",
+        "'false'",
+        "'null'",
+        "DOUBLE_QUOTE_STRING",
+        "SIGNED_NUMBER",
+    }
+    error, _ = jsont.check("[1, }", features=features.JSON5)
+    assert {"SINGLE_QUOTE_STRING", "SIGNED_HEXNUMBER", "CONSTANT"} <= error.expected
@@ -5,6 +5,7 @@ as well as JSON and JSONC sample for backward compatibility
 """
 from __future__ import annotations
 
+from decimal import Decimal
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -21,3 +22,35 @@ pytestmark = pytest.mark.jsons("json", "jsonc", "json5")
 def test_load_and_dump_json_with_style_preservation(jsont: JSONTester, fixture: Path):
     raw = fixture.read_text()
     assert jsont.dumps(jsont.loads(raw)) == raw
+
+
+@pytest.mark.parametrize(
+    "raw",
+    (
+        pytest.param("1.10", id="trailing-zero"),
+        pytest.param("-0", id="negative-zero"),
+        pytest.param("1E400", id="overflow"),
+        pytest.param("23E3", id="upper-exp"),
+        pytest.param("0.1000000000000000000000001", id="precision"),
+    ),
+)
+def test_dump_number_lexeme(jsont: JSONTester, raw: str):
+    assert jsont.dumps(jsont.loads(raw)) == raw
+
+
+def test_dump_deeply_nested(jsont: JSONTester):
+    raw = "[" * 5000 + '{ "a" : [1 , {}] } ' + "]" * 5000
+    assert jsont.dumps(jsont.loads(raw)) == raw
+
+
+def test_dump_decimal(jsont: JSONTester):
+    raw = "[1.10, 2.00000000000000000001]"
+    assert jsont.dumps(jsont.loads(raw, parse_float=Decimal)) == "[1.10,2.00000000000000000001]"
+
+
+def test_dump_escapes_and_unicode(jsont: JSONTester):
+    raw = r'{"msg": "line1\nline2 \"q\" café \\ 😀 \t\u0001"}'
+    data = jsont.loads(raw)
+
+    assert data["msg"] == 'line1\nline2 "q" café \\ \U0001f600 \t\x01'
+    assert jsont.loads(jsont.dumps(data)) == data
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import json
+from decimal import Decimal
+from types import MappingProxyType
 from typing import TYPE_CHECKING, Any
 
 import pytest
 
+from json4humans.errors import JSONDecodeError
+
 if TYPE_CHECKING:
     from tests.conftest import JSONTester
 
@@ -101,3 +105,91 @@ def test_dump_as_std_json(jsont: JSONTester):
         "nested": {"key": "value"},
     }
     assert jsont.dumps(json_as_obj) == json.dumps(json_as_obj, separators=(",", ":"))
+
+
+def test_parse_float_hook(jsont: JSONTester):
+    data = jsont.loads("[1.10, 2, 3e2]", parse_float=Decimal)
+    assert data == [Decimal("1.10"), 2, Decimal("3e2")]
+    assert isinstance(data[0], Decimal)
+    assert isinstance(data[2], Decimal)
+
+
+def test_parse_int_hook(jsont: JSONTester):
+    data = jsont.loads("[1.5, 2]", parse_int=Decimal)
+    assert data == [1.5, Decimal(2)]
+    assert isinstance(data[1], Decimal)
+
+
+def test_hooks_are_scoped_to_the_call(jsont: JSONTester):
+    jsont.loads("[1.5]", parse_float=Decimal)
+    assert not isinstance(jsont.loads("[1.5]")[0], Decimal)
+
+
+def test_object_hook(jsont: JSONTester):
+    data = jsont.loads('{"a": {"b": 1}, "c": []}', object_hook=MappingProxyType)
+    assert isinstance(data, MappingProxyType)
+    assert isinstance(data["a"], MappingProxyType)
+    assert data == {"a": {"b": 1}, "c": []}
+
+
+def test_object_pairs_hook(jsont: JSONTester):
+    data = jsont.loads('{"a": 1, "b": {}}', object_pairs_hook=tuple, object_hook=dict)
+    assert data == (("a", 1), ("b", ()))
+
+
+def test_array_hook(jsont: JSONTester):
+    data = jsont.loads('[1, [2, 3], {"a": []}]', array_hook=tuple)
+    assert data == (1, (2, 3), {"a": ()})
+
+
+@pytest.mark.parametrize("source", ("{}", "{ }", "[]", "[ ]", '{ "a": [ ] }'))
+def test_empty_containers_round_trip(jsont: JSONTester, source: str):
+    assert jsont.dumps(jsont.loads(source)) == source
+
+
+LOADS_AT_SRC = """{
+  "version": "1.0",
+  "skipped": {"nested": [1, "]", {"}": "{"}], "escaped \\" ]": null},
+  "options": {"target": "es2020", "paths": ["a", "b"]},
+  "options": {"target": "es2022", "paths": ["c", "d"]}
+}"""
+
+
+@pytest.mark.parametrize(
+    "pointer,expected",
+    (
+        ("", json.loads(LOADS_AT_SRC)),
+        ("/version", "1.0"),
+        ("/skipped/nested/2", {"}": "{"}),
+        ("/options", {"target": "es2022", "paths": ["c", "d"]}),
+        ("/options/paths/1", "d"),
+        (("options", "paths", 0), "c"),
+    ),
+)
+def test_loads_at(jsont: JSONTester, pointer, expected: Any):
+    assert jsont.loads_at(LOADS_AT_SRC, pointer) == expected
+
+
+def test_loads_at_preserves_style(jsont: JSONTester):
+    data = jsont.loads_at(LOADS_AT_SRC, "/skipped/nested")
+    assert jsont.dumps(data) == '[1, "]", {"}": "{"}]'
+
+
+def test_loads_at_hooks(jsont: JSONTester):
+    assert jsont.loads_at('{"a": [1.5]}', "/a", parse_float=Decimal) == [Decimal("1.5")]
+
+
+@pytest.mark.parametrize(
+    "pointer", ("/missing", "/version/0", "/options/paths/2", "/options/paths/-")
+)
+def test_loads_at_missing(jsont: JSONTester, pointer: str):
+    with pytest.raises(KeyError):
+        jsont.loads_at(LOADS_AT_SRC, pointer)
+
+
+def test_loads_at_error_position(jsont: JSONTester):
+    src = '{"a": 1, "b": [1 2]}'
+    with pytest.raises(JSONDecodeError) as excinfo:
+        jsont.loads_at(src, "/b")
+    assert excinfo.value.pos == src.index("2")
+    assert excinfo.value.doc == src
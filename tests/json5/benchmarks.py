@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from json4humans import bench
+from tests.conftest import JSONTester
+
+if TYPE_CHECKING:
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+
+pytestmark = pytest.mark.jsons("json5")
+
+
+@pytest.mark.benchmark(group="json5-syntax")
+def bench_json5_loads(benchmark: BenchmarkFixture, jsont: JSONTester):
+    benchmark.name = jsont.name
+    benchmark.fullname = "loads(json5)"
+
+    data = bench.json5_syntax(bench.SHAPES["json5"].size)
+    benchmark.extra_info["peak"] = bench.peak_memory(lambda: jsont.loads(data))
+
+    benchmark(jsont.loads, data)
+
+
+@pytest.mark.benchmark(group="json5-syntax")
+def bench_json5_dumps(benchmark: BenchmarkFixture, jsont: JSONTester):
+    benchmark.name = jsont.name
+    benchmark.fullname = "dumps(json5)"
+
+    data = jsont.loads(bench.json5_syntax(bench.SHAPES["json5"].size))
+
+    benchmark(jsont.dumps, data)
@@ -10,6 +10,8 @@ from typing import TYPE_CHECKING
 
 import pytest
 
+from json4humans import json, jsonc
+
 if TYPE_CHECKING:
     from tests.conftest import JSONTester
 
@@ -21,3 +23,19 @@ pytestmark = pytest.mark.jsons("json5")
 def test_load_and_dump_json5_with_style_preservation(jsont: JSONTester, fixture: Path):
     raw = fixture.read_text()
     assert jsont.dumps(jsont.loads(raw)) == raw
+
+
+def test_dump_escapes_and_line_continuations(jsont: JSONTester):
+    raw = "['it\\'s', \"a \\\"b\\\" \\\nc\\\nd\", '\\x41\\0\\v\\u2028 é']"
+    data = jsont.loads(raw)
+
+    assert data == ["it's", 'a "b" cd', "A\x00\x0b  é"]
+    assert jsont.loads(jsont.dumps(data)) == data
+    assert jsont.dumps(data) == "['it\\'s', \"a \\\"b\\\" \\\nc\\\nd\", 'A\\x00\\v\\u2028 é']"
+
+
+@pytest.mark.parametrize("module", [json, jsonc])
+def test_dump_numbers_as_json(jsont: JSONTester, module):
+    data = jsont.loads("[+1, 0xFF, .5, 5., +1.5e3, -0x10, 1.10, 1E400]")
+
+    assert module.dumps(data) == "[1, 255, 0.5, 5.0, 1500.0, -16, 1.10, 1E400]"
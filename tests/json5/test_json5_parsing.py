@@ -5,6 +5,7 @@ as well as JSON and JSONC sample for backward compatibility
 """
 from __future__ import annotations
 
+import math
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
@@ -88,3 +89,42 @@ No \\n's!",
 )
 def test_trailing_comma(jsont: JSONTester, source: str, expected: Any):
     jsont.assert_parse_equal(source, expected)
+
+
+@pytest.mark.parametrize(
+    "source,expected",
+    (
+        pytest.param("Infinity", math.inf, id="infinity"),
+        pytest.param("+Infinity", math.inf, id="positive-infinity"),
+        pytest.param("-Infinity", -math.inf, id="negative-infinity"),
+    ),
+)
+def test_infinity(jsont: JSONTester, source: str, expected: Any):
+    jsont.assert_parse_equal(source, expected)
+    assert jsont.dumps(jsont.loads(source)) == source
+
+
+def test_nan(jsont: JSONTester):
+    assert math.isnan(jsont.loads("NaN"))
+    assert jsont.dumps(jsont.loads("[NaN, -NaN]")) == "[NaN, -NaN]"
+
+
+def test_constants_as_keys(jsont: JSONTester):
+    data = jsont.loads("{NaN: 1, Infinityx: Infinity}")
+    assert data == {"NaN": 1, "Infinityx": math.inf}
+
+
+def test_parse_constant_hook(jsont: JSONTester):
+    assert jsont.loads("[Infinity, -NaN]", parse_constant=str) == ["Infinity", "-NaN"]
+
+
+def test_number_lexemes_are_preserved(jsont: JSONTester):
+    raw = "[0xDECAF, .5, 5., +1, 1.50, +.5e3]"
+    assert jsont.dumps(jsont.loads(raw)) == raw
+
+
+def test_loads_at_json5_syntax():
+    src = "{\n  // comment\n  a: [0xFF, 'x'],\n  'b\\'c': {d: +Infinity,},\n}"
+    assert json5.loads_at(src, "/a/0") == 255
+    assert json5.loads_at(src, "/b'c/d") == math.inf
+    assert json5.loads_at(src, "/b'c") == {"d": math.inf}
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from json4humans import bench, patch
+from tests.conftest import JSONTester
+
+if TYPE_CHECKING:
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+
+pytestmark = pytest.mark.jsons("jsonc", "json5")
+
+
+@pytest.mark.benchmark(group="jsonc-dumps")
+@pytest.mark.fixturize("jsonc/benchs/*.jsonc")
+def bench_jsonc_dumps(benchmark: BenchmarkFixture, jsont: JSONTester, fixture: Path):
+    benchmark.name = jsont.name
+    benchmark.fullname = f"dumps({fixture.stem}.jsonc)"
+
+    data = jsont.loads(fixture.read_text())
+
+    benchmark(jsont.dumps, data)
+
+
+@pytest.mark.fixturize("jsonc/benchs/*.jsonc")
+@pytest.mark.benchmark(group="jsonc-loads")
+def bench_jsonc_loads(benchmark: BenchmarkFixture, jsont: JSONTester, fixture: Path):
+    benchmark.name = jsont.name
+    benchmark.fullname = f"loads({fixture.stem}.jsonc)"
+
+    data = fixture.read_text()
+
+    benchmark(jsont.loads, data)
+
+
+@pytest.mark.fixturize("jsonc/benchs/*.jsonc")
+@pytest.mark.benchmark(group="jsonc-loads-at")
+@pytest.mark.parametrize("selective", [False, True], ids=["loads", "loads_at"])
+def bench_jsonc_loads_at(
+    benchmark: BenchmarkFixture, jsont: JSONTester, fixture: Path, selective: bool
+):
+    benchmark.name = f"{jsont.name}-{'loads_at' if selective else 'loads'}"
+    benchmark.fullname = f"loads_at({fixture.stem}.jsonc)"
+
+    data = fixture.read_text()
+    # The last member is the worst case for the skip scanner
+    key = list(jsont.loads(data))[-1]
+
+    if selective:
+        benchmark(jsont.loads_at, data, f"/{key}")
+    else:
+        benchmark(lambda: jsont.loads(data)[key])
+
+
+@pytest.mark.fixturize("jsonc/benchs/*.jsonc")
+@pytest.mark.benchmark(group="jsonc-patch")
+@pytest.mark.parametrize("textual", [False, True], ids=["tree", "text"])
+def bench_jsonc_patch(benchmark: BenchmarkFixture, jsont: JSONTester, fixture: Path, textual: bool):
+    benchmark.name = f"{jsont.name}-{'text' if textual else 'tree'}"
+    benchmark.fullname = f"patch({fixture.stem}.jsonc)"
+
+    data = fixture.read_text()
+    key = list(jsont.loads(data))[-1]
+    ops: list[patch.Operation] = [
+        {"op": "add", "path": "/patched", "value": True},
+        {"op": "remove", "path": f"/{key}"},
+    ]
+
+    if textual:
+        benchmark(patch.apply_patch, data, ops)
+    else:
+        benchmark(lambda: jsont.dumps(patch.apply(jsont.loads(data), ops)))
+
+
+@pytest.mark.benchmark(group="jsonc-comments")
+def bench_jsonc_comments(benchmark: BenchmarkFixture, jsont: JSONTester):
+    benchmark.name = jsont.name
+    benchmark.fullname = "loads(comments)"
+
+    data = bench.comments(bench.SHAPES["comments"].size)
+    benchmark.extra_info["peak"] = bench.peak_memory(lambda: jsont.loads(data))
+
+    benchmark(jsont.loads, data)
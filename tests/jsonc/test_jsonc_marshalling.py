@@ -23,3 +23,18 @@ def test_load_and_dump_jsonc_with_style_preservation(jsont: JSONTester, fixture:
     parsed = jsont.loads(raw)
     print("parsed", parsed)
     assert jsont.dumps(parsed) == raw
+
+
+@pytest.mark.parametrize(
+    "source",
+    (
+        '{"a": 1,}',
+        "[1,]",
+        '{"a": [1, 2,],}',
+        '{"a": [1, 2, ], }',
+        '{"a": 1, /* tail */ }',
+        "[1, // tail\n]",
+    ),
+)
+def test_load_and_dump_trailing_comma(jsont: JSONTester, source: str):
+    assert jsont.dumps(jsont.loads(source)) == source
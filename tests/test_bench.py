@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json as stdjson
+from pathlib import Path
+
+import pytest
+
+from json4humans import bench, json, json5, jsonc
+
+
+@pytest.mark.parametrize("name", bench.SHAPES)
+def test_shapes(name: str):
+    shape = bench.SHAPES[name]
+    src = shape.generate(10)
+    assert src == shape.generate(10)
+    doc = bench.get_module(shape.dialect).loads(src)
+    if shape.dialect == "json":
+        assert doc == stdjson.loads(src)
+
+
+def test_shapes_syntax():
+    with pytest.raises(ValueError):
+        json.loads(bench.comments(2))
+    with pytest.raises(ValueError):
+        jsonc.loads(bench.json5_syntax(2))
+    assert json5.loads(bench.json5_syntax(2))[1]["id"] == 1
+    assert json.loads(bench.deep(5)) == {"a": [{"a": [{"a": [1]}]}]}
+
+
+def test_measure():
+    result = bench.measure("doc", "[1, 2]", "json", repeat=1, min_time=0, memory=True)
+    assert result.size == 6
+    assert result.loads > 0 and result.stdlib_loads and result.ratio
+    assert result.peak and result.peak > 0
+    result = bench.measure("doc", "[1, 2,]", "json5", repeat=1, min_time=0)
+    assert result.stdlib_loads is None and result.ratio is None and result.peak is None
+
+
+def test_main_shapes(capsys):
+    assert (
+        bench.main(["-s", "deep", "-s", "json5", "--size", "3", "-r", "1", "--min-time", "0"]) == 0
+    )
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].split() == [
+        "document",
+        "dialect",
+        "size",
+        "loads",
+        "dumps",
+        "json.loads",
+        "json.dumps",
+        "ratio",
+        "peak",
+    ]
+    assert [line.split()[:2] for line in lines[2:]] == [["deep(3)", "json"], ["json5(3)", "json5"]]
+
+
+def test_main_corpus(tmp_path: Path, capsys):
+    (tmp_path / "a.jsonc").write_text("// comment\n[1]")
+    (tmp_path / "b.txt").write_text("[1]")
+    assert bench.main([str(tmp_path), "-r", "1", "--min-time", "0"]) == 0
+    assert [line.split()[1] for line in capsys.readouterr().out.splitlines()[2:]] == ["jsonc"]
+    assert bench.main([str(tmp_path / "b.txt"), "-r", "1", "--min-time", "0"]) == 1
+
+
+def test_main_skips_invalid_files(tmp_path: Path, capsys):
+    (tmp_path / "a.json").write_text("[1,]")
+    (tmp_path / "b.json").write_bytes(b'["\xff"]')
+    (tmp_path / "c.json").write_text("[1]")
+    assert bench.main([str(tmp_path), "-r", "1", "--min-time", "0"]) == 0
+    out, err = capsys.readouterr()
+    assert [line.split()[0] for line in out.splitlines()[2:]] == [str(tmp_path / "c.json")]
+    assert [line.split(":")[0] for line in err.splitlines()] == [
+        str(tmp_path / "a.json"),
+        str(tmp_path / "b.json"),
+    ]
+    assert all("skipped" in line for line in err.splitlines())
+
+
+def test_startup():
+    assert 0 < bench.startup("json", 1) < 60
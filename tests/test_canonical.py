@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import hashlib
+import struct
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+from json4humans import bench, canonical, json, json5, jsonc
+
+
+@pytest.mark.parametrize(
+    "bits,expected",
+    [
+        # RFC 8785, Appendix B
+        ("0000000000000000", "0"),
+        ("8000000000000000", "0"),
+        ("0000000000000001", "5e-324"),
+        ("8000000000000001", "-5e-324"),
+        ("7fefffffffffffff", "1.7976931348623157e+308"),
+        ("ffefffffffffffff", "-1.7976931348623157e+308"),
+        ("4340000000000000", "9007199254740992"),
+        ("c340000000000000", "-9007199254740992"),
+        ("4430000000000000", "295147905179352830000"),
+        ("44b52d02c7e14af5", "9.999999999999997e+22"),
+        ("44b52d02c7e14af6", "1e+23"),
+        ("44b52d02c7e14af7", "1.0000000000000001e+23"),
+        ("444b1ae4d6e2ef4e", "999999999999999700000"),
+        ("444b1ae4d6e2ef4f", "999999999999999900000"),
+        ("444b1ae4d6e2ef50", "1e+21"),
+        ("3eb0c6f7a0b5ed8c", "9.999999999999997e-7"),
+        ("3eb0c6f7a0b5ed8d", "0.000001"),
+        ("41b3de4355555553", "333333333.3333332"),
+        ("41b3de4355555554", "333333333.33333325"),
+        ("41b3de4355555555", "333333333.3333333"),
+        ("41b3de4355555556", "333333333.3333334"),
+        ("41b3de4355555557", "333333333.33333343"),
+        ("becbf647612f3696", "-0.0000033333333333333333"),
+        ("43143ff3c1cb0959", "1424953923781206.2"),
+    ],
+)
+def test_numbers(bits: str, expected: str):
+    (value,) = struct.unpack(">d", bytes.fromhex(bits))
+    assert canonical.dumps(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        (4.50, "4.5"),
+        (2e-3, "0.002"),
+        (1e-27, "1e-27"),
+        (100.0, "100"),
+        (42, "42"),
+        (-(2**53), "-9007199254740992"),
+        (2**60, "1152921504606847000"),
+        (Decimal("1.10"), "1.1"),
+    ],
+)
+def test_number_forms(value, expected: str):
+    assert canonical.dumps(value) == expected
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf"), 10**400])
+def test_invalid_numbers(value):
+    with pytest.raises(ValueError):
+        canonical.dumps([value])
+
+
+def test_sort_keys_by_utf16_code_units():
+    # RFC 8785, section 3.2.3
+    data = {"\u20ac": 1, "\r": 2, "\ufb33": 3, "1": 4, "\U0001f600": 5, "\u0080": 6, "\u00f6": 7}
+    assert list(canonical.dumps(data)[1:-1].split(",")) == [
+        '"\\r":2',
+        '"1":4',
+        '"\u0080":6',
+        '"\u00f6":7',
+        '"\u20ac":1',
+        '"\U0001f600":5',
+        '"\ufb33":3',
+    ]
+
+
+def test_minimal_escaping():
+    assert canonical.dumps('\u0001\b\t\n\f\r"\\/é ') == '"\\u0001\\b\\t\\n\\f\\r\\"\\\\/é "'
+
+
+def test_rfc_sample():
+    # RFC 8785, section 3.2.2
+    data = {
+        "numbers": [333333333.33333329, 1e30, 4.50, 2e-3, 0.000000000000000000000000001],
+        "string": '€$\u000f\nA\'B"\\\\"/',
+        "literals": [None, True, False],
+    }
+    assert canonical.dumps(data) == (
+        '{"literals":[null,true,false],'
+        '"numbers":[333333333.3333333,1e+30,4.5,0.002,1e-27],'
+        '"string":"€$\\u000f\\nA\'B\\"\\\\\\\\\\"/"}'
+    )
+
+
+def test_independent_of_dialect_and_style():
+    expected = '{"a":[1.5,16,true,null],"b":{"c":"d"}}'
+    assert canonical.dumps(json.loads('{"b": {"c": "d"}, "a": [1.50, 16, true, null]}')) == expected
+    assert (
+        canonical.dumps(
+            jsonc.loads('{\n  "b": {"c": "d"}, // b\n  "a": [1.5, 16, true, null,],\n}')
+        )
+        == expected
+    )
+    assert canonical.dumps(json5.loads("{b: {c: 'd'}, a: [+1.5, 0x10, true, null]}")) == expected
+
+
+def test_scalars_and_empty_containers():
+    assert canonical.dumps(None) == "null"
+    assert canonical.dumps({"a": {}, "b": [], "c": ()}) == '{"a":{},"b":[],"c":[]}'
+
+
+def test_unknown_types():
+    with pytest.raises(NotImplementedError):
+        canonical.dumps([object()])
+    with pytest.raises(NotImplementedError):
+        canonical.dumps({1: 2})
+
+
+def test_streaming(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(canonical, "CHUNK_PARTS", 8)
+    data = {"items": [{"id": i, "tags": ["a", "b"]} for i in range(100)]}
+    chunks = list(canonical.iterencode(data))
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == canonical.dumps(data)
+
+
+def test_hash():
+    data = json5.loads("{b: [1, 2], a: 'é'}")
+    expected = hashlib.sha256('{"a":"é","b":[1,2]}'.encode()).hexdigest()
+    assert canonical.update(hashlib.sha256(), data).hexdigest() == expected
+
+
+def test_dump(tmp_path: Path):
+    data = {"b": "é", "a": "\n"}
+    out = StringIO()
+    canonical.dump(data, out)
+    assert out.getvalue() == '{"a":"\\n","b":"é"}'
+
+    path = tmp_path / "canonical.json"
+    canonical.dump(data, path)
+    assert path.read_bytes() == '{"a":"\\n","b":"é"}'.encode()
+
+
+def test_deep_documents():
+    src = bench.deep(10_000)
+    assert canonical.dumps(json.loads(src)) == src.replace(" ", "")
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import io
+import json as stdjson
+from pathlib import Path
+
+import pytest
+
+from json4humans import cli
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path) -> Path:
+    return tmp_path / "cache"
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    root = tmp_path / "tree"
+    (root / "nested").mkdir(parents=True)
+    (root / ".hidden").mkdir()
+    (root / "valid.json").write_text('{"a": 1}\n')
+    (root / "nested" / "valid.jsonc").write_text('{\n  // comment\n  "a": [1, 2,],\n}\n')
+    (root / "nested" / "valid.json5").write_text("{a: +Infinity, b: 0xFF}\n")
+    (root / ".hidden" / "invalid.json").write_text("{")
+    (root / "ignored.txt").write_text("{")
+    return root
+
+
+def test_iter_files_detect_dialects(tree: Path):
+    files = {path.relative_to(tree).as_posix(): dialect for path, dialect in cli.iter_files([tree])}
+    assert files == {
+        "valid.json": "json",
+        "nested/valid.jsonc": "jsonc",
+        "nested/valid.json5": "json5",
+    }
+
+
+def test_iter_files_force_dialect(tree: Path):
+    files = dict(cli.iter_files([tree / "ignored.txt", tree / "valid.json"], "json5"))
+    assert set(files.values()) == {"json5"}
+    assert len(files) == 2
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_check_valid(tree: Path, cache_dir: Path, jobs: str, capsys):
+    assert cli.main(["check", "-j", jobs, "--cache-dir", str(cache_dir), str(tree)]) == 0
+    assert capsys.readouterr().out == ""
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_check_report_all_errors(tmp_path: Path, cache_dir: Path, jobs: str, capsys):
+    invalid = tmp_path / "invalid.jsonc"
+    invalid.write_text('{\n  "a": [1 2],\n  "b": [3 4]\n}')
+    (tmp_path / "valid.json").write_text("[]")
+    assert cli.main(["check", "-q", "-j", jobs, "--cache-dir", str(cache_dir), str(tmp_path)]) == 1
+    assert capsys.readouterr().out.splitlines() == [
+        f"{invalid}:2:11: Unexpected '2'",
+        f"{invalid}:3:11: Unexpected '4'",
+    ]
+
+
+def test_check_cache_skip_clean_files(tree: Path, cache_dir: Path, monkeypatch, capsys):
+    args = ["check", "-j", "1", "--cache-dir", str(cache_dir), str(tree)]
+    assert cli.main(args) == 0
+    assert "3 file(s) processed" in capsys.readouterr().err
+
+    assert cli.main(args) == 0
+    assert "0 file(s) processed" in capsys.readouterr().err
+
+    # Touched but unchanged files stay clean
+    (tree / "valid.json").write_text('{"a": 1}\n')
+    assert cli.main(args) == 0
+    assert "0 file(s) processed" in capsys.readouterr().err
+
+    (tree / "valid.json").write_text('{"a": }')
+    assert cli.main(args) == 1
+    assert "1 file(s) processed" in capsys.readouterr().err
+
+    assert cli.main([*args, "--no-cache"]) == 1
+    assert "3 file(s) processed" in capsys.readouterr().err
+
+
+def test_check_does_not_cache_errors(tmp_path: Path, cache_dir: Path, capsys):
+    invalid = tmp_path / "invalid.json"
+    invalid.write_text("{")
+    args = ["check", "-q", "--cache-dir", str(cache_dir), str(invalid)]
+    assert cli.main(args) == 1
+    assert cli.main(args) == 1
+    assert len(capsys.readouterr().out.splitlines()) == 2
+
+
+def test_format(tmp_path: Path, cache_dir: Path, capsys):
+    file = tmp_path / "file.jsonc"
+    file.write_text('{"a": [1, 2,], // comment\n}')
+    args = ["format", "--cache-dir", str(cache_dir), str(file)]
+
+    assert cli.main([*args, "--check"]) == 1
+    assert f"would reformat {file}" in capsys.readouterr().err
+    assert file.read_text() == '{"a": [1, 2,], // comment\n}'
+
+    assert cli.main(args) == 0
+    assert f"reformatted {file}" in capsys.readouterr().err
+    assert file.read_text() == '{"a": [1, 2,], // comment\n}\n'
+
+    assert cli.main([*args, "--check"]) == 0
+    assert "0 file(s) processed" in capsys.readouterr().err
+
+
+def test_format_report_errors(tmp_path: Path, cache_dir: Path, capsys):
+    file = tmp_path / "file.json"
+    file.write_text('{"a": }')
+    assert cli.main(["format", "-q", "--cache-dir", str(cache_dir), str(file)]) == 1
+    assert capsys.readouterr().out == f"{file}:1:7: Unexpected '}}'\n"
+    assert file.read_text() == '{"a": }'
+
+
+def test_convert(tmp_path: Path, fixtures: Path, capsys):
+    output = tmp_path / "sample.json"
+    assert (
+        cli.main(["convert", "-t", "json", "-o", str(output), str(fixtures / "json5/sample.json5")])
+        == 0
+    )
+    assert stdjson.loads(output.read_text())["hexadecimal"] == 0xDECAF
+
+
+def test_convert_error(tmp_path: Path, capsys):
+    input = tmp_path / "invalid.json5"
+    input.write_text("{\n  a: NaN,\n}")
+    assert cli.main(["convert", "-t", "json", str(input)]) == 1
+    assert capsys.readouterr().err == f"{input}:2:6: NaN is not supported by json\n"
+
+
+def test_convert_unknown_dialect(tmp_path: Path, capsys):
+    input = tmp_path / "file.txt"
+    input.write_text("{a: 1}")
+    assert cli.main(["convert", "-t", "json", str(input)]) == 2
+    assert cli.main(["convert", "-f", "json5", "-t", "json", str(input)]) == 0
+    assert capsys.readouterr().out == '{"a": 1}'
+
+
+@pytest.mark.parametrize("dialect", ["json", "jsonc", "json5"])
+def test_format_preserve_strings(tmp_path: Path, cache_dir: Path, dialect: str):
+    file = tmp_path / f"file.{dialect}"
+    src = '{"msg": "line1\\nline2 \\"q\\" café \\u00e9 \\ud83d\\ude00"}'
+    file.write_text(src, encoding="utf-8")
+
+    assert cli.main(["format", "-q", "--cache-dir", str(cache_dir), str(file)]) == 0
+    assert file.read_text(encoding="utf-8").rstrip("\n") == src.replace("\\u00e9", "é").replace(
+        "\\ud83d\\ude00", "\U0001f600"
+    )
+    assert stdjson.loads(file.read_text(encoding="utf-8")) == stdjson.loads(src)
+
+
+def test_format_write_utf8_whatever_the_locale(tmp_path: Path, cache_dir: Path, monkeypatch):
+    file = tmp_path / "file.json"
+    file.write_text('{"msg":"café"}', encoding="utf-8")
+    # Simulate a non UTF-8 locale for the files opened without an explicit encoding
+    text_encoding = io.text_encoding
+    monkeypatch.setattr(io, "text_encoding", lambda encoding, *args: encoding or "latin-1")
+
+    assert cli.main(["format", "-q", "--cache-dir", str(cache_dir), str(file)]) == 0
+    monkeypatch.setattr(io, "text_encoding", text_encoding)
+    assert file.read_bytes() == '{"msg":"café"}\n'.encode()
+
+
+def test_format_refuse_lossy_output(tmp_path: Path, cache_dir: Path, monkeypatch, capsys):
+    file = tmp_path / "file.json"
+    file.write_text('{"a": 1}')
+    monkeypatch.setattr(cli.get_module("json"), "dumps", lambda data: '{"a": 2}')
+
+    assert cli.main(["format", "-q", "--cache-dir", str(cache_dir), str(file)]) == 1
+    assert "left untouched" in capsys.readouterr().out
+    assert file.read_text() == '{"a": 1}'
+
+
+@pytest.mark.parametrize("command", ["check", "format"])
+def test_report_undecodable_files(tmp_path: Path, cache_dir: Path, command: str, capsys):
+    invalid = tmp_path / "invalid.json"
+    invalid.write_bytes(b'{"a": "\xff"}')
+    valid = tmp_path / "valid.json"
+    valid.write_text('{"a": 1}\n')
+
+    assert cli.main([command, "-q", "--cache-dir", str(cache_dir), str(invalid), str(valid)]) == 1
+    assert capsys.readouterr().out.startswith(f"{invalid}: 'utf-8' codec can't decode byte 0xff")
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import bz2
+import gzip
+import json as stdjson
+import lzma
+from collections.abc import Callable
+from io import BytesIO, StringIO
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from json4humans import compression, convert, schema
+from json4humans.errors import LimitError
+from json4humans.limits import Limits
+
+if TYPE_CHECKING:
+    from tests.conftest import JSONTester
+
+pytestmark = pytest.mark.jsons("json5")
+
+DOCUMENT = """\
+// Export
+{
+  name: 'é',
+  values: [0x10, +1.5,],
+}
+"""
+
+COMPRESSORS: dict[str, tuple[Callable[[bytes], bytes], str]] = {
+    "gzip": (gzip.compress, ".gz"),
+    "bz2": (bz2.compress, ".bz2"),
+    "lzma": (lzma.compress, ".xz"),
+}
+
+
+@pytest.fixture(params=list(COMPRESSORS))
+def codec(request) -> str:
+    return request.param
+
+
+def test_load_compressed_path(jsont: JSONTester, tmp_path: Path, codec: str):
+    compress, extension = COMPRESSORS[codec]
+    path = tmp_path / f"export.json5{extension}"
+    path.write_bytes(compress(DOCUMENT.encode()))
+
+    assert jsont.dumps(jsont.load(path)) == DOCUMENT
+
+
+def test_detect_by_magic_bytes(jsont: JSONTester, tmp_path: Path, codec: str):
+    compress, _ = COMPRESSORS[codec]
+    path = tmp_path / "export.json5"
+    path.write_bytes(compress(DOCUMENT.encode()))
+
+    assert jsont.dumps(jsont.load(path)) == DOCUMENT
+
+
+def test_detect_legacy_lzma_by_extension(jsont: JSONTester, tmp_path: Path):
+    path = tmp_path / "export.json5.lzma"
+    path.write_bytes(lzma.compress(DOCUMENT.encode(), format=lzma.FORMAT_ALONE))
+
+    assert jsont.dumps(jsont.load(path)) == DOCUMENT
+
+
+def test_load_uncompressed_path(jsont: JSONTester, tmp_path: Path):
+    path = tmp_path / "export.json5"
+    path.write_text(DOCUMENT, encoding="utf-8")
+
+    assert jsont.dumps(jsont.load(path)) == DOCUMENT
+
+
+def test_load_binary_file(jsont: JSONTester, codec: str):
+    compress, _ = COMPRESSORS[codec]
+    file = BytesIO(compress(DOCUMENT.encode()))
+
+    assert jsont.dumps(jsont.load(file)) == DOCUMENT
+    assert not file.closed
+
+
+def test_load_uncompressed_binary_file(jsont: JSONTester):
+    file = BytesIO(DOCUMENT.encode())
+
+    assert jsont.dumps(jsont.load(file)) == DOCUMENT
+    assert not file.closed
+
+
+def test_load_text_file(jsont: JSONTester):
+    assert jsont.dumps(jsont.load(StringIO(DOCUMENT))) == DOCUMENT
+
+
+def test_dump_compressed_path(jsont: JSONTester, tmp_path: Path, codec: str):
+    _, extension = COMPRESSORS[codec]
+    path = tmp_path / f"export.json5{extension}"
+    jsont.dump(jsont.loads(DOCUMENT), path)
+
+    assert compression.by_magic(path.read_bytes()) == compression.by_extension(path)
+    with compression.open(path) as stream:
+        assert stream.read() == DOCUMENT + "\n"
+
+
+def test_dump_uncompressed_path(jsont: JSONTester, tmp_path: Path):
+    path = tmp_path / "export.json5"
+    jsont.dump(jsont.loads(DOCUMENT), path)
+
+    assert path.read_text(encoding="utf-8") == DOCUMENT + "\n"
+
+
+def test_limits_stop_decompression(jsont: JSONTester, tmp_path: Path):
+    path = tmp_path / "bomb.json.gz"
+    path.write_bytes(gzip.compress(b"[" + b" " * 10_000_000 + b"]"))
+
+    with pytest.raises(LimitError):
+        jsont.load(path, limits=Limits(max_bytes=1000))
+
+
+def test_open_for_writing_requires_a_path():
+    with pytest.raises(TypeError):
+        compression.open(BytesIO(), "w")
+
+
+def test_stream_compressed_documents(tmp_path: Path):
+    path = tmp_path / "export.json5.xz"
+    path.write_bytes(lzma.compress(DOCUMENT.encode()))
+
+    with compression.open(path) as stream:
+        schema.validate_stream(stream, {"required": ["name"]}, "json5")
+
+    out = StringIO()
+    with compression.open(path) as stream:
+        convert.convert(stream, out, "json5", "json")
+    assert stdjson.loads(out.getvalue()) == {"name": "é", "values": [16, 1.5]}
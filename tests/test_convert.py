@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import io
+import json as stdjson
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from json4humans import features
+from json4humans.convert import convert, converts, iterconvert
+from json4humans.errors import JSONDecodeError
+
+if TYPE_CHECKING:
+    from tests.conftest import JSONTester
+
+
+@pytest.mark.jsons("json", "jsonc")
+@pytest.mark.fixturize("json5/*.json5")
+def test_json5_to_json(jsont: JSONTester, fixture: Path):
+    src = fixture.read_text()
+    out = converts(src, "json5", jsont.name)
+    expected = jsont.loads(src, features=features.JSON5)
+    if jsont.name == "json":
+        assert "//" not in out
+        assert stdjson.loads(out) == expected
+    else:
+        assert "// comments" in out
+    assert jsont.loads(out) == expected
+
+
+@pytest.mark.jsons("jsonc")
+@pytest.mark.fixturize("jsonc/*.jsonc")
+def test_jsonc_to_json(jsont: JSONTester, fixture: Path):
+    src = fixture.read_text()
+    assert stdjson.loads(converts(src, "jsonc", "json")) == jsont.loads(src)
+
+
+@pytest.mark.fixturize("json/*.json")
+@pytest.mark.parametrize("target", ["jsonc", "json5"])
+def test_json_is_valid_everywhere(fixture: Path, target: str):
+    src = fixture.read_text()
+    assert converts(src, "json", target) == src
+
+
+@pytest.mark.parametrize(
+    "src,expected",
+    [
+        ("{a: 1, _b_2: 2}", '{"a": 1, "_b_2": 2}'),
+        ("{Infinity: 1, NaN: 2}", '{"Infinity": 1, "NaN": 2}'),
+        ("[0xFF, -0x10, +1, .5, 5., -5.e3]", "[255, -16, 1, 0.5, 5.0, -5.0e3]"),
+        ("['a\"b', 'c\\'d']", '["a\\"b", "c\'d"]'),
+        ("['\\x41\\v\\0', 'a\\\nb']", '["\\u0041\\u000b\\u0000", "ab"]'),
+        ("[1, 2, ]", "[1, 2 ]"),
+        ("{a: [1, /* c */], // c\n}", '{"a": [1 ] \n}'),
+    ],
+)
+def test_json5_to_json_translation(src: str, expected: str):
+    assert converts(src, "json5", "json") == expected
+
+
+def test_keep_trailing_comas_and_comments():
+    src = "{a: [1, /* c */], // c\n}"
+    assert converts(src, "json5", "jsonc") == '{"a": [1, /* c */], // c\n}'
+    assert converts(src, "json5", "jsonc", comments=False) == '{"a": [1, ], \n}'
+    assert converts(src, "json5", "json5", comments=False) == "{a: [1, ], \n}"
+
+
+def test_comments_not_supported():
+    with pytest.raises(ValueError):
+        converts("[]", "jsonc", "json", comments=True)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 8, 13])
+def test_chunk_boundaries(fixtures: Path, chunk_size: int):
+    src = (fixtures / "json5/sample.json5").read_text()
+    assert converts(src, "json5", "json", chunk_size=chunk_size) == converts(src, "json5", "json")
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 1024])
+@pytest.mark.parametrize(
+    "src,msg,lineno,colno",
+    [
+        ("{\n  a: [1, -Infinity],\n}", "-Infinity is not supported by json", 2, 10),
+        ("{\n  a: NaN\n}", "NaN is not supported by json", 2, 6),
+        ("{\n  a: nope\n}", "Unexpected 'nope'", 2, 6),
+        ('{\n  a: "unterminated\n}', "Unexpected '\"'", 2, 6),
+        ("[1, @]", "Unexpected '@'", 1, 5),
+        ("[\xa01]", "Unexpected '\\xa0'", 1, 2),
+    ],
+)
+def test_errors(src: str, msg: str, lineno: int, colno: int, chunk_size: int):
+    with pytest.raises(JSONDecodeError) as excinfo:
+        converts(src, "json5", "json", chunk_size=chunk_size)
+    assert excinfo.value.msg == msg
+    assert (excinfo.value.lineno, excinfo.value.colno) == (lineno, colno)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 16, 1024])
+def test_error_past_first_chunk(chunk_size: int):
+    src = "[\n" + "  1,\n" * 30 + "  @\n]"
+    with pytest.raises(JSONDecodeError) as excinfo:
+        converts(src, "json5", "json", chunk_size=chunk_size)
+    assert excinfo.value.pos == src.index("@")
+    assert (excinfo.value.lineno, excinfo.value.colno) == (32, 3)
+    assert "@" in excinfo.value.excerpt
+
+
+def test_streaming():
+    consumed = []
+
+    def chunks():
+        for chunk in ("[1, 2, 3, 4, 5, 6, 7, 8, ", "9, 10, 11, 12, 13, 14, ", "15]"):
+            consumed.append(chunk)
+            yield chunk
+
+    tokens = iterconvert(chunks(), "json5", "json")
+    assert next(tokens) == "["
+    assert len(consumed) < 3
+    assert "".join(tokens) == "1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15]"
+
+
+@pytest.mark.parametrize("invalid", ["@", "/x", '"a\nb"', "1abc "])
+def test_errors_stop_reading(invalid: str):
+    consumed = []
+
+    def chunks():
+        yield f"[1, {invalid}"
+        for i in range(1000):
+            consumed.append(i)
+            yield "2, "
+
+    with pytest.raises(JSONDecodeError):
+        "".join(iterconvert(chunks(), "json5", "json"))
+    assert len(consumed) < 5
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 8])
+def test_long_tokens_across_chunks(chunk_size: int):
+    src = "{a: [-Infinity, 123456789.5e10, 'abc\\\nd', /* a long comment */ 0x1F]}"
+    assert converts(src, "json5", "json5", chunk_size=chunk_size) == src
+
+
+def test_convert_files():
+    output = io.StringIO()
+    convert(io.StringIO("{a: 'b',}"), output, "json5", "json", chunk_size=2)
+    assert output.getvalue() == '{"a": "b"}'
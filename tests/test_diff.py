@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from json4humans import json5, jsonc, query
+from json4humans.diff import Change, diff, digest, equal
+from json4humans.patch import apply
+from json4humans.types import Literal
+
+if TYPE_CHECKING:
+    from tests.conftest import JSONTester
+
+pytestmark = pytest.mark.jsons("jsonc")
+
+SRC = """\
+{
+  // head
+  "a": 1,
+  "b": [1, 2, 3, 4],
+  "c": {"x": true, "y": "z"} // trailing
+}
+"""
+
+
+def changes(jsont: JSONTester, a: str, b: str, style: bool = False) -> list[tuple[str, str]]:
+    return [(change.op, change.path) for change in diff(jsont.loads(a), jsont.loads(b), style)]
+
+
+def test_digest_value_equality():
+    assert digest(jsonc.loads(SRC)) == digest(
+        {"c": {"y": "z", "x": True}, "b": [1, 2, 3, 4.0], "a": 1}
+    )
+    assert digest(Literal(None)) == digest(None)
+    assert digest(True) != digest(1)
+    assert digest("1") != digest(1)
+    assert digest([1, [2]]) != digest([[1], 2])
+    assert digest({"a": [1]}) != digest({"a": 1})
+
+
+def test_digest_style():
+    doc = jsonc.loads(SRC)
+    assert equal(doc, json5.loads(SRC))
+    assert equal(doc, json5.loads(SRC), style=True)
+    assert equal(doc, jsonc.loads(SRC.replace("// trailing", "")))
+    assert not equal(doc, jsonc.loads(SRC.replace("// trailing", "")), style=True)
+    assert equal(json5.loads("[0xFF]"), json5.loads("[255]"))
+    assert not equal(json5.loads("[0xFF]"), json5.loads("[255]"), style=True)
+    assert equal(json5.loads("{a: 'b'}"), json5.loads('{"a": "b"}'))
+    assert not equal(json5.loads("{a: 'b'}"), json5.loads('{a: "b"}'), style=True)
+
+
+def test_compare_after_mutation():
+    a = jsonc.loads('{"a": {"b": 1}, "c": [1]}')
+    b = jsonc.loads('{"a": {"b": 1}, "c": [1]}')
+    assert equal(a, b)
+    assert diff(a, b) == []
+
+    a["a"]["b"] = 2
+    a["c"].append(2)
+
+    assert not equal(a, b)
+    assert diff(a, b) == [Change("replace", "/a/b", 2, 1), Change("remove", "/c/1", 2)]
+
+
+def test_identical():
+    assert diff(jsonc.loads(SRC), jsonc.loads(SRC)) == []
+    assert diff(jsonc.loads(SRC), jsonc.loads(SRC), style=True) == []
+
+
+@pytest.mark.parametrize(
+    "new,expected",
+    [
+        ('{"a": 2, "b": [1, 2, 3, 4], "c": {"x": true, "y": "z"}}', [("replace", "/a")]),
+        ('{"b": [1, 2, 3, 4], "c": {"y": "z", "x": true}, "a": 1}', []),
+        ('{"a": 1, "b": [1, 2, 3, 4], "c": {"x": true}}', [("remove", "/c/y")]),
+        ('{"a": 1, "b": [1, 2, 3, 4], "c": {"x": true, "y": "z"}, "d/e": 0}', [("add", "/d~1e")]),
+        ('{"a": 1, "b": [1, 3, 4], "c": {"x": true, "y": "z"}}', [("remove", "/b/1")]),
+        (
+            '{"a": 1, "b": [1, 4], "c": {"x": true, "y": "z"}}',
+            [("remove", "/b/2"), ("remove", "/b/1")],
+        ),
+        ('{"a": 1, "b": [0, 1, 2, 3, 4], "c": {"x": true, "y": "z"}}', [("add", "/b/0")]),
+        ('{"a": 1, "b": [1, 5, 3, 4], "c": {"x": true, "y": "z"}}', [("replace", "/b/1")]),
+        ('{"a": 1, "b": [1, 2, 3, 4], "c": [true]}', [("replace", "/c")]),
+        (
+            '{"a": 1, "b": {}, "c": {"x": false, "y": "z"}}',
+            [("replace", "/b"), ("replace", "/c/x")],
+        ),
+    ],
+)
+def test_diff(jsont: JSONTester, new: str, expected: list[tuple[str, str]]):
+    assert changes(jsont, SRC, new) == expected
+
+
+def test_diff_style(jsont: JSONTester):
+    # Keys style belongs to their object
+    assert changes(jsont, SRC, SRC.replace("// head", "// changed"), style=True) == [("style", "")]
+    assert changes(jsont, SRC, SRC.replace("// trailing", ""), style=True) == [("style", "/c")]
+    assert changes(jsont, SRC, SRC.replace('"a": 1', '"a": 1.0'), style=True) == [("style", "/a")]
+    assert changes(jsont, '{"a": 1, "b": 2}', '{"b": 2, "a": 1}', style=True) == [("style", "")]
+    assert changes(jsont, '{"a": [1, 2]}', '{"a": [1,\n 3]}', style=True) == [("replace", "/a/1")]
+
+
+def test_diff_report_values():
+    old, new = jsonc.loads('{"a": [1, 2]}'), jsonc.loads('{"a": [1, 3], "b": null}')
+    assert diff(old, new) == [
+        Change("replace", "/a/1", old["a"][1], new["a"][1]),
+        Change("add", "/b", None, new["b"]),
+    ]
+
+
+@pytest.mark.parametrize(
+    "new",
+    [
+        '{"a": [2, 3, 4], "b": {"c": [], "d": 1}}',
+        '{"a": [1, 5, 6, 7, 3, 8], "b": {"c": [1, {"e": 2}]}}',
+        '{"a": [], "b": [{"c": 1}], "f": {"g": {"h": null}}}',
+        '{"a": [3, 2, 1], "b": {"c": [1, {"e": 0}], "d": 1}}',
+    ],
+)
+def test_diff_apply_as_patch(jsont: JSONTester, new: str):
+    old = jsont.loads('{"a": [1, 2, 3], "b": {"c": [1, {"e": 0}]}}')
+    target = jsont.loads(new)
+    patch = [{"op": op, "path": path, "value": value} for op, path, _, value in diff(old, target)]
+    assert apply(old, patch) == target
+
+
+def test_mutations_invalidate_digests():
+    doc, copy = jsonc.loads(SRC), jsonc.loads(SRC)
+    assert equal(doc, copy, style=True)
+    query.assign(doc, "/c/x", False)
+    assert [change.path for change in diff(copy, doc)] == ["/c/x"]
+    query.delete(doc, "/b/0")
+    assert [change.path for change in diff(copy, doc)] == ["/b/0", "/c/x"]
+
+    index = query.Index(doc)
+    index.assign("/b/0", 1)
+    index.assign("/c/x", True)
+    assert diff(copy, doc) == [Change("remove", "/b/1", copy["b"][1])]
+
+
+def test_deeply_nested():
+    src = '{"a": [' * 3000 + "1" + "]}" * 3000
+    doc, other = jsonc.loads(src), jsonc.loads(src)
+    assert equal(doc, other, style=True)
+    pointer = "/a/0" * 2000
+    query.assign(other, pointer, 2)
+    assert [(change.op, change.path) for change in diff(doc, other)] == [("replace", pointer)]
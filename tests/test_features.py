@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from json4humans import dialect, events, features, json, json5, jsonc, schema, typed
+from json4humans.convert import converts
+from json4humans.errors import JSONDecodeError
+from json4humans.features import Features
+
+if TYPE_CHECKING:
+    from tests.conftest import JSONTester
+
+USAGES = [
+    ("[1] // comment", "comments", "Unexpected comment", 4),
+    ("[1 /* comment */]", "comments", "Unexpected comment", 3),
+    ("# comment\n[1]", "hash_comments", "Unexpected hash comment", 0),
+    ("[1, 2, ]", "trailing_comas", "Unexpected trailing coma", 5),
+    ('{"a": 1,}', "trailing_comas", "Unexpected trailing coma", 7),
+    ("['a']", "single_quotes", "Unexpected single quoted string", 1),
+    ("{a: 1}", "identifiers", "Unexpected identifier", 1),
+    ("{NaN: 1}", "identifiers", "Unexpected identifier", 1),
+    ("[0xFF]", "hex_numbers", "Unexpected hexadecimal number", 1),
+    ("[.5]", "decimal_points", "Unexpected decimal point", 1),
+    ("[5.]", "decimal_points", "Unexpected decimal point", 1),
+    ("[-5.e3]", "decimal_points", "Unexpected decimal point", 1),
+    ('["a\\\nb"]', "line_continuations", "Unexpected line continuation", 3),
+    ("[Infinity]", "constants", "Unexpected constant", 1),
+    ("[-Infinity]", "constants", "Unexpected constant", 1),
+    ("[+1]", "plus_signs", "Unexpected plus sign", 1),
+]
+
+
+@pytest.mark.jsons("json", "jsonc", "json5")
+@pytest.mark.parametrize("src,feature,msg,pos", USAGES)
+def test_feature(jsont: JSONTester, src: str, feature: str, msg: str, pos: int):
+    enabled = Features(**{feature: True})
+    assert jsont.loads(src, features=enabled) == jsont.loads(src, features=dialect.ALL)
+    with pytest.raises(JSONDecodeError) as excinfo:
+        jsont.loads(src, features=replace(dialect.ALL, **{feature: False}))
+    assert (excinfo.value.msg, excinfo.value.pos) == (msg, pos)
+    assert type(excinfo.value) is JSONDecodeError
+
+
+@pytest.mark.parametrize(
+    "src,valid",
+    [
+        ('{"a": [1, 2.5e3, -0, true, null, "b\\n"]}', ("json", "jsonc", "json5")),
+        ("// comment\n[1, 2,]", ("jsonc", "json5")),
+        ("{a: 'b', c: +0xFF, d: .5, e: -Infinity}", ("json5",)),
+        ("# comment\n{}", ()),
+    ],
+)
+def test_presets(src: str, valid: tuple[str, ...]):
+    for module in (json, jsonc, json5):
+        if module.__name__[12:] in valid:
+            module.loads(src)
+        else:
+            with pytest.raises(JSONDecodeError):
+                module.loads(src)
+
+
+def test_single_parser():
+    assert json.parser is jsonc.parser is json5.parser
+    assert (json.features, jsonc.features, json5.features) == (
+        features.JSON,
+        features.JSONC,
+        features.JSON5,
+    )
+
+
+def test_per_call_features():
+    src = "[1, // comment\n  2,\n]"
+    with pytest.raises(JSONDecodeError, match="Unexpected trailing coma"):
+        jsonc.loads(src, features=replace(jsonc.features, trailing_comas=False))
+    assert json.loads(src, features=jsonc.features) == [1, 2]
+    # The module defaults are unchanged
+    assert jsonc.loads(src) == [1, 2]
+    with pytest.raises(JSONDecodeError, match="Unexpected comment"):
+        json.loads(src)
+
+
+def test_hash_comments_roundtrip():
+    src = '# Generated\n{\n  "a": 1 # the answer\n}\n'
+    doc = jsonc.loads(src, features=replace(jsonc.features, hash_comments=True))
+    assert jsonc.dumps(doc) == src
+
+
+def test_check_reports_features():
+    errors = json.check('{"a": [1, 2,], /* c */ "b": {"c": 1 2}}')
+    assert [(error.msg, error.pos) for error in errors] == [
+        ("Unexpected trailing coma", 11),
+        ("Unexpected comment", 15),
+        ("Unexpected '2'", 36),
+    ]
+    assert jsonc.check('{"a": [1, 2,], /* c */ "b": {"c": 1}}') == []
+    assert len(jsonc.check("[1, 2,]", features=features.JSON)) == 1
+
+
+def test_loads_at_features():
+    src = '{"a": {"b": [1, 2,]}, "c": [3,]}'
+    assert json.loads_at(src, "/a/b", features=jsonc.features) == [1, 2]
+    with pytest.raises(JSONDecodeError) as excinfo:
+        json.loads_at(src, "/c")
+    assert excinfo.value.pos == 29
+
+
+def test_features_with_type():
+    assert jsonc.loads("[1, 2,]", type=list[int]) == [1, 2]
+    assert json.loads("[1, 2,]", type=list[int], features=features.JSONC) == [1, 2]
+    with pytest.raises(JSONDecodeError, match="Unexpected trailing coma"):
+        jsonc.loads("[1, 2,]", type=list[int], features=features.JSON)
+
+
+@pytest.mark.jsons("json5")
+@pytest.mark.parametrize("src,feature,msg,pos", USAGES)
+def test_streaming_features(jsont: JSONTester, src: str, feature: str, msg: str, pos: int):
+    enabled = Features(**{feature: True})
+    disabled = replace(dialect.ALL, **{feature: False})
+    expected = jsont.loads(src, features=dialect.ALL)
+    stream = events.events(src, enabled)
+    assert events.build(next(stream), stream) == expected
+    assert typed.loads(src, Any, enabled) == expected
+    assert converts(src, enabled, dialect.ALL) == src
+    for parse in (
+        lambda: list(events.events(src, disabled)),
+        lambda: typed.loads(src, Any, disabled),
+        lambda: schema.validate_stream(src, {}, disabled),
+        lambda: converts(src, disabled, dialect.ALL),
+    ):
+        with pytest.raises(JSONDecodeError) as excinfo:
+            parse()
+        assert (excinfo.value.msg, excinfo.value.pos) == (msg, pos)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from threading import Thread
+
+import pytest
+
+from json4humans import instrument, json, json5, jsonc
+from json4humans.errors import JSONDecodeError
+
+SRC = """\
+{
+  // A comment
+  "a": [1, 2.5, true, null],
+  "b": {"c": "d"} /* tail */
+}
+"""
+
+
+@pytest.fixture(autouse=True)
+def disabled():
+    yield
+    instrument.disable()
+
+
+def test_disabled_by_default():
+    assert instrument.recorder is None
+    assert jsonc.loads(SRC) == {"a": [1, 2.5, True, None], "b": {"c": "d"}}
+
+
+@pytest.mark.parametrize("module", [jsonc, json5])
+def test_loads_phases(module):
+    with instrument.profile() as recorder:
+        doc = module.loads(SRC)
+    assert doc == module.loads(SRC)
+    [stats] = recorder.stats
+    assert (stats.operation, stats.dialect, stats.size) == ("loads", module.__name__[12:], len(SRC))
+    assert stats.lex > 0 and stats.parse > 0 and stats.transform > 0 and stats.wsc > 0
+    assert stats.encode == 0
+    # Both dialects share the same lexer
+    assert stats.tokens == 31
+    # 2 objects, an array, 5 scalars and 3 keys
+    assert stats.nodes == 11
+    assert stats.total == pytest.approx(sum(stats.phases.values()))
+    assert stats.error is None
+
+
+def test_dumps_phases():
+    doc = jsonc.loads(SRC)
+    with instrument.profile() as recorder:
+        out = jsonc.dumps(doc)
+    [stats] = recorder.stats
+    assert (stats.operation, stats.size) == ("dumps", len(out))
+    assert stats.encode > 0 and stats.lex == stats.parse == 0
+
+
+def test_callback_and_enable():
+    received = []
+    recorder = instrument.enable(received.append, maxlen=2)
+    json.loads("[1]")
+    jsonc.loads_at(SRC, "/b")
+    json.loads("1", type=int)
+    assert [stats.dialect for stats in received] == ["json", "jsonc", "json"]
+    assert list(recorder.stats) == received[1:]
+    assert recorder.totals()["parse"] == received[1].parse + received[2].parse
+    assert instrument.disable() is recorder
+    json.loads("[1]")
+    assert len(received) == 3
+
+
+def test_positions_and_errors():
+    with instrument.profile() as recorder:
+        jsonc.loads(SRC, positions=True)
+        with pytest.raises(JSONDecodeError):
+            json.loads("[1,]")
+    assert [stats.error for stats in recorder.stats] == [None, "JSONDecodeError"]
+    assert recorder.stats[0].nodes == 11
+
+
+def test_nested_profiles():
+    with instrument.profile() as outer:
+        with instrument.profile() as inner:
+            json.loads("[]")
+        json.loads("{}")
+    assert instrument.recorder is None
+    assert (len(outer.stats), len(inner.stats)) == (1, 1)
+
+
+def test_profiles_are_context_local():
+    received = []
+    instrument.enable(received.append)
+    with instrument.profile() as recorder:
+        thread = Thread(target=json.loads, args=("[1]",))
+        thread.start()
+        thread.join()
+        json.loads("{}")
+    assert [stats.size for stats in recorder.stats] == [2]
+    # Threads start with an empty context, so the process-wide recorder applies
+    assert [stats.size for stats in received] == [3]
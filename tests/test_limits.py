@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import io
+import pickle
+from typing import TYPE_CHECKING
+
+import pytest
+
+from json4humans import json, json5, jsonc, positions
+from json4humans.errors import JSONDecodeError, LimitError
+from json4humans.limits import Limits
+
+if TYPE_CHECKING:
+    from tests.conftest import JSONTester
+
+SRC = """\
+{
+  // A comment
+  "a": [1, 2.5, true, null],
+  "b": {"c": "def"}
+}
+"""
+
+
+@pytest.mark.parametrize("module", [json, jsonc, json5])
+def test_within_limits(module):
+    src = SRC if module is not json else SRC.replace("  // A comment\n", "")
+    limits = Limits(
+        max_depth=2, max_bytes=len(src), max_nodes=11, max_string_length=3, max_number_digits=2
+    )
+    assert module.loads(src, limits=limits) == module.loads(src)
+
+
+@pytest.mark.parametrize(
+    "limits,limit,lineno,colno",
+    [
+        (Limits(max_depth=1), "max_depth", 3, 8),
+        (Limits(max_bytes=20), "max_bytes", 1, 1),
+        (Limits(max_nodes=10), "max_nodes", 4, 14),
+        (Limits(max_string_length=2), "max_string_length", 4, 14),
+        (Limits(max_number_digits=1), "max_number_digits", 3, 12),
+    ],
+)
+@pytest.mark.parametrize("module", [jsonc, json5])
+def test_exceeded(module, limits: Limits, limit: str, lineno: int, colno: int):
+    with pytest.raises(LimitError) as excinfo:
+        module.loads(SRC, limits=limits)
+    assert excinfo.value.limit == limit
+    assert (excinfo.value.lineno, excinfo.value.colno) == (lineno, colno)
+    assert isinstance(excinfo.value, JSONDecodeError)
+
+
+@pytest.mark.jsons("json5")
+@pytest.mark.parametrize(
+    "src,limits,limit",
+    [
+        ("{a: '', b: \"\", c: 'xy'}", Limits(max_nodes=6), "max_nodes"),
+        ("{abcd: 1}", Limits(max_string_length=3), "max_string_length"),
+        ("['a\\\nb']", Limits(max_string_length=3), "max_string_length"),
+        ("[+0xFFFF]", Limits(max_number_digits=3), "max_number_digits"),
+        ("[-1.5e10]", Limits(max_number_digits=3), "max_number_digits"),
+    ],
+)
+def test_json5_exceeded(jsont: JSONTester, src: str, limits: Limits, limit: str):
+    with pytest.raises(LimitError) as excinfo:
+        jsont.loads(src, limits=limits)
+    assert excinfo.value.limit == limit
+
+
+def test_json5_counts():
+    assert json5.loads("{a: '', b: \"\", c: 'xy'}", limits=Limits(max_nodes=7)) == {
+        "a": "",
+        "b": "",
+        "c": "xy",
+    }
+    assert json5.loads("[+0xFFF, -1.5e1]", limits=Limits(max_number_digits=3)) == [0xFFF, -15]
+
+
+def test_deep_nesting_rejected_early():
+    src = "[" * 100_000
+    with pytest.raises(LimitError, match="Maximum depth of 100 exceeded") as excinfo:
+        json.loads(src, limits=Limits(max_depth=100))
+    assert excinfo.value.pos == 100
+
+
+def test_max_bytes_counts_utf8():
+    src = '"' + "é" * 10 + '"'
+    json.loads(src, limits=Limits(max_bytes=22))
+    with pytest.raises(LimitError):
+        json.loads(src, limits=Limits(max_bytes=21))
+
+
+def test_load_stops_reading_at_limit():
+    file = io.StringIO("[" + "1," * 1000 + "1]")
+    with pytest.raises(LimitError):
+        json.load(file, limits=Limits(max_bytes=100))
+    assert file.tell() == 101
+
+
+def test_loads_at_limits():
+    with pytest.raises(LimitError) as excinfo:
+        jsonc.loads_at(SRC, "/b", limits=Limits(max_string_length=2))
+    assert (excinfo.value.limit, excinfo.value.lineno, excinfo.value.colno) == (
+        "max_string_length",
+        4,
+        14,
+    )
+
+
+def test_limits_with_other_options():
+    doc = jsonc.loads(SRC, limits=Limits(max_depth=2), positions=True)
+    assert positions.of(doc).span(doc["a"])
+    doc = jsonc.loads(SRC, limits=Limits(max_depth=2), array_hook=tuple)
+    assert doc["a"] == (1, 2.5, True, None)
+    with pytest.raises(ValueError):
+        jsonc.loads(SRC, type=dict, limits=Limits(max_depth=2))
+
+
+def test_limit_error_pickling():
+    with pytest.raises(LimitError) as excinfo:
+        jsonc.loads(SRC, limits=Limits(max_depth=1))
+    error = pickle.loads(pickle.dumps(excinfo.value))
+    assert (error.limit, error.pos, error.msg) == (
+        "max_depth",
+        excinfo.value.pos,
+        excinfo.value.msg,
+    )
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import pickle
+import tracemalloc
+from copy import deepcopy
+from typing import TYPE_CHECKING
+
+import pytest
+
+from json4humans import canonical, diff, json, json5, jsonc, patch, query
+from json4humans.numeric import NumericArray
+from json4humans.tree import clone, to_python
+from json4humans.types import Array, Float, Integer, Literal, String
+
+if TYPE_CHECKING:
+    from tests.conftest import JSONTester
+
+
+@pytest.mark.jsons("json5")
+@pytest.mark.parametrize(
+    "src",
+    [
+        "[1, 2, 3]",
+        "[-1,0,9223372036854775807]",
+        "[0.5, -1.25, 3.0, 1e-05]",
+        "[\n  1.5,\n  2.25\n]",
+        "[1 , 2 ,]",
+        "[ 1 ]",
+        "// samples\n[ // head\n  1,\n  2 // last\n]\n",
+    ],
+)
+def test_pack_and_roundtrip(jsont: JSONTester, src: str):
+    doc = jsont.loads(src, numeric_arrays=True)
+
+    assert isinstance(doc, NumericArray)
+    assert jsont.dumps(doc) == src
+
+
+@pytest.mark.jsons("json5")
+@pytest.mark.parametrize(
+    "src",
+    [
+        "[]",
+        "[1, 2.5]",
+        "[1, 0x10]",
+        "[1, +2]",
+        "[1.50, 2.5]",
+        "[1e3]",
+        "[1, 2,  3]",
+        "[1, /* two */ 2]",
+        "[1, Infinity]",
+        "[1, 9223372036854775808]",
+        "[1, true]",
+    ],
+)
+def test_not_packed(jsont: JSONTester, src: str):
+    doc = jsont.loads(src, numeric_arrays=True)
+
+    assert type(doc) is Array
+    assert jsont.dumps(doc) == src
+
+
+@pytest.mark.parametrize("module", [json, jsonc, json5])
+def test_nested_arrays(module):
+    src = '{"timestamps": [1, 2, 3], "samples": [[0.5, 1.5], ["a"]]}'
+    doc = module.loads(src, numeric_arrays=True)
+
+    assert isinstance(doc["timestamps"], NumericArray)
+    assert doc["timestamps"].data.typecode == "q"
+    assert isinstance(doc["samples"][0], NumericArray)
+    assert doc["samples"][0].data.typecode == "d"
+    assert type(doc["samples"]) is Array
+    assert type(doc["samples"][1]) is Array
+    assert module.dumps(doc) == src
+
+
+def test_opt_in():
+    assert type(json.loads("[1, 2]")) is Array
+    assert json.loads("[1, 2]", array_hook=tuple, numeric_arrays=True) == (1, 2)
+    assert type(json.loads("[1, 2]", parse_int=float, numeric_arrays=True)) is Array
+    with pytest.raises(ValueError):
+        json.loads("[1, 2]", numeric_arrays=True, positions=True)
+    with pytest.raises(ValueError):
+        json.loads("[1, 2]", numeric_arrays=True, type=list[int])
+
+
+def test_list_behavior():
+    doc = json.loads("[3, 1, 2, 1]", numeric_arrays=True)
+
+    assert len(doc) == 4
+    assert doc == [3, 1, 2, 1]
+    assert [3, 1, 2, 1] == doc
+    assert doc != [3, 1]
+    assert doc[0] == 3 and doc[-1] == 1
+    assert doc[1:3] == [1, 2]
+    assert list(doc) == [3, 1, 2, 1]
+    assert list(reversed(doc)) == [1, 2, 1, 3]
+    assert 2 in doc and 5 not in doc
+    assert doc.index(1) == 1 and doc.count(1) == 2
+    assert doc + [4] == [3, 1, 2, 1, 4]
+    assert [0] + doc == [0, 3, 1, 2, 1]
+    assert doc < [4]
+    assert repr(doc) == "[3, 1, 2, 1]"
+
+    assert doc.pop() == 1
+    doc.remove(3)
+    doc.sort()
+    assert doc == [1, 2]
+    doc.reverse()
+    assert doc == [2, 1]
+    del doc[0]
+    assert doc == [1]
+    assert isinstance(doc, NumericArray)
+
+
+def test_compact_modifications():
+    doc = json.loads("[\n  1,\n  2\n]", numeric_arrays=True)
+
+    doc.append(3)
+    doc[0] = Integer(0)
+    doc.insert(1, 10)
+    doc.extend([4, 5])
+    doc += [6]
+
+    assert isinstance(doc, NumericArray)
+    assert json.dumps(doc) == "[\n  0,\n  10,\n  2,\n  3,\n  4,\n  5,\n  6\n]"
+
+
+@pytest.mark.jsons("json5")
+@pytest.mark.parametrize(
+    "modify,expected",
+    [
+        (lambda doc: doc.append(String("three")), '[\n  1,\n  2,\n  "three"\n]'),
+        (lambda doc: doc.append(Float(2.5)), "[\n  1,\n  2,\n  2.5\n]"),
+        (lambda doc: doc.append(Literal(True)), "[\n  1,\n  2,\n  true\n]"),
+        (lambda doc: doc.append(Integer(2**63)), "[\n  1,\n  2,\n  9223372036854775808\n]"),
+        (lambda doc: doc.append(Integer(3, raw="+3")), "[\n  1,\n  2,\n  +3\n]"),
+        (lambda doc: doc.extend([String("three")]), '[\n  1,\n  2,\n  "three"\n]'),
+        (lambda doc: doc.insert(0, String("zero")), '[\n  "zero",\n  1,\n  2\n]'),
+        (lambda doc: doc.insert(1, String("half")), '[\n  1,\n  "half",\n  2\n]'),
+        (lambda doc: doc.__setitem__(0, String("one")), '[\n  "one",\n  2\n]'),
+        (lambda doc: doc.__setitem__(-1, String("two")), '[\n  1,\n  "two"\n]'),
+    ],
+)
+def test_inflate_on_other_values(jsont: JSONTester, modify, expected: str):
+    doc = jsont.loads("[\n  1,\n  2\n]", numeric_arrays=True)
+
+    modify(doc)
+
+    assert type(doc) is Array
+    assert jsont.dumps(doc) == expected
+
+
+def test_inflate_keeps_layout():
+    src = "[ // head\n  1,\n  2,\n]"
+    doc = json5.loads(src, numeric_arrays=True)
+
+    doc.inflate()
+
+    assert type(doc) is Array
+    assert all(type(item) is Integer for item in doc)
+    assert json5.dumps(doc) == src
+
+
+def test_query_and_patch():
+    doc = json5.loads("{ids: [\n  1,\n  2\n]}", numeric_arrays=True)
+
+    query.assign(doc, "/ids/1", 20)
+    patch.apply(doc, [{"op": "add", "path": "/ids/0", "value": 0}])
+    assert isinstance(doc["ids"], NumericArray)
+    assert json5.dumps(doc) == "{ids: [\n  0,\n  1,\n  20\n]}"
+
+    query.assign(doc, "/ids/-", "x")
+    assert type(doc["ids"]) is Array
+    assert json5.dumps(doc) == '{ids: [\n  0,\n  1,\n  20,\n  "x"\n]}'
+
+
+@pytest.mark.parametrize("copier", [clone, deepcopy, lambda doc: pickle.loads(pickle.dumps(doc))])
+def test_copies(copier):
+    src = "{a: [\n  1.5,\n  2.5,\n]}"
+    doc = json5.loads(src, numeric_arrays=True)
+
+    copy = copier(doc)
+    copy["a"].append(3.5)
+
+    assert isinstance(copy["a"], NumericArray)
+    assert json5.dumps(doc) == src
+    assert json5.dumps(copy) == "{a: [\n  1.5,\n  2.5,\n  3.5,\n]}"
+
+
+def test_digests():
+    src = "{a: [1, 2, 3], b: 'c'}"
+    doc = json5.loads(src, numeric_arrays=True)
+    other = json5.loads(src, numeric_arrays=True)
+    other["a"][1] = 4
+
+    assert diff.equal(doc, json5.loads(src))
+    assert diff.equal(doc, json5.loads(src, numeric_arrays=True), style=True)
+    assert not diff.equal(doc, json5.loads("{a: [1,2,3], b: 'c'}", numeric_arrays=True), style=True)
+    assert diff.diff(doc, other) == [diff.Change("replace", "/a/1", 2, 4)]
+
+
+def test_conversions():
+    doc = json5.loads("{b: [1, 2], a: [0.5]}", numeric_arrays=True)
+
+    assert to_python(doc) == {"b": [1, 2], "a": [0.5]}
+    assert type(to_python(doc)["b"]) is list
+    assert canonical.dumps(doc) == '{"a":[0.5],"b":[1,2]}'
+
+
+def test_build():
+    assert NumericArray([1, 2]).data.typecode == "q"
+    assert NumericArray([1, 2.5]).data.typecode == "d"
+    assert NumericArray(range(3), "d").data.tolist() == [0.0, 1.0, 2.0]
+    assert json.dumps(NumericArray([1, 2], item_before=[" "])) == "[1, 2]"
+
+
+@pytest.mark.jsons("json")
+def test_memory(jsont: JSONTester):
+    src = str(list(range(10_000)))
+
+    def retained(**kwargs) -> int:
+        tracemalloc.start()
+        try:
+            doc = jsont.loads(src, **kwargs)
+            allocated = tracemalloc.get_traced_memory()[0]
+            del doc
+            return allocated
+        finally:
+            tracemalloc.stop()
+
+    assert retained(numeric_arrays=True) * 10 < retained()
+
+
+def test_numpy_views():
+    numpy = pytest.importorskip("numpy")
+    doc = json.loads('{"samples": [0.5, 1.5, 2.5]}', numeric_arrays=True)
+
+    values = numpy.asarray(doc["samples"])
+    values *= 2
+
+    assert values.dtype == numpy.float64
+    assert json.dumps(doc) == '{"samples": [1.0, 3.0, 5.0]}'
+    assert numpy.asarray(doc["samples"], dtype=numpy.int64).tolist() == [1, 3, 5]
+    assert not numpy.shares_memory(numpy.array(doc["samples"], copy=True), values)
+
+
+def test_from_numpy():
+    numpy = pytest.importorskip("numpy")
+
+    assert NumericArray(numpy.arange(3)).data.tolist() == [0, 1, 2]
+    assert NumericArray(numpy.arange(3, dtype=">i8")).data.tolist() == [0, 1, 2]
+    assert NumericArray(numpy.array([0.5, 1.5], dtype=numpy.float32)).data.tolist() == [0.5, 1.5]
+    doc = json.loads('{"samples": []}')
+    doc["samples"] = NumericArray(numpy.linspace(0, 1, 3), before=[" "], item_before=[" "])
+    assert json.dumps(doc) == '{"samples": [0.0, 0.5, 1.0]}'
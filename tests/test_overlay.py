@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import pytest
+
+from json4humans import jsonc
+from json4humans.overlay import Overlay
+
+BASE = """\
+{
+  // Defaults
+  "name": "app",
+  "database": {"host": "localhost", "port": 5432, "options": {"ssl": false}},
+  "features": ["a", "b"]
+}
+"""
+
+ENV = """\
+{
+  "database": {"host": "db.internal", "options": {"timeout": 10}},
+  "debug": false
+}
+"""
+
+HOST = """\
+{
+  // Host specific
+  "debug": true, // Temporary
+  "features": ["c"]
+}
+"""
+
+
+@pytest.fixture
+def layers():
+    return jsonc.loads(BASE), jsonc.loads(ENV), jsonc.loads(HOST)
+
+
+def test_lookups(layers):
+    base, env, host = layers
+    view = Overlay(base, env, host)
+    assert view["name"] == "app"
+    assert view["debug"] is not None and view["debug"] == True  # noqa: E712
+    assert view["features"] is host["features"]
+    assert view["database"]["host"] == "db.internal"
+    assert view["database"]["port"] is base["database"]["port"]
+    assert dict(view["database"]["options"]) == {"ssl": False, "timeout": 10}
+    assert list(view) == ["name", "database", "features", "debug"]
+    assert len(view) == 4
+    assert "debug" in view and "missing" not in view
+    with pytest.raises(KeyError):
+        view["missing"]
+    assert view == {
+        "name": "app",
+        "database": {"host": "db.internal", "port": 5432, "options": {"ssl": False, "timeout": 10}},
+        "features": ["c"],
+        "debug": True,
+    }
+
+
+def test_values_mask_lower_objects():
+    view = Overlay(jsonc.loads('{"a": {"b": 1}}'), jsonc.loads('{"a": null}'), jsonc.loads("{}"))
+    assert view["a"] is not None and view["a"].value is None
+    view = Overlay(jsonc.loads('{"a": 1}'), jsonc.loads('{"a": {"b": 1}}'))
+    assert dict(view["a"]) == {"b": 1}
+
+
+def test_copy_on_write(layers):
+    base, env, host = layers
+    view = Overlay(base, env, host)
+    view["database"]["options"]["retries"] = 3
+    view["database"]["port"] = 6543
+    view["name"] = "other"
+    assert view["database"]["options"]["retries"] == 3
+    assert view["database"]["port"] == 6543
+    assert view["database"]["host"] == "db.internal"
+    # Lower layers are untouched
+    assert jsonc.dumps(base) == BASE
+    assert jsonc.dumps(env) == ENV
+    # Only the written values land in the top layer, which keeps its comments
+    assert jsonc.dumps(host) == (
+        "{\n"
+        "  // Host specific\n"
+        '  "debug": true, // Temporary\n'
+        '  "features": ["c"],\n'
+        '  "database": {"options": {"retries": 3}, "port": 6543},\n'
+        '  "name": "other"\n'
+        "}\n"
+    )
+
+
+def test_read_back_through_the_same_view(layers):
+    base, env, host = layers
+    view = Overlay(base, env, host)
+    database = view["database"]
+    options = database["options"]
+
+    database["pool"] = 16
+    database["port"] = 2
+    options["retries"] = 3
+
+    assert database["pool"] == 16
+    assert database["port"] == 2
+    assert options["retries"] == 3
+    assert "pool" in database and len(database) == 4
+    assert dict(options) == {"ssl": False, "timeout": 10, "retries": 3}
+    del database["port"]
+    assert database["port"] == 5432
+    view["database"] = 1
+    with pytest.raises(KeyError):
+        database["host"]
+
+
+def test_delete(layers):
+    base, env, host = layers
+    view = Overlay(base, env, host)
+    del view["debug"]
+    assert view["debug"] == False  # noqa: E712
+    with pytest.raises(KeyError):
+        del view["debug"]
+    with pytest.raises(KeyError):
+        del view["database"]["host"]
+    assert "debug" in env
+
+
+def test_materialize(layers):
+    base, env, host = layers
+    view = Overlay(base, env, host)
+    merged = view.materialize()
+    assert merged == view
+    assert merged["database"]["port"] is not base["database"]["port"]
+    merged["database"]["port"] = 1
+    assert base["database"]["port"] == 5432
+    assert jsonc.loads(view.dumps(jsonc)) == view
+    assert view.dumps(jsonc) == (
+        "{\n"
+        "  // Defaults\n"
+        '  "name": "app",\n'
+        '  "database": {"host": "db.internal", "port": 5432, "options": {"ssl": false, "timeout": 10}},\n'
+        '  "features": ["c"],\n'
+        '  "debug": true\n'
+        "}\n"
+    )
+
+
+def test_set_object_merges(layers):
+    base, env, host = layers
+    view = Overlay(base, env, host)
+    view["database"] = {"port": 1}
+    assert view["database"] == {
+        "host": "db.internal",
+        "port": 1,
+        "options": {"ssl": False, "timeout": 10},
+    }
+    view["copy"] = view["database"]
+    assert host["copy"] == view["database"]
+
+
+def test_invalid_layers():
+    with pytest.raises(ValueError):
+        Overlay()
+    with pytest.raises(TypeError):
+        Overlay(jsonc.loads("{}"), jsonc.loads("[]"))
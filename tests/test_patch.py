@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+import pytest
+
+from json4humans import json5, scan
+from json4humans.patch import PatchError, apply, apply_patch
+
+if TYPE_CHECKING:
+    from tests.conftest import JSONTester
+
+SRC = """\
+{
+  // head
+  "a": 1, // one
+  "b": [1, 2, 3],
+  "c": {"x": true} // trailing
+}
+"""
+
+PATCHES = {
+    "add-member": [{"op": "add", "path": "/d", "value": [1]}],
+    "add-existing-member": [{"op": "add", "path": "/a", "value": {"y": None}}],
+    "add-nested": [{"op": "add", "path": "/c/y", "value": "z"}],
+    "add-item": [{"op": "add", "path": "/b/0", "value": 0}],
+    "append-item": [{"op": "add", "path": "/b/-", "value": 4}],
+    "append-index": [{"op": "add", "path": "/b/3", "value": 4}],
+    "add-root": [{"op": "add", "path": "", "value": [True]}],
+    "remove-first": [{"op": "remove", "path": "/a"}],
+    "remove-last": [{"op": "remove", "path": "/c"}],
+    "remove-item": [{"op": "remove", "path": "/b/1"}],
+    "remove-last-item": [{"op": "remove", "path": "/b/2"}],
+    "remove-only": [{"op": "remove", "path": "/c/x"}],
+    "replace": [{"op": "replace", "path": "/c/x", "value": False}],
+    "replace-root": [{"op": "replace", "path": "", "value": {}}],
+    "move": [{"op": "move", "from": "/a", "path": "/c/y"}],
+    "move-item": [{"op": "move", "from": "/b/0", "path": "/b/-"}],
+    "move-same": [{"op": "move", "from": "/b", "path": "/b"}],
+    "move-member": [{"op": "move", "from": "/c/x", "path": "/d"}],
+    "move-nested": [{"op": "move", "from": "/a", "path": "/c/x"}],
+    "copy": [{"op": "copy", "from": "/c", "path": "/b/1"}],
+    "test": [{"op": "test", "path": "/b", "value": [1, 2, 3]}],
+    "sequence": [
+        {"op": "add", "path": "/d", "value": {}},
+        {"op": "add", "path": "/d/e", "value": 1},
+        {"op": "remove", "path": "/b/0"},
+        {"op": "move", "from": "/d", "path": "/b/0"},
+        {"op": "replace", "path": "/a", "value": "z"},
+    ],
+}
+
+
+@pytest.mark.parametrize("dialect", ["jsonc", "json5"])
+@pytest.mark.parametrize("patch", PATCHES.values(), ids=PATCHES.keys())
+def test_apply_patch_match_tree(dialect: str, patch: list):
+    module = import_module(f"json4humans.{dialect}")
+    assert module.dumps(apply(module.loads(SRC), patch)) == apply_patch(SRC, patch)
+
+
+def test_apply_patch_on_json():
+    from json4humans import json
+
+    src = '{"a": {"c": null}, "b": [1, 2]}'
+    patch = PATCHES["sequence"]
+    assert json.dumps(apply(json.loads(src), patch)) == apply_patch(src, patch)
+
+
+@pytest.mark.parametrize(
+    "patch,expected",
+    [
+        (
+            PATCHES["add-member"],
+            '  "c": {"x": true}, // trailing\n  "d": [1]\n}\n',
+        ),
+        (PATCHES["remove-last"], '  "b": [1, 2, 3]\n}\n'),
+        (PATCHES["remove-item"], '  "b": [1, 3],\n  "c": {"x": true} // trailing\n}\n'),
+        (PATCHES["move"], '  "b": [1, 2, 3],\n  "c": {"x": true, "y": 1} // trailing\n}\n'),
+    ],
+)
+def test_apply_patch_preserve_style(patch: list, expected: str):
+    assert apply_patch(SRC, patch).endswith(expected)
+    assert apply_patch(SRC, patch).startswith("{\n  // head\n")
+
+
+def test_remove_first_member_with_comments():
+    assert apply_patch(SRC, PATCHES["remove-first"]) == (
+        '{\n  // head\n  "b": [1, 2, 3],\n  "c": {"x": true} // trailing\n}\n'
+    )
+
+
+@pytest.mark.parametrize(
+    "src,patch,expected",
+    [
+        (
+            "[1, 2,\n  // tail\n]",
+            {"op": "add", "path": "/-", "value": 3},
+            "[1, 2, 3,\n  // tail\n]",
+        ),
+        ("[1, 2,\n  // tail\n]", {"op": "remove", "path": "/1"}, "[1,\n  // tail\n]"),
+        ("[\n  1,\n  2\n]", {"op": "add", "path": "/1", "value": 3}, "[\n  1,\n  3,\n  2\n]"),
+        ("[\n  1,\n  2\n]", {"op": "add", "path": "/-", "value": 3}, "[\n  1,\n  2,\n  3\n]"),
+        ("{/* empty */}", {"op": "add", "path": "/a", "value": 1}, '{"a": 1/* empty */}'),
+        ("{a: 1 /* one */}", {"op": "remove", "path": "/a"}, "{ /* one */}"),
+        ("{'a': 1, b: 2}", {"op": "copy", "from": "/a", "path": "/c"}, "{'a': 1, b: 2, \"c\": 1}"),
+        ("[1, /* 2 */ 2]", {"op": "replace", "path": "/1", "value": [2]}, "[1, /* 2 */ [2]]"),
+    ],
+)
+def test_apply_patch_layout(src: str, patch: dict, expected: str):
+    assert apply_patch(src, [patch]) == expected
+
+
+def test_move_keep_source_text():
+    src = "{\n  a: [0xFF, /* keep */ 'b'],\n  c: {},\n}"
+    assert apply_patch(src, [{"op": "move", "from": "/a", "path": "/c/a"}]) == (
+        "{\n  c: {\"a\": [0xFF, /* keep */ 'b']},\n}"
+    )
+
+
+@pytest.mark.parametrize(
+    "patch",
+    [
+        {"op": "add", "path": "/x/y", "value": 1},
+        {"op": "add", "path": "/b/5", "value": 1},
+        {"op": "remove", "path": "/x"},
+        {"op": "replace", "path": "/b/3", "value": 1},
+        {"op": "move", "from": "/x", "path": "/y"},
+        {"op": "test", "path": "/x", "value": 1},
+    ],
+)
+def test_unresolved_pointer(patch: dict):
+    with pytest.raises(KeyError):
+        apply_patch(SRC, [patch])
+
+
+@pytest.mark.parametrize(
+    "patch",
+    [
+        {"op": "unknown", "path": "/a"},
+        {"path": "/a"},
+        {"op": "remove", "path": ""},
+        {"op": "move", "from": "/c", "path": "/c/x"},
+        {"op": "test", "path": "/a", "value": 2},
+    ],
+)
+def test_invalid_operation(patch: dict):
+    with pytest.raises(PatchError):
+        apply_patch(SRC, [patch])
+
+
+BATCH = [
+    {"op": "test", "path": "/a", "value": 1},
+    {"op": "replace", "path": "/a", "value": 2},
+    {"op": "replace", "path": "/b/2", "value": "three"},
+    {"op": "replace", "path": "/b/0", "value": None},
+    {"op": "test", "path": "/c/x", "value": True},
+    {"op": "replace", "path": "/c/x", "value": False},
+    {"op": "replace", "path": "/c", "value": {}},
+    {"op": "test", "path": "/c", "value": {}},
+]
+
+
+def test_batched_operations_match_sequential():
+    expected = SRC
+    for operation in BATCH:
+        expected = apply_patch(expected, [operation])
+    assert apply_patch(SRC, BATCH) == expected
+    assert json5.dumps(apply(json5.loads(SRC), BATCH)) == expected
+
+
+@pytest.mark.jsons("json5")
+def test_batched_operations_scan_once(jsont: JSONTester, monkeypatch: pytest.MonkeyPatch):
+    scanned = []
+    entries = scan.entries
+
+    def counting(src: str, pos: int) -> tuple[list[scan.Entry], int]:
+        scanned.append(pos)
+        return entries(src, pos)
+
+    monkeypatch.setattr(scan, "entries", counting)
+    patch = [{"op": "replace", "path": f"/{key}", "value": 0} for key in "abc"]
+    assert jsont.loads(apply_patch(SRC, patch)) == {"a": 0, "b": 0, "c": 0}
+    assert scanned == [SRC.index("{")]
+
+
+@pytest.mark.parametrize(
+    "patch,error",
+    [
+        (BATCH[:3] + [{"op": "replace", "path": "/x", "value": 1}], KeyError),
+        (BATCH[:3] + [{"op": "test", "path": "/b/0", "value": 2}], PatchError),
+        ([{"op": "replace", "path": "/c", "value": {}}, {"op": "test", "path": "/c/x"}], KeyError),
+    ],
+)
+def test_batched_operations_errors(patch: list, error: type[Exception]):
+    with pytest.raises(error) as excinfo:
+        apply_patch(SRC, patch)
+    assert patch[-1]["path"] in str(excinfo.value)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import copy
+from typing import TYPE_CHECKING
+
+import pytest
+
+from json4humans import json, json5, jsonc, positions, query
+from json4humans.positions import Location, Span
+
+if TYPE_CHECKING:
+    from tests.conftest import JSONTester
+
+SRC = """\
+{
+  // A comment
+  "a": [1, 2.5, true, null],
+  "b": {"c": "d"},
+  "e": [] /* tail */
+}
+"""
+
+
+def text(doc, node) -> str:
+    table = positions.of(doc)
+    start, end = table.span(node)
+    return table.src[start:end]
+
+
+@pytest.mark.parametrize("module", [jsonc, json5])
+def test_spans(module):
+    doc = module.loads(SRC, positions=True)
+    assert text(doc, doc) == SRC.strip()
+    assert text(doc, doc["a"]) == "[1, 2.5, true, null]"
+    assert [text(doc, item) for item in doc["a"]] == ["1", "2.5", "true", "null"]
+    assert text(doc, doc["b"]["c"]) == '"d"'
+    assert text(doc, doc["e"]) == "[]"
+    assert [text(doc, key) for key in doc] == ['"a"', '"b"', '"e"']
+    assert len(positions.of(doc)) == 13
+
+
+def test_json5_spans():
+    src = "{key: 'v', n: -Infinity, h: +0xFF, s: \"a\\\nb\", l: [.5,],}"
+    doc = json5.loads(src, positions=True)
+    assert [(text(doc, key), text(doc, value)) for key, value in doc.items()] == [
+        ("key", "'v'"),
+        ("n", "-Infinity"),
+        ("h", "+0xFF"),
+        ("s", '"a\\\nb"'),
+        ("l", "[.5,]"),
+    ]
+
+
+def test_locations():
+    doc = json.loads(SRC.replace("  // A comment\n", "").replace(" /* tail */", ""), positions=True)
+    table = positions.of(doc)
+    assert table.span(doc["b"]) == Span(38, 48)
+    assert table.start(doc["b"]) == Location(3, 8)
+    assert table.end(doc["b"]) == Location(3, 18)
+    assert table.start(doc) == Location(1, 1)
+    assert table.location(len(table.src)) == Location(6, 1)
+
+
+def test_scalar_root():
+    doc = jsonc.loads('  "a" // comment', positions=True)
+    assert positions.of(doc).span(doc) == Span(2, 5)
+
+
+def test_without_positions():
+    doc = jsonc.loads(SRC)
+    with pytest.raises(ValueError):
+        positions.of(doc)
+
+
+@pytest.mark.jsons("jsonc")
+@pytest.mark.parametrize(
+    "hook",
+    [
+        {"array_hook": list},
+        {"object_hook": dict},
+        {"object_pairs_hook": dict},
+        {"parse_float": float},
+        {"parse_int": int},
+        {"parse_constant": float},
+    ],
+)
+def test_hooks_rejected(jsont: JSONTester, hook: dict):
+    with pytest.raises(ValueError, match="positions can't be combined with hooks"):
+        jsont.loads('{"a": [1]}', positions=True, **hook)
+
+
+def test_unknown_nodes():
+    doc = jsonc.loads(SRC, positions=True)
+    query.assign(doc, "/b/f", 1)
+    table = positions.of(doc)
+    assert doc["b"]["c"] in table
+    assert doc["b"]["f"] not in table
+    with pytest.raises(KeyError):
+        table.span(doc["b"]["f"])
+    with pytest.raises(KeyError):
+        table.span(jsonc.loads(SRC, positions=True))
+
+
+def test_deepcopy():
+    doc = jsonc.loads(SRC, positions=True)
+    other = copy.deepcopy(doc)
+    assert positions.of(other).span(other["a"][1]) == positions.of(doc).span(doc["a"][1])
+    assert doc["a"][1] not in positions.of(other)
+
+
+def test_loads_at():
+    doc = jsonc.loads_at(SRC, "/b", positions=True)
+    assert text(doc, doc["c"]) == '"d"'
+    assert positions.of(doc).start(doc["c"]) == Location(4, 14)
+
+
+def test_same_document():
+    assert jsonc.loads(SRC, positions=True) == jsonc.loads(SRC)
+    assert jsonc.dumps(jsonc.loads(SRC, positions=True)) == jsonc.dumps(jsonc.loads(SRC))
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from json4humans import json5, jsonc
+from json4humans import query as q
+from json4humans.types import Quote, String
+
+if TYPE_CHECKING:
+    from tests.conftest import JSONTester
+
+SRC = """\
+{
+  // Services
+  "services": {
+    "api": {
+      "env": [
+        {"name": "A", "value": 1},
+        {"name": "B", "value": 2}, // second
+        {"name": "C", "value": 3}
+      ],
+      "port": 8080 // the port
+    },
+    "a/b": {"~": true}
+  }
+}
+"""
+
+
+@pytest.fixture
+def doc():
+    return jsonc.loads(SRC)
+
+
+@pytest.mark.parametrize(
+    "pointer,expected",
+    [
+        ("", ()),
+        ("/a", ("a",)),
+        ("/a/0/", ("a", "0", "")),
+        ("/a~1b/~0", ("a/b", "~")),
+        ("/~01", ("~1",)),
+    ],
+)
+def test_parse_and_format_pointer(pointer: str, expected: tuple):
+    assert q.parse_pointer(pointer) == expected
+    assert q.format_pointer(expected) == pointer
+
+
+def test_invalid_pointer():
+    with pytest.raises(ValueError):
+        q.parse_pointer("a/b")
+
+
+@pytest.mark.parametrize(
+    "pointer,expected",
+    [
+        ("/services/api/env/1/value", 2),
+        (("services", "api", "env", 2, "name"), "C"),
+        ("/services/a~1b/~0", True),
+        ("/services/api/port", 8080),
+    ],
+)
+def test_get(doc, pointer, expected):
+    assert q.get(doc, pointer) == expected
+
+
+@pytest.mark.parametrize(
+    "pointer", ["/missing", "/services/api/env/3", "/services/api/env/-", "/services/api/env/01"]
+)
+def test_get_missing(doc, pointer):
+    with pytest.raises(KeyError):
+        q.get(doc, pointer)
+    assert q.get(doc, pointer, None) is None
+
+
+def test_set_preserves_style(doc):
+    q.assign(doc, "/services/api/env/1/value", 42)
+    q.assign(doc, "/services/api/port", 9090)
+    assert jsonc.dumps(doc) == SRC.replace('"value": 2', '"value": 42').replace("8080", "9090")
+
+
+def test_set_add_member(doc):
+    q.assign(doc, "/services/api/host", "localhost")
+    assert jsonc.dumps(doc) == SRC.replace(
+        '"port": 8080 // the port\n',
+        '"port": 8080, // the port\n      "host": "localhost"\n',
+    )
+
+
+def test_set_append_item(doc):
+    q.assign(doc, "/services/api/env/-", 4)
+    q.assign(doc, "/services/api/env/4", 5)
+    assert jsonc.dumps(doc) == SRC.replace('"value": 3}\n', '"value": 3},\n        4,\n        5\n')
+
+
+def test_set_keeps_quotes():
+    doc = json5.loads("{a: 'b', 'c': 1}")
+    q.assign(doc, "/a", "x")
+    q.assign(doc, "/d", "y")
+    assert json5.dumps(doc) == "{a: 'x', 'c': 1, 'd': \"y\"}"
+    assert isinstance(q.get(doc, "/a"), String) and q.get(doc, "/a").quote is Quote.SINGLE
+
+
+def test_set_missing_parent(doc):
+    with pytest.raises(KeyError):
+        q.assign(doc, "/missing/key", 1)
+    with pytest.raises(KeyError):
+        q.assign(doc, "/services/api/env/5", 1)
+
+
+def test_delete(doc):
+    assert q.delete(doc, "/services/api/env/1") == {"name": "B", "value": 2}
+    assert jsonc.dumps(doc) == SRC.replace('{"name": "B", "value": 2}, // second\n        ', "")
+
+
+def test_delete_last_entry(doc):
+    q.delete(doc, "/services/api/env/2")
+    q.delete(doc, "/services/a~1b")
+    assert jsonc.dumps(doc) == SRC.replace(
+        '}, // second\n        {"name": "C", "value": 3}', "} // second"
+    ).replace(',\n    "a/b": {"~": true}', "")
+
+
+@pytest.mark.parametrize("pointer", ["/services/api/host", "/services/api/env/-"])
+def test_set_then_delete_roundtrip(doc, pointer):
+    node = q.assign(doc, pointer, {"x": 1})
+    q.delete(doc, pointer if pointer[-1] != "-" else pointer[:-1] + "3")
+    assert node == {"x": 1}
+    assert jsonc.dumps(doc) == SRC
+
+
+def test_delete_with_trailing_coma():
+    doc = jsonc.loads('{\n  "a": 1, // a\n  "b": 2,\n}')
+    q.delete(doc, "/b")
+    assert jsonc.dumps(doc) == '{\n  "a": 1, // a\n}'
+
+
+@pytest.mark.jsons("jsonc")
+@pytest.mark.parametrize(
+    "src,pointer,expected",
+    [
+        ('{\n  // head\n  "a": 1, // a\n  "b": 2\n}', "/a", '{\n  // head\n  "b": 2\n}'),
+        ('{\n  "a": 1,\n  // b\n  "b": 2\n}', "/b", '{\n  "a": 1\n  // b\n}'),
+        ("[\n  // only\n  1,\n]", "/0", "[\n  // only\n]"),
+        ('{"a": 1, "b": 2}', "/a", '{"b": 2}'),
+        ('{ "a": 1 }', "/a", "{  }"),
+    ],
+)
+def test_delete_keeps_comment_lines(jsont: JSONTester, src: str, pointer: str, expected: str):
+    doc = jsont.loads(src)
+    q.delete(doc, pointer)
+    assert jsont.dumps(doc) == expected
+
+
+def test_delete_missing(doc):
+    with pytest.raises(KeyError):
+        q.delete(doc, "/services/missing")
+    with pytest.raises(KeyError):
+        q.delete(doc, "")
+
+
+@pytest.mark.parametrize(
+    "path,expected",
+    [
+        ("$", ["/"]),
+        ("$.services.api.port", ["/services/api/port"]),
+        ("$['services'][\"a/b\"]['~']", ["/services/a~1b/~0"]),
+        ("$.services.api.env[0].name", ["/services/api/env/0/name"]),
+        ("$.services.api.env[-1].name", ["/services/api/env/2/name"]),
+        ("$.services.api.env[*].value", [f"/services/api/env/{i}/value" for i in range(3)]),
+        ("$.services.api.env[1:].name", ["/services/api/env/1/name", "/services/api/env/2/name"]),
+        ("$.services.api.env[::2].name", ["/services/api/env/0/name", "/services/api/env/2/name"]),
+        ("$.services.api.env[0,2].name", ["/services/api/env/0/name", "/services/api/env/2/name"]),
+        ("$..name", [f"/services/api/env/{i}/name" for i in range(3)]),
+        ("$.services.*", ["/services/api", "/services/a~1b"]),
+        ("$..missing", []),
+        ("$.services.api.port.nested", []),
+    ],
+)
+def test_query(doc, path: str, expected: list[str]):
+    pointers = q.pointers(doc, path)
+    assert pointers == [p if p != "/" else "" for p in expected]
+    assert q.query(doc, path) == [q.get(doc, p) for p in pointers]
+
+
+@pytest.mark.parametrize("path", ["services", "$.", "$[", "$[?(@.a)]", "$.a b"])
+def test_invalid_query(path: str):
+    with pytest.raises(ValueError):
+        q.parse_path(path)
+
+
+def test_index(doc):
+    index = q.Index(doc)
+    assert index.get("/services/api/env/1/value") == 2
+    assert "/services/api/port" in index
+    assert index.get("/missing", None) is None
+    with pytest.raises(KeyError):
+        index.get("/missing")
+    assert index.query("$..name") == ["A", "B", "C"]
+
+
+@pytest.mark.parametrize(
+    "operation,pointer,value",
+    [
+        ("set", "/services/api/env/1", {"name": "X", "value": [1, 2]}),
+        ("set", "/services/api/env/-", {"name": "D"}),
+        ("set", "/services/api/host", "localhost"),
+        ("set", "/services/api", [1]),
+        ("delete", "/services/api/env/0", None),
+        ("delete", "/services/api", None),
+    ],
+)
+def test_index_incremental_update(doc, operation: str, pointer: str, value):
+    index = q.Index(doc)
+    if operation == "set":
+        index.assign(pointer, value)
+    else:
+        index.delete(pointer)
+    assert index.nodes == q.Index(doc).nodes
+    assert all(index.nodes[tokens] is node for tokens, node in q.Index(doc).nodes.items())
+
+
+def test_index_reindex(doc):
+    index = q.Index(doc)
+    doc["services"]["api"]["env"].pop()
+    index.reindex("/services/api/env")
+    assert index.nodes == q.Index(doc).nodes
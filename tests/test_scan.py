@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import pytest
+
+from json4humans import scan
+from json4humans.errors import JSONDecodeError
+from json4humans.query import to_tokens
+
+SRC = """\
+// header
+{
+  "a": [1, /* ] */ "two", {"b": null}],
+  // "c": "commented"
+  'c': {d: 0xFF, "e\\"f": 'g'},
+  "h": "i" // trailing
+}
+"""
+
+
+@pytest.mark.parametrize(
+    "pointer,expected",
+    [
+        ("", SRC[SRC.index("{") : SRC.rindex("}") + 1]),
+        ("/a", '[1, /* ] */ "two", {"b": null}]'),
+        ("/a/0", "1"),
+        ("/a/1", '"two"'),
+        ("/a/2/b", "null"),
+        ("/c", '{d: 0xFF, "e\\"f": \'g\'}'),
+        ("/c/d", "0xFF"),
+        ('/c/e"f', "'g'"),
+        ("/h", '"i"'),
+    ],
+)
+def test_locate(pointer: str, expected: str):
+    start, end = scan.locate(SRC, pointer)
+    assert SRC[start:end] == expected
+
+
+@pytest.mark.parametrize("pointer", ["/x", "/a/3", "/a/01", "/a/-", "/a/x", "/h/0", "/a/0/b"])
+def test_locate_missing(pointer: str):
+    with pytest.raises(KeyError):
+        scan.locate(SRC, pointer)
+
+
+def test_locate_all():
+    found = ["", "/a/0", "/a/2/b", "/c", "/c/d", '/c/e"f', "/h"]
+    missing = ["/x", "/a/3", "/a/01", "/a/-", "/h/0", "/a/0/b"]
+    spans = scan.locate_all(SRC, found + missing)
+    assert spans == {to_tokens(pointer): scan.locate(SRC, pointer) for pointer in found}
+
+
+def test_locate_all_duplicated_keys():
+    src = '{"a": {"b": 1}, "a": {"b": 2}}'
+    assert scan.locate_all(src, ["/a/b"]) == {("a", "b"): scan.locate(src, "/a/b")}
+
+
+@pytest.mark.parametrize(
+    "src,pos",
+    [
+        ('{"a": [1, 2}', 12),
+        ('{"a" 1, "b": 2}', 5),
+        ('{"a": 1 "b": 2}', 8),
+        ('{"a": ', 6),
+    ],
+)
+def test_locate_structural_errors(src: str, pos: int):
+    with pytest.raises(JSONDecodeError) as excinfo:
+        scan.locate(src, "/b")
+    assert excinfo.value.pos == pos
+
+
+def test_entries():
+    src = '{"a": 1, /* c */ b: [2],\n}'
+    entries, closing = scan.entries(src, 0)
+    assert entries == [
+        scan.Entry("a", 1, 6, 7, 7),
+        scan.Entry("b", 17, 20, 23, 23),
+    ]
+    assert closing == len(src) - 1
+    assert scan.entries("[]", 0) == ([], 1)
+    with pytest.raises(KeyError):
+        scan.entries(src, 6)
+
+
+@pytest.mark.parametrize(
+    "src,expected", [("1, // x\n  2", 7), ("1, /* \n */ 2", -1), ("1, 2", -1), ("1,\n2", 2)]
+)
+def test_line_end(src: str, expected: int):
+    assert scan.line_end(src, 2, len(src)) == expected
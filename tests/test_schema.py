@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import io
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+import pytest
+
+from json4humans import events, json5, jsonc, schema
+from json4humans.errors import JSONDecodeError, ValidationError
+
+if TYPE_CHECKING:
+    from tests.conftest import JSONTester
+
+SCHEMA = {
+    "type": "object",
+    "required": ["name"],
+    "properties": {
+        "name": {"type": "string", "minLength": 2},
+        "tags": {"type": "array", "items": {"type": "string"}, "uniqueItems": True},
+        "port": {"$ref": "#/$defs/port"},
+    },
+    "additionalProperties": False,
+    "$defs": {"port": {"type": "integer", "minimum": 1, "maximum": 65535}},
+}
+
+SRC = """\
+{
+  // A comment
+  "name": "a",
+  "tags": ["x", 1],
+  "port": 0,
+  "extra": null
+}
+"""
+
+
+def messages(doc, schema_: schema.Schema) -> list[tuple[str, str]]:
+    return [(error.pointer, error.msg) for error in schema.errors(doc, schema_)]
+
+
+def test_errors_with_positions():
+    errors = schema.errors(jsonc.loads(SRC), SCHEMA, SRC)
+    assert [(error.pointer, error.lineno, error.colno) for error in errors] == [
+        ("/name", 3, 11),
+        ("/tags/1", 4, 17),
+        ("/port", 5, 11),
+        ("/extra", 6, 12),
+    ]
+    assert errors[0].msg == '"a" is too short'
+    assert str(errors[2]) == "0 is less than 1 at '/port': line 5 column 11"
+
+
+def test_errors_without_source():
+    errors = schema.errors(jsonc.loads(SRC), SCHEMA)
+    assert len(errors) == 4
+    assert all(error.lineno is None for error in errors)
+
+
+def test_validate():
+    schema.validate(jsonc.loads('{"name": "ab", "port": 80}'), SCHEMA)
+    with pytest.raises(ValidationError, match="Missing required properties: 'name'"):
+        schema.validate(jsonc.loads('{"port": 80}'), SCHEMA)
+
+
+def test_compile_is_cached():
+    assert schema.compile(SCHEMA) is schema.compile(dict(SCHEMA))
+
+
+@pytest.mark.jsons("jsonc")
+@pytest.mark.parametrize(
+    "keywords,valid,invalid",
+    [
+        ({"type": "integer"}, ["1", "1.0"], ["1.5", "true", '"1"']),
+        ({"type": ["string", "null"]}, ['"a"', "null"], ["0", "[]"]),
+        ({"exclusiveMinimum": 0, "exclusiveMaximum": 1}, ["0.5", '"a"'], ["0", "1"]),
+        ({"multipleOf": 0.1}, ["0.3", "2"], ["0.35"]),
+        ({"maxLength": 2, "pattern": "^a"}, ['"ab"'], ['"abc"', '"ba"']),
+        ({"enum": [1, "a", [True]]}, ["1.0", '"a"', "[true]"], ["2", "[false]", "null"]),
+        ({"const": {"a": [1]}}, ['{"a": [1]}'], ['{"a": [1], "b": 2}']),
+        ({"minProperties": 1, "maxProperties": 1}, ['{"a": 1}'], ["{}", '{"a": 1, "b": 2}']),
+        ({"propertyNames": {"pattern": "^[a-z]+$"}}, ['{"ab": 1}'], ['{"A": 1}']),
+        ({"dependentRequired": {"a": ["b"]}}, ['{"b": 1}', '{"a": 1, "b": 1}'], ['{"a": 1}']),
+        (
+            {"patternProperties": {"^x-": {"type": "string"}}},
+            ['{"x-a": "b", "y": 1}'],
+            ['{"x-a": 1}'],
+        ),
+        (
+            {"prefixItems": [{"type": "string"}], "items": False},
+            ['["a"]', "[]"],
+            ["[1]", '["a", 1]'],
+        ),
+        ({"items": [{"type": "string"}], "additionalItems": False}, ['["a"]'], ['["a", 1]']),
+        ({"minItems": 1, "maxItems": 2}, ["[1]"], ["[]", "[1, 2, 3]"]),
+        ({"contains": {"type": "string"}}, ['[1, "a"]'], ["[1]"]),
+        ({"anyOf": [{"type": "string"}, {"minimum": 2}]}, ['"a"', "3"], ["1"]),
+        ({"oneOf": [{"type": "integer"}, {"minimum": 2}]}, ["1", "2.5"], ["3"]),
+        ({"allOf": [{"minimum": 1}, {"maximum": 2}]}, ["1"], ["0", "3"]),
+        ({"not": {"type": "null"}}, ["1"], ["null"]),
+        (
+            {"if": {"type": "integer"}, "then": {"minimum": 1}, "else": {"type": "string"}},
+            ["1", '"a"'],
+            ["0", "[]"],
+        ),
+    ],
+)
+def test_keywords(jsont: JSONTester, keywords: dict, valid: list[str], invalid: list[str]):
+    for src in valid:
+        assert schema.errors(jsont.loads(src), keywords) == [], src
+        schema.validate_stream(src, keywords)
+    for src in invalid:
+        assert schema.errors(jsont.loads(src), keywords), src
+        with pytest.raises(ValidationError):
+            schema.validate_stream(src, keywords)
+
+
+def test_recursive_reference():
+    tree = {"required": ["id"], "properties": {"children": {"items": {"$ref": "#"}}}}
+    doc = jsonc.loads('{"id": 1, "children": [{"id": 2}, {"children": [{}]}]}')
+    assert messages(doc, tree) == [
+        ("/children/1", "Missing required properties: 'id'"),
+        ("/children/1/children/0", "Missing required properties: 'id'"),
+    ]
+
+
+def test_unresolvable_reference():
+    with pytest.raises(ValueError, match="Unresolvable reference"):
+        schema.Validator({"$ref": "#/$defs/missing"})
+
+
+def test_validate_literals():
+    doc = json5.loads("{a: true, b: null}")
+    assert messages(doc, {"properties": {"a": {"type": "boolean"}, "b": {"type": "null"}}}) == []
+    assert messages(doc, {"properties": {"a": {"type": "null"}}}) == [
+        ("/a", "Expected null, got boolean")
+    ]
+
+
+def test_validate_decimals():
+    doc = jsonc.loads('{"a": 1.5, "b": 2.0, "c": 1e400}', parse_float=Decimal)
+    number, integer = {"type": "number"}, {"type": "integer", "maximum": 1}
+    assert messages(doc, {"additionalProperties": number}) == []
+    assert messages(doc, {"additionalProperties": integer}) == [
+        ("/a", "Expected integer, got number"),
+        ("/b", "2.0 is greater than 1"),
+        ("/c", "1E+400 is greater than 1"),
+    ]
+
+
+def test_errors_located_in_a_single_scan():
+    src = '{"a": [{"b": 0}, {"b": 1}, {"b": 0}], "a": [{"b": 0},\n {"b": 1}], "c": [[0]]}'
+    errors = schema.errors(
+        jsonc.loads(src),
+        {
+            "additionalProperties": {
+                "type": "array",
+                "items": {"items": False, "additionalProperties": {"const": 0}},
+            }
+        },
+        src,
+    )
+    assert [(error.pointer, error.lineno, error.colno) for error in errors] == [
+        ("/a/1/b", 2, 8),
+        ("/c/0/0", 2, 20),
+    ]
+
+
+@pytest.mark.parametrize(
+    "src,pointer,lineno,colno",
+    [
+        ('{"name": "ab", "port": 0}', "/port", 1, 24),
+        ('{\n  "name": "ab",\n  "tags": ["a", "a"]\n}', "/tags", 3, 11),
+        ('{"name": "ab", "tags": ["a", 1]}', "/tags/1", 1, 24),
+        ('{\n  "name": "ab"\n  , "extra": {}\n}', "/extra", 3, 14),
+        ('{"port": 1}', "", 1, 1),
+    ],
+)
+def test_validate_stream_fails_fast(src: str, pointer: str, lineno: int, colno: int):
+    with pytest.raises(ValidationError) as excinfo:
+        schema.validate_stream(io.StringIO(src), SCHEMA)
+    assert (excinfo.value.pointer, excinfo.value.lineno, excinfo.value.colno) == (
+        pointer,
+        lineno,
+        colno,
+    )
+
+
+def test_validate_stream_dialects():
+    schema.validate_stream(
+        SRC.replace('"a"', "'ab'").replace("1]", "'y',]").replace("0", "80"),
+        SCHEMA | {"additionalProperties": True},
+        "json5",
+    )
+    with pytest.raises(JSONDecodeError):
+        schema.validate_stream(SRC, SCHEMA, "json")
+
+
+def test_validate_stream_chunks():
+    chunks = ['{"name"', ': "a', 'b", "tags": ["a"', ', "b"]}']
+    schema.validate_stream(chunks, SCHEMA)
+
+
+def test_events():
+    assert [
+        (event.kind, event.value) for event in events.events('{"a": [1, 2.5, "b"], "c": null}')
+    ] == [
+        ("start_object", None),
+        ("key", "a"),
+        ("start_array", None),
+        ("scalar", 1),
+        ("scalar", 2.5),
+        ("scalar", "b"),
+        ("end_array", None),
+        ("key", "c"),
+        ("scalar", None),
+        ("end_object", None),
+    ]
+    assert list(events.events("{a: [+0xFF, .5, 'b',],}", "json5"))[3].value == 255
+
+
+@pytest.mark.parametrize(
+    "src,dialect",
+    [
+        ("[1,]", "json"),
+        ("[1 2]", "json"),
+        ("[1", "json"),
+        ("[1] // comment", "json"),
+        ("{a: 1}", "jsonc"),
+        ("{$a: 1}", "json5"),
+        ("1 2", "json5"),
+        ("[,]", "json5"),
+    ],
+)
+def test_events_errors(src: str, dialect: str):
+    with pytest.raises(JSONDecodeError):
+        list(events.events(src, dialect))
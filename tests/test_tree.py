@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+from copy import deepcopy
+
+import pytest
+
+from json4humans import bench, diff, json, json5, jsonc, positions
+from json4humans.tree import clone, from_python, to_python
+from json4humans.types import (
+    Array,
+    Float,
+    HexInteger,
+    Integer,
+    Literal,
+    Object,
+    String,
+)
+
+JSON5 = """\
+// Header
+{
+  id: 0x1F, 'name': 'app', // comment
+  ratio: +.5,
+  "text": "line\\
+continued",
+  values: [1, 2., -Infinity, null, true,], /* block */
+  nested: {"a": {"b": []}},
+}
+"""
+
+
+def test_clone_preserves_style_and_types():
+    doc = json5.loads(JSON5)
+    copy = clone(doc)
+
+    assert copy == doc
+    assert json5.dumps(copy) == JSON5
+    assert type(copy) is Object and type(copy["values"]) is Array
+    assert isinstance(copy["id"], HexInteger) and copy["id"].raw == "0x1F"
+    assert isinstance(copy["ratio"], Float) and copy["ratio"].prefixed
+    assert isinstance(copy["values"][3], Literal) and copy["values"][3].value is None
+    assert copy["text"].linebreaks == doc["text"].linebreaks
+
+
+def test_clone_copies_nodes():
+    doc = json5.loads(JSON5)
+    copy = clone(doc)
+
+    pairs = [(doc, copy), (doc["nested"], copy["nested"]), (doc["values"], copy["values"])]
+    pairs += [(doc["name"], copy["name"]), (doc["values"][0], copy["values"][0])]
+    for original, cloned in pairs:
+        assert cloned is not original
+    assert all(
+        cloned is not original for original, cloned in zip(doc.keys(), copy.keys())
+    ), "Keys are copied"
+
+    copy["nested"]["a"]["b"].append(1)
+    copy["name"].json_before = []
+    assert doc["nested"]["a"]["b"] == []
+    assert json5.dumps(doc) == JSON5
+
+
+def test_clone_share_trivia():
+    doc = jsonc.loads('{"a": 1 /* one */}')
+
+    shared = clone(doc)
+    assert shared["a"].json_after is doc["a"].json_after
+
+    copy = clone(doc, share_trivia=False)
+    assert copy["a"].json_after == doc["a"].json_after
+    assert copy["a"].json_after is not doc["a"].json_after
+    copy["a"].json_after.clear()
+    assert jsonc.dumps(doc) == '{"a": 1 /* one */}'
+
+
+@pytest.mark.parametrize("value", [1, 1.5, "text", True, None])
+def test_clone_share_immutables(value):
+    assert clone(value) is value
+    assert clone([value])[0] is clone({"a": value})["a"] is value
+
+
+def test_clone_plain_containers():
+    data = {"a": [1, {"b": String("c", before=[" "])}]}
+    copy = clone(data)
+
+    assert type(copy) is dict and type(copy["a"]) is list
+    assert copy == data and copy["a"][1]["b"].json_before == [" "]
+    assert copy["a"][1] is not data["a"][1]
+
+
+def test_clone_deep_documents():
+    src = bench.deep(10_000)
+    assert json.dumps(clone(json.loads(src))) == src
+
+
+def test_clone_drops_positions():
+    doc = json.loads('{"a": [1, 2]}', positions=True)
+    copy = clone(doc)
+
+    assert positions.of(doc)
+    with pytest.raises(ValueError):
+        positions.of(copy)
+    assert diff.digest(copy) == diff.digest(doc)
+    copy["a"].append(3)
+    assert diff.digest(copy) != diff.digest(doc)
+
+
+def test_clone_matches_deepcopy():
+    doc = json5.loads(JSON5)
+    assert json5.dumps(clone(doc)) == json5.dumps(deepcopy(doc))
+
+
+def test_to_python():
+    doc = json5.loads(JSON5)
+    data = to_python(doc)
+
+    assert data == {
+        "id": 31,
+        "name": "app",
+        "ratio": 0.5,
+        "text": "linecontinued",
+        "values": [1, 2.0, float("-inf"), None, True],
+        "nested": {"a": {"b": []}},
+    }
+    builtins = (dict, list, str, int, float, bool, type(None))
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        assert type(node) in builtins
+        if isinstance(node, dict):
+            assert all(type(key) is str for key in node)
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+
+
+def test_to_python_copies_plain_containers():
+    data = {"a": [1, {"b": (2, String("c"))}]}
+    copy = to_python(data)
+
+    assert copy == {"a": [1, {"b": [2, "c"]}]}
+    assert copy["a"] is not data["a"] and type(copy["a"][1]["b"][1]) is str
+
+
+def test_from_python_without_template():
+    doc = from_python({"a": [1, 1.5, "x", True, None], "b": {}})
+
+    assert json.dumps(doc) == '{"a":[1,1.5,"x",true,null],"b":{}}'
+    assert type(doc) is Object and type(doc["a"]) is Array
+    assert [type(value) for value in doc["a"]] == [Integer, Float, String, Literal, Literal]
+    assert all(type(key) is String for key in doc)
+
+
+def test_from_python_keeps_nodes():
+    node = String("x", quote="'")
+    assert from_python({"a": node})["a"] is node
+
+
+def test_from_python_roundtrip_with_template():
+    doc = json5.loads(JSON5)
+    assert json5.dumps(from_python(to_python(doc), template=doc)) == JSON5
+
+
+TEMPLATE = """\
+{
+  "name": 'app', // the name
+  "port": 0x1F90,
+  "tags": ["a", "b"],
+  "debug": false
+}
+"""
+
+
+@pytest.mark.parametrize(
+    "change,expected",
+    [
+        pytest.param(
+            lambda data: data.update(port=8081, extra=1),
+            """\
+{
+  "name": 'app', // the name
+  "port": 0x1f91,
+  "tags": ["a", "b"],
+  "debug": false,
+  "extra": 1
+}
+""",
+            id="add",
+        ),
+        pytest.param(
+            lambda data: data.pop("debug"),
+            """\
+{
+  "name": 'app', // the name
+  "port": 0x1F90,
+  "tags": ["a", "b"]
+}
+""",
+            id="remove-last",
+        ),
+        pytest.param(
+            lambda data: data["tags"].extend(["c", "d"]),
+            """\
+{
+  "name": 'app', // the name
+  "port": 0x1F90,
+  "tags": ["a", "b", "c", "d"],
+  "debug": false
+}
+""",
+            id="append",
+        ),
+    ],
+)
+def test_from_python_template_layout(change, expected):
+    doc = json5.loads(TEMPLATE)
+    data = to_python(doc)
+    change(data)
+    assert json5.dumps(from_python(data, template=doc)) == expected
+
+
+def test_from_python_reordered_members():
+    doc = json5.loads(TEMPLATE)
+    data = dict(reversed(list(to_python(doc).items())))
+
+    assert json5.dumps(from_python(data, template=doc)) == (
+        "{\n"
+        '  "debug": false,\n'
+        '  "tags": ["a", "b"], // the name\n'
+        '  "port": 0x1F90,\n'
+        "  \"name\": 'app'\n"
+        "}\n"
+    )
+
+
+def test_from_python_template_items():
+    doc = jsonc.loads("[\n  1 /* one */\n]")
+
+    assert jsonc.dumps(from_python([1, 2, 3], template=doc)) == "[\n  1,\n  2,\n  3\n]"
+    assert jsonc.dumps(from_python([], template=doc)) == "[]"
+
+
+def test_tree_conversions_deep_documents():
+    src = bench.deep(10_000)
+    data = to_python(json.loads(src))
+    assert json.dumps(from_python(data)) == src.replace(" ", "")
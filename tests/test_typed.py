@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import enum
+import json as stdjson
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Literal, TypedDict
+
+import pytest
+
+from json4humans import json, json5, jsonc, typed
+from json4humans.errors import JSONDecodeError
+
+if TYPE_CHECKING:
+    from tests.conftest import JSONTester
+
+
+class Color(enum.Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class Server(TypedDict, total=False):
+    host: str
+    port: int
+
+
+@dataclass
+class Node:
+    name: str
+    children: list[Node] = field(default_factory=list)
+
+
+@dataclass
+class Config:
+    name: str
+    servers: list[Server]
+    color: Color | None = None
+    mode: Literal["a", "b"] = "a"
+    ratio: float = 1.0
+    tree: Node | None = None
+    pair: tuple[int, str] | None = None
+    tags: set[str] = field(default_factory=set)
+    extra: dict[str, Any] = field(default_factory=dict)
+
+
+SRC = """\
+{
+  // The name
+  "name": "x",
+  "servers": [{"host": "h"}, {"host": "i", "port": 8},],
+  "color": "red",
+  "ratio": 2,
+  "tree": {"name": "r", "children": [{"name": "c"}]},
+  "pair": [1, "a"],
+  "tags": ["a", "b", "a"],
+  "extra": {"a": [1, {"b": null}]},
+}
+"""
+
+
+def test_loads_typed():
+    assert jsonc.loads(SRC, type=Config) == Config(
+        name="x",
+        servers=[{"host": "h"}, {"host": "i", "port": 8}],
+        color=Color.RED,
+        ratio=2.0,
+        tree=Node("r", [Node("c")]),
+        pair=(1, "a"),
+        tags={"a", "b"},
+        extra={"a": [1, {"b": None}]},
+    )
+
+
+def test_loads_typed_defaults():
+    assert json.loads('{"name": "x", "servers": []}', type=Config) == Config("x", [])
+
+
+@pytest.mark.jsons("json", "jsonc", "json5")
+@pytest.mark.parametrize(
+    "target,src,expected",
+    [
+        (int, "1", 1),
+        (float, "1", 1.0),
+        (bool | None, "null", None),
+        (list[int | str], '[1, "a"]', [1, "a"]),
+        (tuple[int, ...], "[1, 2]", (1, 2)),
+        (dict[str, float], '{"a": 1.5}', {"a": 1.5}),
+        (Literal[1, True], "true", True),
+        (Any, '{"a": [1]}', {"a": [1]}),
+        (list, "[[1], {}]", [[1], {}]),
+    ],
+)
+def test_loads_types(jsont: JSONTester, target: Any, src: str, expected: Any):
+    value = jsont.loads(src, type=target)
+    assert value == expected
+    assert type(value) is type(expected)
+
+
+def test_loads_json5_typed():
+    assert json5.loads("{name: 'x', servers: [{port: 0xFF,},]}", type=Config) == Config(
+        "x", [{"port": 255}]
+    )
+
+
+@pytest.mark.jsons("json")
+@pytest.mark.parametrize(
+    "src,message,lineno,colno",
+    [
+        ('{"name": 1, "servers": []}', "Expected string, got integer at '/name'", 1, 10),
+        ('{\n  "servers": []\n}', "Missing required fields: 'name'", 1, 1),
+        (
+            '{"name": "x",\n "servers": [{"port": "8"}]}',
+            "Expected integer, got string at '/servers/0/port'",
+            2,
+            23,
+        ),
+        (
+            '{"name": "x", "servers": [], "mode": "c"}',
+            "Expected 'a' or 'b', got 'c' at '/mode'",
+            1,
+            38,
+        ),
+        ('{"name": "x", "servers": [], "color": 1}', "got integer at '/color'", 1, 39),
+        ('{"name": "x", "servers": [], "zz": 1}', "Unknown field 'zz'", 1, 30),
+        (
+            '{"name": "x", "servers": [], "pair": [1]}',
+            "Expected array of 2 items, got 1 at '/pair'",
+            1,
+            38,
+        ),
+        (
+            '{"name": "x", "servers": [], "tree": {"name": "r", "children": [{"name": 1}]}}',
+            "Expected string, got integer at '/tree/children/0/name'",
+            1,
+            74,
+        ),
+        ('{"name": "x", "servers": []} x', "Unexpected 'x'", 1, 30),
+        ('{"name": "x", "servers": [{},]}', "Unexpected trailing coma", 1, 29),
+    ],
+)
+def test_loads_typed_errors(jsont: JSONTester, src: str, message: str, lineno: int, colno: int):
+    with pytest.raises(JSONDecodeError, match=message) as excinfo:
+        jsont.loads(src, type=Config)
+    assert (excinfo.value.lineno, excinfo.value.colno) == (lineno, colno)
+
+
+def test_loads_at_typed():
+    assert jsonc.loads_at(SRC, "/tree", type=Node) == Node("r", [Node("c")])
+    with pytest.raises(JSONDecodeError, match="Unknown field 'children'") as excinfo:
+        jsonc.loads_at(SRC, "/tree", type=Config)
+    assert (excinfo.value.lineno, excinfo.value.colno) == (7, 25)
+
+
+def test_events_empty_containers_after_coma():
+    assert json.loads('[1, [], {}, [[], {"a": []}]]', type=list) == [1, [], {}, [[], {"a": []}]]
+
+
+def test_decoders_are_cached():
+    assert typed.decoder(Config) is typed.decoder(Config)
+    assert typed.decoder(list[Config]) is typed.decoder(list[Config])
+    assert typed.decoder(Config).fields["tree"].members[0] is typed.decoder(Node)
+
+
+def test_unsupported_types():
+    with pytest.raises(TypeError):
+        json.loads("{}", type=dict[int, str])
+    with pytest.raises(ValueError):
+        json.loads("{}", type=dict, object_hook=dict)
+
+
+@dataclass
+class Unsupported:
+    a: int
+    b: complex
+
+
+@dataclass
+class Outer:
+    inner: Unsupported
+
+
+@pytest.mark.jsons("json")
+@pytest.mark.parametrize("target", [Unsupported, Outer])
+def test_unsupported_fields_are_not_cached(jsont: JSONTester, target: type):
+    for _ in range(2):
+        with pytest.raises(TypeError):
+            jsont.loads('{"a": 1, "b": 2}', type=target)
+    assert target not in typed.DECODERS and Unsupported not in typed.DECODERS
+
+
+PARITY_SOURCES = [
+    "01",
+    "-00.5",
+    '["\\x41", "a\tb", "\\q", "\\uD83D\\uDE00", "\\ud800", "\\v\\0"]',
+    '"a\\\r\nb"',
+    "[\f1]",
+    "[\v1]",
+    "[\xa01]",
+    "{_a1: 1, Infinity: 2}",
+    "{true: 1}",
+    "{$a: 1}",
+    "{a$: 1}",
+    "['a\\'b', +1, .5, 5., 0x1F, -Infinity]",
+    "[1,]",
+    "# c\n1",
+    "/* c */ 1 // c",
+    "[1abc]",
+    "[0x1g]",
+    "[1ee5]",
+    "[1 2]",
+    "[]]",
+    "1 2",
+]
+
+
+@pytest.mark.jsons("json", "jsonc", "json5")
+@pytest.mark.parametrize("src", PARITY_SOURCES)
+def test_parser_parity(jsont: JSONTester, src: str):
+    def parse():
+        return jsont.loads(src, parse_float=float, parse_int=int, object_hook=dict, array_hook=list)
+
+    try:
+        expected = parse()
+    except JSONDecodeError:
+        with pytest.raises(JSONDecodeError):
+            jsont.loads(src, type=Any)
+    else:
+        assert stdjson.dumps(jsont.loads(src, type=Any)) == stdjson.dumps(expected)
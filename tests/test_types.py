@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from json4humans.types import Array, Float, LineStyleComment, Literal, Object, String, WhiteSpace
+
+if TYPE_CHECKING:
+    from tests.conftest import JSONTester
+
+
+def test_object_style_parameters():
+    obj = Object([("a", 1)], before=["\n  "], tail=[" // tail"], trailing_coma=True)
+    assert obj == {"a": 1}
+    assert obj.json_before == [WhiteSpace("\n  ")]
+    assert obj.json_container_tail == [WhiteSpace(" "), LineStyleComment(" tail")]
+    assert obj.json_container_trailing_coma
+
+
+def test_nodes_do_not_share_trivia_lists():
+    first = String("a", before=["\n  "])
+    second = Array([], before=["\n  "])
+    first.json_before.append(WhiteSpace(" "))
+    assert second.json_before == [WhiteSpace("\n  ")]
+
+
+def test_literals_equality():
+    assert Literal(None) == Literal(None)
+    assert Literal(True) == True  # noqa: E712
+    assert Literal(True) != Literal(False)
+
+
+def test_float_representation():
+    assert str(Float(0.5, leading_point=True)) == ".5"
+    assert str(Float(1.25, significand=1)) == "1.2"
+    assert str(Float(0.5, leading_point=True, raw="0.50")) == "0.50"
+
+
+@pytest.mark.jsons("json5")
+@pytest.mark.parametrize(
+    "raw,leading_point,significand",
+    [
+        (".5", True, 1),
+        ("-.5", True, 1),
+        ("5.", False, 0),
+        ("1.50e3", False, 2),
+        ("1e3", False, None),
+    ],
+)
+def test_float_representation_from_lexeme(
+    jsont: JSONTester, raw: str, leading_point: bool, significand: int | None
+):
+    number = jsont.loads(raw)
+    assert (number.leading_point, number.significand) == (leading_point, significand)
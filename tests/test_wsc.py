@@ -30,3 +30,49 @@ from json4humans.types import WSC, BlockStyleComment, HashStyleComment, LineStyl
 )
 def test_parse_wsc_list(items: list[WSC | str] | None, expected: list[WSC]):
     assert wsc.parse_list(items) == expected
+
+
+@pytest.mark.parametrize(
+    "trivia,expected",
+    (
+        ("", []),
+        (" \n\t", [WhiteSpace(" \n\t")]),
+        (
+            "  // line\n/* block\n */# hash",
+            [
+                WhiteSpace("  "),
+                LineStyleComment(" line"),
+                WhiteSpace("\n"),
+                BlockStyleComment(" block\n "),
+                HashStyleComment(" hash"),
+            ],
+        ),
+        ("/**//**/", [BlockStyleComment(""), BlockStyleComment("")]),
+    ),
+)
+def test_lex(trivia: str, expected: list[WSC]):
+    assert wsc.lex(trivia) == expected
+
+
+def test_parse_list_keeps_parsed_comments():
+    comments = [LineStyleComment(" not a comment anymore"), BlockStyleComment("x")]
+    assert wsc.parse_list(comments) == comments
+
+
+def test_parse_is_memoized():
+    assert wsc.parse_cached("  // comment") is wsc.parse_cached("  // comment")
+    first = wsc.parse("  // comment")
+    first.append(WhiteSpace(" "))
+    assert wsc.parse("  // comment") == [WhiteSpace("  "), LineStyleComment(" comment")]
+
+
+def test_parse_whitespaces_without_parser(monkeypatch: pytest.MonkeyPatch):
+    wsc.parse_cached.cache_clear()
+    monkeypatch.setattr(wsc, "parser", None)
+    assert wsc.parse("\n    ") == [WhiteSpace("\n    ")]
+    assert wsc.parse("") == []
+
+
+@pytest.mark.parametrize("trivia", ("// line", "/* block */", "# hash", "  \n"))
+def test_encode_wsc_roundtrip(trivia: str):
+    assert "".join(map(wsc.encode_wsc, wsc.lex(trivia))) == trivia